@@ -9,6 +9,15 @@ class Settings:
     api_title: str = "LLM Flight Recorder API"
     api_version: str = "0.1.0"
     database_url: str = "sqlite:///./flight_recorder.db"
+    database_async: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: int = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 64 * 1024
     auth_enabled: bool = False
     auth_token: str = ""
     artifact_bucket: str = "artifacts"
@@ -21,6 +30,45 @@ class Settings:
     s3_secure: bool = False
     worker_poll_interval_ms: int = 1000
     redaction_block_on_failure: bool = True
+    artifact_diff_max_bytes: int = 2 * 1024 * 1024
+    artifact_diff_cache_entries: int = 1024
+    bundle_compression: str = "zstd"
+    bundle_read_workers: int = 8
+    bundle_prefetch_max_bytes: int = 8 * 1024 * 1024
+    bundle_import_chunk_size: int = 2000
+    bundle_import_spool_bytes: int = 16 * 1024 * 1024
+    retention_dev_short_days: int = 7
+    retention_ci_medium_days: int = 30
+    retention_incident_long_days: int = 180
+    retention_grace_hours: int = 24
+    retention_run_batch_size: int = 50
+    retention_row_batch_size: int = 5000
+    retention_interval_minutes: int = 60
+    event_partition_months_ahead: int = 3
+    stream_keepalive_seconds: int = 15
+    stream_resync_seconds: int = 5
+    search_artifact_text_max_bytes: int = 256 * 1024
+    request_body_max_bytes: int = 32 * 1024 * 1024
+    ingest_wal_enabled: bool = False
+    ingest_wal_dir: str = ".data/ingest-wal"
+    ingest_wal_commit_batch: int = 1000
+    ingest_wal_commit_interval_ms: int = 50
+    ingest_wal_max_pending: int = 50000
+    ingest_wal_read_wait_ms: int = 5000
+    ingest_stream_max_line_bytes: int = 1024 * 1024
+    ingest_stream_batch_lines: int = 500
+    ingest_reorder_enabled: bool = False
+    ingest_reorder_window: int = 256
+    ingest_reorder_timeout_ms: int = 2000
+    ingest_reorder_max_runs: int = 10000
+    ingest_idempotency_filter_capacity: int = 1_000_000
+    event_payload_offload_bytes: int = 0
+    compaction_seal_after_days: int = 0
+    compaction_interval_minutes: int = 60
+    compaction_run_batch_size: int = 20
+    compaction_snapshot_cache_runs: int = 8
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    response_cache_max_age_seconds: int = 3600
 
     @staticmethod
     def from_env() -> "Settings":
@@ -43,6 +91,15 @@ class Settings:
             api_title=os.getenv("API_TITLE", "LLM Flight Recorder API"),
             api_version=os.getenv("API_VERSION", "0.1.0"),
             database_url=os.getenv("DATABASE_URL", "sqlite:///./flight_recorder.db"),
+            database_async=b("DATABASE_ASYNC", False),
+            db_pool_size=i("DB_POOL_SIZE", 10),
+            db_max_overflow=i("DB_MAX_OVERFLOW", 20),
+            db_pool_timeout_seconds=i("DB_POOL_TIMEOUT_SECONDS", 30),
+            db_pool_recycle_seconds=i("DB_POOL_RECYCLE_SECONDS", 1800),
+            db_pool_pre_ping=b("DB_POOL_PRE_PING", True),
+            sqlite_journal_mode=os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+            sqlite_busy_timeout_ms=i("SQLITE_BUSY_TIMEOUT_MS", 5000),
+            sqlite_cache_size_kib=i("SQLITE_CACHE_SIZE_KIB", 64 * 1024),
             auth_enabled=b("AUTH_ENABLED", False),
             auth_token=os.getenv("AUTH_TOKEN", ""),
             artifact_bucket=os.getenv("ARTIFACT_BUCKET", "artifacts"),
@@ -55,6 +112,45 @@ class Settings:
             s3_secure=b("S3_SECURE", False),
             worker_poll_interval_ms=i("WORKER_POLL_INTERVAL_MS", 1000),
             redaction_block_on_failure=b("REDACTION_BLOCK_ON_FAILURE", True),
+            artifact_diff_max_bytes=i("ARTIFACT_DIFF_MAX_BYTES", 2 * 1024 * 1024),
+            artifact_diff_cache_entries=i("ARTIFACT_DIFF_CACHE_ENTRIES", 1024),
+            bundle_compression=os.getenv("BUNDLE_COMPRESSION", "zstd"),
+            bundle_read_workers=i("BUNDLE_READ_WORKERS", 8),
+            bundle_prefetch_max_bytes=i("BUNDLE_PREFETCH_MAX_BYTES", 8 * 1024 * 1024),
+            bundle_import_chunk_size=i("BUNDLE_IMPORT_CHUNK_SIZE", 2000),
+            bundle_import_spool_bytes=i("BUNDLE_IMPORT_SPOOL_BYTES", 16 * 1024 * 1024),
+            retention_dev_short_days=i("RETENTION_DEV_SHORT_DAYS", 7),
+            retention_ci_medium_days=i("RETENTION_CI_MEDIUM_DAYS", 30),
+            retention_incident_long_days=i("RETENTION_INCIDENT_LONG_DAYS", 180),
+            retention_grace_hours=i("RETENTION_GRACE_HOURS", 24),
+            retention_run_batch_size=i("RETENTION_RUN_BATCH_SIZE", 50),
+            retention_row_batch_size=i("RETENTION_ROW_BATCH_SIZE", 5000),
+            retention_interval_minutes=i("RETENTION_INTERVAL_MINUTES", 60),
+            event_partition_months_ahead=i("EVENT_PARTITION_MONTHS_AHEAD", 3),
+            stream_keepalive_seconds=i("STREAM_KEEPALIVE_SECONDS", 15),
+            stream_resync_seconds=i("STREAM_RESYNC_SECONDS", 5),
+            search_artifact_text_max_bytes=i("SEARCH_ARTIFACT_TEXT_MAX_BYTES", 256 * 1024),
+            request_body_max_bytes=i("REQUEST_BODY_MAX_BYTES", 32 * 1024 * 1024),
+            ingest_wal_enabled=b("INGEST_WAL_ENABLED", False),
+            ingest_wal_dir=os.getenv("INGEST_WAL_DIR", ".data/ingest-wal"),
+            ingest_wal_commit_batch=i("INGEST_WAL_COMMIT_BATCH", 1000),
+            ingest_wal_commit_interval_ms=i("INGEST_WAL_COMMIT_INTERVAL_MS", 50),
+            ingest_wal_max_pending=i("INGEST_WAL_MAX_PENDING", 50000),
+            ingest_wal_read_wait_ms=i("INGEST_WAL_READ_WAIT_MS", 5000),
+            ingest_stream_max_line_bytes=i("INGEST_STREAM_MAX_LINE_BYTES", 1024 * 1024),
+            ingest_stream_batch_lines=i("INGEST_STREAM_BATCH_LINES", 500),
+            ingest_reorder_enabled=b("INGEST_REORDER_ENABLED", False),
+            ingest_reorder_window=i("INGEST_REORDER_WINDOW", 256),
+            ingest_reorder_timeout_ms=i("INGEST_REORDER_TIMEOUT_MS", 2000),
+            ingest_reorder_max_runs=i("INGEST_REORDER_MAX_RUNS", 10000),
+            ingest_idempotency_filter_capacity=i("INGEST_IDEMPOTENCY_FILTER_CAPACITY", 1_000_000),
+            event_payload_offload_bytes=i("EVENT_PAYLOAD_OFFLOAD_BYTES", 0),
+            compaction_seal_after_days=i("COMPACTION_SEAL_AFTER_DAYS", 0),
+            compaction_interval_minutes=i("COMPACTION_INTERVAL_MINUTES", 60),
+            compaction_run_batch_size=i("COMPACTION_RUN_BATCH_SIZE", 20),
+            compaction_snapshot_cache_runs=i("COMPACTION_SNAPSHOT_CACHE_RUNS", 8),
+            response_cache_max_bytes=i("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+            response_cache_max_age_seconds=i("RESPONSE_CACHE_MAX_AGE_SECONDS", 3600),
         )
 
 
@@ -0,0 +1,42 @@
+"""bundle import progress
+
+Revision ID: 0002_bundle_imports
+Revises: 0001_initial
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_bundle_imports"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bundle_imports",
+        sa.Column("import_id", sa.String(length=64), primary_key=True),
+        sa.Column("source_run_id", sa.String(length=64), nullable=False),
+        sa.Column("run_id", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("steps_loaded", sa.Integer(), nullable=False),
+        sa.Column("last_step_sequence_no", sa.Integer(), nullable=False),
+        sa.Column("events_loaded", sa.Integer(), nullable=False),
+        sa.Column("last_sequence_no", sa.Integer(), nullable=False),
+        sa.Column("artifacts_loaded", sa.Integer(), nullable=False),
+        sa.Column("artifacts_skipped", sa.Integer(), nullable=False),
+        sa.Column("started_at_utc", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at_utc", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("ended_at_utc", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_bundle_imports_run_id", "bundle_imports", ["run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bundle_imports_run_id", table_name="bundle_imports")
+    op.drop_table("bundle_imports")
@@ -0,0 +1,29 @@
+"""run purge marker
+
+Revision ID: 0003_run_purge_marker
+Revises: 0002_bundle_imports
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_run_purge_marker"
+down_revision = "0002_bundle_imports"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "runs", sa.Column("purge_marked_at_utc", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_index("ix_runs_purge_marked_at_utc", "runs", ["purge_marked_at_utc"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_purge_marked_at_utc", table_name="runs")
+    op.drop_column("runs", "purge_marked_at_utc")
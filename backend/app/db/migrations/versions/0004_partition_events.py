@@ -0,0 +1,144 @@
+"""partition events by ingest month (postgres only)
+
+Revision ID: 0004_partition_events
+Revises: 0003_run_purge_marker
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_partition_events"
+down_revision = "0003_run_purge_marker"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+EVENT_INDEXES = {
+    "ix_events_run_id": "run_id",
+    "ix_events_step_id": "step_id",
+    "ix_events_event_type": "event_type",
+    "ix_events_run_sequence": "run_id, sequence_no",
+    "ix_events_idempotency_key": "idempotency_key",
+}
+
+
+def _month_index(value: datetime) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def _month(index: int) -> datetime:
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    # Partition keys must be part of every unique constraint, so global idempotency moves
+    # into its own table and event_artifacts can no longer hold a foreign key into events.
+    op.drop_constraint("event_artifacts_event_id_fkey", "event_artifacts", type_="foreignkey")
+    op.execute("ALTER TABLE events RENAME TO events_unpartitioned")
+    op.execute(
+        "CREATE TABLE events (LIKE events_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at_utc)"
+    )
+    op.execute("ALTER TABLE events ADD CONSTRAINT pk_events PRIMARY KEY (event_id, created_at_utc)")
+    op.execute(
+        "ALTER TABLE events ADD CONSTRAINT fk_events_run_id "
+        "FOREIGN KEY (run_id) REFERENCES runs (run_id)"
+    )
+    op.execute(
+        "ALTER TABLE events ADD CONSTRAINT fk_events_step_id "
+        "FOREIGN KEY (step_id) REFERENCES steps (step_id)"
+    )
+
+    now = datetime.now(timezone.utc)
+    oldest = (
+        bind.execute(sa.text("SELECT min(created_at_utc) FROM events_unpartitioned")).scalar()
+        or now
+    )
+    for index in range(_month_index(oldest), _month_index(now) + MONTHS_AHEAD + 1):
+        lower, upper = _month(index), _month(index + 1)
+        op.execute(
+            f"CREATE TABLE events_p{lower.year:04d}{lower.month:02d} PARTITION OF events "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+
+    op.execute("INSERT INTO events SELECT * FROM events_unpartitioned")
+    op.create_table(
+        "event_idempotency_keys",
+        sa.Column("idempotency_key", sa.String(length=256), primary_key=True),
+        sa.Column("event_id", sa.String(length=64), nullable=False),
+    )
+    op.create_index("ix_event_idempotency_keys_event_id", "event_idempotency_keys", ["event_id"])
+    op.execute(
+        "INSERT INTO event_idempotency_keys (idempotency_key, event_id) "
+        "SELECT idempotency_key, event_id FROM events_unpartitioned"
+    )
+    op.execute("DROP TABLE events_unpartitioned")
+    for name, columns in EVENT_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON events ({columns})")
+
+    op.execute(
+        """
+        CREATE FUNCTION events_claim_idempotency_key() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO event_idempotency_keys (idempotency_key, event_id)
+            VALUES (NEW.idempotency_key, NEW.event_id);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION events_release_idempotency_key() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM event_idempotency_keys WHERE idempotency_key = OLD.idempotency_key;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER trg_events_claim_idempotency_key BEFORE INSERT ON events "
+        "FOR EACH ROW EXECUTE FUNCTION events_claim_idempotency_key()"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_events_release_idempotency_key AFTER DELETE ON events "
+        "FOR EACH ROW EXECUTE FUNCTION events_release_idempotency_key()"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE events RENAME TO events_partitioned")
+    op.execute("CREATE TABLE events (LIKE events_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO events SELECT * FROM events_partitioned")
+    op.execute("DROP TABLE events_partitioned CASCADE")
+    op.execute("DROP FUNCTION events_claim_idempotency_key()")
+    op.execute("DROP FUNCTION events_release_idempotency_key()")
+    op.drop_index("ix_event_idempotency_keys_event_id", table_name="event_idempotency_keys")
+    op.drop_table("event_idempotency_keys")
+
+    op.create_primary_key("events_pkey", "events", ["event_id"])
+    op.create_unique_constraint("uq_events_idempotency", "events", ["idempotency_key"])
+    op.create_foreign_key("events_run_id_fkey", "events", "runs", ["run_id"], ["run_id"])
+    op.create_foreign_key("events_step_id_fkey", "events", "steps", ["step_id"], ["step_id"])
+    for name, columns in EVENT_INDEXES.items():
+        if name != "ix_events_idempotency_key":
+            op.execute(f"CREATE INDEX {name} ON events ({columns})")
+    op.create_foreign_key(
+        "event_artifacts_event_id_fkey", "event_artifacts", "events", ["event_id"], ["event_id"]
+    )
@@ -0,0 +1,36 @@
+"""precomputed run counters
+
+Revision ID: 0005_run_stats
+Revises: 0004_partition_events
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_run_stats"
+down_revision = "0004_partition_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing runs are backfilled with `python -m worker.app.rebuild_run_stats`; until then
+    # run detail falls back to aggregating their events.
+    op.create_table(
+        "run_stats",
+        sa.Column("run_id", sa.String(length=64), sa.ForeignKey("runs.run_id"), primary_key=True),
+        sa.Column("total_events", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_sequence_no", sa.Integer(), nullable=False, server_default="-1"),
+        sa.Column("event_type_counts_json", sa.JSON(), nullable=False),
+        sa.Column("determinism_mode_counts_json", sa.JSON(), nullable=False),
+        sa.Column("artifact_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at_utc", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("run_stats")
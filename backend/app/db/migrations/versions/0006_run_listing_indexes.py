@@ -0,0 +1,38 @@
+"""keyset indexes for run listing
+
+Revision ID: 0006_run_listing_indexes
+Revises: 0005_run_stats
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_run_listing_indexes"
+down_revision = "0005_run_stats"
+branch_labels = None
+depends_on = None
+
+
+def _keyset(*leading: str) -> list[sa.TextClause | str]:
+    return [*leading, sa.text("started_at_utc DESC"), sa.text("run_id DESC")]
+
+
+def upgrade() -> None:
+    # list_runs orders by (started_at_utc desc, run_id desc); run_id makes the keyset unique.
+    op.drop_index("ix_runs_app_started", table_name="runs")
+    op.drop_index("ix_runs_status_started", table_name="runs")
+    op.create_index("ix_runs_app_started", "runs", _keyset("app_id"))
+    op.create_index("ix_runs_status_started", "runs", _keyset("status"))
+    op.create_index("ix_runs_started_run", "runs", _keyset())
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_started_run", table_name="runs")
+    op.drop_index("ix_runs_status_started", table_name="runs")
+    op.drop_index("ix_runs_app_started", table_name="runs")
+    op.create_index("ix_runs_app_started", "runs", ["app_id", "started_at_utc"])
+    op.create_index("ix_runs_status_started", "runs", ["status", "started_at_utc"])
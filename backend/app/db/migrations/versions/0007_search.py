@@ -0,0 +1,80 @@
+"""payload and artifact text search
+
+Revision ID: 0007_search
+Revises: 0006_run_listing_indexes
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_search"
+down_revision = "0006_run_listing_indexes"
+branch_labels = None
+depends_on = None
+
+POSTGRES_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_events_payload_path ON events "
+    "USING gin ((payload_json::jsonb) jsonb_path_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_events_payload_fts ON events "
+    "USING gin (to_tsvector('simple', payload_json::jsonb))",
+    "CREATE INDEX IF NOT EXISTS ix_artifact_text_fts ON artifact_text "
+    "USING gin (to_tsvector('simple', content))",
+]
+
+SQLITE_SEARCH = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS event_search USING fts5(body)",
+    "CREATE TRIGGER IF NOT EXISTS events_search_insert AFTER INSERT ON events BEGIN "
+    "INSERT INTO event_search(rowid, body) SELECT new.rowid, group_concat(value, ' ') "
+    "FROM json_tree(new.payload_json) WHERE type = 'text'; END",
+    "CREATE TRIGGER IF NOT EXISTS events_search_delete AFTER DELETE ON events BEGIN "
+    "DELETE FROM event_search WHERE rowid = old.rowid; END",
+    "INSERT INTO event_search(rowid, body) SELECT events.rowid, "
+    "(SELECT group_concat(value, ' ') FROM json_tree(events.payload_json) WHERE type = 'text') "
+    "FROM events",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS artifact_search USING fts5(body)",
+    "CREATE TRIGGER IF NOT EXISTS artifact_text_search_insert "
+    "AFTER INSERT ON artifact_text BEGIN "
+    "INSERT INTO artifact_search(rowid, body) VALUES (new.rowid, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS artifact_text_search_delete "
+    "AFTER DELETE ON artifact_text BEGIN "
+    "DELETE FROM artifact_search WHERE rowid = old.rowid; END",
+]
+
+
+def upgrade() -> None:
+    # Existing artifacts are not backfilled into artifact_text;
+    # only artifacts stored from now on are searchable.
+    op.create_table(
+        "artifact_text",
+        sa.Column(
+            "artifact_hash",
+            sa.String(length=128),
+            sa.ForeignKey("artifacts.artifact_hash"),
+            primary_key=True,
+        ),
+        sa.Column("content", sa.Text(), nullable=False),
+    )
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_INDEXES:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for statement in SQLITE_SEARCH:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_events_payload_fts")
+        op.execute("DROP INDEX IF EXISTS ix_events_payload_path")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS events_search_insert")
+        op.execute("DROP TRIGGER IF EXISTS events_search_delete")
+        op.execute("DROP TABLE IF EXISTS event_search")
+        op.execute("DROP TABLE IF EXISTS artifact_search")
+    op.drop_table("artifact_text")
@@ -0,0 +1,42 @@
+"""hourly usage rollups
+
+Revision ID: 0008_usage_rollups
+Revises: 0007_search
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_usage_rollups"
+down_revision = "0007_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backfill with `python -m worker.app.rebuild_usage_rollups`.
+    op.create_table(
+        "usage_rollups",
+        sa.Column("bucket_start_utc", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("app_id", sa.String(length=128), primary_key=True),
+        sa.Column("environment", sa.String(length=64), primary_key=True),
+        sa.Column("kind", sa.String(length=16), primary_key=True),
+        sa.Column("subject", sa.String(length=128), primary_key=True),
+        sa.Column("call_count", sa.BigInteger(), nullable=False),
+        sa.Column("error_count", sa.BigInteger(), nullable=False),
+        sa.Column("latency_sum_ms", sa.Float(), nullable=False),
+        sa.Column("latency_max_ms", sa.Float(), nullable=False),
+        sa.Column("latency_histogram_json", sa.JSON(), nullable=False),
+        sa.Column("prompt_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("completion_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("usage_rollups")
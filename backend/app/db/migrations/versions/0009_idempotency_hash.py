@@ -0,0 +1,160 @@
+"""fixed-width idempotency key hashes
+
+Revision ID: 0009_idempotency_hash
+Revises: 0008_usage_rollups
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_idempotency_hash"
+down_revision = "0008_usage_rollups"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+# Same value as backend.app.db.models.idempotency_key_hash.
+POSTGRES_HASH = "substring(sha256(convert_to({column}, 'UTF8')) from 1 for 16)"
+
+CLAIM_FUNCTION = """
+CREATE OR REPLACE FUNCTION events_claim_idempotency_key() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO event_idempotency_keys (idempotency_hash, event_id)
+    VALUES (NEW.idempotency_hash, NEW.event_id)
+    ON CONFLICT DO NOTHING;
+    IF NOT FOUND THEN
+        -- Skipping the row lets INSERT ... ON CONFLICT DO NOTHING RETURNING report the duplicate.
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+RELEASE_FUNCTION = """
+CREATE OR REPLACE FUNCTION events_release_idempotency_key() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM event_idempotency_keys WHERE idempotency_hash = OLD.idempotency_hash;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+LEGACY_CLAIM_FUNCTION = """
+CREATE OR REPLACE FUNCTION events_claim_idempotency_key() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO event_idempotency_keys (idempotency_key, event_id)
+    VALUES (NEW.idempotency_key, NEW.event_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+LEGACY_RELEASE_FUNCTION = """
+CREATE OR REPLACE FUNCTION events_release_idempotency_key() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM event_idempotency_keys WHERE idempotency_key = OLD.idempotency_key;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _partitioned(bind: sa.engine.Connection) -> bool:
+    return (
+        bind.execute(
+            sa.text(
+                "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = 'events' AND c.relnamespace = to_regnamespace(current_schema())"
+            )
+        ).first()
+        is not None
+    )
+
+
+def _backfill_sqlite(bind: sa.engine.Connection) -> None:
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT rowid, idempotency_key FROM events "
+                "WHERE idempotency_hash IS NULL LIMIT :limit"
+            ),
+            {"limit": BACKFILL_BATCH},
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            sa.text("UPDATE events SET idempotency_hash = :hash WHERE rowid = :rowid"),
+            [
+                {"rowid": rowid, "hash": hashlib.sha256(key.encode("utf-8")).digest()[:16]}
+                for rowid, key in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column("events", sa.Column("idempotency_hash", sa.LargeBinary(length=16), nullable=True))
+    if bind.dialect.name != "postgresql":
+        # SQLite cannot drop the old unique constraint or add NOT NULL without rebuilding the
+        # table (and its FTS rowids), so it keeps both; the application always sets the hash.
+        _backfill_sqlite(bind)
+        op.create_index("uq_events_idempotency_hash", "events", ["idempotency_hash"], unique=True)
+        return
+
+    op.execute(
+        f"UPDATE events SET idempotency_hash = {POSTGRES_HASH.format(column='idempotency_key')}"
+    )
+    op.execute("ALTER TABLE events ALTER COLUMN idempotency_hash SET NOT NULL")
+    if not _partitioned(bind):
+        op.create_index("uq_events_idempotency_hash", "events", ["idempotency_hash"], unique=True)
+        op.drop_constraint("uq_events_idempotency", "events", type_="unique")
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_events_idempotency_key")
+    op.add_column(
+        "event_idempotency_keys", sa.Column("idempotency_hash", sa.LargeBinary(length=16))
+    )
+    op.execute(
+        "UPDATE event_idempotency_keys SET idempotency_hash = "
+        + POSTGRES_HASH.format(column="idempotency_key")
+    )
+    op.execute("ALTER TABLE event_idempotency_keys DROP CONSTRAINT event_idempotency_keys_pkey")
+    op.drop_column("event_idempotency_keys", "idempotency_key")
+    op.execute("ALTER TABLE event_idempotency_keys ADD PRIMARY KEY (idempotency_hash)")
+    op.execute(CLAIM_FUNCTION)
+    op.execute(RELEASE_FUNCTION)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.drop_index("uq_events_idempotency_hash", table_name="events")
+        op.execute("ALTER TABLE events DROP COLUMN idempotency_hash")
+        return
+
+    if not _partitioned(bind):
+        op.create_unique_constraint("uq_events_idempotency", "events", ["idempotency_key"])
+        op.drop_index("uq_events_idempotency_hash", table_name="events")
+        op.drop_column("events", "idempotency_hash")
+        return
+
+    op.execute(LEGACY_CLAIM_FUNCTION)
+    op.execute(LEGACY_RELEASE_FUNCTION)
+    op.add_column("event_idempotency_keys", sa.Column("idempotency_key", sa.String(length=256)))
+    op.execute(
+        "UPDATE event_idempotency_keys k SET idempotency_key = e.idempotency_key "
+        "FROM events e WHERE e.event_id = k.event_id"
+    )
+    op.execute("ALTER TABLE event_idempotency_keys DROP CONSTRAINT event_idempotency_keys_pkey")
+    op.drop_column("event_idempotency_keys", "idempotency_hash")
+    op.execute("ALTER TABLE event_idempotency_keys ADD PRIMARY KEY (idempotency_key)")
+    op.drop_column("events", "idempotency_hash")
+    op.execute("CREATE INDEX ix_events_idempotency_key ON events (idempotency_key)")
@@ -0,0 +1,126 @@
+"""native uuid keys and enum labels (postgres only)
+
+Revision ID: 0010_compact_keys
+Revises: 0009_idempotency_hash
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_compact_keys"
+down_revision = "0009_idempotency_hash"
+branch_labels = None
+depends_on = None
+
+# Server-issued identifiers. step_id, trace_id and parent ids come from clients and stay text.
+UUID_COLUMNS = {
+    "runs": ["run_id", "source_run_id"],
+    "run_stats": ["run_id"],
+    "steps": ["run_id"],
+    "events": ["event_id", "run_id"],
+    "event_artifacts": ["event_id"],
+    "event_idempotency_keys": ["event_id"],
+    "replay_sessions": ["replay_session_id", "source_run_id", "derived_run_id"],
+    "diff_reports": ["diff_report_id", "base_run_id", "candidate_run_id"],
+    "audit_log": ["audit_id"],
+    "bundle_imports": ["import_id", "run_id"],
+}
+
+# Keep in step with backend.app.schemas.events; a new label needs ALTER TYPE ... ADD VALUE.
+ENUMS = {
+    "event_type": [
+        "final_output",
+        "input_received",
+        "model_called",
+        "model_result",
+        "prompt_rendered",
+        "retrieval_executed",
+        "run_completed",
+        "run_failed",
+        "run_started",
+        "safety_decision",
+        "tool_called",
+        "tool_result",
+        "validator_decision",
+    ],
+    "determinism_mode": ["live", "exact", "cached", "simulated"],
+    "actor_type": ["sdk", "backend", "replay_engine"],
+    "redaction_status": ["not_required", "redacted", "blocked", "failed"],
+}
+
+ENUM_COLUMNS = {
+    "events": ["event_type", "determinism_mode", "actor_type", "redaction_status"],
+    "steps": ["determinism_mode"],
+}
+
+
+def _existing_tables(bind: sa.engine.Connection) -> set[str]:
+    return set(sa.inspect(bind).get_table_names())
+
+
+def _foreign_keys(bind: sa.engine.Connection, tables: list[str]) -> list[tuple[str, str, str]]:
+    # Only constraints declared on a table itself; partitions inherit theirs from the parent.
+    return [
+        tuple(row)
+        for row in bind.execute(
+            sa.text(
+                "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) "
+                "FROM pg_constraint WHERE contype = 'f' AND conparentid = 0 "
+                "AND conrelid::regclass::text = ANY(:tables)"
+            ),
+            {"tables": tables},
+        )
+    ]
+
+
+def _retype(bind: sa.engine.Connection, column_type: str, cast: str) -> None:
+    tables = sorted(_existing_tables(bind) & set(UUID_COLUMNS))
+    # Key columns on both ends of a foreign key must change together, so drop and re-add them.
+    foreign_keys = _foreign_keys(bind, tables)
+    for table, name, _ in foreign_keys:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+    for table in tables:
+        changes = ", ".join(
+            f"ALTER COLUMN {column} TYPE {column_type} USING {column}::{cast}"
+            for column in UUID_COLUMNS[table]
+        )
+        op.execute(f"ALTER TABLE {table} {changes}")
+    for table, name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite stores text whatever the declared type, so the models keep String there.
+        return
+
+    _retype(bind, "uuid", "uuid")
+    for name, labels in ENUMS.items():
+        values = ", ".join(f"'{label}'" for label in labels)
+        op.execute(f"CREATE TYPE {name} AS ENUM ({values})")
+    for table, columns in ENUM_COLUMNS.items():
+        changes = ", ".join(
+            f"ALTER COLUMN {column} TYPE {column} USING {column}::{column}" for column in columns
+        )
+        op.execute(f"ALTER TABLE {table} {changes}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for table, columns in ENUM_COLUMNS.items():
+        changes = ", ".join(
+            f"ALTER COLUMN {column} TYPE varchar(32) USING {column}::text" for column in columns
+        )
+        op.execute(f"ALTER TABLE {table} {changes}")
+    op.execute("ALTER TABLE events ALTER COLUMN event_type TYPE varchar(64)")
+    for name in ENUMS:
+        op.execute(f"DROP TYPE {name}")
+    _retype(bind, "varchar(64)", "text")
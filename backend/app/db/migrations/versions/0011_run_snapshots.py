@@ -0,0 +1,57 @@
+"""sealed run snapshots
+
+Revision ID: 0011_run_snapshots
+Revises: 0010_compact_keys
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0011_run_snapshots"
+down_revision = "0010_compact_keys"
+branch_labels = None
+depends_on = None
+
+UUID_KEY = sa.String(length=64).with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_snapshots",
+        sa.Column("run_id", UUID_KEY, sa.ForeignKey("runs.run_id"), primary_key=True),
+        sa.Column(
+            "artifact_hash",
+            sa.String(length=128),
+            sa.ForeignKey("artifacts.artifact_hash"),
+            nullable=False,
+        ),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("last_sequence_no", sa.Integer(), nullable=False),
+        sa.Column("raw_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("sealed_at_utc", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_run_snapshots_artifact_hash", "run_snapshots", ["artifact_hash"])
+    op.create_table(
+        "sealed_event_ids",
+        sa.Column("event_id", UUID_KEY, primary_key=True),
+        sa.Column("run_id", UUID_KEY, sa.ForeignKey("runs.run_id"), nullable=False),
+    )
+    op.create_index("ix_sealed_event_ids_run_id", "sealed_event_ids", ["run_id"])
+    if op.get_bind().dialect.name == "postgresql":
+        # Sealed events keep their artifact links after their rows are deleted. Partitioned
+        # databases dropped this constraint in 0004 already; SQLite does not enforce it.
+        op.execute(
+            "ALTER TABLE event_artifacts DROP CONSTRAINT IF EXISTS event_artifacts_event_id_fkey"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sealed_event_ids_run_id", table_name="sealed_event_ids")
+    op.drop_table("sealed_event_ids")
+    op.drop_index("ix_run_snapshots_artifact_hash", table_name="run_snapshots")
+    op.drop_table("run_snapshots")
@@ -1,60 +1,152 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import time
 import uuid
 from datetime import datetime, timezone
+from typing import Any, get_args
 
 from sqlalchemy import (
+    DDL,
     JSON,
+    BigInteger,
     Boolean,
     DateTime,
+    Enum,
+    Float,
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
+    TypeDecorator,
     UniqueConstraint,
+    event,
 )
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Dialect
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.db.session import Base
+from backend.app.schemas.events import EVENT_TYPES, ActorType, DeterminismMode, RedactionStatus
 
 
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _uuid_str() -> str:
-    return str(uuid.uuid4())
+def uuid7() -> uuid.UUID:
+    """RFC 9562 version 7 UUID: 48 bits of Unix milliseconds followed by random bits."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """Time-ordered identifier for new rows: primary key inserts land at the index's right edge."""
+    return str(uuid7())
+
+
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+class UUIDString(TypeDecorator[str]):
+    """UUID held as a str in Python: a native 16-byte uuid on Postgres and String(64) elsewhere.
+
+    Postgres rejects text that is not a UUID, so such values bind as the nil UUID (never issued)
+    and lookups of ids that cannot exist miss instead of raising.
+    """
+
+    impl = String(64)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> Any:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(String(64))
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Any:
+        if value is None or dialect.name != "postgresql":
+            return value
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return NIL_UUID
+
+
+def _label_enum(name: str, values: Any) -> Enum:
+    # Native enum (4 bytes per row) on Postgres; a plain VARCHAR with no CHECK constraint elsewhere.
+    return Enum(*values, name=name, length=64, validate_strings=False, create_constraint=False)
+
+
+EVENT_TYPE = _label_enum("event_type", sorted(EVENT_TYPES))
+DETERMINISM_MODE = _label_enum("determinism_mode", get_args(DeterminismMode))
+ACTOR_TYPE = _label_enum("actor_type", get_args(ActorType))
+REDACTION_STATUS = _label_enum("redaction_status", get_args(RedactionStatus))
+
+
+def idempotency_key_hash(idempotency_key: str) -> bytes:
+    """Fixed-width idempotency index key: the first 16 bytes of SHA-256 over the UTF-8 key."""
+    return hashlib.sha256(idempotency_key.encode("utf-8")).digest()[:16]
+
+
+def _idempotency_hash_default(context: Any) -> bytes:
+    return idempotency_key_hash(context.get_current_parameters()["idempotency_key"])
 
 
 class Run(Base):
     __tablename__ = "runs"
 
-    run_id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid_str)
+    run_id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_id)
     trace_id: Mapped[str] = mapped_column(String(64), index=True)
-    app_id: Mapped[str] = mapped_column(String(128), index=True)
+    app_id: Mapped[str] = mapped_column(String(128))
     environment: Mapped[str] = mapped_column(String(64), index=True)
-    status: Mapped[str] = mapped_column(String(64), index=True)
+    status: Mapped[str] = mapped_column(String(64))
     started_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
     ended_at_utc: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     source_type: Mapped[str] = mapped_column(String(32), default="live", index=True)
-    source_run_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    source_run_id: Mapped[str | None] = mapped_column(UUIDString, nullable=True)
     tags_json: Mapped[dict[str, object]] = mapped_column(JSON, default=dict)
     retention_class: Mapped[str] = mapped_column(String(32), default="dev_short")
     legal_hold: Mapped[bool] = mapped_column(Boolean, default=False)
+    purge_marked_at_utc: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+
+
+# Listing pages newest first with a (started_at_utc, run_id) keyset; these serve the common filters
+# and the unfiltered listing without sorting. They also cover plain app_id / status lookups.
+Index("ix_runs_started_run", Run.started_at_utc.desc(), Run.run_id.desc())
+Index("ix_runs_app_started", Run.app_id, Run.started_at_utc.desc(), Run.run_id.desc())
+Index("ix_runs_status_started", Run.status, Run.started_at_utc.desc(), Run.run_id.desc())
+
+
+class RunStats(Base):
+    __tablename__ = "run_stats"
+
+    run_id: Mapped[str] = mapped_column(UUIDString, ForeignKey("runs.run_id"), primary_key=True)
+    total_events: Mapped[int] = mapped_column(Integer, default=0)
+    last_sequence_no: Mapped[int] = mapped_column(Integer, default=-1)
+    event_type_counts_json: Mapped[dict[str, int]] = mapped_column(JSON, default=dict)
+    determinism_mode_counts_json: Mapped[dict[str, int]] = mapped_column(JSON, default=dict)
+    artifact_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
 
 
 class Step(Base):
     __tablename__ = "steps"
 
     step_id: Mapped[str] = mapped_column(String(64), primary_key=True)
-    run_id: Mapped[str] = mapped_column(String(64), ForeignKey("runs.run_id"), index=True)
+    run_id: Mapped[str] = mapped_column(UUIDString, ForeignKey("runs.run_id"), index=True)
     parent_step_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
     sequence_no: Mapped[int] = mapped_column(Integer)
     step_type: Mapped[str] = mapped_column(String(64))
     started_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
     ended_at_utc: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    determinism_mode: Mapped[str] = mapped_column(String(32), default="live")
+    determinism_mode: Mapped[str] = mapped_column(DETERMINISM_MODE, default="live")
 
     __table_args__ = (UniqueConstraint("run_id", "sequence_no", name="uq_steps_run_sequence"),)
 
@@ -62,20 +154,24 @@ class Step(Base):
 class Event(Base):
     __tablename__ = "events"
 
-    event_id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid_str)
-    run_id: Mapped[str] = mapped_column(String(64), ForeignKey("runs.run_id"), index=True)
+    event_id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_id)
+    run_id: Mapped[str] = mapped_column(UUIDString, ForeignKey("runs.run_id"), index=True)
     step_id: Mapped[str] = mapped_column(String(64), ForeignKey("steps.step_id"), index=True)
     parent_step_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
-    event_type: Mapped[str] = mapped_column(String(64), index=True)
+    event_type: Mapped[str] = mapped_column(EVENT_TYPE, index=True)
     schema_version: Mapped[str] = mapped_column(String(16))
     payload_json: Mapped[dict[str, object]] = mapped_column(JSON)
-    redaction_status: Mapped[str] = mapped_column(String(32), default="not_required")
+    redaction_status: Mapped[str] = mapped_column(REDACTION_STATUS, default="not_required")
     created_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
-    idempotency_key: Mapped[str] = mapped_column(String(256), unique=True)
+    idempotency_key: Mapped[str] = mapped_column(String(256))
+    # Uniqueness is enforced on the hash; the full key is kept for exports and debugging.
+    idempotency_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(16), unique=True, default=_idempotency_hash_default
+    )
     sequence_no: Mapped[int] = mapped_column(Integer)
     timestamp_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
-    actor_type: Mapped[str] = mapped_column(String(32), default="sdk")
-    determinism_mode: Mapped[str] = mapped_column(String(32), default="live")
+    actor_type: Mapped[str] = mapped_column(ACTOR_TYPE, default="sdk")
+    determinism_mode: Mapped[str] = mapped_column(DETERMINISM_MODE, default="live")
     artifact_pending: Mapped[bool] = mapped_column(Boolean, default=False)
 
     __table_args__ = (Index("ix_events_run_sequence", "run_id", "sequence_no"),)
@@ -99,28 +195,65 @@ class Artifact(Base):
     blocked_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
+class ArtifactText(Base):
+    """Searchable text of small, redacted, text-like artifacts."""
+
+    __tablename__ = "artifact_text"
+
+    artifact_hash: Mapped[str] = mapped_column(
+        String(128), ForeignKey("artifacts.artifact_hash"), primary_key=True
+    )
+    content: Mapped[str] = mapped_column(Text)
+
+
 class EventArtifact(Base):
     __tablename__ = "event_artifacts"
 
-    event_id: Mapped[str] = mapped_column(String(64), ForeignKey("events.event_id"), primary_key=True)
+    # No foreign key into events: partitioned and sealed events keep their links
+    # without an events row.
+    event_id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
     artifact_hash: Mapped[str] = mapped_column(
         String(128), ForeignKey("artifacts.artifact_hash"), primary_key=True
     )
     reference_role: Mapped[str] = mapped_column(String(64), primary_key=True)
 
 
+class RunSnapshot(Base):
+    """Manifest of a sealed run whose events were moved into one compressed NDJSON artifact."""
+
+    __tablename__ = "run_snapshots"
+
+    run_id: Mapped[str] = mapped_column(UUIDString, ForeignKey("runs.run_id"), primary_key=True)
+    artifact_hash: Mapped[str] = mapped_column(
+        String(128), ForeignKey("artifacts.artifact_hash"), index=True
+    )
+    event_count: Mapped[int] = mapped_column(Integer)
+    last_sequence_no: Mapped[int] = mapped_column(Integer)
+    raw_bytes: Mapped[int] = mapped_column(BigInteger)
+    sealed_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
+
+
+class SealedEventId(Base):
+    """Locates an event of a sealed run: its row is gone and its record is in the run's snapshot."""
+
+    __tablename__ = "sealed_event_ids"
+
+    event_id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
+    run_id: Mapped[str] = mapped_column(UUIDString, ForeignKey("runs.run_id"), index=True)
+
+
 class ReplaySession(Base):
     __tablename__ = "replay_sessions"
 
-    replay_session_id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid_str)
-    source_run_id: Mapped[str] = mapped_column(String(64), ForeignKey("runs.run_id"), index=True)
+    replay_session_id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_id)
+    source_run_id: Mapped[str] = mapped_column(UUIDString, ForeignKey("runs.run_id"), index=True)
     fork_step_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
     override_profile_json: Mapped[dict[str, object]] = mapped_column(JSON, default=dict)
     status: Mapped[str] = mapped_column(String(64), default="pending", index=True)
     started_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
     ended_at_utc: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     failure_reason_code: Mapped[str | None] = mapped_column(String(64), nullable=True)
-    derived_run_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    derived_run_id: Mapped[str | None] = mapped_column(UUIDString, nullable=True)
     reason_codes_json: Mapped[list[str]] = mapped_column(JSON, default=list)
     cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False)
 
@@ -128,9 +261,9 @@ class ReplaySession(Base):
 class DiffReport(Base):
     __tablename__ = "diff_reports"
 
-    diff_report_id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid_str)
-    base_run_id: Mapped[str] = mapped_column(String(64), index=True)
-    candidate_run_id: Mapped[str] = mapped_column(String(64), index=True)
+    diff_report_id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_id)
+    base_run_id: Mapped[str] = mapped_column(UUIDString, index=True)
+    candidate_run_id: Mapped[str] = mapped_column(UUIDString, index=True)
     status: Mapped[str] = mapped_column(String(64), default="pending")
     summary_json: Mapped[dict[str, object]] = mapped_column(JSON, default=dict)
     created_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
@@ -139,7 +272,7 @@ class DiffReport(Base):
 class AuditLog(Base):
     __tablename__ = "audit_log"
 
-    audit_id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid_str)
+    audit_id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_id)
     actor_id: Mapped[str] = mapped_column(String(128), default="system")
     actor_type: Mapped[str] = mapped_column(String(64), default="service")
     action: Mapped[str] = mapped_column(String(128), index=True)
@@ -162,3 +295,90 @@ class Job(Base):
     available_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
     created_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
     updated_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
+
+
+class BundleImport(Base):
+    __tablename__ = "bundle_imports"
+
+    import_id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
+    source_run_id: Mapped[str] = mapped_column(String(64))
+    run_id: Mapped[str] = mapped_column(UUIDString, index=True)
+    status: Mapped[str] = mapped_column(String(32), default="running")
+    steps_loaded: Mapped[int] = mapped_column(Integer, default=0)
+    last_step_sequence_no: Mapped[int] = mapped_column(Integer, default=-1)
+    events_loaded: Mapped[int] = mapped_column(Integer, default=0)
+    last_sequence_no: Mapped[int] = mapped_column(Integer, default=-1)
+    artifacts_loaded: Mapped[int] = mapped_column(Integer, default=0)
+    artifacts_skipped: Mapped[int] = mapped_column(Integer, default=0)
+    started_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
+    updated_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc)
+    ended_at_utc: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class UsageRollup(Base):
+    """Hourly latency/token/cost aggregates of model_result and tool_result events."""
+
+    __tablename__ = "usage_rollups"
+
+    bucket_start_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    app_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    environment: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    subject: Mapped[str] = mapped_column(String(128), primary_key=True)
+    call_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    error_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    latency_sum_ms: Mapped[float] = mapped_column(Float, default=0.0)
+    latency_max_ms: Mapped[float] = mapped_column(Float, default=0.0)
+    latency_histogram_json: Mapped[list[int]] = mapped_column(JSON, default=list)
+    prompt_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    completion_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    total_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+
+
+# Search indexes that have no portable SQLAlchemy spelling. Postgres indexes the payload as jsonb
+# (containment) and as a tsvector of its string values; SQLite keeps FTS5 tables in sync by trigger.
+SEARCH_DDL: dict[str, dict[str, list[str]]] = {
+    "events": {
+        "postgresql": [
+            "CREATE INDEX IF NOT EXISTS ix_events_payload_path ON events "
+            "USING gin ((payload_json::jsonb) jsonb_path_ops)",
+            "CREATE INDEX IF NOT EXISTS ix_events_payload_fts ON events "
+            "USING gin (to_tsvector('simple', payload_json::jsonb))",
+        ],
+        "sqlite": [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS event_search USING fts5(body)",
+            "CREATE TRIGGER IF NOT EXISTS events_search_insert AFTER INSERT ON events BEGIN "
+            "INSERT INTO event_search(rowid, body) SELECT new.rowid, group_concat(value, ' ') "
+            "FROM json_tree(new.payload_json) WHERE type = 'text'; END",
+            "CREATE TRIGGER IF NOT EXISTS events_search_delete AFTER DELETE ON events BEGIN "
+            "DELETE FROM event_search WHERE rowid = old.rowid; END",
+        ],
+    },
+    "artifact_text": {
+        "postgresql": [
+            "CREATE INDEX IF NOT EXISTS ix_artifact_text_fts ON artifact_text "
+            "USING gin (to_tsvector('simple', content))",
+        ],
+        "sqlite": [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS artifact_search USING fts5(body)",
+            "CREATE TRIGGER IF NOT EXISTS artifact_text_search_insert "
+            "AFTER INSERT ON artifact_text BEGIN "
+            "INSERT INTO artifact_search(rowid, body) VALUES (new.rowid, new.content); END",
+            "CREATE TRIGGER IF NOT EXISTS artifact_text_search_delete "
+            "AFTER DELETE ON artifact_text BEGIN "
+            "DELETE FROM artifact_search WHERE rowid = old.rowid; END",
+        ],
+    },
+}
+SEARCH_TABLES = {"events": "event_search", "artifact_text": "artifact_search"}
+
+for _table in (Event.__table__, ArtifactText.__table__):
+    for _dialect, _statements in SEARCH_DDL[_table.name].items():
+        for _statement in _statements:
+            event.listen(_table, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+    event.listen(
+        _table,
+        "after_drop",
+        DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLES[_table.name]}").execute_if(dialect="sqlite"),
+    )
@@ -1,18 +1,66 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncIterator, Callable, Generator
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from backend.app.config import settings
 
 
-engine_kwargs: dict[str, object] = {}
-if settings.database_url.startswith("sqlite"):
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
+T = TypeVar("T")
 
-engine = create_engine(settings.database_url, future=True, **engine_kwargs)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+psycopg"}
+SQLITE_JOURNAL_MODES = {"WAL", "DELETE", "TRUNCATE", "PERSIST"}
+
+
+def engine_options(database_url: str) -> dict[str, Any]:
+    url = make_url(database_url)
+    options: dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite":
+        if not url.drivername.endswith("aiosqlite"):
+            options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases use a single-connection pool that takes no sizing options.
+            return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+def _sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    # WAL lets readers run alongside the single writer; NORMAL only fsyncs at checkpoints, which
+    # is still durable against application crashes. busy_timeout makes writers wait, not fail.
+    journal_mode = settings.sqlite_journal_mode.upper()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unsupported SQLITE_JOURNAL_MODE '{settings.sqlite_journal_mode}'")
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+    if journal_mode == "WAL":
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+    cursor.close()
+
+
+def configure_engine(sync_engine: Engine) -> Engine:
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _sqlite_pragmas)
+    return sync_engine
+
+
+engine = configure_engine(
+    create_engine(settings.database_url, future=True, **engine_options(settings.database_url))
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
@@ -23,3 +71,72 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def async_database_url(database_url: str) -> str:
+    """Swap a sync driver for its asyncio counterpart; asyncpg and other async URLs pass through."""
+    url = make_url(database_url)
+    if url.drivername in {"postgresql+asyncpg", "sqlite+aiosqlite"}:
+        return database_url
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{url.drivername}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def build_async_sessionmaker(database_url: str) -> Any:
+    # Imported lazily: the asyncio extension needs greenlet and an async driver (the `async` extra).
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = async_database_url(database_url)
+    async_engine = create_async_engine(url, **engine_options(url))
+    configure_engine(async_engine.sync_engine)
+    # Handlers read returned objects outside the session's greenlet,
+    # so they must not expire on commit.
+    return async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+AsyncSessionLocal = (
+    build_async_sessionmaker(settings.database_url) if settings.database_async else None
+)
+
+
+class DbRunner:
+    """Runs sync service functions for `async def` handlers without blocking the event loop.
+
+    In async mode the function runs on an AsyncSession's greenlet, so its queries await the
+    async driver on the event loop. In sync mode it runs on the threadpool with a plain Session.
+    """
+
+    def __init__(self, session: Any, is_async: bool) -> None:
+        self.session = session
+        self.is_async = is_async
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self.is_async:
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def open_db_runner(async_session_factory: Any = None) -> AsyncIterator[DbRunner]:
+    if async_session_factory is not None:
+        async with async_session_factory() as session:
+            yield DbRunner(session, is_async=True)
+        return
+    db = SessionLocal()
+    try:
+        yield DbRunner(db, is_async=False)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def get_db_runner() -> AsyncIterator[DbRunner]:
+    async for runner in open_db_runner(AsyncSessionLocal):
+        yield runner
+
+
+@asynccontextmanager
+async def db_runner() -> AsyncIterator[DbRunner]:
+    """A DbRunner for work that outlives the request it came from, such as timer callbacks."""
+    async for runner in open_db_runner(AsyncSessionLocal):
+        yield runner
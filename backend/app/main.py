@@ -1,62 +1,211 @@
 from __future__ import annotations
 
+import tempfile
 from datetime import datetime, timezone
+from typing import BinaryIO
 
 from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from backend.app.config import settings
 from backend.app.db import models  # noqa: F401
-from backend.app.db.session import Base, engine, get_db
+from backend.app.db.session import (
+    Base,
+    DbRunner,
+    SessionLocal,
+    db_runner,
+    engine,
+    get_db,
+    get_db_runner,
+)
+from backend.app.modules.analytics.service import usage_summary
 from backend.app.modules.artifacts.service import ArtifactService
-from backend.app.modules.ingestion.service import create_run, finalize_run, get_run_or_error, ingest_event
+from backend.app.modules.bundles.service import (
+    CONTENT_TYPES,
+    bundle_filename,
+    import_bundle,
+    iter_bundle_chunks,
+    prepare_bundle_export,
+    resolve_compression,
+)
+from backend.app.modules.diff.service import ArtifactDiffService
+from backend.app.modules.export.service import (
+    CONTENT_TYPES as EXPORT_CONTENT_TYPES,
+    export_filename,
+    iter_event_export,
+    prepare_event_export,
+)
+from backend.app.modules.ingestion.reorder import ReorderBuffer
+from backend.app.modules.ingestion.service import (
+    create_run,
+    finalize_run,
+    get_run_or_error,
+    ingest_event,
+    last_sequence_no,
+    store_payload,
+)
+from backend.app.modules.ingestion.stream import (
+    NDJSON_CONTENT_TYPE,
+    DuplexStreamingResponse,
+    StreamIngestor,
+    iter_stream_acks,
+)
 from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.modules.ingestion.wal import IngestWal
 from backend.app.modules.query.service import (
     event_to_dict,
     get_artifact_metadata,
+    get_event,
     get_run_detail,
     list_events,
     list_runs,
+    resolve_event_fields,
+    resolve_payload_mode,
+    run_counters,
+    run_events_immutable,
     run_to_summary_dict,
 )
 from backend.app.modules.replay.service import (
     cancel_replay_session,
     create_replay_session,
     get_replay_session,
+    replay_status_dict,
 )
+from backend.app.modules.retention.service import list_retention_reports
+from backend.app.modules.search.service import search_events
 from backend.app.modules.security.auth import AuthContext, require_auth
+from backend.app.modules.streaming.service import stream_replay_status, stream_run_events
 from backend.app.schemas.api import (
+    ArtifactDiffResponse,
+    BundleExportRequest,
+    BundleImportResponse,
     CancelReplayResponse,
     CreateReplaySessionRequest,
     CreateReplaySessionResponse,
     CreateRunRequest,
     CreateRunResponse,
+    EventArtifactDiffResponse,
+    EventExportRequest,
+    EventView,
     FinalizeRunRequest,
     FinalizeRunResponse,
     IngestEventRequest,
     IngestEventResponse,
-    ListEventsResponse,
-    ListRunsResponse,
     RegisterArtifactRequest,
     RegisterArtifactResponse,
+    ReorderStatsResponse,
     ReplayStatusResponse,
+    RetentionPurgeRequest,
+    RetentionPurgeResponse,
+    RetentionReportsResponse,
     RunDetailResponse,
+    SearchResponse,
+    UsageSummaryResponse,
 )
-from backend.app.services.artifact_store import build_artifact_store
+from backend.app.schemas.events import CanonicalEvent
+from backend.app.services.artifact_store import get_artifact_store
+from backend.app.services.http_cache import ResponseCache
+from backend.app.services.jobs import enqueue_job
+from backend.app.services.partitions import ensure_event_partitions
+from backend.app.services.payload_refs import rehydrate_rows
 from backend.app.services.redaction import RedactionEngine
-from backend.app.services.responses import error_envelope, request_id, success_envelope
+from backend.app.services.responses import (
+    error_envelope,
+    request_id,
+    success_envelope,
+    success_response,
+)
+from backend.app.services.wire import wire_body
 
 
 app = FastAPI(title=settings.api_title, version=settings.api_version)
-artifact_service = ArtifactService(build_artifact_store(), RedactionEngine())
+artifact_store = get_artifact_store()
+artifact_service = ArtifactService(artifact_store, RedactionEngine())
+artifact_diff_service = ArtifactDiffService(artifact_store)
+response_cache = ResponseCache()
+ingest_wal = (
+    IngestWal(
+        settings.ingest_wal_dir,
+        SessionLocal,
+        commit_batch=settings.ingest_wal_commit_batch,
+        commit_interval_ms=settings.ingest_wal_commit_interval_ms,
+        max_pending=settings.ingest_wal_max_pending,
+    )
+    if settings.ingest_wal_enabled
+    else None
+)
+
+
+async def apply_ingest(
+    db: DbRunner, run_id: str, idempotency_key: str, event: CanonicalEvent
+) -> tuple[str, bool, list[str]]:
+    if ingest_wal is not None:
+        return await run_in_threadpool(ingest_wal.ingest, run_id, idempotency_key, event)
+    run = await db.run(get_run_or_error, run_id)
+    # Offloaded fields go to the artifact store first, off the event loop, so that an async
+    # session's database step does no blocking I/O.
+    stored_payload = await run_in_threadpool(store_payload, event)
+    db_event, accepted, warnings = await db.run(
+        ingest_event, run, idempotency_key, event, stored_payload
+    )
+    return db_event.event_id, accepted, warnings
+
+
+async def apply_released_event(
+    run_id: str, idempotency_key: str, event: CanonicalEvent
+) -> tuple[str, bool, list[str]]:
+    # Events the reorder buffer releases on a timer get a runner of their own.
+    async with db_runner() as db:
+        return await apply_ingest(db, run_id, idempotency_key, event)
+
+
+reorder_buffer = (
+    ReorderBuffer(
+        apply_released_event,
+        window=settings.ingest_reorder_window,
+        timeout_ms=settings.ingest_reorder_timeout_ms,
+        max_runs=settings.ingest_reorder_max_runs,
+    )
+    if settings.ingest_reorder_enabled
+    else None
+)
+SSE_HEADERS = {"cache-control": "no-cache", "x-accel-buffering": "no"}
 
 
 @app.on_event("startup")
 def startup() -> None:
     Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        ensure_event_partitions(db)
+    if ingest_wal is not None:
+        ingest_wal.start()
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    if ingest_wal is not None:
+        ingest_wal.stop()
+
+
+def wait_ingested(run_id: str | None) -> None:
+    # Read-your-writes: acknowledged events may still sit in the group-commit buffer.
+    if ingest_wal is None:
+        return
+    if not ingest_wal.wait_committed(run_id, timeout=settings.ingest_wal_read_wait_ms / 1000):
+        # Answering without the acknowledged events would silently serve stale data.
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "code": "DEPENDENCY_UNAVAILABLE",
+                "message": "Acknowledged events are not committed yet",
+                "details": {"run_id": run_id, "wait_ms": settings.ingest_wal_read_wait_ms},
+                "retryable": True,
+            },
+        )
 
 
 @app.exception_handler(EventValidationError)
@@ -101,37 +250,80 @@ def health_ready(db: Session = Depends(get_db)) -> dict[str, str]:
 
 
 @app.post("/api/v1/runs")
-def api_create_run(
-    request: CreateRunRequest,
+async def api_create_run(
     http_request: Request,
-    db: Session = Depends(get_db),
+    request: CreateRunRequest = Depends(wire_body(CreateRunRequest)),
+    db: DbRunner = Depends(get_db_runner),
     auth: AuthContext = Depends(require_auth),
 ):
     _ = auth
-    run = create_run(db, request)
+    run = await db.run(create_run, request)
     payload = CreateRunResponse(run_id=run.run_id, trace_id=run.trace_id, status=run.status)
     return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
 @app.post("/api/v1/runs/{run_id}/events")
-def api_ingest_event(
+async def api_ingest_event(
     run_id: str,
-    request: IngestEventRequest,
     http_request: Request,
-    db: Session = Depends(get_db),
+    request: IngestEventRequest = Depends(wire_body(IngestEventRequest)),
+    db: DbRunner = Depends(get_db_runner),
     auth: AuthContext = Depends(require_auth),
 ):
     _ = auth
-    run = get_run_or_error(db, run_id)
-    event, accepted, warnings = ingest_event(db, run, request.idempotency_key, request.event)
-    payload = IngestEventResponse(event_id=event.event_id, accepted=accepted, validation_warnings=warnings)
+
+    async def apply(
+        run_id: str, idempotency_key: str, event: CanonicalEvent
+    ) -> tuple[str, bool, list[str]]:
+        return await apply_ingest(db, run_id, idempotency_key, event)
+
+    async def last_sequence(run_id: str) -> int | None:
+        await run_in_threadpool(wait_ingested, run_id)
+        return await db.run(last_sequence_no, run_id)
+
+    if reorder_buffer is not None:
+        event_id, accepted, warnings = await reorder_buffer.submit(
+            run_id, request.idempotency_key, request.event, apply, last_sequence
+        )
+    else:
+        event_id, accepted, warnings = await apply(run_id, request.idempotency_key, request.event)
+    payload = IngestEventResponse(
+        event_id=event_id, accepted=accepted, validation_warnings=warnings
+    )
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
+
+
+@app.post("/api/v1/ingest/stream")
+async def api_ingest_stream(
+    http_request: Request,
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    ingestor = StreamIngestor(SessionLocal, artifact_service, ingest_wal)
+    acks = iter_stream_acks(
+        http_request.stream(),
+        ingestor,
+        settings.ingest_stream_max_line_bytes,
+        settings.ingest_stream_batch_lines,
+    )
+    return DuplexStreamingResponse(acks, media_type=NDJSON_CONTENT_TYPE)
+
+
+@app.get("/api/v1/ingest/reorder")
+async def api_reorder_stats(
+    http_request: Request,
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    stats = reorder_buffer.stats() if reorder_buffer is not None else {}
+    payload = ReorderStatsResponse(enabled=reorder_buffer is not None, **stats)
     return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
 @app.post("/api/v1/artifacts")
 def api_register_artifact(
-    request: RegisterArtifactRequest,
     http_request: Request,
+    request: RegisterArtifactRequest = Depends(wire_body(RegisterArtifactRequest)),
     db: Session = Depends(get_db),
     auth: AuthContext = Depends(require_auth),
 ):
@@ -142,22 +334,23 @@ def api_register_artifact(
 
 
 @app.post("/api/v1/runs/{run_id}/finalize")
-def api_finalize_run(
+async def api_finalize_run(
     run_id: str,
-    request: FinalizeRunRequest,
     http_request: Request,
-    db: Session = Depends(get_db),
+    request: FinalizeRunRequest = Depends(wire_body(FinalizeRunRequest)),
+    db: DbRunner = Depends(get_db_runner),
     auth: AuthContext = Depends(require_auth),
 ):
     _ = auth
-    run = get_run_or_error(db, run_id)
-    run = finalize_run(db, run, request)
+    await run_in_threadpool(wait_ingested, run_id)
+    run = await db.run(get_run_or_error, run_id)
+    run = await db.run(finalize_run, run, request)
     payload = FinalizeRunResponse(run_id=run.run_id, status=run.status)
     return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
 @app.get("/api/v1/runs")
-def api_list_runs(
+async def api_list_runs(
     http_request: Request,
     app_id: str | None = Query(default=None),
     environment: str | None = Query(default=None),
@@ -167,14 +360,14 @@ def api_list_runs(
     source_type: str | None = Query(default=None),
     page_size: int = Query(default=50),
     page_token: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    db: DbRunner = Depends(get_db_runner),
     auth: AuthContext = Depends(require_auth),
 ):
     _ = auth
     parsed_from = datetime.fromisoformat(from_utc) if from_utc else None
     parsed_to = datetime.fromisoformat(to_utc) if to_utc else None
-    rows, next_token = list_runs(
-        db,
+    rows, next_token = await db.run(
+        list_runs,
         app_id=app_id,
         environment=environment,
         status=status,
@@ -184,28 +377,31 @@ def api_list_runs(
         page_size=page_size,
         page_token=page_token,
     )
-    payload = ListRunsResponse(
-        items=[run_to_summary_dict(item) for item in rows],
-        next_page_token=next_token,
+    # Rows already have the RunSummary shape, so they are serialized as read
+    # rather than validated again.
+    return success_response(
+        request_id(http_request), {"items": rows, "next_page_token": next_token}
     )
-    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
 @app.get("/api/v1/runs/{run_id}")
-def api_get_run(
+async def api_get_run(
     run_id: str,
     http_request: Request,
-    db: Session = Depends(get_db),
+    db: DbRunner = Depends(get_db_runner),
     auth: AuthContext = Depends(require_auth),
 ):
     _ = auth
-    run, counters = get_run_detail(db, run_id)
-    payload = RunDetailResponse(run=run_to_summary_dict(run), counters=counters)
+    await run_in_threadpool(wait_ingested, run_id)
+    run, stats = await db.run(get_run_detail, run_id)
+    payload = RunDetailResponse(
+        run=run_to_summary_dict(run), counters=run_counters(stats), stats=stats
+    )
     return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
 @app.get("/api/v1/runs/{run_id}/events")
-def api_list_events(
+async def api_list_events(
     run_id: str,
     http_request: Request,
     event_type: str | None = Query(default=None),
@@ -214,12 +410,22 @@ def api_list_events(
     sequence_to: int | None = Query(default=None),
     page_size: int = Query(default=200),
     page_token: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    fields: str | None = Query(default=None),
+    include_payload: str = Query(default="true"),
+    hydrate_payload: bool = Query(default=False),
+    db: DbRunner = Depends(get_db_runner),
     auth: AuthContext = Depends(require_auth),
 ):
     _ = auth
-    rows, next_token = list_events(
-        db,
+    cached = response_cache.lookup(http_request)
+    if cached is not None:
+        return cached
+    await run_in_threadpool(wait_ingested, run_id)
+    # Checked before the read: a terminal event landing in between would otherwise mark a page
+    # that lacks it as immutable.
+    immutable = await db.run(run_events_immutable, run_id)
+    rows, next_token = await db.run(
+        list_events,
         run_id=run_id,
         event_type=event_type,
         step_id=step_id,
@@ -227,11 +433,118 @@ def api_list_events(
         sequence_to=sequence_to,
         page_size=page_size,
         page_token=page_token,
+        fields=resolve_event_fields(fields),
+        payload_mode=resolve_payload_mode(include_payload),
     )
-    payload = ListEventsResponse(items=[event_to_dict(row) for row in rows], next_page_token=next_token)
+    if hydrate_payload:
+        rows = await run_in_threadpool(rehydrate_rows, artifact_store, rows)
+    page = {"items": rows, "next_page_token": next_token}
+    return response_cache.respond(http_request, page, immutable)
+
+
+@app.get("/api/v1/events/{event_id}")
+async def api_get_event(
+    event_id: str,
+    http_request: Request,
+    hydrate_payload: bool = Query(default=False),
+    db: DbRunner = Depends(get_db_runner),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    pending = ingest_wal.pending_event(event_id) if ingest_wal is not None else None
+    item = pending or event_to_dict(await db.run(get_event, event_id))
+    if hydrate_payload:
+        [item] = await run_in_threadpool(rehydrate_rows, artifact_store, [item])
+    payload = EventView(**item)
     return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
+@app.get("/api/v1/search")
+async def api_search(
+    http_request: Request,
+    q: str | None = Query(default=None),
+    match: list[str] = Query(default=[]),
+    event_type: str | None = Query(default=None),
+    run_id: str | None = Query(default=None),
+    app_id: str | None = Query(default=None),
+    environment: str | None = Query(default=None),
+    include_artifacts: bool = Query(default=False),
+    page_size: int = Query(default=50),
+    page_token: str | None = Query(default=None),
+    db: DbRunner = Depends(get_db_runner),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    rows, next_token = await db.run(
+        search_events,
+        q=q,
+        matches=match,
+        event_type=event_type,
+        run_id=run_id,
+        app_id=app_id,
+        environment=environment,
+        include_artifacts=include_artifacts,
+        page_size=page_size,
+        page_token=page_token,
+    )
+    payload = SearchResponse(items=rows, next_page_token=next_token)
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
+
+
+@app.get("/api/v1/analytics/usage")
+def api_usage_summary(
+    http_request: Request,
+    kind: str = Query(default="model"),
+    group_by: str | None = Query(default=None),
+    bucket: str = Query(default="hour"),
+    from_utc: str | None = Query(default=None),
+    to_utc: str | None = Query(default=None),
+    app_id: str | None = Query(default=None),
+    environment: str | None = Query(default=None),
+    subject: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    items = usage_summary(
+        db,
+        kind=kind,
+        group_by=group_by,
+        bucket=bucket,
+        from_utc=datetime.fromisoformat(from_utc) if from_utc else None,
+        to_utc=datetime.fromisoformat(to_utc) if to_utc else None,
+        app_id=app_id,
+        environment=environment,
+        subject=subject,
+    )
+    payload = UsageSummaryResponse(items=items)
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
+
+
+@app.get("/api/v1/runs/{run_id}/events/stream")
+async def api_stream_run_events(
+    run_id: str,
+    http_request: Request,
+    after_sequence_no: int = Query(default=-1),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    last_event_id = http_request.headers.get("last-event-id", "")
+    if last_event_id.lstrip("-").isdigit():
+        after_sequence_no = int(last_event_id)
+    await run_in_threadpool(_require_run, run_id)
+    return StreamingResponse(
+        stream_run_events(SessionLocal, run_id, after_sequence_no, http_request.is_disconnected),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+def _require_run(run_id: str) -> None:
+    with SessionLocal() as db:
+        get_run_or_error(db, run_id)
+
+
 @app.get("/api/v1/artifacts/{artifact_hash}")
 def api_get_artifact(
     artifact_hash: str,
@@ -240,6 +553,9 @@ def api_get_artifact(
     auth: AuthContext = Depends(require_auth),
 ):
     _ = auth
+    cached = response_cache.lookup(http_request)
+    if cached is not None:
+        return cached
     artifact = get_artifact_metadata(db, artifact_hash)
     payload = {
         "artifact_hash": artifact.artifact_hash,
@@ -253,7 +569,40 @@ def api_get_artifact(
         "storage_bucket": artifact.storage_bucket,
         "storage_object_key": artifact.storage_object_key,
     }
-    return success_envelope(request_id(http_request), payload)
+    # Content addressed, so once uploaded the metadata no longer changes;
+    # pending ones still move on.
+    return response_cache.respond(http_request, payload, artifact.status == "ready")
+
+
+@app.get("/api/v1/artifacts/{base_artifact_hash}/diff/{candidate_artifact_hash}")
+def api_diff_artifacts(
+    base_artifact_hash: str,
+    candidate_artifact_hash: str,
+    http_request: Request,
+    diff_kind: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    result = artifact_diff_service.diff_artifacts(
+        db, base_artifact_hash, candidate_artifact_hash, diff_kind
+    )
+    payload = ArtifactDiffResponse(**result)
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
+
+
+@app.get("/api/v1/events/{base_event_id}/diff/{candidate_event_id}")
+def api_diff_event_artifacts(
+    base_event_id: str,
+    candidate_event_id: str,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    result = artifact_diff_service.diff_event_artifacts(db, base_event_id, candidate_event_id)
+    payload = EventArtifactDiffResponse(**result)
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
 @app.post("/api/v1/replays")
@@ -263,6 +612,7 @@ def api_create_replay(
     db: Session = Depends(get_db),
     auth: AuthContext = Depends(require_auth),
 ):
+    wait_ingested(request.source_run_id)
     session = create_replay_session(
         db,
         source_run_id=request.source_run_id,
@@ -284,16 +634,30 @@ def api_get_replay(
 ):
     _ = auth
     session = get_replay_session(db, replay_session_id)
-    payload = ReplayStatusResponse(
-        replay_session_id=session.replay_session_id,
-        status=session.status,
-        derived_run_id=session.derived_run_id,
-        reason_codes=session.reason_codes_json or [],
-        failure_reason_code=session.failure_reason_code,
-    )
+    payload = ReplayStatusResponse(**replay_status_dict(session))
     return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
 
 
+@app.get("/api/v1/replays/{replay_session_id}/stream")
+async def api_stream_replay(
+    replay_session_id: str,
+    http_request: Request,
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    await run_in_threadpool(_require_replay_session, replay_session_id)
+    return StreamingResponse(
+        stream_replay_status(SessionLocal, replay_session_id, http_request.is_disconnected),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+def _require_replay_session(replay_session_id: str) -> None:
+    with SessionLocal() as db:
+        get_replay_session(db, replay_session_id)
+
+
 @app.post("/api/v1/replays/{replay_session_id}/cancel")
 def api_cancel_replay(
     replay_session_id: str,
@@ -338,26 +702,91 @@ def api_get_diff(diff_report_id: str) -> None:
 
 
 @app.post("/api/v1/bundles/export")
-def api_bundle_export() -> None:
-    raise HTTPException(
-        status_code=501,
-        detail={
-            "code": "NOT_IMPLEMENTED",
-            "message": "Bundle workflows are part of M3 scope and are not implemented in this build",
-            "details": {},
-            "retryable": False,
+def api_bundle_export(
+    request: BundleExportRequest,
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    wait_ingested(request.run_id)
+    manifest = prepare_bundle_export(db, request.run_id, request.bundle_profile)
+    compression = resolve_compression(request.compression)
+    filename = bundle_filename(request.run_id, compression)
+    return StreamingResponse(
+        iter_bundle_chunks(SessionLocal, artifact_store, manifest, compression),
+        media_type=CONTENT_TYPES[compression],
+        headers={
+            "content-disposition": f'attachment; filename="{filename}"',
+            "x-bundle-id": str(manifest["bundle_id"]),
         },
     )
 
 
-@app.post("/api/v1/bundles/import")
-def api_bundle_import() -> None:
-    raise HTTPException(
-        status_code=501,
-        detail={
-            "code": "NOT_IMPLEMENTED",
-            "message": "Bundle workflows are part of M3 scope and are not implemented in this build",
-            "details": {},
-            "retryable": False,
+@app.post("/api/v1/exports/events")
+def api_event_export(
+    request: EventExportRequest,
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    stmt = prepare_event_export(
+        db,
+        request.format,
+        run_ids=request.run_ids,
+        from_utc=request.from_utc,
+        to_utc=request.to_utc,
+        app_id=request.app_id,
+        environment=request.environment,
+    )
+    return StreamingResponse(
+        iter_event_export(SessionLocal, stmt, request.format),
+        media_type=EXPORT_CONTENT_TYPES[request.format],
+        headers={
+            "content-disposition": f'attachment; filename="{export_filename(request.format)}"'
         },
     )
+
+
+@app.post("/api/v1/bundles/import")
+async def api_bundle_import(
+    http_request: Request,
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    with tempfile.SpooledTemporaryFile(max_size=settings.bundle_import_spool_bytes) as spool:
+        async for chunk in http_request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        result = await run_in_threadpool(_import_spooled_bundle, spool)
+    payload = BundleImportResponse(**result)
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
+
+
+def _import_spooled_bundle(spool: BinaryIO) -> dict[str, object]:
+    with SessionLocal() as db:
+        return import_bundle(db, artifact_store, spool)
+
+
+@app.post("/api/v1/retention/purge")
+def api_retention_purge(
+    request: RetentionPurgeRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    job = enqueue_job(db, "retention_purge", {"dry_run": request.dry_run})
+    payload = RetentionPurgeResponse(job_id=job.job_id, status=job.status)
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
+
+
+@app.get("/api/v1/retention/reports")
+def api_retention_reports(
+    http_request: Request,
+    limit: int = Query(default=20),
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(require_auth),
+):
+    _ = auth
+    payload = RetentionReportsResponse(items=list_retention_reports(db, limit))
+    return success_envelope(request_id(http_request), payload.model_dump(mode="json"))
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from backend.app.db.models import Event, Run, UsageRollup
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.services.bulk import insert_ignore
+
+
+# Upper bounds of the latency histogram slots; the extra last slot counts everything slower.
+LATENCY_BOUNDS_MS = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    30000,
+    60000,
+    120000,
+)
+PERCENTILES = (50, 90, 95, 99)
+KIND_BY_EVENT_TYPE = {"model_result": "model", "tool_result": "tool"}
+SUBJECT_FIELDS = {"model": "model_id", "tool": "tool_name"}
+GROUP_FIELDS = {"app_id", "environment", "model_id", "tool_name", "bucket"}
+BUCKETS = {"hour", "day"}
+TOOL_ERROR_STATUSES = {"timeout", "error"}
+SUBJECT_MAX_LENGTH = UsageRollup.__table__.c.subject.type.length
+
+RollupKey = tuple[datetime, str, str, str, str]
+
+
+@dataclass
+class UsageSample:
+    kind: str
+    subject: str
+    bucket_start_utc: datetime
+    latency_ms: float
+    error: bool
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cost_usd: float
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0
+    return value
+
+
+def _hour(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def counts_toward_usage(run: Run) -> bool:
+    # Replays re-derive recorded calls; counting them would double the usage of their source run.
+    return run.source_type != "replay"
+
+
+def _subject(value: Any) -> str:
+    """The rollup key for a model id or tool name, shortened to fit the subject column.
+
+    Overlong names keep a readable prefix and end in a hash of the full name, so two names that
+    share the prefix still get separate rollups.
+    """
+    subject = str(value or "unknown")
+    if len(subject) <= SUBJECT_MAX_LENGTH:
+        return subject
+    digest = hashlib.blake2b(subject.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{subject[: SUBJECT_MAX_LENGTH - len(digest) - 1]}~{digest}"
+
+
+def usage_sample(
+    event_type: str, payload: dict[str, Any], timestamp: datetime
+) -> UsageSample | None:
+    kind = KIND_BY_EVENT_TYPE.get(event_type)
+    if kind is None:
+        return None
+    usage = payload.get("token_usage") if kind == "model" else None
+    usage = usage if isinstance(usage, dict) else {}
+    return UsageSample(
+        kind=kind,
+        subject=_subject(payload.get(SUBJECT_FIELDS[kind])),
+        bucket_start_utc=_hour(timestamp),
+        latency_ms=float(_number(payload.get("latency_ms"))),
+        error=kind == "tool" and payload.get("status") in TOOL_ERROR_STATUSES,
+        prompt_tokens=int(_number(usage.get("prompt"))),
+        completion_tokens=int(_number(usage.get("completion"))),
+        total_tokens=int(_number(usage.get("total"))),
+        cost_usd=float(_number(payload.get("cost_usd"))),
+    )
+
+
+SUMMED_FIELDS = (
+    "call_count",
+    "error_count",
+    "latency_sum_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cost_usd",
+)
+TOTAL_FIELDS = (*SUMMED_FIELDS, "latency_max_ms", "latency_histogram_json")
+
+
+def _zero_totals() -> dict[str, Any]:
+    totals: dict[str, Any] = {field: 0 for field in SUMMED_FIELDS}
+    totals["latency_max_ms"] = 0.0
+    totals["latency_histogram_json"] = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+    return totals
+
+
+def _empty_rollup(key: RollupKey) -> dict[str, Any]:
+    bucket_start_utc, app_id, environment, kind, subject = key
+    return {
+        "bucket_start_utc": bucket_start_utc,
+        "app_id": app_id,
+        "environment": environment,
+        "kind": kind,
+        "subject": subject,
+        **_zero_totals(),
+    }
+
+
+def _fold(target: dict[str, Any], source: dict[str, Any]) -> dict[str, Any]:
+    for field in SUMMED_FIELDS:
+        target[field] += source[field]
+    target["latency_max_ms"] = max(target["latency_max_ms"], source["latency_max_ms"])
+    left, right = target["latency_histogram_json"] or [], source["latency_histogram_json"] or []
+    target["latency_histogram_json"] = [
+        (left[index] if index < len(left) else 0) + (right[index] if index < len(right) else 0)
+        for index in range(max(len(left), len(right)))
+    ]
+    return target
+
+
+def _totals(rollup: UsageRollup) -> dict[str, Any]:
+    return {field: getattr(rollup, field) for field in TOTAL_FIELDS}
+
+
+def _accumulate(
+    rollups: dict[RollupKey, dict[str, Any]], app_id: str, environment: str, sample: UsageSample
+) -> None:
+    key = (sample.bucket_start_utc, app_id, environment, sample.kind, sample.subject)
+    rollup = rollups.get(key)
+    if rollup is None:
+        rollup = rollups[key] = _empty_rollup(key)
+    rollup["call_count"] += 1
+    rollup["error_count"] += int(sample.error)
+    rollup["latency_sum_ms"] += sample.latency_ms
+    rollup["latency_max_ms"] = max(rollup["latency_max_ms"], sample.latency_ms)
+    rollup["latency_histogram_json"][bisect_left(LATENCY_BOUNDS_MS, sample.latency_ms)] += 1
+    rollup["prompt_tokens"] += sample.prompt_tokens
+    rollup["completion_tokens"] += sample.completion_tokens
+    rollup["total_tokens"] += sample.total_tokens
+    rollup["cost_usd"] += sample.cost_usd
+
+
+def record_usage(
+    db: Session, app_id: str, environment: str, samples: Iterable[UsageSample]
+) -> None:
+    """Fold samples into their hourly rollups, in the caller's transaction."""
+    deltas: dict[RollupKey, dict[str, Any]] = {}
+    for sample in samples:
+        _accumulate(deltas, app_id, environment, sample)
+    if not deltas:
+        return
+
+    # Create missing rows without racing other writers,
+    # then lock rows in key order to avoid deadlocks.
+    keys = sorted(deltas)
+    insert_ignore(db, UsageRollup.__table__, [_empty_rollup(key) for key in keys])
+    for key in keys:
+        rollup = db.get(UsageRollup, key, with_for_update=True)
+        for field, value in _fold(_totals(rollup), deltas[key]).items():
+            setattr(rollup, field, value)
+
+
+def rebuild_usage_rollups(db: Session, batch_size: int = 5000) -> int:
+    """Recompute every rollup from the events table."""
+    stmt = (
+        select(
+            Event.event_type, Event.payload_json, Event.timestamp_utc, Run.app_id, Run.environment
+        )
+        .join(Run, Run.run_id == Event.run_id)
+        .where(Event.event_type.in_(list(KIND_BY_EVENT_TYPE)), Run.source_type != "replay")
+        .execution_options(yield_per=batch_size)
+    )
+    rollups: dict[RollupKey, dict[str, Any]] = {}
+    for event_type, payload, timestamp, app_id, environment in db.execute(stmt):
+        sample = usage_sample(event_type, payload, timestamp)
+        if sample is not None:
+            _accumulate(rollups, app_id, environment, sample)
+
+    db.execute(delete(UsageRollup))
+    rows = list(rollups.values())
+    for start in range(0, len(rows), batch_size):
+        db.execute(insert(UsageRollup.__table__), rows[start : start + batch_size])
+    db.commit()
+    return len(rows)
+
+
+def _percentile(histogram: list[int], count: int, percentile: int, max_ms: float) -> float:
+    # Interpolates inside the slot holding the target rank; exact to within one slot width.
+    target = count * percentile / 100
+    cumulative = 0
+    for index, slot_count in enumerate(histogram):
+        if slot_count and cumulative + slot_count >= target:
+            lower = LATENCY_BOUNDS_MS[index - 1] if index > 0 else 0
+            upper = LATENCY_BOUNDS_MS[index] if index < len(LATENCY_BOUNDS_MS) else max_ms
+            return round(
+                min(lower + (upper - lower) * (target - cumulative) / slot_count, max_ms), 3
+            )
+        cumulative += slot_count
+    return max_ms
+
+
+def resolve_group_by(kind: str, group_by: str | None) -> list[str]:
+    if kind not in SUBJECT_FIELDS:
+        raise EventValidationError(
+            "VALIDATION_ERROR", "kind must be one of: model, tool", {"kind": kind}
+        )
+    fields = [name.strip() for name in (group_by or "").split(",") if name.strip()]
+    foreign_subject = {field for kind_name, field in SUBJECT_FIELDS.items() if kind_name != kind}
+    invalid = sorted(set(fields) - (GROUP_FIELDS - foreign_subject))
+    if invalid:
+        raise EventValidationError(
+            "VALIDATION_ERROR",
+            f"Unsupported group_by fields for kind '{kind}'",
+            {"group_by": invalid},
+        )
+    return fields
+
+
+def usage_summary(
+    db: Session,
+    kind: str = "model",
+    group_by: str | None = None,
+    bucket: str = "hour",
+    from_utc: datetime | None = None,
+    to_utc: datetime | None = None,
+    app_id: str | None = None,
+    environment: str | None = None,
+    subject: str | None = None,
+) -> list[dict[str, Any]]:
+    fields = resolve_group_by(kind, group_by)
+    if bucket not in BUCKETS:
+        raise EventValidationError(
+            "VALIDATION_ERROR", "bucket must be one of: hour, day", {"bucket": bucket}
+        )
+
+    stmt = select(UsageRollup).where(UsageRollup.kind == kind)
+    if from_utc:
+        stmt = stmt.where(UsageRollup.bucket_start_utc >= _hour(from_utc))
+    if to_utc:
+        stmt = stmt.where(UsageRollup.bucket_start_utc <= to_utc)
+    if app_id:
+        stmt = stmt.where(UsageRollup.app_id == app_id)
+    if environment:
+        stmt = stmt.where(UsageRollup.environment == environment)
+    if subject:
+        stmt = stmt.where(UsageRollup.subject == _subject(subject))
+
+    groups: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for rollup in db.execute(stmt.execution_options(yield_per=1000)).scalars():
+        values = {
+            "app_id": rollup.app_id,
+            "environment": rollup.environment,
+            SUBJECT_FIELDS[kind]: rollup.subject,
+            "bucket": _bucket_start(rollup.bucket_start_utc, bucket),
+        }
+        key = tuple(values[field] for field in fields)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "group": {field: values[field] for field in fields},
+                **_zero_totals(),
+            }
+        _fold(group, _totals(rollup))
+
+    return [
+        _summary_item(groups[key]) for key in sorted(groups, key=lambda item: tuple(map(str, item)))
+    ]
+
+
+def _bucket_start(bucket_start_utc: datetime, bucket: str) -> datetime:
+    hour = _hour(bucket_start_utc)
+    return hour.replace(hour=0) if bucket == "day" else hour
+
+
+def _summary_item(group: dict[str, Any]) -> dict[str, Any]:
+    count = group["call_count"]
+    latency = {
+        "avg": round(group["latency_sum_ms"] / count, 3) if count else 0.0,
+        "max": group["latency_max_ms"],
+    }
+    for percentile in PERCENTILES:
+        latency[f"p{percentile}"] = _percentile(
+            group["latency_histogram_json"], count, percentile, group["latency_max_ms"]
+        )
+    return {
+        "group": group["group"],
+        "call_count": count,
+        "error_count": group["error_count"],
+        "latency_ms": latency,
+        "token_usage": {
+            "prompt": group["prompt_tokens"],
+            "completion": group["completion_tokens"],
+            "total": group["total_tokens"],
+        },
+        "cost_usd": round(group["cost_usd"], 6),
+    }
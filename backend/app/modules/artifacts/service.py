@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from backend.app.config import settings
 from backend.app.db.models import Artifact
 from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.modules.search.service import index_artifact_text
 from backend.app.schemas.api import RegisterArtifactRequest
 from backend.app.services.artifact_store import ArtifactStore
 from backend.app.services.redaction import RedactionEngine
@@ -113,6 +114,7 @@ class ArtifactService:
             blocked_reason=redaction.blocked_reason,
         )
         db.add(artifact)
+        index_artifact_text(db, artifact, redaction.redacted_bytes)
         db.commit()
 
         return {
@@ -125,6 +127,8 @@ class ArtifactService:
         }
 
     def _decode_payload(self, req: RegisterArtifactRequest) -> bytes | None:
+        if req.content_bytes is not None:
+            return req.content_bytes
         if req.content_base64:
             return base64.b64decode(req.content_base64)
         if req.content_text is not None:
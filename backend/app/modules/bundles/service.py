@@ -0,0 +1,771 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import tarfile
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, BinaryIO
+
+from sqlalchemy import and_, exists, func, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.config import settings
+from backend.app.db.models import (
+    Artifact,
+    BundleImport,
+    Event,
+    EventArtifact,
+    Run,
+    RunSnapshot,
+    Step,
+    idempotency_key_hash,
+)
+from backend.app.modules.analytics.service import record_usage, usage_sample
+from backend.app.modules.compaction.service import SealedEvent, run_event_ids, sealed_events
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.modules.search.service import index_artifact_text
+from backend.app.services.artifact_store import ArtifactStore
+from backend.app.services.bulk import bulk_insert
+from backend.app.services.partitions import ensure_event_partitions
+from backend.app.services.run_stats import rebuild_run_stats
+from backend.app.services.streams import ChunkSink
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_PROFILES = {"minimal_failure", "full_debug"}
+BUNDLE_PAGE_SIZE = 500
+BUNDLE_CHUNK_BYTES = 64 * 1024
+CONTENT_TYPES = {"zstd": "application/zstd", "gzip": "application/gzip"}
+FILE_SUFFIXES = {"zstd": ".tar.zst", "gzip": ".tar.gz"}
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def resolve_compression(requested: str | None = None) -> str:
+    compression = (requested or settings.bundle_compression).lower()
+    if compression == "zstd" and zstandard is None:
+        return "gzip"
+    if compression not in CONTENT_TYPES:
+        return "gzip"
+    return compression
+
+
+def prepare_bundle_export(db: Session, run_id: str, bundle_profile: str) -> dict[str, Any]:
+    if bundle_profile not in BUNDLE_PROFILES:
+        raise EventValidationError(
+            "VALIDATION_ERROR",
+            "Unsupported bundle_profile",
+            {"bundle_profile": bundle_profile, "supported": sorted(BUNDLE_PROFILES)},
+        )
+
+    run = db.execute(select(Run).where(Run.run_id == run_id)).scalar_one_or_none()
+    if run is None:
+        raise EventValidationError("NOT_FOUND", "Run not found", {"run_id": run_id})
+    snapshot = db.get(RunSnapshot, run_id)
+
+    # Runs with pending artifacts are never sealed, so only live rows need checking.
+    if bundle_profile == "full_debug" and snapshot is None:
+        pending = db.execute(
+            select(func.count())
+            .select_from(Event)
+            .where(Event.run_id == run_id, Event.artifact_pending.is_(True))
+        ).scalar_one()
+        if pending:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Run has unresolved artifacts and cannot be exported with full_debug",
+                {"run_id": run_id, "pending_events": pending},
+            )
+
+    return {
+        "bundle_format_version": BUNDLE_FORMAT_VERSION,
+        "bundle_id": str(uuid.uuid4()),
+        "bundle_profile": bundle_profile,
+        "run_id": run_id,
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "step_count": db.execute(
+            select(func.count()).select_from(Step).where(Step.run_id == run_id)
+        ).scalar_one(),
+        "event_count": snapshot.event_count
+        if snapshot is not None
+        else db.execute(
+            select(func.count()).select_from(Event).where(Event.run_id == run_id)
+        ).scalar_one(),
+        "artifact_count": db.execute(
+            select(func.count(func.distinct(EventArtifact.artifact_hash))).where(
+                EventArtifact.event_id.in_(run_event_ids(run_id))
+            )
+        ).scalar_one(),
+        "artifact_content_included": bundle_profile == "full_debug",
+    }
+
+
+def iter_bundle_chunks(
+    session_factory: Callable[[], Session],
+    store: ArtifactStore,
+    manifest: dict[str, Any],
+    compression: str,
+    read_workers: int = settings.bundle_read_workers,
+    prefetch_max_bytes: int = settings.bundle_prefetch_max_bytes,
+) -> Iterator[bytes]:
+    sink = ChunkSink()
+    compressor = _open_compressor(sink, compression)
+    archive = tarfile.open(fileobj=compressor, mode="w|")
+    run_id = str(manifest["run_id"])
+
+    with session_factory() as db:
+        _add_bytes(
+            archive,
+            "manifest.json",
+            json.dumps({**manifest, "compression": compression}).encode("utf-8"),
+        )
+
+        run = db.execute(select(Run).where(Run.run_id == run_id)).scalar_one()
+        _add_bytes(archive, "run.json", json.dumps(_run_record(run)).encode("utf-8"))
+        yield from sink.drain(BUNDLE_CHUNK_BYTES)
+
+        for index, page in enumerate(_iter_step_pages(db, run_id)):
+            _add_bytes(
+                archive, f"steps/{index:06d}.ndjson", _ndjson(_step_record(step) for step in page)
+            )
+            yield from sink.drain(BUNDLE_CHUNK_BYTES)
+
+        for index, page in enumerate(_iter_event_pages(db, run_id)):
+            refs = _event_refs(db, [event.event_id for event in page])
+            records = (_event_record(event, refs.get(event.event_id, [])) for event in page)
+            _add_bytes(archive, f"events/{index:06d}.ndjson", _ndjson(records))
+            yield from sink.drain(BUNDLE_CHUNK_BYTES)
+
+        artifacts = db.execute(
+            select(Artifact)
+            .where(
+                Artifact.artifact_hash.in_(
+                    select(EventArtifact.artifact_hash).where(EventArtifact.event_id.in_(run_event_ids(run_id)))
+                )
+            )
+            .order_by(Artifact.artifact_hash.asc())
+            .execution_options(yield_per=BUNDLE_PAGE_SIZE)
+        ).scalars()
+        include_content = bool(manifest["artifact_content_included"])
+        records = (_artifact_record(artifact) for artifact in artifacts)
+        for record, content in _iter_artifact_content(
+            store,
+            records,
+            include_content,
+            read_workers,
+            prefetch_max_bytes,
+        ):
+            artifact_hash = record["artifact_hash"]
+            record["content_included"] = content is not None
+            _add_bytes(
+                archive, f"artifacts/{artifact_hash}.json", json.dumps(record).encode("utf-8")
+            )
+            if content is not None:
+                handle, size = content
+                try:
+                    info = tarfile.TarInfo(f"artifacts/{artifact_hash}")
+                    info.size = size
+                    info.mtime = int(time.time())
+                    archive.addfile(info, handle)
+                finally:
+                    handle.close()
+            yield from sink.drain(BUNDLE_CHUNK_BYTES)
+
+    archive.close()
+    compressor.close()
+    yield from sink.drain(0)
+
+
+def write_bundle_file(path: str, chunks: Iterable[bytes]) -> int:
+    written = 0
+    with open(path, "wb") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def bundle_filename(run_id: str, compression: str) -> str:
+    return f"run-{run_id}{FILE_SUFFIXES[compression]}"
+
+
+def import_bundle(
+    db: Session,
+    store: ArtifactStore,
+    fileobj: BinaryIO,
+    chunk_size: int = settings.bundle_import_chunk_size,
+) -> dict[str, Any]:
+    importer = _BundleImporter(db, store, max(chunk_size, 1))
+    with _open_decompressor(fileobj) as stream, tarfile.open(fileobj=stream, mode="r|") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            handle = archive.extractfile(member)
+            if handle is None:
+                continue
+            if importer.handle(member.name, handle):
+                break
+    return importer.finish()
+
+
+class _BundleImporter:
+    def __init__(self, db: Session, store: ArtifactStore, chunk_size: int) -> None:
+        self._db = db
+        self._store = store
+        self._chunk_size = chunk_size
+        self._bundle_id: uuid.UUID | None = None
+        self._progress: BundleImport | None = None
+        self._steps: list[dict[str, Any]] = []
+        self._events: list[dict[str, Any]] = []
+        self._awaiting_blob: dict[str, Any] | None = None
+        self._artifact_writes = 0
+        self._usage_scope: tuple[str, str] | None = None
+
+    def handle(self, name: str, handle: BinaryIO) -> bool:
+        if name == "manifest.json":
+            return self._start(json.loads(handle.read()))
+        if self._progress is None:
+            raise EventValidationError(
+                "VALIDATION_ERROR", "Bundle manifest must be the first member", {"member": name}
+            )
+
+        if name == "run.json":
+            self._create_run(json.loads(handle.read()))
+        elif name.startswith("steps/"):
+            self._steps.extend(_read_ndjson(handle))
+            if len(self._steps) >= self._chunk_size:
+                self._flush_steps()
+        elif name.startswith("events/"):
+            self._flush_steps()
+            self._events.extend(_read_ndjson(handle))
+            if len(self._events) >= self._chunk_size:
+                self._flush_events()
+        elif name.startswith("artifacts/") and name.endswith(".json"):
+            self._flush_steps()
+            self._flush_events()
+            self._artifact_metadata(json.loads(handle.read()))
+        elif name.startswith("artifacts/"):
+            self._artifact_content(name.split("/", 1)[1], handle)
+        return False
+
+    def finish(self) -> dict[str, Any]:
+        progress = self._progress
+        if progress is None:
+            raise EventValidationError("VALIDATION_ERROR", "Bundle is missing manifest.json", {})
+
+        if progress.status != "completed":
+            self._flush_steps()
+            self._flush_events()
+            self._db.execute(
+                update(Event)
+                .where(
+                    Event.run_id == progress.run_id,
+                    Event.artifact_pending.is_(True),
+                    ~exists().where(
+                        and_(
+                            EventArtifact.event_id == Event.event_id,
+                            EventArtifact.artifact_hash == Artifact.artifact_hash,
+                            Artifact.status == "pending",
+                        )
+                    ),
+                )
+                .values(artifact_pending=False)
+            )
+            rebuild_run_stats(self._db, progress.run_id)
+            progress.status = "completed"
+            progress.ended_at_utc = datetime.now(timezone.utc)
+            progress.updated_at_utc = progress.ended_at_utc
+            self._db.commit()
+
+        return {
+            "import_id": progress.import_id,
+            "run_id": progress.run_id,
+            "source_run_id": progress.source_run_id,
+            "status": progress.status,
+            "steps_loaded": progress.steps_loaded,
+            "events_loaded": progress.events_loaded,
+            "artifacts_loaded": progress.artifacts_loaded,
+            "artifacts_skipped": progress.artifacts_skipped,
+        }
+
+    def _start(self, manifest: dict[str, Any]) -> bool:
+        if manifest.get("bundle_format_version") != BUNDLE_FORMAT_VERSION:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Unsupported bundle format version",
+                {"bundle_format_version": manifest.get("bundle_format_version")},
+            )
+        try:
+            self._bundle_id = uuid.UUID(str(manifest.get("bundle_id")))
+        except ValueError as exc:
+            raise EventValidationError(
+                "VALIDATION_ERROR", "Bundle manifest has an invalid bundle_id", {}
+            ) from exc
+
+        import_id = str(self._bundle_id)
+        progress = self._db.execute(
+            select(BundleImport).where(BundleImport.import_id == import_id)
+        ).scalar_one_or_none()
+        if progress is None:
+            source_run_id = str(manifest["run_id"])
+            progress = BundleImport(
+                import_id=import_id,
+                source_run_id=source_run_id,
+                run_id=self._remap(source_run_id),
+                status="running",
+                steps_loaded=0,
+                last_step_sequence_no=-1,
+                events_loaded=0,
+                last_sequence_no=-1,
+                artifacts_loaded=0,
+                artifacts_skipped=0,
+            )
+            self._db.add(progress)
+            self._db.flush()
+        self._progress = progress
+        return progress.status == "completed"
+
+    def _create_run(self, record: dict[str, Any]) -> None:
+        progress = self._require_progress()
+        self._usage_scope = (record["app_id"], record["environment"])
+        exists_already = self._db.execute(
+            select(Run.run_id).where(Run.run_id == progress.run_id)
+        ).first()
+        if exists_already is None:
+            tags = dict(record.get("tags") or {})
+            tags["bundle_id"] = progress.import_id
+            self._db.add(
+                Run(
+                    run_id=progress.run_id,
+                    trace_id=record["trace_id"],
+                    app_id=record["app_id"],
+                    environment=record["environment"],
+                    status=record["status"],
+                    started_at_utc=_parse_dt(record["started_at_utc"]),
+                    ended_at_utc=_parse_dt(record.get("ended_at_utc")),
+                    source_type="ci_bundle_import",
+                    source_run_id=progress.source_run_id,
+                    tags_json=tags,
+                    retention_class=record.get("retention_class", "dev_short"),
+                )
+            )
+        self._db.commit()
+
+    def _flush_steps(self) -> None:
+        if not self._steps:
+            return
+        progress = self._require_progress()
+        records = [
+            item for item in self._steps if item["sequence_no"] > progress.last_step_sequence_no
+        ]
+        self._steps = []
+        if not records:
+            return
+
+        rows = [
+            {
+                "step_id": self._remap(record["step_id"]),
+                "run_id": progress.run_id,
+                "parent_step_id": self._remap(record.get("parent_step_id")),
+                "sequence_no": record["sequence_no"],
+                "step_type": record["step_type"],
+                "started_at_utc": _parse_dt(record["started_at_utc"]),
+                "ended_at_utc": _parse_dt(record.get("ended_at_utc")),
+                "determinism_mode": record["determinism_mode"],
+            }
+            for record in records
+        ]
+        bulk_insert(self._db, Step.__table__, rows)
+        progress.steps_loaded += len(rows)
+        progress.last_step_sequence_no = max(record["sequence_no"] for record in records)
+        progress.updated_at_utc = datetime.now(timezone.utc)
+        self._db.commit()
+
+    def _flush_events(self) -> None:
+        if not self._events:
+            return
+        progress = self._require_progress()
+        records = [item for item in self._events if item["sequence_no"] > progress.last_sequence_no]
+        self._events = []
+        if not records:
+            return
+
+        event_rows: list[dict[str, Any]] = []
+        link_rows: list[dict[str, Any]] = []
+        placeholders: dict[str, dict[str, Any]] = {}
+        for record in records:
+            event_id = self._remap(record["event_id"])
+            event_rows.append(
+                {
+                    "event_id": event_id,
+                    "run_id": progress.run_id,
+                    "step_id": self._remap(record["step_id"]),
+                    "parent_step_id": self._remap(record.get("parent_step_id")),
+                    "event_type": record["event_type"],
+                    "schema_version": record["schema_version"],
+                    "payload_json": record["payload"],
+                    "redaction_status": record["redaction_status"],
+                    "created_at_utc": _parse_dt(record["created_at_utc"]),
+                    "idempotency_key": f"import:{event_id}",
+                    "idempotency_hash": idempotency_key_hash(f"import:{event_id}"),
+                    "sequence_no": record["sequence_no"],
+                    "timestamp_utc": _parse_dt(record["timestamp_utc"]),
+                    "actor_type": record["actor_type"],
+                    "determinism_mode": record["determinism_mode"],
+                    "artifact_pending": bool(record.get("artifact_pending"))
+                    or bool(record["artifact_refs"]),
+                }
+            )
+            for ref in record["artifact_refs"]:
+                link_rows.append(
+                    {
+                        "event_id": event_id,
+                        "artifact_hash": ref["artifact_hash"],
+                        "reference_role": ref["reference_role"],
+                    }
+                )
+                placeholders.setdefault(ref["artifact_hash"], _placeholder_artifact(ref))
+
+        # Imported events keep their original ingest time, which may predate every live partition.
+        created = [row["created_at_utc"] for row in event_rows if row["created_at_utc"] is not None]
+        if created:
+            ensure_event_partitions(self._db, start=min(created), end=max(created))
+        if placeholders:
+            known = set(
+                self._db.execute(
+                    select(Artifact.artifact_hash).where(Artifact.artifact_hash.in_(list(placeholders)))
+                ).scalars()
+            )
+            bulk_insert(
+                self._db,
+                Artifact.__table__,
+                [row for artifact_hash, row in placeholders.items() if artifact_hash not in known],
+            )
+
+        bulk_insert(self._db, Event.__table__, event_rows)
+        bulk_insert(self._db, EventArtifact.__table__, link_rows)
+        if self._usage_scope is not None:
+            samples = (
+                usage_sample(row["event_type"], row["payload_json"], row["timestamp_utc"])
+                for row in event_rows
+            )
+            record_usage(
+                self._db, *self._usage_scope, (sample for sample in samples if sample is not None)
+            )
+        progress.events_loaded += len(event_rows)
+        progress.last_sequence_no = max(record["sequence_no"] for record in records)
+        progress.updated_at_utc = datetime.now(timezone.utc)
+        self._db.commit()
+
+    def _artifact_metadata(self, record: dict[str, Any]) -> None:
+        progress = self._require_progress()
+        self._awaiting_blob = None
+        existing = self._db.execute(
+            select(Artifact).where(Artifact.artifact_hash == record["artifact_hash"])
+        ).scalar_one_or_none()
+        if existing is not None and existing.status != "pending":
+            progress.artifacts_skipped += 1
+            self._count_artifact_write()
+            return
+        if record.get("content_included"):
+            self._awaiting_blob = record
+            return
+        if existing is None:
+            self._db.add(Artifact(**_placeholder_artifact(record)))
+            self._count_artifact_write()
+
+    def _artifact_content(self, artifact_hash: str, handle: BinaryIO) -> None:
+        record = self._awaiting_blob
+        self._awaiting_blob = None
+        if record is None or record["artifact_hash"] != artifact_hash:
+            return
+
+        payload = handle.read()
+        if (
+            record.get("hash_algorithm", "sha256") == "sha256"
+            and hashlib.sha256(payload).hexdigest() != artifact_hash
+        ):
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Bundle artifact content does not match its hash",
+                {"artifact_hash": artifact_hash},
+            )
+
+        stored = self._store.store(artifact_hash, payload)
+        artifact = self._db.execute(
+            select(Artifact).where(Artifact.artifact_hash == artifact_hash)
+        ).scalar_one_or_none()
+        if artifact is None:
+            artifact = Artifact(artifact_hash=artifact_hash)
+            self._db.add(artifact)
+        artifact.artifact_type = record["artifact_type"]
+        artifact.byte_size = len(payload)
+        artifact.mime_type = record["mime_type"]
+        artifact.content_encoding = record["content_encoding"]
+        artifact.redaction_profile = record["redaction_profile"]
+        artifact.storage_bucket = stored.bucket
+        artifact.storage_object_key = stored.object_key
+        artifact.retention_class = record["retention_class"]
+        artifact.status = record["status"]
+        artifact.hash_algorithm = record.get("hash_algorithm", "sha256")
+        artifact.blocked_reason = record.get("blocked_reason")
+        index_artifact_text(self._db, artifact, payload)
+        self._require_progress().artifacts_loaded += 1
+        self._count_artifact_write()
+
+    def _count_artifact_write(self) -> None:
+        self._artifact_writes += 1
+        if self._artifact_writes >= self._chunk_size:
+            self._artifact_writes = 0
+            self._require_progress().updated_at_utc = datetime.now(timezone.utc)
+            self._db.commit()
+
+    def _remap(self, original_id: str | None) -> str | None:
+        if original_id is None:
+            return None
+        assert self._bundle_id is not None
+        return str(uuid.uuid5(self._bundle_id, original_id))
+
+    def _require_progress(self) -> BundleImport:
+        assert self._progress is not None
+        return self._progress
+
+
+def _placeholder_artifact(record: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "artifact_hash": record["artifact_hash"],
+        "artifact_type": record.get("artifact_type") or record.get("reference_role", "unknown"),
+        "byte_size": record.get("byte_size", 0),
+        "mime_type": record.get("mime_type", "application/octet-stream"),
+        "content_encoding": record.get("content_encoding", "identity"),
+        "redaction_profile": record.get("redaction_profile", "default"),
+        "storage_bucket": "pending",
+        "storage_object_key": "pending",
+        "created_at_utc": datetime.now(timezone.utc),
+        "retention_class": record.get("retention_class", "dev_short"),
+        "status": "pending",
+        "hash_algorithm": record.get("hash_algorithm", "sha256"),
+        "blocked_reason": None,
+    }
+
+
+def _read_ndjson(handle: BinaryIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in handle.read().splitlines() if line.strip()]
+
+
+def _parse_dt(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _open_decompressor(fileobj: BinaryIO) -> BinaryIO:
+    magic = fileobj.read(4)
+    fileobj.seek(0)
+    if magic.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "zstd bundles require the optional zstandard package",
+                {},
+            )
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+    raise EventValidationError("VALIDATION_ERROR", "Unrecognized bundle compression", {})
+
+
+def _iter_artifact_content(
+    store: ArtifactStore,
+    records: Iterator[dict[str, Any]],
+    include_content: bool,
+    read_workers: int,
+    prefetch_max_bytes: int,
+) -> Iterator[tuple[dict[str, Any], tuple[BinaryIO, int] | None]]:
+    def fetch(record: dict[str, Any]) -> tuple[BinaryIO, int] | None:
+        if not include_content or record["status"] not in {"ready", "blocked"}:
+            return None
+        if record["byte_size"] <= prefetch_max_bytes:
+            payload = store.load(record["artifact_hash"])
+            return io.BytesIO(payload), len(payload)
+        return store.open(record["artifact_hash"])
+
+    def close_unread(future: Future[tuple[BinaryIO, int] | None]) -> None:
+        if not future.cancelled() and future.exception() is None and future.result() is not None:
+            future.result()[0].close()
+
+    window = max(read_workers, 1)
+    pool = ThreadPoolExecutor(max_workers=window)
+    in_flight: deque[tuple[dict[str, Any], Future[tuple[BinaryIO, int] | None]]] = deque()
+    try:
+        for record in records:
+            in_flight.append((record, pool.submit(fetch, record)))
+            if len(in_flight) >= window:
+                ready, future = in_flight.popleft()
+                yield ready, future.result()
+        while in_flight:
+            ready, future = in_flight.popleft()
+            yield ready, future.result()
+    finally:
+        # Closed early (e.g. the client disconnected): nobody reads the prefetched handles, so
+        # cancel reads not yet started and close the others as they finish, without waiting.
+        for _, future in in_flight:
+            future.cancel()
+            future.add_done_callback(close_unread)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_step_pages(db: Session, run_id: str) -> Iterator[list[Step]]:
+    last_sequence = -1
+    while True:
+        page = list(
+            db.execute(
+                select(Step)
+                .where(Step.run_id == run_id, Step.sequence_no > last_sequence)
+                .order_by(Step.sequence_no.asc())
+                .limit(BUNDLE_PAGE_SIZE)
+            ).scalars()
+        )
+        if not page:
+            return
+        yield page
+        last_sequence = page[-1].sequence_no
+        db.expunge_all()
+
+
+def _iter_event_pages(db: Session, run_id: str) -> Iterator[list[Event] | list[SealedEvent]]:
+    sealed = sealed_events(db, run_id)
+    if sealed is not None:
+        for start in range(0, len(sealed), BUNDLE_PAGE_SIZE):
+            yield list(sealed[start : start + BUNDLE_PAGE_SIZE])
+        return
+
+    last_sequence = -1
+    while True:
+        page = list(
+            db.execute(
+                select(Event)
+                .where(Event.run_id == run_id, Event.sequence_no > last_sequence)
+                .order_by(Event.sequence_no.asc())
+                .limit(BUNDLE_PAGE_SIZE)
+            ).scalars()
+        )
+        if not page:
+            return
+        yield page
+        last_sequence = page[-1].sequence_no
+        db.expunge_all()
+
+
+def _event_refs(db: Session, event_ids: list[str]) -> dict[str, list[dict[str, str]]]:
+    refs: dict[str, list[dict[str, str]]] = {}
+    rows = db.execute(
+        select(
+            EventArtifact.event_id, EventArtifact.artifact_hash, EventArtifact.reference_role
+        ).where(EventArtifact.event_id.in_(event_ids))
+    ).all()
+    for event_id, artifact_hash, reference_role in rows:
+        refs.setdefault(event_id, []).append(
+            {"artifact_hash": artifact_hash, "reference_role": reference_role}
+        )
+    return refs
+
+
+def _run_record(run: Run) -> dict[str, Any]:
+    return {
+        "run_id": run.run_id,
+        "trace_id": run.trace_id,
+        "app_id": run.app_id,
+        "environment": run.environment,
+        "status": run.status,
+        "started_at_utc": _iso(run.started_at_utc),
+        "ended_at_utc": _iso(run.ended_at_utc),
+        "source_type": run.source_type,
+        "source_run_id": run.source_run_id,
+        "tags": run.tags_json or {},
+        "retention_class": run.retention_class,
+    }
+
+
+def _step_record(step: Step) -> dict[str, Any]:
+    return {
+        "step_id": step.step_id,
+        "run_id": step.run_id,
+        "parent_step_id": step.parent_step_id,
+        "sequence_no": step.sequence_no,
+        "step_type": step.step_type,
+        "started_at_utc": _iso(step.started_at_utc),
+        "ended_at_utc": _iso(step.ended_at_utc),
+        "determinism_mode": step.determinism_mode,
+    }
+
+
+def _event_record(event: Event | SealedEvent, refs: list[dict[str, str]]) -> dict[str, Any]:
+    return {
+        "event_id": event.event_id,
+        "run_id": event.run_id,
+        "step_id": event.step_id,
+        "parent_step_id": event.parent_step_id,
+        "event_type": event.event_type,
+        "schema_version": event.schema_version,
+        "payload": event.payload_json,
+        "redaction_status": event.redaction_status,
+        "created_at_utc": _iso(event.created_at_utc),
+        "idempotency_key": event.idempotency_key,
+        "sequence_no": event.sequence_no,
+        "timestamp_utc": _iso(event.timestamp_utc),
+        "actor_type": event.actor_type,
+        "determinism_mode": event.determinism_mode,
+        "artifact_pending": event.artifact_pending,
+        "artifact_refs": refs,
+    }
+
+
+def _artifact_record(artifact: Artifact) -> dict[str, Any]:
+    return {
+        "artifact_hash": artifact.artifact_hash,
+        "artifact_type": artifact.artifact_type,
+        "byte_size": artifact.byte_size,
+        "mime_type": artifact.mime_type,
+        "content_encoding": artifact.content_encoding,
+        "redaction_profile": artifact.redaction_profile,
+        "created_at_utc": _iso(artifact.created_at_utc),
+        "retention_class": artifact.retention_class,
+        "status": artifact.status,
+        "hash_algorithm": artifact.hash_algorithm,
+        "blocked_reason": artifact.blocked_reason,
+    }
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _ndjson(records: Iterable[dict[str, Any]]) -> bytes:
+    return b"".join(
+        json.dumps(record, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        for record in records
+    )
+
+
+def _add_bytes(archive: tarfile.TarFile, name: str, payload: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(payload)
+    info.mtime = int(time.time())
+    archive.addfile(info, io.BytesIO(payload))
+
+
+def _open_compressor(sink: ChunkSink, compression: str) -> BinaryIO:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().stream_writer(sink, closefd=False)
+    return gzip.GzipFile(fileobj=sink, mode="wb")
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import CompoundSelect, DateTime, delete, exists, select, union_all
+from sqlalchemy.orm import Session
+
+from backend.app.config import settings
+from backend.app.db.models import (
+    Artifact,
+    AuditLog,
+    Event,
+    Run,
+    RunSnapshot,
+    RunStats,
+    SealedEventId,
+)
+from backend.app.services.artifact_store import ArtifactStore, get_artifact_store
+from backend.app.services.bulk import bulk_insert, insert_ignore
+from backend.app.services.run_stats import rebuild_run_stats
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+SNAPSHOT_ARTIFACT_TYPE = "run_snapshot"
+SNAPSHOT_MIME_TYPE = "application/x-ndjson"
+SEALABLE_STATUSES = ("success", "failed")
+
+# idempotency_hash only backs the live unique index; the key itself is kept.
+EVENT_COLUMNS = [
+    column.key for column in Event.__table__.columns if column.key != "idempotency_hash"
+]
+DATETIME_COLUMNS = {
+    column.key for column in Event.__table__.columns if isinstance(column.type, DateTime)
+}
+
+
+@dataclass
+class CompactionReport:
+    runs_sealed: int = 0
+    events_moved: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class SealedEvent:
+    """A read-only event from a run snapshot, with the column attributes of an `Event` row.
+
+    Much cheaper to build than a transient ORM instance, which matters when a whole run is decoded.
+    """
+
+    event_id: str
+    run_id: str
+    step_id: str
+    parent_step_id: str | None
+    event_type: str
+    schema_version: str
+    payload_json: dict[str, Any]
+    redaction_status: str
+    created_at_utc: datetime
+    idempotency_key: str
+    sequence_no: int
+    timestamp_utc: datetime
+    actor_type: str
+    determinism_mode: str
+    artifact_pending: bool
+
+
+def snapshot_record(event: Event) -> dict[str, Any]:
+    record = {name: getattr(event, name) for name in EVENT_COLUMNS}
+    for name in DATETIME_COLUMNS:
+        if record[name] is not None:
+            record[name] = record[name].isoformat()
+    return record
+
+
+def _event_from_record(record: dict[str, Any]) -> SealedEvent:
+    values = {name: record.get(name) for name in EVENT_COLUMNS}
+    for name in DATETIME_COLUMNS:
+        if values[name] is not None:
+            values[name] = datetime.fromisoformat(values[name])
+    return SealedEvent(**values)
+
+
+def _compress(raw: bytes) -> tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=9).compress(raw), "zstd"
+    return gzip.compress(raw, compresslevel=6), "gzip"
+
+
+def _decompress(content: bytes, content_encoding: str) -> bytes:
+    if content_encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd run snapshots require the optional zstandard package")
+        return zstandard.ZstdDecompressor().decompress(content, max_output_size=2**31)
+    if content_encoding == "gzip":
+        return gzip.decompress(content)
+    return content
+
+
+def read_snapshot(
+    store: ArtifactStore, artifact_hash: str, content_encoding: str
+) -> list[dict[str, Any]]:
+    """All event records of a sealed run, in sequence order, from one read of its snapshot."""
+    raw = _decompress(store.load(artifact_hash), content_encoding)
+    return [json.loads(line) for line in raw.splitlines() if line]
+
+
+@lru_cache(maxsize=max(settings.compaction_snapshot_cache_runs, 1))
+def _snapshot_events(artifact_hash: str, content_encoding: str) -> tuple[SealedEvent, ...]:
+    # Snapshots are immutable and content addressed, so paging through a sealed run decodes it once.
+    records = read_snapshot(get_artifact_store(), artifact_hash, content_encoding)
+    return tuple(_event_from_record(record) for record in records)
+
+
+def sealed_events(db: Session, run_id: str) -> tuple[SealedEvent, ...] | None:
+    """Events of a sealed run by sequence_no, or None while the run's events are still rows."""
+    row = db.execute(
+        select(RunSnapshot.artifact_hash, Artifact.content_encoding)
+        .join(Artifact, Artifact.artifact_hash == RunSnapshot.artifact_hash)
+        .where(RunSnapshot.run_id == run_id)
+    ).first()
+    if row is None:
+        return None
+    return _snapshot_events(row.artifact_hash, row.content_encoding)
+
+
+def find_sealed_event(db: Session, event_id: str) -> SealedEvent | None:
+    """An event of a sealed run by id, read from its run's snapshot."""
+    run_id = db.execute(
+        select(SealedEventId.run_id).where(SealedEventId.event_id == event_id)
+    ).scalar_one_or_none()
+    if run_id is None:
+        return None
+    return next(
+        (event for event in sealed_events(db, run_id) or () if event.event_id == event_id), None
+    )
+
+
+def run_event_ids(run_id: str) -> CompoundSelect:
+    """Ids of a run's events, live or sealed, for joining artifact links."""
+    return union_all(
+        select(Event.event_id).where(Event.run_id == run_id),
+        select(SealedEventId.event_id).where(SealedEventId.run_id == run_id),
+    )
+
+
+def load_run_events(db: Session, run_id: str) -> list[Event] | list[SealedEvent]:
+    sealed = sealed_events(db, run_id)
+    if sealed is not None:
+        return list(sealed)
+    return list(
+        db.execute(
+            select(Event).where(Event.run_id == run_id).order_by(Event.sequence_no.asc())
+        ).scalars()
+    )
+
+
+def sealable_runs_query(now: datetime, seal_after_days: int, limit: int):
+    return (
+        select(Run.run_id)
+        .where(
+            Run.status.in_(SEALABLE_STATUSES),
+            Run.ended_at_utc < now - timedelta(days=seal_after_days),
+            Run.purge_marked_at_utc.is_(None),
+            ~exists().where(RunSnapshot.run_id == Run.run_id),
+            # Pending artifacts may still be finalized, which updates their events.
+            ~exists().where(Event.run_id == Run.run_id, Event.artifact_pending.is_(True)),
+        )
+        .order_by(Run.ended_at_utc.asc())
+        .limit(limit)
+    )
+
+
+def seal_run(db: Session, store: ArtifactStore, run: Run, report: CompactionReport) -> RunSnapshot:
+    """Move a terminal run's events into one compressed NDJSON artifact and delete their rows.
+
+    Artifact links in event_artifacts stay, so retention and replay still see what the events
+    reference, and sealed_event_ids keeps each event addressable by id.
+    """
+    events = list(
+        db.execute(
+            select(Event).where(Event.run_id == run.run_id).order_by(Event.sequence_no.asc())
+        ).scalars()
+    )
+    if db.get(RunStats, run.run_id) is None:
+        # Run detail reads counters from run_stats;
+        # after sealing they can no longer be counted from rows.
+        rebuild_run_stats(db, run.run_id)
+
+    raw = b"".join(
+        json.dumps(snapshot_record(event), separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+        + b"\n"
+        for event in events
+    )
+    content, content_encoding = _compress(raw)
+    artifact_hash = hashlib.sha256(content).hexdigest()
+    stored = store.store(artifact_hash, content)
+    insert_ignore(
+        db,
+        Artifact.__table__,
+        [
+            {
+                "artifact_hash": artifact_hash,
+                "artifact_type": SNAPSHOT_ARTIFACT_TYPE,
+                "byte_size": len(content),
+                "mime_type": SNAPSHOT_MIME_TYPE,
+                "content_encoding": content_encoding,
+                "redaction_profile": "default",
+                "storage_bucket": stored.bucket,
+                "storage_object_key": stored.object_key,
+                "created_at_utc": datetime.now(timezone.utc),
+                "retention_class": run.retention_class,
+                "status": "ready",
+                "hash_algorithm": "sha256",
+            }
+        ],
+    )
+    snapshot = RunSnapshot(
+        run_id=run.run_id,
+        artifact_hash=artifact_hash,
+        event_count=len(events),
+        last_sequence_no=events[-1].sequence_no if events else -1,
+        raw_bytes=len(raw),
+    )
+    db.add(snapshot)
+    db.flush()
+    bulk_insert(
+        db,
+        SealedEventId.__table__,
+        [{"event_id": event.event_id, "run_id": run.run_id} for event in events],
+    )
+    db.execute(delete(Event).where(Event.run_id == run.run_id))
+    report.runs_sealed += 1
+    report.events_moved += len(events)
+    report.raw_bytes += len(raw)
+    report.stored_bytes += len(content)
+    return snapshot
+
+
+def seal_runs(
+    db: Session,
+    store: ArtifactStore,
+    now: datetime | None = None,
+    seal_after_days: int = settings.compaction_seal_after_days,
+    run_batch_size: int = settings.compaction_run_batch_size,
+) -> CompactionReport:
+    now = now or datetime.now(timezone.utc)
+    report = CompactionReport()
+    if seal_after_days <= 0:
+        return report
+
+    while True:
+        run_ids = list(
+            db.execute(sealable_runs_query(now, seal_after_days, max(run_batch_size, 1))).scalars()
+        )
+        if not run_ids:
+            break
+        for run in db.execute(select(Run).where(Run.run_id.in_(run_ids))).scalars().all():
+            seal_run(db, store, run, report)
+        # The blobs are already stored; a failed commit leaves orphans that are content addressed.
+        db.commit()
+
+    db.add(
+        AuditLog(
+            actor_id="compaction_job",
+            actor_type="service",
+            action="run_compaction",
+            target_type="compaction",
+            target_id=now.isoformat(),
+            details_json=report.as_dict(),
+        )
+    )
+    db.commit()
+    return report
@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import difflib
+import hashlib
+import io
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.config import settings
+from backend.app.db.models import Artifact, Event
+from backend.app.modules.compaction.service import SealedEvent, find_sealed_event
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.services.artifact_store import ArtifactStore
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+DIFF_KINDS = {"text", "json", "candidate_list"}
+CANDIDATE_LIST_TYPES = {"candidate_list", "retrieval_candidates"}
+CANDIDATE_ID_KEYS = ("chunk_id", "doc_id", "document_id", "id")
+FIELD_DIFF_KINDS = {"candidate_list_ref": "candidate_list"}
+CONTENT_ENCODINGS = {"identity", "gzip"} | ({"zstd"} if zstandard is not None else set())
+DECODE_ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class ArtifactDiffService:
+    def __init__(
+        self,
+        store: ArtifactStore,
+        max_bytes: int = settings.artifact_diff_max_bytes,
+        cache_entries: int = settings.artifact_diff_cache_entries,
+    ) -> None:
+        self._store = store
+        self._max_bytes = max_bytes
+        self._cache_entries = max(cache_entries, 0)
+        self._cache: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def diff_artifacts(
+        self,
+        db: Session,
+        base_hash: str,
+        candidate_hash: str,
+        diff_kind: str | None = None,
+    ) -> dict[str, Any]:
+        if diff_kind is not None and diff_kind not in DIFF_KINDS:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Unsupported diff_kind",
+                {"diff_kind": diff_kind, "supported": sorted(DIFF_KINDS)},
+            )
+
+        if base_hash == candidate_hash:
+            return _result(base_hash, candidate_hash, True, diff_kind or "identity", {})
+
+        key = (base_hash, candidate_hash, diff_kind or "auto")
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        base = self._ready_artifact(db, base_hash)
+        candidate = self._ready_artifact(db, candidate_hash)
+        kind = diff_kind or _infer_kind(base, candidate)
+        base_bytes = self._load(base)
+        candidate_bytes = self._load(candidate)
+
+        changes: dict[str, Any] | None = None
+        if kind in {"json", "candidate_list"}:
+            try:
+                base_obj = json.loads(base_bytes)
+                candidate_obj = json.loads(candidate_bytes)
+            except ValueError:
+                kind = "text"
+            else:
+                if kind == "candidate_list":
+                    changes = rank_movement_diff(base_obj, candidate_obj)
+                else:
+                    changes = json_structural_diff(base_obj, candidate_obj)
+        if changes is None:
+            changes = text_diff(
+                base_bytes.decode("utf-8", errors="replace"),
+                candidate_bytes.decode("utf-8", errors="replace"),
+            )
+
+        result = _result(base_hash, candidate_hash, False, kind, changes)
+        self._cache_put(key, result)
+        return result
+
+    def diff_event_artifacts(
+        self, db: Session, base_event_id: str, candidate_event_id: str
+    ) -> dict[str, Any]:
+        base = _event_or_error(db, base_event_id)
+        candidate = _event_or_error(db, candidate_event_id)
+
+        fields: dict[str, Any] = {}
+        ref_fields = sorted(
+            key
+            for key in set(base.payload_json) | set(candidate.payload_json)
+            if key.endswith("_ref")
+        )
+        for field in ref_fields:
+            base_ref = base.payload_json.get(field)
+            candidate_ref = candidate.payload_json.get(field)
+            if not isinstance(base_ref, str) or not isinstance(candidate_ref, str):
+                fields[field] = {"unavailable": "reference_missing"}
+                continue
+            try:
+                fields[field] = self.diff_artifacts(
+                    db, base_ref, candidate_ref, FIELD_DIFF_KINDS.get(field)
+                )
+            except EventValidationError as exc:
+                fields[field] = {"unavailable": str(exc), "details": exc.details}
+
+        return {
+            "base_event_id": base.event_id,
+            "candidate_event_id": candidate.event_id,
+            "fields": fields,
+        }
+
+    def _ready_artifact(self, db: Session, artifact_hash: str) -> Artifact:
+        artifact = db.execute(
+            select(Artifact).where(Artifact.artifact_hash == artifact_hash)
+        ).scalar_one_or_none()
+        if artifact is None:
+            raise EventValidationError(
+                "NOT_FOUND", "Artifact not found", {"artifact_hash": artifact_hash}
+            )
+        if artifact.status != "ready":
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Artifact content is not available for diffing",
+                {"artifact_hash": artifact_hash, "status": artifact.status},
+            )
+        if artifact.byte_size > self._max_bytes:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Artifact exceeds diff size limit",
+                {
+                    "artifact_hash": artifact_hash,
+                    "byte_size": artifact.byte_size,
+                    "max_bytes": self._max_bytes,
+                },
+            )
+        if artifact.content_encoding not in CONTENT_ENCODINGS:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Artifact content encoding is not supported for diffing",
+                {
+                    "artifact_hash": artifact_hash,
+                    "content_encoding": artifact.content_encoding,
+                    "supported": sorted(CONTENT_ENCODINGS),
+                },
+            )
+        return artifact
+
+    def _load(self, artifact: Artifact) -> bytes:
+        """The decoded content of a ready artifact; a blob missing from the store is NOT_FOUND."""
+        try:
+            content = self._store.load(artifact.artifact_hash)
+        except Exception as exc:  # noqa: BLE001 - FileNotFoundError locally, ClientError on S3
+            raise EventValidationError(
+                "NOT_FOUND",
+                "Artifact content is unavailable in the artifact store",
+                {"artifact_hash": artifact.artifact_hash, "error": type(exc).__name__},
+            ) from exc
+        try:
+            decoded = _decode(content, artifact.content_encoding, self._max_bytes)
+        except DECODE_ERRORS as exc:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Artifact content does not match its content encoding",
+                {
+                    "artifact_hash": artifact.artifact_hash,
+                    "content_encoding": artifact.content_encoding,
+                },
+            ) from exc
+        if len(decoded) > self._max_bytes:
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "Decoded artifact exceeds diff size limit",
+                {"artifact_hash": artifact.artifact_hash, "max_bytes": self._max_bytes},
+            )
+        return decoded
+
+    def _cache_get(self, key: tuple[str, str, str]) -> dict[str, Any] | None:
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: tuple[str, str, str], result: dict[str, Any]) -> None:
+        if self._cache_entries == 0:
+            return
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_entries:
+                self._cache.popitem(last=False)
+
+
+def _decode(content: bytes, content_encoding: str, max_bytes: int) -> bytes:
+    """Undo the artifact's Content-Encoding, reading at most one byte past `max_bytes`."""
+    if content_encoding == "gzip":
+        return zlib.decompressobj(wbits=16 + zlib.MAX_WBITS).decompress(content, max_bytes + 1)
+    if content_encoding == "zstd":
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(content)) as reader:
+            return reader.read(max_bytes + 1)
+    return content
+
+
+def text_diff(base: str, candidate: str) -> dict[str, Any]:
+    base_lines = base.splitlines()
+    candidate_lines = candidate.splitlines()
+    matcher = difflib.SequenceMatcher(None, base_lines, candidate_lines, autojunk=False)
+
+    lines_added = 0
+    lines_removed = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in {"replace", "delete"}:
+            lines_removed += i2 - i1
+        if tag in {"replace", "insert"}:
+            lines_added += j2 - j1
+
+    unified: list[str] = []
+    for group in matcher.get_grouped_opcodes(3):
+        first, last = group[0], group[-1]
+        unified.append(
+            f"@@ -{first[1] + 1},{last[2] - first[1]} +{first[3] + 1},{last[4] - first[3]} @@"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                unified.extend(f" {line}" for line in base_lines[i1:i2])
+                continue
+            unified.extend(f"-{line}" for line in base_lines[i1:i2])
+            unified.extend(f"+{line}" for line in candidate_lines[j1:j2])
+
+    return {
+        "lines_added": lines_added,
+        "lines_removed": lines_removed,
+        "similarity": round(matcher.ratio(), 4),
+        "unified_diff": unified,
+    }
+
+
+def json_structural_diff(base: Any, candidate: Any) -> dict[str, Any]:
+    changes: list[dict[str, Any]] = []
+    _walk_json("$", base, candidate, changes)
+    return {
+        "added": sum(1 for change in changes if change["op"] == "added"),
+        "removed": sum(1 for change in changes if change["op"] == "removed"),
+        "changed": sum(1 for change in changes if change["op"] == "changed"),
+        "changes": changes,
+    }
+
+
+def _walk_json(path: str, base: Any, candidate: Any, changes: list[dict[str, Any]]) -> None:
+    if isinstance(base, dict) and isinstance(candidate, dict):
+        for key in sorted(set(base) | set(candidate)):
+            child = f"{path}.{key}"
+            if key not in candidate:
+                changes.append({"path": child, "op": "removed", "base": base[key]})
+            elif key not in base:
+                changes.append({"path": child, "op": "added", "candidate": candidate[key]})
+            else:
+                _walk_json(child, base[key], candidate[key], changes)
+        return
+
+    if isinstance(base, list) and isinstance(candidate, list):
+        for index in range(max(len(base), len(candidate))):
+            child = f"{path}[{index}]"
+            if index >= len(candidate):
+                changes.append({"path": child, "op": "removed", "base": base[index]})
+            elif index >= len(base):
+                changes.append({"path": child, "op": "added", "candidate": candidate[index]})
+            else:
+                _walk_json(child, base[index], candidate[index], changes)
+        return
+
+    if base != candidate or type(base) is not type(candidate):
+        changes.append({"path": path, "op": "changed", "base": base, "candidate": candidate})
+
+
+def rank_movement_diff(base: Any, candidate: Any) -> dict[str, Any]:
+    base_ranks = _candidate_ranks(base)
+    candidate_ranks = _candidate_ranks(candidate)
+
+    moved: list[dict[str, Any]] = []
+    unchanged = 0
+    for candidate_id, base_rank in base_ranks.items():
+        candidate_rank = candidate_ranks.get(candidate_id)
+        if candidate_rank is None:
+            continue
+        if candidate_rank == base_rank:
+            unchanged += 1
+            continue
+        moved.append(
+            {
+                "candidate_id": candidate_id,
+                "base_rank": base_rank,
+                "candidate_rank": candidate_rank,
+                "rank_delta": base_rank - candidate_rank,
+            }
+        )
+
+    added = [
+        {"candidate_id": candidate_id, "candidate_rank": rank}
+        for candidate_id, rank in candidate_ranks.items()
+        if candidate_id not in base_ranks
+    ]
+    removed = [
+        {"candidate_id": candidate_id, "base_rank": rank}
+        for candidate_id, rank in base_ranks.items()
+        if candidate_id not in candidate_ranks
+    ]
+
+    return {
+        "base_count": len(base_ranks),
+        "candidate_count": len(candidate_ranks),
+        "unchanged": unchanged,
+        "moved": sorted(moved, key=lambda item: item["candidate_rank"]),
+        "added": added,
+        "removed": removed,
+    }
+
+
+def _candidate_ranks(obj: Any) -> dict[str, int]:
+    if isinstance(obj, dict):
+        obj = obj.get("candidates", [])
+    if not isinstance(obj, list):
+        return {}
+
+    ranks: dict[str, int] = {}
+    for rank, item in enumerate(obj, start=1):
+        ranks.setdefault(_candidate_id(item), rank)
+    return ranks
+
+
+def _candidate_id(item: Any) -> str:
+    if isinstance(item, dict):
+        for key in CANDIDATE_ID_KEYS:
+            value = item.get(key)
+            if value is not None:
+                return str(value)
+    if isinstance(item, str):
+        return item
+    normalized = json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _infer_kind(base: Artifact, candidate: Artifact) -> str:
+    if (
+        base.artifact_type in CANDIDATE_LIST_TYPES
+        and candidate.artifact_type in CANDIDATE_LIST_TYPES
+    ):
+        return "candidate_list"
+    if base.mime_type == "application/json" and candidate.mime_type == "application/json":
+        return "json"
+    return "text"
+
+
+def _event_or_error(db: Session, event_id: str) -> Event | SealedEvent:
+    event = db.execute(select(Event).where(Event.event_id == event_id)).scalar_one_or_none()
+    if event is None:
+        event = find_sealed_event(db, event_id)
+    if event is None:
+        raise EventValidationError("NOT_FOUND", "Event not found", {"event_id": event_id})
+    return event
+
+
+def _result(
+    base_hash: str,
+    candidate_hash: str,
+    identical: bool,
+    diff_kind: str,
+    changes: dict[str, Any],
+) -> dict[str, Any]:
+    return {
+        "base_artifact_hash": base_hash,
+        "candidate_artifact_hash": candidate_hash,
+        "identical": identical,
+        "diff_kind": diff_kind,
+        "changes": changes,
+    }
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from backend.app.db.models import Event, Run
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.services.streams import ChunkSink
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+
+EXPORT_FORMATS = {"arrow", "parquet"}
+CONTENT_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+FILE_SUFFIXES = {"arrow": ".arrows", "parquet": ".parquet"}
+EXPORT_BATCH_ROWS = 5000
+EXPORT_CHUNK_BYTES = 256 * 1024
+EXPORT_MAX_RUN_IDS = 1000
+
+# Payload fields lifted into typed columns; every other field stays in the payload_json column.
+STRING_FIELDS = ("provider", "model_id", "tool_name", "status", "finish_reason")
+FLOAT_FIELDS = ("latency_ms", "cost_usd")
+TOKEN_FIELDS = {
+    "prompt_tokens": "prompt",
+    "completion_tokens": "completion",
+    "total_tokens": "total",
+}
+
+
+def event_schema() -> pyarrow.Schema:
+    timestamp = pyarrow.timestamp("us", tz="UTC")
+    return pyarrow.schema(
+        [
+            ("event_id", pyarrow.string()),
+            ("run_id", pyarrow.string()),
+            ("app_id", pyarrow.string()),
+            ("environment", pyarrow.string()),
+            ("step_id", pyarrow.string()),
+            ("parent_step_id", pyarrow.string()),
+            ("sequence_no", pyarrow.int64()),
+            ("event_type", pyarrow.string()),
+            ("schema_version", pyarrow.string()),
+            ("timestamp_utc", timestamp),
+            ("created_at_utc", timestamp),
+            ("actor_type", pyarrow.string()),
+            ("determinism_mode", pyarrow.string()),
+            ("redaction_status", pyarrow.string()),
+            *((name, pyarrow.string()) for name in STRING_FIELDS),
+            *((name, pyarrow.float64()) for name in FLOAT_FIELDS),
+            *((name, pyarrow.int64()) for name in TOKEN_FIELDS),
+            ("payload_json", pyarrow.string()),
+        ]
+    )
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def prepare_event_export(
+    db: Session,
+    export_format: str,
+    run_ids: list[str] | None = None,
+    from_utc: datetime | None = None,
+    to_utc: datetime | None = None,
+    app_id: str | None = None,
+    environment: str | None = None,
+) -> Select:
+    """Validate an export request and return the event query it streams."""
+    if pyarrow is None:
+        raise EventValidationError(
+            "VALIDATION_ERROR", "Columnar export requires the 'export' extra (pyarrow)", {}
+        )
+    if export_format not in EXPORT_FORMATS:
+        raise EventValidationError(
+            "VALIDATION_ERROR",
+            "Unsupported export format",
+            {"format": export_format, "supported": sorted(EXPORT_FORMATS)},
+        )
+    if not run_ids and from_utc is None and to_utc is None:
+        raise EventValidationError(
+            "VALIDATION_ERROR", "Provide run_ids or a from_utc/to_utc range", {}
+        )
+    if run_ids and len(run_ids) > EXPORT_MAX_RUN_IDS:
+        raise EventValidationError(
+            "VALIDATION_ERROR",
+            f"At most {EXPORT_MAX_RUN_IDS} run_ids per export",
+            {"run_ids": len(run_ids)},
+        )
+
+    # Time ranges select runs by start time, which the runs listing index answers; events are
+    # then read per run in (run_id, sequence_no) order off ix_events_run_sequence.
+    runs = select(Run.run_id)
+    if run_ids:
+        found = set(db.execute(select(Run.run_id).where(Run.run_id.in_(run_ids))).scalars())
+        missing = sorted(set(run_ids) - found)
+        if missing:
+            raise EventValidationError("NOT_FOUND", "Runs not found", {"run_ids": missing})
+        runs = runs.where(Run.run_id.in_(run_ids))
+    if from_utc is not None:
+        runs = runs.where(Run.started_at_utc >= from_utc)
+    if to_utc is not None:
+        runs = runs.where(Run.started_at_utc < to_utc)
+    if app_id:
+        runs = runs.where(Run.app_id == app_id)
+    if environment:
+        runs = runs.where(Run.environment == environment)
+
+    return (
+        select(Event, Run.app_id, Run.environment)
+        .join(Run, Run.run_id == Event.run_id)
+        .where(Event.run_id.in_(runs))
+        .order_by(Event.run_id.asc(), Event.sequence_no.asc())
+    )
+
+
+def export_filename(export_format: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"events-{stamp}{FILE_SUFFIXES[export_format]}"
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _text(value: Any) -> str | None:
+    return None if value is None or isinstance(value, (dict, list)) else str(value)
+
+
+def _record_batch(
+    rows: list[tuple[Event, str, str]], schema: pyarrow.Schema
+) -> pyarrow.RecordBatch:
+    columns: dict[str, list[Any]] = {name: [] for name in schema.names}
+    for event, app_id, environment in rows:
+        payload = event.payload_json or {}
+        usage = payload.get("token_usage")
+        usage = usage if isinstance(usage, dict) else {}
+        columns["event_id"].append(event.event_id)
+        columns["run_id"].append(event.run_id)
+        columns["app_id"].append(app_id)
+        columns["environment"].append(environment)
+        columns["step_id"].append(event.step_id)
+        columns["parent_step_id"].append(event.parent_step_id)
+        columns["sequence_no"].append(event.sequence_no)
+        columns["event_type"].append(event.event_type)
+        columns["schema_version"].append(event.schema_version)
+        columns["timestamp_utc"].append(_utc(event.timestamp_utc))
+        columns["created_at_utc"].append(_utc(event.created_at_utc))
+        columns["actor_type"].append(event.actor_type)
+        columns["determinism_mode"].append(event.determinism_mode)
+        columns["redaction_status"].append(event.redaction_status)
+        for name in STRING_FIELDS:
+            columns[name].append(_text(payload.get(name)))
+        for name in FLOAT_FIELDS:
+            value = _number(payload.get(name))
+            columns[name].append(None if value is None else float(value))
+        for name, key in TOKEN_FIELDS.items():
+            value = _number(usage.get(key))
+            columns[name].append(None if value is None else int(value))
+        columns["payload_json"].append(json.dumps(payload, separators=(",", ":"), sort_keys=True))
+    return pyarrow.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def _open_writer(sink: ChunkSink, export_format: str, schema: pyarrow.Schema) -> Any:
+    if export_format == "parquet":
+        return pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd")
+    return pyarrow.ipc.new_stream(sink, schema)
+
+
+def iter_event_export(
+    session_factory: Callable[[], Session],
+    stmt: Select,
+    export_format: str,
+    batch_rows: int = EXPORT_BATCH_ROWS,
+) -> Iterator[bytes]:
+    """Stream the query's events as Arrow IPC or Parquet, one record batch (row group) per page."""
+    schema = event_schema()
+    sink = ChunkSink()
+    writer = _open_writer(sink, export_format, schema)
+    with session_factory() as db:
+        # yield_per streams through a server-side cursor instead of buffering the whole result.
+        result = db.execute(stmt.execution_options(yield_per=batch_rows))
+        for partition in result.partitions():
+            writer.write_batch(_record_batch([tuple(row) for row in partition], schema))
+            db.expunge_all()
+            yield from sink.drain(EXPORT_CHUNK_BYTES)
+    writer.close()
+    yield from sink.drain(0)
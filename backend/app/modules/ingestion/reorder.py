@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.schemas.events import CanonicalEvent
+
+
+IngestResult = tuple[str, bool, list[str]]
+ApplyFn = Callable[[str, str, CanonicalEvent], Awaitable[IngestResult]]
+LastSequenceFn = Callable[[str], Awaitable[int | None]]
+
+
+@dataclass
+class ReorderMetrics:
+    in_order: int = 0
+    reordered: int = 0
+    late: int = 0
+    dropped: int = 0
+    gap_timeouts: int = 0
+    window_overflows: int = 0
+
+
+@dataclass
+class HeldEvent:
+    idempotency_key: str
+    event: CanonicalEvent
+    future: asyncio.Future[IngestResult]
+    held_at: float
+    # Requests awaiting `future`: the original and any retries of it.
+    waiters: int = 1
+
+
+@dataclass
+class RunWindow:
+    next_sequence: int | None
+    held: dict[int, HeldEvent] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    timer: asyncio.TimerHandle | None = None
+
+
+class ReorderBuffer:
+    """Per-run reorder window in front of ingest so concurrent emitters need not send serially.
+
+    Events are applied in `sequence_no` order. One that arrives ahead of the next expected
+    number is held, and its request waits, until the gap fills. A gap is skipped once its
+    oldest held event has waited `timeout_ms` or the run holds more than `window` events.
+    An event that arrives after its gap was skipped is late and meets the usual CONFLICT.
+    State lives on the event loop of this process, so a run's requests must reach the same process.
+
+    Released events are applied through the releasing request's `apply`, or through the
+    buffer's own `apply` when a timer releases them, never through the request that sent them:
+    it may be gone by then, with its session. A held event whose requests all went away is
+    dropped instead of applied; the client's retry submits it again.
+    """
+
+    def __init__(
+        self,
+        apply: ApplyFn,
+        window: int = 256,
+        timeout_ms: int = 2000,
+        max_runs: int = 10000,
+    ) -> None:
+        self.apply = apply
+        self.window = max(window, 1)
+        self.timeout = max(timeout_ms, 1) / 1000
+        self.max_runs = max(max_runs, 1)
+        self.metrics = ReorderMetrics()
+        self._runs: OrderedDict[str, RunWindow] = OrderedDict()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "window": self.window,
+            "timeout_ms": int(self.timeout * 1000),
+            "runs_tracked": len(self._runs),
+            "held_events": sum(len(window.held) for window in self._runs.values()),
+            **asdict(self.metrics),
+        }
+
+    async def submit(
+        self,
+        run_id: str,
+        idempotency_key: str,
+        event: CanonicalEvent,
+        apply: ApplyFn,
+        last_sequence: LastSequenceFn,
+    ) -> IngestResult:
+        """Ingest `event` through `apply` once every lower sequence_no is applied or skipped."""
+        window = await self._window(run_id, last_sequence)
+        async with window.lock:
+            sequence_no = event.sequence_no
+            if window.next_sequence is None and event.event_type == "run_started":
+                window.next_sequence = sequence_no
+            if window.next_sequence is not None and sequence_no < window.next_sequence:
+                return await self._apply_late(run_id, idempotency_key, event, apply)
+            if sequence_no == window.next_sequence:
+                self.metrics.in_order += 1
+                try:
+                    return await apply(run_id, idempotency_key, event)
+                finally:
+                    window.next_sequence = sequence_no + 1
+                    await self._drain(run_id, window, apply)
+            future = self._hold(run_id, window, idempotency_key, event)
+            if len(window.held) > self.window:
+                self.metrics.window_overflows += 1
+                await self._skip_gap(run_id, window, apply)
+        try:
+            # Shielded: a retry may wait on the same future after this request is cancelled.
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self._abandon(window, event.sequence_no, future)
+            raise
+
+    async def _window(self, run_id: str, last_sequence: LastSequenceFn) -> RunWindow:
+        window = self._runs.get(run_id)
+        if window is not None:
+            self._runs.move_to_end(run_id)
+            return window
+        last = await last_sequence(run_id)
+        # Another request may have loaded the run while this one awaited the database.
+        window = self._runs.get(run_id)
+        if window is None:
+            window = self._runs[run_id] = RunWindow(
+                next_sequence=None if last is None else last + 1
+            )
+            self._evict_idle()
+        return window
+
+    def _evict_idle(self) -> None:
+        for run_id in list(self._runs):
+            if len(self._runs) <= self.max_runs:
+                return
+            window = self._runs[run_id]
+            if not window.held and not window.lock.locked():
+                del self._runs[run_id]
+
+    async def _apply_late(
+        self,
+        run_id: str,
+        idempotency_key: str,
+        event: CanonicalEvent,
+        apply: ApplyFn,
+    ) -> IngestResult:
+        # Retries of already-applied events land here too; ingest answers those idempotently.
+        try:
+            return await apply(run_id, idempotency_key, event)
+        except EventValidationError as exc:
+            if exc.code == "CONFLICT":
+                self.metrics.late += 1
+                self.metrics.dropped += 1
+            raise
+
+    def _hold(
+        self,
+        run_id: str,
+        window: RunWindow,
+        idempotency_key: str,
+        event: CanonicalEvent,
+    ) -> asyncio.Future[IngestResult]:
+        existing = window.held.get(event.sequence_no)
+        if existing is not None and existing.future.cancelled():
+            # Its requests went away; the new one takes the slot over.
+            del window.held[event.sequence_no]
+            existing = None
+        if existing is not None:
+            if existing.idempotency_key == idempotency_key:
+                # A retry of an event that is still held waits on the original.
+                existing.waiters += 1
+                return existing.future
+            raise EventValidationError(
+                "CONFLICT",
+                "Event sequence_no must be monotonic and unique",
+                {"received": event.sequence_no, "held": True},
+            )
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[IngestResult] = loop.create_future()
+        window.held[event.sequence_no] = HeldEvent(idempotency_key, event, future, time.monotonic())
+        if window.timer is None:
+            window.timer = loop.call_later(self.timeout, self._on_timer, run_id)
+        return future
+
+    def _abandon(
+        self, window: RunWindow, sequence_no: int, future: asyncio.Future[IngestResult]
+    ) -> None:
+        entry = window.held.get(sequence_no)
+        if entry is None or entry.future is not future:
+            return
+        entry.waiters -= 1
+        if entry.waiters == 0:
+            future.cancel()
+
+    def _on_timer(self, run_id: str) -> None:
+        window = self._runs.get(run_id)
+        if window is not None:
+            window.timer = None
+            asyncio.get_running_loop().create_task(self._expire(run_id, window))
+
+    async def _expire(self, run_id: str, window: RunWindow) -> None:
+        async with window.lock:
+            if not window.held:
+                return
+            oldest = min(entry.held_at for entry in window.held.values())
+            if time.monotonic() - oldest >= self.timeout:
+                self.metrics.gap_timeouts += 1
+                await self._skip_gap(run_id, window, self.apply)
+            if window.held and window.timer is None:
+                oldest = min(entry.held_at for entry in window.held.values())
+                delay = max(self.timeout - (time.monotonic() - oldest), 0)
+                window.timer = asyncio.get_running_loop().call_later(delay, self._on_timer, run_id)
+
+    async def _skip_gap(self, run_id: str, window: RunWindow, apply: ApplyFn) -> None:
+        lowest = min(window.held)
+        if window.next_sequence is None or lowest > window.next_sequence:
+            window.next_sequence = lowest
+        await self._drain(run_id, window, apply, skipped=True)
+
+    async def _drain(
+        self, run_id: str, window: RunWindow, apply: ApplyFn, skipped: bool = False
+    ) -> None:
+        # Held events below the next expected number can no longer apply
+        # (e.g. they precede run_started).
+        for sequence_no in [number for number in window.held if number < window.next_sequence]:
+            entry = window.held.pop(sequence_no)
+            self.metrics.dropped += 1
+            if entry.future.cancelled():
+                continue
+            entry.future.set_exception(
+                EventValidationError(
+                    "CONFLICT",
+                    "Event sequence_no must be monotonic and unique",
+                    {"next_sequence_no": window.next_sequence, "received": sequence_no},
+                )
+            )
+        while window.next_sequence in window.held:
+            sequence_no = window.next_sequence
+            entry = window.held.pop(sequence_no)
+            if entry.future.cancelled():
+                self.metrics.dropped += 1
+                if not skipped:
+                    # Leave the gap open for the client's retry of this event.
+                    break
+                window.next_sequence = sequence_no + 1
+                continue
+            window.next_sequence = sequence_no + 1
+            try:
+                result = await apply(run_id, entry.idempotency_key, entry.event)
+            except Exception as exc:  # noqa: BLE001 - handed to the waiting request
+                if skipped:
+                    self.metrics.dropped += 1
+                entry.future.set_exception(exc)
+            else:
+                self.metrics.reordered += 1
+                entry.future.set_result(result)
+        if not window.held and window.timer is not None:
+            window.timer.cancel()
+            window.timer = None
@@ -1,16 +1,43 @@
 from __future__ import annotations
 
-import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from backend.app.db.models import Artifact, Event, EventArtifact, Run, Step
+from backend.app.config import settings
+from backend.app.db.models import (
+    Artifact,
+    Event,
+    EventArtifact,
+    Run,
+    RunSnapshot,
+    Step,
+    idempotency_key_hash,
+    new_id,
+)
+from backend.app.modules.analytics.service import counts_toward_usage, record_usage, usage_sample
 from backend.app.modules.ingestion.validation import EventValidationError, validate_event
+from backend.app.modules.query.service import event_to_dict, run_status_dict
 from backend.app.schemas.api import CreateRunRequest, FinalizeRunRequest
-from backend.app.schemas.events import CanonicalEvent
-from backend.app.services.idempotency import find_existing_event_by_idempotency
+from backend.app.schemas.events import CanonicalEvent, ValidationResult
+from backend.app.services.artifact_store import get_artifact_store
+from backend.app.services.bulk import insert_ignore
+from backend.app.services.idempotency import (
+    find_existing_event_by_idempotency,
+    insert_event_if_new,
+    recent_keys,
+)
+from backend.app.services.payload_refs import (
+    PAYLOAD_ARTIFACT_TYPE,
+    PAYLOAD_MIME_TYPE,
+    split_payload,
+)
+from backend.app.services.pubsub import broker, run_topic
+from backend.app.services.run_stats import init_run_stats, record_run_events
 
 
 def _now() -> datetime:
@@ -19,8 +46,8 @@ def _now() -> datetime:
 
 def create_run(db: Session, request: CreateRunRequest) -> Run:
     run = Run(
-        run_id=str(uuid.uuid4()),
-        trace_id=str(uuid.uuid4()),
+        run_id=new_id(),
+        trace_id=new_id(),
         app_id=request.app_id,
         environment=request.environment,
         status="running",
@@ -29,6 +56,8 @@ def create_run(db: Session, request: CreateRunRequest) -> Run:
         retention_class=request.retention_class,
     )
     db.add(run)
+    db.flush()
+    init_run_stats(db, run.run_id)
     db.commit()
     db.refresh(run)
     return run
@@ -41,6 +70,18 @@ def get_run_or_error(db: Session, run_id: str) -> Run:
     return run
 
 
+def last_sequence_no(db: Session, run_id: str) -> int | None:
+    get_run_or_error(db, run_id)
+    value = db.execute(
+        select(func.max(Event.sequence_no)).where(Event.run_id == run_id)
+    ).scalar_one()
+    if value is None:
+        snapshot = db.get(RunSnapshot, run_id)
+        if snapshot is not None and snapshot.event_count:
+            return snapshot.last_sequence_no
+    return value
+
+
 def _upsert_step(db: Session, event: CanonicalEvent) -> Step:
     step = db.execute(select(Step).where(Step.step_id == event.step_id)).scalar_one_or_none()
     if step is None:
@@ -62,32 +103,144 @@ def _upsert_step(db: Session, event: CanonicalEvent) -> Step:
     return step
 
 
-def ingest_event(db: Session, run: Run, idempotency_key: str, event: CanonicalEvent) -> tuple[Event, bool, list[str]]:
-    existing = find_existing_event_by_idempotency(db, idempotency_key)
+@dataclass(frozen=True, slots=True)
+class StoredPayload:
+    """An event payload whose oversized fields are already written to the artifact store."""
+
+    payload: dict[str, Any]
+    # Artifact rows for the offloaded fields, still without the run's retention class.
+    artifacts: tuple[dict[str, Any], ...] = ()
+
+
+def store_payload(event: CanonicalEvent) -> StoredPayload:
+    """Split oversized fields off the event payload and write them to the artifact store.
+
+    This is blocking I/O without database access, so async handlers run it on the threadpool
+    before the database step. Blobs are content-addressed, so storing again on a retry is harmless.
+    """
+    payload, offloaded = split_payload(event.payload, settings.event_payload_offload_bytes)
+    if not offloaded:
+        return StoredPayload(payload)
+    store = get_artifact_store()
+    rows = []
+    for artifact_hash, content in offloaded.items():
+        stored = store.store(artifact_hash, content)
+        rows.append(
+            {
+                "artifact_hash": artifact_hash,
+                "artifact_type": PAYLOAD_ARTIFACT_TYPE,
+                "byte_size": len(content),
+                "mime_type": PAYLOAD_MIME_TYPE,
+                "storage_bucket": stored.bucket,
+                "storage_object_key": stored.object_key,
+                "status": "ready",
+            }
+        )
+    return StoredPayload(payload, tuple(rows))
+
+
+def register_offloaded_fields(db: Session, run: Run, stored_payload: StoredPayload) -> None:
+    """Add artifact rows for the stored fields; existing rows (same content) are kept."""
+    rows = [{**row, "retention_class": run.retention_class} for row in stored_payload.artifacts]
+    insert_ignore(db, Artifact.__table__, rows)
+
+
+def _link_offloaded_fields(
+    db: Session, run: Run, event_id: str, stored_payload: StoredPayload
+) -> int:
+    """Register the offloaded payload fields as artifacts and link them to the event."""
+    if not stored_payload.artifacts:
+        return 0
+    for row in stored_payload.artifacts:
+        # The link keeps retention from collecting the artifact while the event still points at it.
+        db.add(
+            EventArtifact(
+                event_id=event_id,
+                artifact_hash=row["artifact_hash"],
+                reference_role=PAYLOAD_ARTIFACT_TYPE,
+            )
+        )
+    register_offloaded_fields(db, run, stored_payload)
+    return sum(row["byte_size"] for row in stored_payload.artifacts)
+
+
+def find_duplicate_or_validate(
+    db: Session,
+    run: Run,
+    idempotency_key: str,
+    event: CanonicalEvent,
+    pending: Sequence[CanonicalEvent] = (),
+) -> tuple[Event | None, ValidationResult | None]:
+    """Return the stored event for a retried key, or validate `event` as a new one.
+
+    Keys missing from `recent_keys` skip the lookup. A retry of an event stored before this
+    process saw its key then fails validation on its taken sequence_no, and is looked up there.
+    """
+    looked_up = recent_keys.might_contain(idempotency_key_hash(idempotency_key))
+    if looked_up:
+        existing = find_existing_event_by_idempotency(db, idempotency_key)
+        if existing is not None:
+            return existing, None
+    try:
+        return None, validate_event(db, run, event, pending)
+    except EventValidationError:
+        existing = None if looked_up else find_existing_event_by_idempotency(db, idempotency_key)
+        if existing is None:
+            raise
+        return existing, None
+
+
+def apply_event(
+    db: Session,
+    run: Run,
+    idempotency_key: str,
+    event: CanonicalEvent,
+    event_id: str | None = None,
+    stored_payload: StoredPayload | None = None,
+) -> tuple[Event, bool, list[str]]:
+    """Validate and stage one event with its step, artifacts and counters, without committing.
+
+    Without `stored_payload`, oversized payload fields are written to the artifact store here.
+    """
+    existing, validation = find_duplicate_or_validate(db, run, idempotency_key, event)
     if existing is not None:
         return existing, False, []
 
-    validation = validate_event(db, run, event)
-    _upsert_step(db, event)
-
-    db_event = Event(
-        run_id=event.run_id,
-        step_id=event.step_id,
-        parent_step_id=event.parent_step_id,
-        event_type=event.event_type,
-        schema_version=event.schema_version,
-        payload_json=event.payload,
-        redaction_status=event.redaction_status,
-        idempotency_key=idempotency_key,
-        sequence_no=event.sequence_no,
-        timestamp_utc=event.timestamp_utc,
-        actor_type=event.actor_type,
-        determinism_mode=event.determinism_mode,
-        artifact_pending=False,
+    step = _upsert_step(db, event)
+    if step in db.new:
+        # The event row references the step, so a new step must reach the database first.
+        db.flush()
+
+    if stored_payload is None:
+        stored_payload = store_payload(event)
+    key_hash = idempotency_key_hash(idempotency_key)
+    db_event = insert_event_if_new(
+        db,
+        {
+            "event_id": event_id or new_id(),
+            "run_id": event.run_id,
+            "step_id": event.step_id,
+            "parent_step_id": event.parent_step_id,
+            "event_type": event.event_type,
+            "schema_version": event.schema_version,
+            "payload_json": stored_payload.payload,
+            "redaction_status": event.redaction_status,
+            "idempotency_key": idempotency_key,
+            "idempotency_hash": key_hash,
+            "sequence_no": event.sequence_no,
+            "timestamp_utc": event.timestamp_utc,
+            "actor_type": event.actor_type,
+            "determinism_mode": event.determinism_mode,
+            "artifact_pending": False,
+        },
     )
-    db.add(db_event)
-    db.flush()
+    if db_event is None:
+        # A concurrent request stored the same key after validation; the step update above
+        # repeats what that request wrote, so answering with its event is safe.
+        return find_existing_event_by_idempotency(db, idempotency_key), False, []
+    recent_keys.add(key_hash)
 
+    artifact_bytes = _link_offloaded_fields(db, run, db_event.event_id, stored_payload)
     for ref in event.artifact_refs:
         artifact = db.execute(
             select(Artifact).where(Artifact.artifact_hash == ref.artifact_hash)
@@ -106,6 +259,7 @@ def ingest_event(db: Session, run: Run, idempotency_key: str, event: CanonicalEv
             )
             db.add(artifact)
             db_event.artifact_pending = True
+        artifact_bytes += artifact.byte_size
 
         db.add(
             EventArtifact(
@@ -119,9 +273,49 @@ def ingest_event(db: Session, run: Run, idempotency_key: str, event: CanonicalEv
         run.status = "success" if event.event_type == "run_completed" else "failed"
         run.ended_at_utc = _now()
 
+    sample = usage_sample(event.event_type, event.payload, event.timestamp_utc)
+    if sample is not None and counts_toward_usage(run):
+        record_usage(db, run.app_id, run.environment, [sample])
+    record_run_events(
+        db,
+        run.run_id,
+        {event.event_type: 1},
+        {event.determinism_mode: 1},
+        event.sequence_no,
+        artifact_bytes,
+    )
+    return db_event, True, validation.warnings
+
+
+def publish_event(run: Run, event_dict: dict[str, object]) -> None:
+    topic = run_topic(run.run_id)
+    if broker.has_subscribers(topic):
+        broker.publish(topic, "trace_event", event_dict)
+        if event_dict["event_type"] in {"run_completed", "run_failed"}:
+            broker.publish(topic, "run_status", run_status_dict(run))
+
+
+def ingest_event(
+    db: Session,
+    run: Run,
+    idempotency_key: str,
+    event: CanonicalEvent,
+    stored_payload: StoredPayload | None = None,
+) -> tuple[Event, bool, list[str]]:
+    if stored_payload is not None and stored_payload.artifacts:
+        # Committed before validation: the blobs of an event rejected below are then
+        # unreferenced artifacts, which retention collects like any other.
+        register_offloaded_fields(db, run, stored_payload)
+        db.commit()
+    db_event, accepted, warnings = apply_event(
+        db, run, idempotency_key, event, stored_payload=stored_payload
+    )
+    if not accepted:
+        return db_event, False, []
     db.commit()
     db.refresh(db_event)
-    return db_event, True, validation.warnings
+    publish_event(run, event_to_dict(db_event))
+    return db_event, True, warnings
 
 
 def finalize_run(db: Session, run: Run, request: FinalizeRunRequest) -> Run:
@@ -136,4 +330,7 @@ def finalize_run(db: Session, run: Run, request: FinalizeRunRequest) -> Run:
     run.ended_at_utc = _now()
     db.commit()
     db.refresh(run)
+    topic = run_topic(run.run_id)
+    if broker.has_subscribers(topic):
+        broker.publish(topic, "run_status", run_status_dict(run))
     return run
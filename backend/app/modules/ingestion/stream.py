@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from backend.app.db.models import Run
+from backend.app.modules.artifacts.service import ArtifactService
+from backend.app.modules.ingestion.service import apply_event, get_run_or_error, publish_event
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.modules.ingestion.wal import IngestWal
+from backend.app.modules.query.service import event_to_dict
+from backend.app.schemas.api import IngestEventResponse, RegisterArtifactResponse, StreamIngestLine
+from backend.app.services.pubsub import broker, run_topic
+
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def _ack(line_no: int, data: dict[str, Any]) -> dict[str, Any]:
+    return {"line": line_no, "status": "success", "data": data, "error": None}
+
+
+def _error_ack(
+    line_no: int,
+    code: str,
+    message: str,
+    details: dict[str, Any] | None = None,
+    retryable: bool = False,
+) -> dict[str, Any]:
+    error = {"code": code, "message": message, "details": details or {}, "retryable": retryable}
+    return {"line": line_no, "status": "error", "data": None, "error": error}
+
+
+class NdjsonSplitter:
+    """Splits a chunked body into lines; a line longer than `max_line_bytes` comes out as None."""
+
+    def __init__(self, max_line_bytes: int) -> None:
+        self.max_line_bytes = max_line_bytes
+        self._buffer = bytearray()
+        self._skipping = False
+
+    def feed(self, chunk: bytes) -> list[bytes | None]:
+        self._buffer += chunk
+        lines: list[bytes | None] = []
+        start = 0
+        while (end := self._buffer.find(b"\n", start)) >= 0:
+            if self._skipping:
+                # Tail of an over-long line that was already reported.
+                self._skipping = False
+            elif end - start > self.max_line_bytes:
+                lines.append(None)
+            else:
+                lines.append(bytes(self._buffer[start:end]))
+            start = end + 1
+        del self._buffer[:start]
+        if len(self._buffer) > self.max_line_bytes:
+            if not self._skipping:
+                lines.append(None)
+                self._skipping = True
+            self._buffer.clear()
+        return lines
+
+    def close(self) -> list[bytes | None]:
+        tail = bytes(self._buffer)
+        self._buffer.clear()
+        return [tail] if tail.strip() and not self._skipping else []
+
+
+class StreamIngestor:
+    """Applies the lines of one streaming ingest request over a single session.
+
+    Consecutive event lines are staged together and committed once. A batch that hits a
+    database error is retried line by line, so one bad line only fails its own ack.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        artifact_service: ArtifactService,
+        wal: IngestWal | None = None,
+    ) -> None:
+        self.db = session_factory()
+        self.artifact_service = artifact_service
+        self.wal = wal
+        self._runs: dict[str, Run] = {}
+
+    def close(self) -> None:
+        self.db.close()
+
+    def process(self, lines: list[tuple[int, bytes | None]]) -> list[dict[str, Any]]:
+        acks: list[dict[str, Any]] = []
+        events: list[tuple[int, StreamIngestLine]] = []
+        for line_no, raw in lines:
+            if raw is None:
+                acks.append(
+                    _error_ack(
+                        line_no, "VALIDATION_ERROR", "Line exceeds INGEST_STREAM_MAX_LINE_BYTES"
+                    )
+                )
+                continue
+            if not raw.strip():
+                continue
+            try:
+                item = self._parse(raw)
+            except EventValidationError as exc:
+                acks.append(_error_ack(line_no, exc.code, str(exc), exc.details))
+                continue
+            if item.kind == "event":
+                events.append((line_no, item))
+                continue
+            # Artifact registration commits on its own; land the events staged before it first.
+            acks.extend(self._ingest_events(events))
+            events = []
+            acks.append(self._register_artifact(line_no, item))
+        acks.extend(self._ingest_events(events))
+        acks.sort(key=lambda ack: ack["line"])
+        return acks
+
+    def _parse(self, raw: bytes) -> StreamIngestLine:
+        try:
+            item = StreamIngestLine.model_validate_json(raw)
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False, include_context=False, include_input=False)
+            raise EventValidationError(
+                "VALIDATION_ERROR", "Malformed stream line", {"errors": errors}
+            ) from exc
+        if item.kind == "event" and (item.event is None or not item.idempotency_key):
+            raise EventValidationError(
+                "VALIDATION_ERROR", "Event lines require idempotency_key and event", {}
+            )
+        if item.kind == "artifact" and item.artifact is None:
+            raise EventValidationError("VALIDATION_ERROR", "Artifact lines require artifact", {})
+        return item
+
+    def _run(self, run_id: str) -> Run:
+        run = self._runs.get(run_id)
+        if run is None:
+            run = self._runs[run_id] = get_run_or_error(self.db, run_id)
+        return run
+
+    def _ingest_events(self, batch: list[tuple[int, StreamIngestLine]]) -> list[dict[str, Any]]:
+        if not batch:
+            return []
+        if self.wal is not None:
+            return [self._log_event(line_no, item) for line_no, item in batch]
+        try:
+            return self._apply(batch)
+        except SQLAlchemyError as exc:
+            self.db.rollback()
+            self._runs.clear()
+            if len(batch) == 1:
+                line_no = batch[0][0]
+                if isinstance(exc, IntegrityError):
+                    return [_error_ack(line_no, "CONFLICT", str(exc.orig))]
+                return [
+                    _error_ack(line_no, "DEPENDENCY_UNAVAILABLE", "Database error", retryable=True)
+                ]
+            acks: list[dict[str, Any]] = []
+            for entry in batch:
+                acks.extend(self._ingest_events([entry]))
+            return acks
+
+    def _apply(self, batch: list[tuple[int, StreamIngestLine]]) -> list[dict[str, Any]]:
+        acks: list[dict[str, Any]] = []
+        published: list[tuple[Run, dict[str, Any]]] = []
+        for line_no, item in batch:
+            try:
+                run = self._run(item.event.run_id)
+                db_event, accepted, warnings = apply_event(
+                    self.db, run, item.idempotency_key, item.event
+                )
+            except EventValidationError as exc:
+                # Validation fails before anything is staged,
+                # so the rest of the batch is unaffected.
+                acks.append(_error_ack(line_no, exc.code, str(exc), exc.details))
+                continue
+            if accepted and broker.has_subscribers(run_topic(run.run_id)):
+                published.append((run, event_to_dict(db_event)))
+            payload = IngestEventResponse(
+                event_id=db_event.event_id, accepted=accepted, validation_warnings=warnings
+            )
+            acks.append(_ack(line_no, payload.model_dump(mode="json")))
+        self.db.commit()
+        for run, event_dict in published:
+            publish_event(run, event_dict)
+        return acks
+
+    def _log_event(self, line_no: int, item: StreamIngestLine) -> dict[str, Any]:
+        try:
+            event_id, accepted, warnings = self.wal.ingest(
+                item.event.run_id, item.idempotency_key, item.event
+            )
+        except EventValidationError as exc:
+            return _error_ack(line_no, exc.code, str(exc), exc.details)
+        payload = IngestEventResponse(
+            event_id=event_id, accepted=accepted, validation_warnings=warnings
+        )
+        return _ack(line_no, payload.model_dump(mode="json"))
+
+    def _register_artifact(self, line_no: int, item: StreamIngestLine) -> dict[str, Any]:
+        try:
+            response = self.artifact_service.register_artifact(self.db, item.artifact)
+        except EventValidationError as exc:
+            self.db.rollback()
+            return _error_ack(line_no, exc.code, str(exc), exc.details)
+        return _ack(line_no, RegisterArtifactResponse(**response).model_dump(mode="json"))
+
+
+async def iter_stream_acks(
+    chunks: AsyncIterator[bytes],
+    ingestor: StreamIngestor,
+    max_line_bytes: int,
+    batch_lines: int,
+) -> AsyncIterator[bytes]:
+    """Ingest NDJSON lines as they arrive and yield one ack line per input line, in order."""
+    splitter = NdjsonSplitter(max_line_bytes)
+    line_no = 0
+    try:
+        pending: list[tuple[int, bytes | None]] = []
+        async for chunk in chunks:
+            for raw in splitter.feed(chunk):
+                line_no += 1
+                pending.append((line_no, raw))
+            # Everything received so far goes to the database in one threadpool hop.
+            while pending:
+                batch, pending = pending[:batch_lines], pending[batch_lines:]
+                acks = await run_in_threadpool(ingestor.process, batch)
+                if acks:
+                    yield "".join(json.dumps(ack) + "\n" for ack in acks).encode("utf-8")
+        tail = [(line_no + 1, raw) for raw in splitter.close()]
+        if tail:
+            acks = await run_in_threadpool(ingestor.process, tail)
+            yield "".join(json.dumps(ack) + "\n" for ack in acks).encode("utf-8")
+    finally:
+        await run_in_threadpool(ingestor.close)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """Streams the response while the handler is still reading the request body.
+
+    Before ASGI spec 2.4, StreamingResponse watches `receive` for a disconnect while it sends,
+    which would swallow request body chunks. Here the body reader sees the disconnect instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
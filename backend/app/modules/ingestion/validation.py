@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from backend.app.db.models import Event, Run
+from backend.app.db.models import Event, Run, RunSnapshot
 from backend.app.schemas.events import EVENT_TYPES, REQUIRED_PAYLOAD_FIELDS, CanonicalEvent, ValidationResult
 
 
@@ -17,7 +19,24 @@ class EventValidationError(ValueError):
         self.details = details or {}
 
 
-def validate_event(db: Session, run: Run, event: CanonicalEvent) -> ValidationResult:
+def _has_prior_call(
+    pending: Sequence[CanonicalEvent], event: CanonicalEvent, call_type: str
+) -> bool:
+    return any(
+        item.event_type == call_type
+        and item.step_id == event.step_id
+        and item.sequence_no < event.sequence_no
+        for item in pending
+    )
+
+
+def validate_event(
+    db: Session,
+    run: Run,
+    event: CanonicalEvent,
+    pending: Sequence[CanonicalEvent] = (),
+) -> ValidationResult:
+    """Check an event against the run's stored events plus `pending` ones not yet in the DB."""
     if event.event_type not in EVENT_TYPES:
         raise EventValidationError(
             "VALIDATION_ERROR",
@@ -46,7 +65,13 @@ def validate_event(db: Session, run: Run, event: CanonicalEvent) -> ValidationRe
     max_sequence = db.execute(
         select(func.max(Event.sequence_no)).where(Event.run_id == run.run_id)
     ).scalar_one()
+    if pending:
+        pending_max = max(item.sequence_no for item in pending)
+        max_sequence = pending_max if max_sequence is None else max(max_sequence, pending_max)
     if max_sequence is None:
+        # A sealed run has no event rows left, but it is terminal; nothing may be appended.
+        if db.get(RunSnapshot, run.run_id) is not None:
+            raise EventValidationError("CONFLICT", "Run is sealed", {"run_id": run.run_id})
         if event.event_type != "run_started":
             raise EventValidationError(
                 "VALIDATION_ERROR",
@@ -61,7 +86,7 @@ def validate_event(db: Session, run: Run, event: CanonicalEvent) -> ValidationRe
                 {"max_sequence_no": max_sequence, "received": event.sequence_no},
             )
 
-        has_terminal = db.execute(
+        has_terminal = any(item.event_type in TERMINAL_TYPES for item in pending) or db.execute(
             select(func.count())
             .select_from(Event)
             .where(Event.run_id == run.run_id, Event.event_type.in_(TERMINAL_TYPES))
@@ -84,7 +109,7 @@ def validate_event(db: Session, run: Run, event: CanonicalEvent) -> ValidationRe
                 Event.sequence_no < event.sequence_no,
             )
         ).scalar_one()
-        if model_call_exists == 0:
+        if model_call_exists == 0 and not _has_prior_call(pending, event, "model_called"):
             raise EventValidationError(
                 "VALIDATION_ERROR",
                 "model_result requires prior model_called in the same step",
@@ -102,7 +127,7 @@ def validate_event(db: Session, run: Run, event: CanonicalEvent) -> ValidationRe
                 Event.sequence_no < event.sequence_no,
             )
         ).scalar_one()
-        if tool_call_exists == 0:
+        if tool_call_exists == 0 and not _has_prior_call(pending, event, "tool_called"):
             raise EventValidationError(
                 "VALIDATION_ERROR",
                 "tool_result requires prior tool_called in the same step",
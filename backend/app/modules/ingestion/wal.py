@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.db.models import Run, new_id
+from backend.app.modules.ingestion.service import (
+    apply_event,
+    find_duplicate_or_validate,
+    get_run_or_error,
+    publish_event,
+)
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.modules.query.service import event_to_dict
+from backend.app.schemas.events import CanonicalEvent
+
+
+logger = logging.getLogger(__name__)
+
+LOG_NAME = "ingest.log"
+CHECKPOINT_NAME = "ingest.checkpoint"
+REJECTED_NAME = "rejected.ndjson"
+# Committed log prefixes are truncated away once the file grows past this and fully drains.
+ROTATE_BYTES = 64 * 1024 * 1024
+RUN_LOCK_STRIPES = 64
+# Records the committer sets aside instead of applying; the rest of their batch still commits.
+REJECTABLE_ERRORS = (EventValidationError, IntegrityError)
+# Upper bound for the committer's pause between failed attempts; the pause doubles from one
+# commit interval.
+MAX_RETRY_SECONDS = 5.0
+
+
+class IngestLogFile:
+    """Append-only event log with group commit: concurrent appenders share one write and fsync."""
+
+    def __init__(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / LOG_NAME
+        self.checkpoint_path = directory / CHECKPOINT_NAME
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition(self._lock)
+        self._pending: list[bytes] = []
+        self._end = os.fstat(self._fd).st_size
+        self._durable = self._end
+        self._flushing = False
+        self._error: OSError | None = None
+
+    @property
+    def durable_offset(self) -> int:
+        return self._durable
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def append(self, record: dict[str, Any]) -> int:
+        """Queue a record and return its end offset; it is durable once `wait_durable` returns."""
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            self._pending.append(line)
+            self._end += len(line)
+            return self._end
+
+    def wait_durable(self, offset: int) -> None:
+        with self._lock:
+            while self._durable < offset:
+                if self._error is not None:
+                    # The log's tail is unknown after a failed write; recovery on restart trims it.
+                    raise self._error
+                if self._flushing:
+                    self._flushed.wait()
+                    continue
+                # Leader: write and fsync everything queued so far,
+                # including other callers' records.
+                self._flushing = True
+                batch, self._pending = self._pending, []
+                target = self._end
+                self._lock.release()
+                try:
+                    os.write(self._fd, b"".join(batch))
+                    os.fsync(self._fd)
+                except OSError as exc:
+                    self._error = exc
+                else:
+                    self._durable = target
+                finally:
+                    self._lock.acquire()
+                    self._flushing = False
+                    self._flushed.notify_all()
+
+    def read_checkpoint(self) -> int:
+        try:
+            return int(self.checkpoint_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def write_checkpoint(self, offset: int) -> None:
+        # Not fsynced: a stale checkpoint only re-applies records,
+        # which idempotency keys make harmless.
+        temp = self.checkpoint_path.with_suffix(".tmp")
+        temp.write_text(str(offset))
+        os.replace(temp, self.checkpoint_path)
+
+    def read_from(self, offset: int) -> list[tuple[int, dict[str, Any]]]:
+        """Records after `offset` with their end offsets; a torn tail from a crash is cut off."""
+        with self._lock:
+            with self.path.open("rb") as handle:
+                handle.seek(min(offset, self._end))
+                position = handle.tell()
+                records = []
+                for line in handle:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    position += len(line)
+                    records.append((position, record))
+            if position < self._end:
+                os.ftruncate(self._fd, position)
+                self._end = self._durable = position
+        return records
+
+    def truncate_if_drained(self, committed: int) -> bool:
+        with self._lock:
+            if committed < self._end or self._pending or self._end < ROTATE_BYTES:
+                return False
+            # Checkpoint first: a crash in between then replays committed records instead of
+            # skipping new ones.
+            self.write_checkpoint(0)
+            os.ftruncate(self._fd, 0)
+            self._end = self._durable = 0
+            return True
+
+
+@dataclass
+class PendingEvent:
+    event_id: str
+    run_id: str
+    idempotency_key: str
+    event: CanonicalEvent
+    offset: int
+
+
+class IngestWal:
+    """Acknowledge events once durable in a local log; a committer thread batches them into the DB.
+
+    Accepted events stay in an in-flight buffer until committed. Validation of later events and
+    `get_event` read from it, and run-level reads call `wait_committed` to see everything
+    acknowledged.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        session_factory: Callable[[], Session],
+        commit_batch: int = 1000,
+        commit_interval_ms: int = 50,
+        max_pending: int = 50000,
+    ) -> None:
+        self.directory = Path(directory)
+        self.log = IngestLogFile(self.directory)
+        self.session_factory = session_factory
+        self.commit_batch = max(commit_batch, 1)
+        self.commit_interval = max(commit_interval_ms, 1) / 1000
+        self.max_pending = max(max_pending, 1)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pending: OrderedDict[str, PendingEvent] = OrderedDict()
+        self._by_run: dict[str, list[PendingEvent]] = {}
+        self._by_key: dict[str, PendingEvent] = {}
+        self._run_locks = [threading.Lock() for _ in range(RUN_LOCK_STRIPES)]
+        self._flush_requested = False
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Recover unapplied records from the log, then start the committer."""
+        records = self.log.read_from(self.log.read_checkpoint())
+        with self._lock:
+            for offset, record in records:
+                self._add(
+                    PendingEvent(
+                        event_id=record["event_id"],
+                        run_id=record["run_id"],
+                        idempotency_key=record["idempotency_key"],
+                        event=CanonicalEvent.model_validate(record["event"]),
+                        offset=offset,
+                    )
+                )
+        self._thread = threading.Thread(
+            target=self._commit_loop, name="ingest-wal-committer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopping = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.log.close()
+
+    def _add(self, entry: PendingEvent) -> None:
+        self._pending[entry.event_id] = entry
+        self._by_run.setdefault(entry.run_id, []).append(entry)
+        self._by_key[entry.idempotency_key] = entry
+        self._changed.notify_all()
+
+    def _discard(self, entries: list[PendingEvent]) -> None:
+        for entry in entries:
+            self._pending.pop(entry.event_id, None)
+            self._by_key.pop(entry.idempotency_key, None)
+            run_entries = self._by_run.get(entry.run_id)
+            if run_entries is not None:
+                run_entries.remove(entry)
+                if not run_entries:
+                    del self._by_run[entry.run_id]
+        self._changed.notify_all()
+
+    def _run_lock(self, run_id: str) -> threading.Lock:
+        return self._run_locks[hash(run_id) % RUN_LOCK_STRIPES]
+
+    def ingest(
+        self, run_id: str, idempotency_key: str, event: CanonicalEvent
+    ) -> tuple[str, bool, list[str]]:
+        """Validate, log and acknowledge one event; returns (event_id, accepted, warnings)."""
+        with self._lock:
+            while len(self._pending) >= self.max_pending and not self._stopping:
+                self._flush_requested = True
+                self._changed.notify_all()
+                self._changed.wait()
+
+        # Serializes validation per run so two requests cannot both claim the next sequence_no.
+        with self._run_lock(run_id):
+            with self._lock:
+                duplicate = self._by_key.get(idempotency_key)
+                pending = [entry.event for entry in self._by_run.get(run_id, [])]
+            if duplicate is not None:
+                return duplicate.event_id, False, []
+
+            # Snapshot the buffer before querying:
+            # anything committed since is then visible in the DB.
+            with self.session_factory() as db:
+                run = get_run_or_error(db, run_id)
+                existing, validation = find_duplicate_or_validate(
+                    db, run, idempotency_key, event, pending
+                )
+                if existing is not None:
+                    return existing.event_id, False, []
+
+            entry = PendingEvent(new_id(), run_id, idempotency_key, event, 0)
+            record = {
+                "event_id": entry.event_id,
+                "run_id": run_id,
+                "idempotency_key": idempotency_key,
+                "event": event.model_dump(mode="json"),
+            }
+            # Appending under the buffer lock keeps the buffer in log order, so a committed
+            # prefix of the buffer is always a committed prefix of the log.
+            with self._lock:
+                entry.offset = self.log.append(record)
+                self._add(entry)
+
+        try:
+            self.log.wait_durable(entry.offset)
+        except OSError:
+            with self._lock:
+                self._discard([entry])
+            raise
+        return entry.event_id, True, validation.warnings
+
+    def pending_event(self, event_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._pending.get(event_id)
+        if entry is None:
+            return None
+        event = entry.event
+        return {
+            "event_id": entry.event_id,
+            "run_id": entry.run_id,
+            "step_id": event.step_id,
+            "sequence_no": event.sequence_no,
+            "event_type": event.event_type,
+            "timestamp_utc": event.timestamp_utc,
+            "determinism_mode": event.determinism_mode,
+            "redaction_status": event.redaction_status,
+            "payload": event.payload,
+        }
+
+    def wait_committed(self, run_id: str | None = None, timeout: float | None = None) -> bool:
+        """Block until the run's (or every) acknowledged event is in the DB; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while (self._by_run.get(run_id) if run_id is not None else self._pending):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._flush_requested = True
+                self._changed.notify_all()
+                self._changed.wait(remaining)
+        return True
+
+    def _next_batch(self) -> list[PendingEvent]:
+        deadline = time.monotonic() + self.commit_interval
+        with self._lock:
+            # Gather for up to one interval so commits stay large,
+            # unless a reader or a full batch is waiting.
+            while not (
+                self._flush_requested or self._stopping or len(self._pending) >= self.commit_batch
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            self._flush_requested = False
+            batch = []
+            for entry in self._pending.values():
+                # Only durable records: committing one that a failed fsync
+                # later discards would be unsafe.
+                if entry.offset > self.log.durable_offset or len(batch) >= self.commit_batch:
+                    break
+                batch.append(entry)
+            return batch
+
+    def _commit_loop(self) -> None:
+        delay = self.commit_interval
+        while True:
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._commit(batch)
+                    delay = self.commit_interval
+                    continue
+                except Exception:
+                    # Database or artifact store unavailable, or a bug: the batch stays buffered and
+                    # logged, so keep the thread alive and retry after a growing pause.
+                    logger.exception(
+                        "ingest WAL commit of %d events failed; retrying in %.2fs",
+                        len(batch),
+                        delay,
+                    )
+                    if not self._stopping:
+                        with self._lock:
+                            self._changed.wait_for(lambda: self._stopping, timeout=delay)
+                        delay = min(delay * 2, MAX_RETRY_SECONDS)
+                        continue
+            if self._stopping:
+                # Whatever is left is durable in the log and is recovered on the next start.
+                return
+
+    def _commit(self, batch: list[PendingEvent]) -> None:
+        try:
+            self._apply(batch)
+        except REJECTABLE_ERRORS:
+            # One record no longer applies; commit the rest one at a time and set the rejects aside.
+            for entry in batch:
+                try:
+                    self._apply([entry])
+                except REJECTABLE_ERRORS as exc:
+                    self._reject(entry, exc)
+
+        self.log.write_checkpoint(batch[-1].offset)
+        with self._lock:
+            self._discard(batch)
+        self.log.truncate_if_drained(batch[-1].offset)
+
+    def _apply(self, batch: list[PendingEvent]) -> None:
+        with self.session_factory() as db:
+            runs: dict[str, Run] = {}
+            published: list[tuple[Run, dict[str, Any]]] = []
+            for entry in batch:
+                run = runs.get(entry.run_id)
+                if run is None:
+                    run = runs[entry.run_id] = get_run_or_error(db, entry.run_id)
+                db_event, accepted, _ = apply_event(
+                    db, run, entry.idempotency_key, entry.event, event_id=entry.event_id
+                )
+                if accepted:
+                    published.append((run, event_to_dict(db_event)))
+            db.commit()
+            for run, event_dict in published:
+                publish_event(run, event_dict)
+
+    def _reject(self, entry: PendingEvent, exc: Exception) -> None:
+        record = {
+            "event_id": entry.event_id,
+            "run_id": entry.run_id,
+            "idempotency_key": entry.idempotency_key,
+            "code": getattr(exc, "code", "CONFLICT"),
+            "message": str(getattr(exc, "orig", exc)),
+            "event": entry.event.model_dump(mode="json"),
+        }
+        with (self.directory / REJECTED_NAME).open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record) + "\n")
@@ -1,18 +1,66 @@
 from __future__ import annotations
 
-from collections import Counter
+import base64
+import json
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, select
+from sqlalchemy import LargeBinary, Row, Select, Text, and_, cast, func, select, tuple_
 from sqlalchemy.orm import Session
 
-from backend.app.db.models import Artifact, Event, Run
-from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.db.models import Artifact, Event, Run, RunSnapshot, RunStats
+from backend.app.modules.compaction.service import SealedEvent, find_sealed_event, sealed_events
+from backend.app.modules.ingestion.validation import TERMINAL_TYPES, EventValidationError
+from backend.app.services.run_stats import compute_run_stats, run_stats_dict
 
 
-def list_runs(
-    db: Session,
+def encode_page_token(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_token(page_token: str, size: int) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(page_token + "=" * (-len(page_token) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise EventValidationError(
+            "VALIDATION_ERROR", "Invalid page_token", {"page_token": page_token}
+        )
+    return values
+
+
+def encode_run_page_token(run: Run | Row[Any]) -> str:
+    return encode_page_token(run.started_at_utc.isoformat(), run.run_id)
+
+
+def decode_run_page_token(page_token: str) -> tuple[datetime, str]:
+    started_at, run_id = decode_page_token(page_token, 2)
+    try:
+        return datetime.fromisoformat(started_at), str(run_id)
+    except (ValueError, TypeError):
+        raise EventValidationError(
+            "VALIDATION_ERROR", "Invalid page_token", {"page_token": page_token}
+        ) from None
+
+
+# The RunSummary fields, in response order; list pages select only these.
+RUN_SUMMARY_COLUMNS = (
+    Run.run_id,
+    Run.trace_id,
+    Run.app_id,
+    Run.environment,
+    Run.status,
+    Run.source_type,
+    Run.source_run_id,
+    Run.started_at_utc,
+    Run.ended_at_utc,
+    Run.retention_class,
+)
+
+
+def list_runs_query(
     app_id: str | None = None,
     environment: str | None = None,
     status: str | None = None,
@@ -21,8 +69,7 @@ def list_runs(
     source_type: str | None = None,
     page_size: int = 50,
     page_token: str | None = None,
-) -> tuple[list[Run], str | None]:
-    stmt = select(Run)
+) -> Select[Any]:
     filters = []
 
     if app_id:
@@ -38,31 +85,103 @@ def list_runs(
     if to_utc:
         filters.append(Run.started_at_utc <= to_utc)
     if page_token:
-        filters.append(Run.started_at_utc < datetime.fromisoformat(page_token))
+        # run_id breaks ties between runs started in the same instant,
+        # so pages never skip or repeat.
+        filters.append(
+            tuple_(Run.started_at_utc, Run.run_id) < tuple_(*decode_run_page_token(page_token))
+        )
 
+    stmt = select(*RUN_SUMMARY_COLUMNS)
     if filters:
         stmt = stmt.where(and_(*filters))
+    # Matches the (..., started_at_utc desc, run_id desc) indexes so the limit stops the scan early.
+    return stmt.order_by(Run.started_at_utc.desc(), Run.run_id.desc()).limit(page_size + 1)
 
-    stmt = stmt.order_by(Run.started_at_utc.desc()).limit(min(max(page_size, 1), 200) + 1)
-    rows = list(db.execute(stmt).scalars().all())
+
+def list_runs(
+    db: Session,
+    app_id: str | None = None,
+    environment: str | None = None,
+    status: str | None = None,
+    from_utc: datetime | None = None,
+    to_utc: datetime | None = None,
+    source_type: str | None = None,
+    page_size: int = 50,
+    page_token: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Run summaries as plain dicts, read with a column select instead of loading Run objects."""
+    page_size = min(max(page_size, 1), 200)
+    stmt = list_runs_query(
+        app_id, environment, status, from_utc, to_utc, source_type, page_size, page_token
+    )
+    rows = db.execute(stmt).all()
 
     next_page_token = None
     if len(rows) > page_size:
-        next_page_token = rows[page_size - 1].started_at_utc.isoformat()
+        next_page_token = encode_run_page_token(rows[page_size - 1])
         rows = rows[:page_size]
 
-    return rows, next_page_token
+    return [row._asdict() for row in rows], next_page_token
 
 
-def get_run_detail(db: Session, run_id: str) -> tuple[Run, dict[str, int]]:
-    run = db.execute(select(Run).where(Run.run_id == run_id)).scalar_one_or_none()
-    if run is None:
+def get_run_detail(db: Session, run_id: str) -> tuple[Run, dict[str, Any]]:
+    row = db.execute(
+        select(Run, RunStats)
+        .outerjoin(RunStats, RunStats.run_id == Run.run_id)
+        .where(Run.run_id == run_id)
+    ).first()
+    if row is None:
         raise EventValidationError("NOT_FOUND", "Run not found", {"run_id": run_id})
 
-    events = db.execute(select(Event.event_type).where(Event.run_id == run_id)).all()
-    counters = Counter([evt[0] for evt in events])
-    counters["total_events"] = sum(counters.values())
-    return run, dict(counters)
+    run, stats = row
+    # Runs written before run_stats existed have no row until `worker.app.rebuild_run_stats` runs.
+    return run, run_stats_dict(stats) if stats is not None else compute_run_stats(db, run_id)
+
+
+def run_counters(stats: dict[str, Any]) -> dict[str, int]:
+    counters = dict(stats["event_type_counts"])
+    counters["total_events"] = stats["total_events"]
+    return counters
+
+
+EVENT_FIELDS = {
+    "event_id": Event.event_id,
+    "run_id": Event.run_id,
+    "step_id": Event.step_id,
+    "sequence_no": Event.sequence_no,
+    "event_type": Event.event_type,
+    "timestamp_utc": Event.timestamp_utc,
+    "determinism_mode": Event.determinism_mode,
+    "redaction_status": Event.redaction_status,
+}
+# Needed to identify items and to build the next page token, so always selected.
+REQUIRED_EVENT_FIELDS = ("event_id", "sequence_no")
+PAYLOAD_MODES = {"true": "full", "false": "none", "summary": "summary"}
+
+
+def resolve_event_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return list(EVENT_FIELDS)
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(EVENT_FIELDS))
+    if unknown:
+        raise EventValidationError(
+            "VALIDATION_ERROR",
+            "Unknown event fields requested",
+            {"unknown_fields": unknown, "allowed_fields": list(EVENT_FIELDS)},
+        )
+    return [name for name in EVENT_FIELDS if name in requested or name in REQUIRED_EVENT_FIELDS]
+
+
+def resolve_payload_mode(include_payload: str) -> str:
+    mode = PAYLOAD_MODES.get(include_payload.strip().lower())
+    if mode is None:
+        raise EventValidationError(
+            "VALIDATION_ERROR",
+            "include_payload must be one of true, false, summary",
+            {"include_payload": include_payload},
+        )
+    return mode
 
 
 def list_events(
@@ -74,8 +193,29 @@ def list_events(
     sequence_to: int | None = None,
     page_size: int = 200,
     page_token: str | None = None,
-) -> tuple[list[Event], str | None]:
-    stmt = select(Event).where(Event.run_id == run_id)
+    fields: list[str] | None = None,
+    payload_mode: str = "full",
+) -> tuple[list[dict[str, Any]], str | None]:
+    sealed = sealed_events(db, run_id)
+    if sealed is not None:
+        return _list_sealed_events(
+            sealed,
+            event_type,
+            step_id,
+            sequence_from,
+            sequence_to,
+            page_size,
+            page_token,
+            fields,
+            payload_mode,
+        )
+
+    columns = [EVENT_FIELDS[name].label(name) for name in fields or EVENT_FIELDS]
+    if payload_mode == "full":
+        columns.append(Event.payload_json.label("payload"))
+    elif payload_mode == "summary":
+        columns.append(_payload_bytes(db).label("payload_bytes"))
+    stmt = select(*columns).where(Event.run_id == run_id)
 
     if event_type:
         stmt = stmt.where(Event.event_type == event_type)
@@ -88,17 +228,99 @@ def list_events(
     if page_token:
         stmt = stmt.where(Event.sequence_no > int(page_token))
 
-    stmt = stmt.order_by(Event.sequence_no.asc()).limit(min(max(page_size, 1), 500) + 1)
-    rows = list(db.execute(stmt).scalars().all())
+    # Clamp before comparing against the fetched rows so oversized requests still get a next token.
+    page_size = min(max(page_size, 1), 500)
+    stmt = stmt.order_by(Event.sequence_no.asc()).limit(page_size + 1)
+    rows = [dict(row) for row in db.execute(stmt).mappings()]
 
     next_token = None
     if len(rows) > page_size:
-        next_token = str(rows[page_size - 1].sequence_no)
+        next_token = str(rows[page_size - 1]["sequence_no"])
         rows = rows[:page_size]
 
     return rows, next_token
 
 
+def _list_sealed_events(
+    events: tuple[SealedEvent, ...],
+    event_type: str | None,
+    step_id: str | None,
+    sequence_from: int | None,
+    sequence_to: int | None,
+    page_size: int,
+    page_token: str | None,
+    fields: list[str] | None,
+    payload_mode: str,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """list_events over a sealed run's snapshot, with the same filters, projection and paging."""
+    lower = int(page_token) + 1 if page_token else None
+    if sequence_from is not None:
+        lower = sequence_from if lower is None else max(lower, sequence_from)
+    page_size = min(max(page_size, 1), 500)
+    names = fields or list(EVENT_FIELDS)
+
+    rows: list[dict[str, Any]] = []
+    for event in events:
+        if lower is not None and event.sequence_no < lower:
+            continue
+        if sequence_to is not None and event.sequence_no > sequence_to:
+            break
+        if (event_type and event.event_type != event_type) or (
+            step_id and event.step_id != step_id
+        ):
+            continue
+        row = {name: getattr(event, name) for name in names}
+        if payload_mode == "full":
+            row["payload"] = event.payload_json
+        elif payload_mode == "summary":
+            row["payload_bytes"] = len(json.dumps(event.payload_json).encode("utf-8"))
+        rows.append(row)
+        if len(rows) > page_size:
+            break
+
+    next_token = None
+    if len(rows) > page_size:
+        next_token = str(rows[page_size - 1]["sequence_no"])
+        rows = rows[:page_size]
+    return rows, next_token
+
+
+def _payload_bytes(db: Session):
+    payload_text = cast(Event.payload_json, Text)
+    if db.get_bind().dialect.name == "postgresql":
+        return func.octet_length(payload_text)
+    return func.length(cast(payload_text, LargeBinary))
+
+
+def get_event(db: Session, event_id: str) -> Event | SealedEvent:
+    event = db.execute(select(Event).where(Event.event_id == event_id)).scalar_one_or_none()
+    if event is None:
+        event = find_sealed_event(db, event_id)
+    if event is None:
+        raise EventValidationError("NOT_FOUND", "Event not found", {"event_id": event_id})
+    return event
+
+
+def run_events_immutable(db: Session, run_id: str) -> bool:
+    """True once no event of the run can be added or changed.
+
+    That is when the run is sealed or its last event is terminal. A finalized run without a
+    terminal event still accepts events, so run status alone is not enough.
+    """
+    if (
+        db.execute(select(RunSnapshot.run_id).where(RunSnapshot.run_id == run_id)).first()
+        is not None
+    ):
+        return True
+    last_event_type = db.execute(
+        select(Event.event_type)
+        .where(Event.run_id == run_id)
+        .order_by(Event.sequence_no.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    return last_event_type in TERMINAL_TYPES
+
+
 def get_artifact_metadata(db: Session, artifact_hash: str) -> Artifact:
     artifact = db.execute(select(Artifact).where(Artifact.artifact_hash == artifact_hash)).scalar_one_or_none()
     if artifact is None:
@@ -125,7 +347,11 @@ def run_to_summary_dict(run: Run) -> dict[str, Any]:
     }
 
 
-def event_to_dict(event: Event) -> dict[str, Any]:
+def run_status_dict(run: Run) -> dict[str, Any]:
+    return {"run_id": run.run_id, "status": run.status, "ended_at_utc": run.ended_at_utc}
+
+
+def event_to_dict(event: Event | SealedEvent) -> dict[str, Any]:
     return {
         "event_id": event.event_id,
         "run_id": event.run_id,
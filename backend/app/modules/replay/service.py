@@ -8,9 +8,22 @@ from typing import Any
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
-from backend.app.db.models import AuditLog, Event, Job, ReplaySession, Run, Step
+from backend.app.db.models import (
+    AuditLog,
+    Event,
+    EventArtifact,
+    Job,
+    ReplaySession,
+    Run,
+    Step,
+    new_id,
+)
+from backend.app.modules.compaction.service import SealedEvent, load_run_events
 from backend.app.modules.ingestion.validation import EventValidationError
 from backend.app.schemas.events import ReplayOverrideProfile
+from backend.app.services.payload_refs import PAYLOAD_ARTIFACT_TYPE, payload_ref_hashes
+from backend.app.services.pubsub import broker, replay_topic
+from backend.app.services.run_stats import init_run_stats, record_run_events
 
 
 def _now() -> datetime:
@@ -48,7 +61,7 @@ def create_replay_session(
             )
 
     session = ReplaySession(
-        replay_session_id=str(uuid.uuid4()),
+        replay_session_id=new_id(),
         source_run_id=source_run_id,
         fork_step_id=fork_step_id,
         override_profile_json=override_profile.model_dump(mode="json"),
@@ -83,6 +96,23 @@ def create_replay_session(
     return session
 
 
+def replay_status_dict(session: ReplaySession) -> dict[str, Any]:
+    return {
+        "replay_session_id": session.replay_session_id,
+        "status": session.status,
+        "derived_run_id": session.derived_run_id,
+        "reason_codes": session.reason_codes_json or [],
+        "failure_reason_code": session.failure_reason_code,
+    }
+
+
+def _commit_status(db: Session, session: ReplaySession) -> None:
+    db.commit()
+    topic = replay_topic(session.replay_session_id)
+    if broker.has_subscribers(topic):
+        broker.publish(topic, "replay_status", replay_status_dict(session))
+
+
 def get_replay_session(db: Session, replay_session_id: str) -> ReplaySession:
     session = db.execute(
         select(ReplaySession).where(ReplaySession.replay_session_id == replay_session_id)
@@ -103,7 +133,7 @@ def cancel_replay_session(db: Session, replay_session_id: str) -> ReplaySession:
         session.status = "failed_execution"
         session.failure_reason_code = "cancel_requested"
         session.ended_at_utc = _now()
-    db.commit()
+    _commit_status(db, session)
     db.refresh(session)
     return session
 
@@ -114,18 +144,17 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
         return session
 
     session.status = "running"
-    db.commit()
+    _commit_status(db, session)
 
     source_run = db.execute(select(Run).where(Run.run_id == session.source_run_id)).scalar_one()
-    source_events = list(
-        db.execute(select(Event).where(Event.run_id == source_run.run_id).order_by(Event.sequence_no.asc())).scalars()
-    )
+    # A sealed run comes back from one sequential read of its snapshot.
+    source_events = load_run_events(db, source_run.run_id)
 
     if not source_events:
         session.status = "failed_validation"
         session.failure_reason_code = "source_run_empty"
         session.ended_at_utc = _now()
-        db.commit()
+        _commit_status(db, session)
         return session
 
     pending_artifacts = [evt.event_id for evt in source_events if evt.artifact_pending]
@@ -134,14 +163,14 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
         session.failure_reason_code = "artifact_missing"
         session.reason_codes_json = ["artifact_missing"]
         session.ended_at_utc = _now()
-        db.commit()
+        _commit_status(db, session)
         return session
 
     override_profile = ReplayOverrideProfile.model_validate(session.override_profile_json)
 
     derived_run = Run(
-        run_id=str(uuid.uuid4()),
-        trace_id=str(uuid.uuid4()),
+        run_id=new_id(),
+        trace_id=new_id(),
         app_id=source_run.app_id,
         environment=source_run.environment,
         status="running",
@@ -151,6 +180,7 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
         retention_class=source_run.retention_class,
     )
     db.add(derived_run)
+    init_run_stats(db, derived_run.run_id)
     db.flush()
 
     fork_sequence = source_events[0].sequence_no
@@ -170,13 +200,17 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
 
     reason_codes: list[str] = []
     mode_counts: dict[str, int] = defaultdict(int)
+    type_counts: dict[str, int] = defaultdict(int)
+    # The session does not autoflush, so pending steps are invisible to queries; track them here.
+    created_steps: set[str] = set()
 
     for index, source_event in enumerate(source_events):
         if session.cancel_requested:
+            record_run_events(db, derived_run.run_id, type_counts, mode_counts, index - 1)
             session.status = "failed_execution"
             session.failure_reason_code = "cancel_requested"
             session.ended_at_utc = _now()
-            db.commit()
+            _commit_status(db, session)
             return session
 
         payload = dict(source_event.payload_json)
@@ -193,12 +227,13 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
         payload["replay_reason_code"] = replay_reason_code
         reason_codes.append(replay_reason_code)
         mode_counts[determinism_mode] += 1
+        type_counts[source_event.event_type] += 1
 
         new_step_id = step_map[source_event.step_id]
         new_parent_step_id = step_map.get(source_event.parent_step_id, None)
 
-        step_exists = db.execute(select(Step).where(Step.step_id == new_step_id)).scalar_one_or_none()
-        if step_exists is None:
+        if new_step_id not in created_steps:
+            created_steps.add(new_step_id)
             db.add(
                 Step(
                     step_id=new_step_id,
@@ -212,7 +247,7 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
             )
 
         replay_event = Event(
-            event_id=str(uuid.uuid4()),
+            event_id=new_id(),
             run_id=derived_run.run_id,
             step_id=new_step_id,
             parent_step_id=new_parent_step_id,
@@ -228,9 +263,19 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
             artifact_pending=False,
         )
         db.add(replay_event)
+        # Offloaded payload fields stay in the artifact store; the derived event links them too.
+        for artifact_hash in payload_ref_hashes(payload):
+            db.add(
+                EventArtifact(
+                    event_id=replay_event.event_id,
+                    artifact_hash=artifact_hash,
+                    reference_role=PAYLOAD_ARTIFACT_TYPE,
+                )
+            )
 
     derived_run.status = "success" if source_run.status == "success" else "failed"
     derived_run.ended_at_utc = _now()
+    record_run_events(db, derived_run.run_id, type_counts, mode_counts, len(source_events) - 1)
 
     completed_status = _derive_session_status(mode_counts)
     session.status = completed_status
@@ -238,13 +283,13 @@ def execute_replay_session(db: Session, replay_session_id: str) -> ReplaySession
     session.failure_reason_code = None
     session.derived_run_id = derived_run.run_id
     session.reason_codes_json = sorted(set(reason_codes))
-    db.commit()
+    _commit_status(db, session)
     db.refresh(session)
     return session
 
 
 def _determinism_for_event(
-    source_event: Event,
+    source_event: Event | SealedEvent,
     fork_sequence: int,
     override_profile: ReplayOverrideProfile,
     payload: dict[str, Any],
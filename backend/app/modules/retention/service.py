@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import and_, column, delete, exists, func, or_, select, table, union_all, update
+from sqlalchemy.orm import Session
+
+from backend.app.config import settings
+from backend.app.db.models import (
+    Artifact,
+    ArtifactText,
+    AuditLog,
+    BundleImport,
+    Event,
+    EventArtifact,
+    ReplaySession,
+    Run,
+    RunSnapshot,
+    RunStats,
+    SealedEventId,
+    Step,
+)
+from backend.app.services.artifact_store import ArtifactStore
+from backend.app.services.partitions import (
+    drop_event_partition,
+    events_partitioned,
+    list_event_partitions,
+)
+
+
+STORED_ARTIFACT_STATUSES = {"ready", "blocked"}
+
+
+@dataclass
+class RetentionReport:
+    dry_run: bool
+    runs_marked: int = 0
+    runs_deleted: int = 0
+    artifacts_deleted: int = 0
+    bytes_reclaimed: int = 0
+    rows_deleted: dict[str, int] = field(default_factory=dict)
+    skipped_legal_hold: int = 0
+    partitions_dropped: list[str] = field(default_factory=list)
+
+    def count(self, table: str, rows: int) -> None:
+        self.rows_deleted[table] = self.rows_deleted.get(table, 0) + rows
+
+    def as_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["rows_deleted_total"] = sum(self.rows_deleted.values())
+        return payload
+
+
+def retention_days() -> dict[str, int]:
+    return {
+        "dev_short": settings.retention_dev_short_days,
+        "ci_medium": settings.retention_ci_medium_days,
+        "incident_long": settings.retention_incident_long_days,
+    }
+
+
+def run_retention(
+    db: Session,
+    store: ArtifactStore,
+    dry_run: bool = False,
+    now: datetime | None = None,
+    run_batch_size: int = settings.retention_run_batch_size,
+    row_batch_size: int = settings.retention_row_batch_size,
+) -> RetentionReport:
+    now = now or datetime.now(timezone.utc)
+    report = RetentionReport(dry_run=dry_run)
+
+    report.skipped_legal_hold = db.execute(
+        select(func.count()).select_from(Run).where(_expired_clause(now), Run.legal_hold.is_(True))
+    ).scalar_one()
+
+    _mark_expired_runs(db, report, now, dry_run)
+    if events_partitioned(db):
+        _drop_event_partitions(db, report, now, dry_run)
+    _purge_marked_runs(db, report, now, dry_run, max(run_batch_size, 1), max(row_batch_size, 1))
+    _collect_artifacts(db, store, report, now, dry_run, max(row_batch_size, 1))
+
+    db.add(
+        AuditLog(
+            actor_id="retention_job",
+            actor_type="service",
+            action="retention_purge",
+            target_type="retention",
+            target_id=now.isoformat(),
+            details_json=report.as_dict(),
+        )
+    )
+    db.commit()
+    return report
+
+
+def list_retention_reports(db: Session, limit: int = 20) -> list[dict[str, Any]]:
+    rows = db.execute(
+        select(AuditLog)
+        .where(AuditLog.action == "retention_purge")
+        .order_by(AuditLog.timestamp_utc.desc())
+        .limit(min(max(limit, 1), 200))
+    ).scalars()
+    return [{"executed_at_utc": row.timestamp_utc, **row.details_json} for row in rows]
+
+
+def _expired_clause(now: datetime):
+    reference_time = func.coalesce(Run.ended_at_utc, Run.started_at_utc)
+    return or_(
+        *(
+            and_(
+                Run.retention_class == retention_class, reference_time < now - timedelta(days=days)
+            )
+            for retention_class, days in retention_days().items()
+        )
+    )
+
+
+def _mark_expired_runs(db: Session, report: RetentionReport, now: datetime, dry_run: bool) -> None:
+    clause = and_(
+        _expired_clause(now), Run.legal_hold.is_(False), Run.purge_marked_at_utc.is_(None)
+    )
+    if dry_run:
+        report.runs_marked = db.execute(
+            select(func.count()).select_from(Run).where(clause)
+        ).scalar_one()
+        return
+    result = db.execute(update(Run).where(clause).values(purge_marked_at_utc=now))
+    report.runs_marked = result.rowcount or 0
+    db.commit()
+
+
+def _purge_clause(now: datetime):
+    return and_(
+        Run.purge_marked_at_utc.is_not(None),
+        Run.purge_marked_at_utc <= now - timedelta(hours=settings.retention_grace_hours),
+        Run.legal_hold.is_(False),
+    )
+
+
+def _drop_event_partitions(
+    db: Session, report: RetentionReport, now: datetime, dry_run: bool
+) -> None:
+    # A whole month can go in one DDL statement once every run with events in it is due for purge.
+    for name, _, upper in list_event_partitions(db):
+        if upper > now:
+            break
+        partition = table(name, column("run_id"))
+        blocking = db.execute(
+            select(Run.run_id)
+            .where(Run.run_id.in_(select(partition.c.run_id).distinct()), ~_purge_clause(now))
+            .limit(1)
+        ).first()
+        if blocking is not None:
+            continue
+        # A dry run counts these rows with the runs they belong to, as they are still there.
+        if not dry_run:
+            for table_name, rows in drop_event_partition(db, name).items():
+                report.count(table_name, rows)
+        report.partitions_dropped.append(name)
+
+
+def _purge_marked_runs(
+    db: Session,
+    report: RetentionReport,
+    now: datetime,
+    dry_run: bool,
+    run_batch_size: int,
+    row_batch_size: int,
+) -> None:
+    purge_clause = _purge_clause(now)
+
+    if dry_run:
+        run_ids = select(Run.run_id).where(purge_clause)
+        event_ids = union_all(
+            select(Event.event_id).where(Event.run_id.in_(run_ids)),
+            select(SealedEventId.event_id).where(SealedEventId.run_id.in_(run_ids)),
+        )
+        report.runs_deleted = db.execute(
+            select(func.count()).select_from(Run).where(purge_clause)
+        ).scalar_one()
+        for table, model, clause in (
+            ("event_artifacts", EventArtifact, EventArtifact.event_id.in_(event_ids)),
+            ("events", Event, Event.run_id.in_(run_ids)),
+            ("sealed_event_ids", SealedEventId, SealedEventId.run_id.in_(run_ids)),
+            ("steps", Step, Step.run_id.in_(run_ids)),
+            ("replay_sessions", ReplaySession, ReplaySession.source_run_id.in_(run_ids)),
+            ("bundle_imports", BundleImport, BundleImport.run_id.in_(run_ids)),
+            ("run_snapshots", RunSnapshot, RunSnapshot.run_id.in_(run_ids)),
+            ("run_stats", RunStats, RunStats.run_id.in_(run_ids)),
+        ):
+            report.count(
+                table,
+                db.execute(select(func.count()).select_from(model).where(clause)).scalar_one(),
+            )
+        report.count("runs", report.runs_deleted)
+        return
+
+    while True:
+        run_ids = list(
+            db.execute(select(Run.run_id).where(purge_clause).limit(run_batch_size)).scalars()
+        )
+        if not run_ids:
+            return
+
+        while True:
+            event_ids = list(
+                db.execute(
+                    select(Event.event_id).where(Event.run_id.in_(run_ids)).limit(row_batch_size)
+                ).scalars()
+            )
+            if not event_ids:
+                break
+            report.count(
+                "event_artifacts",
+                db.execute(
+                    delete(EventArtifact).where(EventArtifact.event_id.in_(event_ids))
+                ).rowcount
+                or 0,
+            )
+            report.count(
+                "events",
+                db.execute(delete(Event).where(Event.event_id.in_(event_ids))).rowcount or 0,
+            )
+            db.commit()
+
+        while True:
+            step_ids = list(
+                db.execute(select(Step.step_id).where(Step.run_id.in_(run_ids)).limit(row_batch_size)).scalars()
+            )
+            if not step_ids:
+                break
+            report.count(
+                "steps", db.execute(delete(Step).where(Step.step_id.in_(step_ids))).rowcount or 0
+            )
+            db.commit()
+
+        _purge_sealed_links(db, report, run_ids, row_batch_size)
+        report.count(
+            "replay_sessions",
+            db.execute(
+                delete(ReplaySession).where(ReplaySession.source_run_id.in_(run_ids))
+            ).rowcount
+            or 0,
+        )
+        report.count(
+            "bundle_imports",
+            db.execute(delete(BundleImport).where(BundleImport.run_id.in_(run_ids))).rowcount or 0,
+        )
+        report.count(
+            "run_snapshots",
+            db.execute(delete(RunSnapshot).where(RunSnapshot.run_id.in_(run_ids))).rowcount or 0,
+        )
+        report.count(
+            "run_stats",
+            db.execute(delete(RunStats).where(RunStats.run_id.in_(run_ids))).rowcount or 0,
+        )
+        deleted = db.execute(delete(Run).where(Run.run_id.in_(run_ids))).rowcount or 0
+        report.count("runs", deleted)
+        report.runs_deleted += deleted
+        db.commit()
+
+
+def _purge_sealed_links(
+    db: Session, report: RetentionReport, run_ids: list[str], row_batch_size: int
+) -> None:
+    # Sealed events have no rows to join through; their ids are kept in sealed_event_ids.
+    while True:
+        event_ids = list(
+            db.execute(
+                select(SealedEventId.event_id).where(SealedEventId.run_id.in_(run_ids)).limit(row_batch_size)
+            ).scalars()
+        )
+        if not event_ids:
+            return
+        report.count(
+            "event_artifacts",
+            db.execute(delete(EventArtifact).where(EventArtifact.event_id.in_(event_ids))).rowcount
+            or 0,
+        )
+        report.count(
+            "sealed_event_ids",
+            db.execute(delete(SealedEventId).where(SealedEventId.event_id.in_(event_ids))).rowcount
+            or 0,
+        )
+        db.commit()
+
+
+def _collect_artifacts(
+    db: Session,
+    store: ArtifactStore,
+    report: RetentionReport,
+    now: datetime,
+    dry_run: bool,
+    row_batch_size: int,
+) -> None:
+    unreferenced = and_(
+        ~exists().where(EventArtifact.artifact_hash == Artifact.artifact_hash),
+        ~exists().where(RunSnapshot.artifact_hash == Artifact.artifact_hash),
+        or_(
+            *(
+                and_(
+                    Artifact.retention_class == retention_class,
+                    Artifact.created_at_utc < now - timedelta(days=days),
+                )
+                for retention_class, days in retention_days().items()
+            )
+        ),
+    )
+
+    if dry_run:
+        count, stored_bytes = db.execute(
+            select(
+                func.count(),
+                func.coalesce(
+                    func.sum(Artifact.byte_size).filter(
+                        Artifact.status.in_(STORED_ARTIFACT_STATUSES)
+                    ),
+                    0,
+                ),
+            ).where(unreferenced)
+        ).one()
+        report.artifacts_deleted = count
+        report.bytes_reclaimed = int(stored_bytes)
+        report.count("artifacts", count)
+        report.count(
+            "artifact_text",
+            db.execute(
+                select(func.count())
+                .select_from(ArtifactText)
+                .where(ArtifactText.artifact_hash.in_(select(Artifact.artifact_hash).where(unreferenced)))
+            ).scalar_one(),
+        )
+        return
+
+    while True:
+        rows = db.execute(
+            select(Artifact.artifact_hash, Artifact.byte_size, Artifact.status)
+            .where(unreferenced)
+            .limit(row_batch_size)
+        ).all()
+        if not rows:
+            return
+
+        hashes = [row.artifact_hash for row in rows]
+        report.count(
+            "artifact_text",
+            db.execute(delete(ArtifactText).where(ArtifactText.artifact_hash.in_(hashes))).rowcount
+            or 0,
+        )
+        deleted = (
+            db.execute(delete(Artifact).where(Artifact.artifact_hash.in_(hashes))).rowcount or 0
+        )
+        db.commit()
+
+        # Rows go first so a failed blob delete leaves an orphan blob, never a dangling row.
+        for row in rows:
+            if row.status in STORED_ARTIFACT_STATUSES:
+                store.delete(row.artifact_hash)
+                report.bytes_reclaimed += row.byte_size
+        report.artifacts_deleted += deleted
+        report.count("artifacts", deleted)
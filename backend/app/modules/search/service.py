@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import re
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    cast,
+    column,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from backend.app.config import settings
+from backend.app.db.models import Artifact, ArtifactText, Event, EventArtifact, Run
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.modules.query.service import decode_page_token, encode_page_token
+
+
+FIELD_PATH = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+TEXT_MIME_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/yaml",
+}
+
+event_search = table("event_search", column("rowid"), column("body"))
+artifact_search = table("artifact_search", column("rowid"), column("body"))
+
+
+def parse_field_matches(matches: list[str]) -> list[tuple[str, str]]:
+    parsed = []
+    for item in matches:
+        path, sep, value = item.partition("=")
+        path = path.strip()
+        if not sep or not FIELD_PATH.match(path):
+            raise EventValidationError(
+                "VALIDATION_ERROR",
+                "match must look like 'payload.path=value'",
+                {"match": item},
+            )
+        parsed.append((path.removeprefix("payload."), value))
+    return parsed
+
+
+def _candidates(value: str) -> list[Any]:
+    # `finish_reason=length` is a string, but `attempt=2` may have been recorded as 2 or "2".
+    try:
+        decoded = json.loads(value)
+    except ValueError:
+        return [value]
+    if isinstance(decoded, (bool, int, float)) or decoded is None:
+        return [value, decoded]
+    return [value]
+
+
+def _field_clause(db: Session, path: str, value: str) -> ColumnElement[bool]:
+    keys = path.split(".")
+    if db.get_bind().dialect.name == "postgresql":
+        clauses = []
+        for candidate in _candidates(value):
+            document: Any = candidate
+            for key in reversed(keys):
+                document = {key: document}
+            # Containment is what the jsonb_path_ops GIN index answers.
+            clauses.append(
+                cast(Event.payload_json, JSONB).op("@>")(cast(literal(json.dumps(document)), JSONB))
+            )
+        return or_(*clauses)
+
+    extracted = func.json_extract(Event.payload_json, "$." + path)
+    return or_(
+        *(extracted == candidate for candidate in _candidates(value) if candidate is not None)
+    )
+
+
+def _fts5_query(text: str) -> str:
+    # Every term must match, like plainto_tsquery; quoting keeps FTS5 operators out of user input.
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+def _text_clause(db: Session, text: str, include_artifacts: bool) -> ColumnElement[bool]:
+    if db.get_bind().dialect.name == "postgresql":
+        simple = literal_column("'simple'")
+        query = func.plainto_tsquery(simple, text)
+        clause = func.to_tsvector(simple, cast(Event.payload_json, JSONB)).op("@@")(query)
+        artifact_match = func.to_tsvector(simple, ArtifactText.content).op("@@")(query)
+    else:
+        fts_query = _fts5_query(text)
+        clause = literal_column("events.rowid").in_(
+            select(event_search.c.rowid).where(literal_column("event_search").op("MATCH")(fts_query))
+        )
+        artifact_match = literal_column("artifact_text.rowid").in_(
+            select(artifact_search.c.rowid).where(literal_column("artifact_search").op("MATCH")(fts_query))
+        )
+
+    if not include_artifacts:
+        return clause
+    return or_(
+        clause,
+        exists().where(
+            EventArtifact.event_id == Event.event_id,
+            ArtifactText.artifact_hash == EventArtifact.artifact_hash,
+            artifact_match,
+        ),
+    )
+
+
+def search_events(
+    db: Session,
+    q: str | None = None,
+    matches: list[str] | None = None,
+    event_type: str | None = None,
+    run_id: str | None = None,
+    app_id: str | None = None,
+    environment: str | None = None,
+    include_artifacts: bool = False,
+    page_size: int = 50,
+    page_token: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    q = (q or "").strip()
+    field_matches = parse_field_matches(matches or [])
+    if not q and not field_matches:
+        raise EventValidationError("VALIDATION_ERROR", "Provide q or at least one match", {})
+
+    filters: list[ColumnElement[bool]] = [
+        _field_clause(db, path, value) for path, value in field_matches
+    ]
+    if q:
+        filters.append(_text_clause(db, q, include_artifacts))
+    if event_type:
+        filters.append(Event.event_type == event_type)
+    if run_id:
+        filters.append(Event.run_id == run_id)
+    if app_id:
+        filters.append(Run.app_id == app_id)
+    if environment:
+        filters.append(Run.environment == environment)
+    if page_token:
+        created_at, event_id = decode_page_token(page_token, 2)
+        try:
+            cursor = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise EventValidationError(
+                "VALIDATION_ERROR", "Invalid page_token", {"page_token": page_token}
+            ) from None
+        filters.append(tuple_(Event.created_at_utc, Event.event_id) < tuple_(cursor, event_id))
+
+    page_size = min(max(page_size, 1), 200)
+    stmt = (
+        select(
+            Event.event_id,
+            Event.run_id,
+            Event.step_id,
+            Event.sequence_no,
+            Event.event_type,
+            Event.timestamp_utc,
+            Event.created_at_utc,
+            Run.app_id,
+            Run.environment,
+        )
+        .join(Run, Run.run_id == Event.run_id)
+        .where(and_(*filters))
+        .order_by(Event.created_at_utc.desc(), Event.event_id.desc())
+        .limit(page_size + 1)
+    )
+    rows = [dict(row._mapping) for row in db.execute(stmt)]
+
+    next_token = None
+    if len(rows) > page_size:
+        last = rows[page_size - 1]
+        next_token = encode_page_token(last["created_at_utc"].isoformat(), last["event_id"])
+        rows = rows[:page_size]
+    for row in rows:
+        del row["created_at_utc"]
+    return rows, next_token
+
+
+def index_artifact_text(db: Session, artifact: Artifact, content: bytes) -> None:
+    """Make a stored artifact searchable when it is small, readable text that passed redaction."""
+    if artifact.status != "ready" or artifact.content_encoding != "identity":
+        return
+    if len(content) > settings.search_artifact_text_max_bytes:
+        return
+    mime_type = (artifact.mime_type or "").split(";")[0].strip().lower()
+    if not (mime_type.startswith("text/") or mime_type in TEXT_MIME_TYPES):
+        return
+    if db.get(ArtifactText, artifact.artifact_hash) is None:
+        db.add(
+            ArtifactText(
+                artifact_hash=artifact.artifact_hash,
+                content=content.decode("utf-8", errors="replace"),
+            )
+        )
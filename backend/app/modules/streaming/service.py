@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.app.config import settings
+from backend.app.modules.ingestion.service import get_run_or_error
+from backend.app.modules.query.service import list_events, run_status_dict
+from backend.app.modules.replay.service import get_replay_session, replay_status_dict
+from backend.app.services.pubsub import Subscription, broker, replay_topic, run_topic
+
+
+TERMINAL_RUN_STATUSES = {"success", "failed"}
+ACTIVE_REPLAY_STATUSES = {"pending", "running"}
+TAIL_PAGE_SIZE = 500
+KEEPALIVE = b": keepalive\n\n"
+
+
+def format_sse(event: str, data: dict[str, Any], event_id: int | None = None) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def stream_run_events(
+    session_factory: sessionmaker[Session],
+    run_id: str,
+    after_sequence_no: int,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[bytes]:
+    # Subscribe before the catch-up read so nothing ingested in between is missed.
+    subscription = broker.subscribe(run_topic(run_id))
+    loop = asyncio.get_running_loop()
+    cursor = after_sequence_no
+    last_write = loop.time()
+    try:
+        while True:
+            subscription.overflowed = False
+            events, run_status, has_more = await run_in_threadpool(
+                _read_run_page, session_factory, run_id, cursor
+            )
+            for event in events:
+                yield format_sse("trace_event", event, event["sequence_no"])
+                cursor = event["sequence_no"]
+                last_write = loop.time()
+            if has_more:
+                continue
+            if run_status["status"] in TERMINAL_RUN_STATUSES:
+                yield format_sse("run_status", run_status)
+                return
+
+            async for kind, data in _wait_for_messages(subscription):
+                if kind == "trace_event" and data["sequence_no"] > cursor:
+                    yield format_sse(kind, data, data["sequence_no"])
+                    cursor = data["sequence_no"]
+                    last_write = loop.time()
+                elif kind == "run_status" and data["status"] in TERMINAL_RUN_STATUSES:
+                    yield format_sse(kind, data)
+                    return
+            if await is_disconnected():
+                return
+            if loop.time() - last_write >= settings.stream_keepalive_seconds:
+                yield KEEPALIVE
+                last_write = loop.time()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def stream_replay_status(
+    session_factory: sessionmaker[Session],
+    replay_session_id: str,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[bytes]:
+    subscription = broker.subscribe(replay_topic(replay_session_id))
+    loop = asyncio.get_running_loop()
+    last: dict[str, Any] | None = None
+    last_write = loop.time()
+    try:
+        while True:
+            subscription.overflowed = False
+            snapshot = await run_in_threadpool(
+                _read_replay_status, session_factory, replay_session_id
+            )
+            if snapshot != last:
+                yield format_sse("replay_status", snapshot)
+                last = snapshot
+                last_write = loop.time()
+            if snapshot["status"] not in ACTIVE_REPLAY_STATUSES:
+                return
+
+            async for kind, data in _wait_for_messages(subscription):
+                if data != last:
+                    yield format_sse(kind, data)
+                    last = data
+                    last_write = loop.time()
+                if data["status"] not in ACTIVE_REPLAY_STATUSES:
+                    return
+            if await is_disconnected():
+                return
+            if loop.time() - last_write >= settings.stream_keepalive_seconds:
+                yield KEEPALIVE
+                last_write = loop.time()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def _wait_for_messages(
+    subscription: Subscription,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    # Ends when the caller should resync from the database: after the resync interval, which
+    # picks up writes from other processes such as the replay worker, or on queue overflow.
+    loop = asyncio.get_running_loop()
+    resync_at = loop.time() + max(settings.stream_resync_seconds, 1)
+    while not subscription.overflowed:
+        remaining = resync_at - loop.time()
+        if remaining <= 0:
+            return
+        message = await subscription.get(remaining)
+        if message is not None:
+            yield message
+
+
+def _read_run_page(
+    session_factory: sessionmaker[Session], run_id: str, cursor: int
+) -> tuple[list[dict[str, Any]], dict[str, Any], bool]:
+    with session_factory() as db:
+        run = get_run_or_error(db, run_id)
+        rows, next_token = list_events(
+            db, run_id=run_id, page_size=TAIL_PAGE_SIZE, page_token=str(cursor)
+        )
+        return rows, run_status_dict(run), next_token is not None
+
+
+def _read_replay_status(
+    session_factory: sessionmaker[Session], replay_session_id: str
+) -> dict[str, Any]:
+    with session_factory() as db:
+        return replay_status_dict(get_replay_session(db, replay_session_id))
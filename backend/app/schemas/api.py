@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Literal, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -58,6 +58,8 @@ class RegisterArtifactRequest(BaseModel):
     content_hash: str | None = None
     content_base64: str | None = None
     content_text: str | None = None
+    # Raw content for binary (msgpack) bodies, which need no base64 step.
+    content_bytes: bytes | None = None
     retention_class: str = "dev_short"
     content_encoding: str = "identity"
     field_policies: dict[str, str] = Field(default_factory=dict)
@@ -69,6 +71,13 @@ class RegisterArtifactResponse(BaseModel):
     upload_target: dict[str, Any]
 
 
+class StreamIngestLine(BaseModel):
+    kind: Literal["event", "artifact"] = "event"
+    idempotency_key: str | None = None
+    event: CanonicalEvent | None = None
+    artifact: RegisterArtifactRequest | None = None
+
+
 class FinalizeRunRequest(BaseModel):
     final_status: str
     terminal_event_ref: str | None = None
@@ -97,9 +106,18 @@ class ListRunsResponse(BaseModel):
     next_page_token: str | None = None
 
 
+class RunStatsView(BaseModel):
+    total_events: int
+    last_sequence_no: int
+    event_type_counts: dict[str, int]
+    determinism_mode_counts: dict[str, int]
+    artifact_bytes: int
+
+
 class RunDetailResponse(BaseModel):
     run: RunSummary
     counters: dict[str, int]
+    stats: RunStatsView
 
 
 class EventView(BaseModel):
@@ -115,10 +133,69 @@ class EventView(BaseModel):
 
 
 class ListEventsResponse(BaseModel):
-    items: list[EventView]
+    # Items follow the requested field projection, so they are plain dicts rather than EventView.
+    items: list[dict[str, Any]]
+    next_page_token: str | None = None
+
+
+class SearchHit(BaseModel):
+    event_id: str
+    run_id: str
+    step_id: str
+    sequence_no: int
+    event_type: str
+    timestamp_utc: datetime
+    app_id: str
+    environment: str
+
+
+class SearchResponse(BaseModel):
+    items: list[SearchHit]
     next_page_token: str | None = None
 
 
+class LatencySummary(BaseModel):
+    avg: float
+    max: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+
+
+class TokenUsageSummary(BaseModel):
+    prompt: int
+    completion: int
+    total: int
+
+
+class UsageSummaryItem(BaseModel):
+    group: dict[str, Any]
+    call_count: int
+    error_count: int
+    latency_ms: LatencySummary
+    token_usage: TokenUsageSummary
+    cost_usd: float
+
+
+class UsageSummaryResponse(BaseModel):
+    items: list[UsageSummaryItem]
+
+
+class ReorderStatsResponse(BaseModel):
+    enabled: bool
+    window: int = 0
+    timeout_ms: int = 0
+    runs_tracked: int = 0
+    held_events: int = 0
+    in_order: int = 0
+    reordered: int = 0
+    late: int = 0
+    dropped: int = 0
+    gap_timeouts: int = 0
+    window_overflows: int = 0
+
+
 class ArtifactMetadataResponse(BaseModel):
     artifact_hash: str
     artifact_type: str
@@ -132,6 +209,59 @@ class ArtifactMetadataResponse(BaseModel):
     storage_object_key: str
 
 
+class ArtifactDiffResponse(BaseModel):
+    base_artifact_hash: str
+    candidate_artifact_hash: str
+    identical: bool
+    diff_kind: str
+    changes: dict[str, Any] = Field(default_factory=dict)
+
+
+class EventArtifactDiffResponse(BaseModel):
+    base_event_id: str
+    candidate_event_id: str
+    fields: dict[str, Any] = Field(default_factory=dict)
+
+
+class BundleExportRequest(BaseModel):
+    run_id: str
+    bundle_profile: str = "full_debug"
+    compression: str | None = None
+
+
+class EventExportRequest(BaseModel):
+    format: str = "parquet"
+    run_ids: list[str] | None = None
+    from_utc: datetime | None = None
+    to_utc: datetime | None = None
+    app_id: str | None = None
+    environment: str | None = None
+
+
+class BundleImportResponse(BaseModel):
+    import_id: str
+    run_id: str
+    source_run_id: str
+    status: str
+    steps_loaded: int
+    events_loaded: int
+    artifacts_loaded: int
+    artifacts_skipped: int
+
+
+class RetentionPurgeRequest(BaseModel):
+    dry_run: bool = False
+
+
+class RetentionPurgeResponse(BaseModel):
+    job_id: int
+    status: str
+
+
+class RetentionReportsResponse(BaseModel):
+    items: list[dict[str, Any]] = Field(default_factory=list)
+
+
 class CreateReplaySessionRequest(ReplayRequestPayload):
     pass
 
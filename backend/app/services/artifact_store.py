@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO
 
 import boto3
 
@@ -21,6 +23,15 @@ class ArtifactStore:
     def exists(self, artifact_hash: str) -> bool:
         raise NotImplementedError
 
+    def load(self, artifact_hash: str) -> bytes:
+        raise NotImplementedError
+
+    def open(self, artifact_hash: str) -> tuple[BinaryIO, int]:
+        raise NotImplementedError
+
+    def delete(self, artifact_hash: str) -> None:
+        raise NotImplementedError
+
 
 class LocalArtifactStore(ArtifactStore):
     def __init__(self, base_dir: str, bucket: str) -> None:
@@ -45,6 +56,19 @@ class LocalArtifactStore(ArtifactStore):
         path = self._path_for(artifact_hash)
         return os.path.exists(path)
 
+    def load(self, artifact_hash: str) -> bytes:
+        with open(self._path_for(artifact_hash), "rb") as handle:
+            return handle.read()
+
+    def open(self, artifact_hash: str) -> tuple[BinaryIO, int]:
+        path = self._path_for(artifact_hash)
+        return open(path, "rb"), os.path.getsize(path)
+
+    def delete(self, artifact_hash: str) -> None:
+        path = self._path_for(artifact_hash)
+        if os.path.exists(path):
+            os.remove(path)
+
 
 class S3ArtifactStore(ArtifactStore):
     def __init__(self) -> None:
@@ -75,8 +99,25 @@ class S3ArtifactStore(ArtifactStore):
         except Exception:  # noqa: BLE001
             return False
 
+    def load(self, artifact_hash: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=self._key(artifact_hash))
+        return response["Body"].read()
+
+    def open(self, artifact_hash: str) -> tuple[BinaryIO, int]:
+        response = self.client.get_object(Bucket=self.bucket, Key=self._key(artifact_hash))
+        return response["Body"], int(response["ContentLength"])
+
+    def delete(self, artifact_hash: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(artifact_hash))
+
 
 def build_artifact_store() -> ArtifactStore:
     if settings.artifact_store_mode.lower() == "s3":
         return S3ArtifactStore()
     return LocalArtifactStore(settings.artifact_local_dir, settings.artifact_bucket)
+
+
+@lru_cache(maxsize=1)
+def get_artifact_store() -> ArtifactStore:
+    """The process-wide store, for code paths such as event ingest that are not handed one."""
+    return build_artifact_store()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy import JSON, Table, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def bulk_insert(db: Session, table: Table, rows: list[dict[str, Any]]) -> int:
+    if not rows:
+        return 0
+    if db.get_bind().dialect.name == "postgresql":
+        _copy_rows(db, table, rows)
+    else:
+        db.execute(insert(table), rows)
+    return len(rows)
+
+
+def insert_ignore(db: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    """Insert rows, silently skipping any that collide with an existing primary or unique key."""
+    if not rows:
+        return
+    dialect_insert = (
+        postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    )
+    db.execute(dialect_insert(table).on_conflict_do_nothing(), rows)
+
+
+def _copy_rows(db: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    columns = list(rows[0])
+    json_columns = {column.name for column in table.columns if isinstance(column.type, JSON)}
+    driver_connection = db.connection().connection.driver_connection
+    statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(
+                    [
+                        json.dumps(row[name])
+                        if name in json_columns and row[name] is not None
+                        else row[name]
+                        for name in columns
+                    ]
+                )
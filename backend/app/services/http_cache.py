@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request, Response
+
+from backend.app.config import settings
+from backend.app.services.responses import dumps, request_id, success_body
+
+REVALIDATE = "no-cache"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedBody:
+    """The serialized `data` member of a success envelope, with its strong ETag."""
+
+    data: bytes
+    etag: str
+    expires_at: float
+
+
+class ResponseCache:
+    """In-process LRU of response bodies for immutable resources, bounded by total bytes.
+
+    Entries also expire after `max_age_seconds`, so data removed by retention in another
+    process stops being served at the same time clients stop reusing their copies.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = settings.response_cache_max_bytes,
+        max_age_seconds: int = settings.response_cache_max_age_seconds,
+    ) -> None:
+        self.max_bytes = max(max_bytes, 0)
+        self.max_age_seconds = max(max_age_seconds, 0)
+        self._entries: OrderedDict[str, CachedBody] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedBody | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedBody) -> None:
+        # A single body over a quarter of the budget would evict most hot pages for one read.
+        if len(entry.data) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += len(entry.data)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def lookup(self, request: Request) -> Response | None:
+        """The cached response for this request, served without touching the database."""
+        entry = self.get(cache_key(request))
+        if entry is None:
+            return None
+        return cached_response(request, entry, immutable_cache_control(self.max_age_seconds))
+
+    def respond(self, request: Request, data: Any, immutable: bool) -> Response:
+        """A success response with a strong ETag; immutable data is also kept for later lookups."""
+        entry = make_body(data, self.max_age_seconds)
+        if not immutable:
+            return cached_response(request, entry, REVALIDATE)
+        self.put(cache_key(request), entry)
+        return cached_response(request, entry, immutable_cache_control(self.max_age_seconds))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= len(self._entries.pop(key).data)
+
+
+def cache_key(request: Request) -> str:
+    # Sorted so that reordering query parameters still hits the same entry.
+    query = "&".join(
+        f"{name}={value}" for name, value in sorted(request.query_params.multi_items())
+    )
+    return f"{request.url.path}?{query}"
+
+
+def make_body(data: Any, max_age_seconds: int) -> CachedBody:
+    raw = dumps(data)
+    etag = '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+    return CachedBody(data=raw, etag=etag, expires_at=time.monotonic() + max_age_seconds)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so `W/` prefixes are ignored (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
+    )
+
+
+def cached_response(request: Request, entry: CachedBody, cache_control: str) -> Response:
+    headers = {"etag": entry.etag, "cache-control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    # The envelope carries a per-request id, so only the data member is cached and spliced in.
+    content = success_body(request_id(request), entry.data)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def immutable_cache_control(max_age_seconds: int) -> str:
+    return f"private, max-age={max_age_seconds}, immutable"
@@ -1,11 +1,89 @@
 from __future__ import annotations
 
+import math
+import threading
+from typing import Any
+
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from backend.app.db.models import Event
+from backend.app.config import settings
+from backend.app.db.models import Event, idempotency_key_hash
+
+
+class RecentKeyFilter:
+    """Bloom filter over the idempotency key hashes this process inserted recently.
+
+    A miss means the key is new to this process, so ingest can skip the duplicate lookup and
+    leave older or foreign keys to the insert's ON CONFLICT. A hit may be a false positive and
+    only costs the lookup. Two generations rotate once the current one holds `capacity` keys,
+    which keeps the false positive rate near `error_rate` without unbounded growth.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.capacity = max(capacity, 0)
+        self.bits = max(math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.bits / max(self.capacity, 1) * math.log(2)), 1)
+        self._current = bytearray((self.bits + 7) // 8)
+        self._previous = bytearray((self.bits + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _positions(self, key_hash: bytes) -> list[int]:
+        # The key hash is already uniform, so its two halves drive double hashing directly.
+        first = int.from_bytes(key_hash[:8], "little")
+        step = int.from_bytes(key_hash[8:16], "little") | 1
+        return [(first + index * step) % self.bits for index in range(self.hashes)]
+
+    def might_contain(self, key_hash: bytes) -> bool:
+        if not self.enabled:
+            return True
+        positions = self._positions(key_hash)
+        current, previous = self._current, self._previous
+        return all(current[bit >> 3] & (1 << (bit & 7)) for bit in positions) or all(
+            previous[bit >> 3] & (1 << (bit & 7)) for bit in positions
+        )
+
+    def add(self, key_hash: bytes) -> None:
+        if not self.enabled:
+            return
+        positions = self._positions(key_hash)
+        with self._lock:
+            if self._count >= self.capacity:
+                self._previous, self._current = self._current, bytearray(len(self._current))
+                self._count = 0
+            for bit in positions:
+                self._current[bit >> 3] |= 1 << (bit & 7)
+            self._count += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._current = bytearray(len(self._current))
+            self._previous = bytearray(len(self._previous))
+            self._count = 0
+
+
+recent_keys = RecentKeyFilter(settings.ingest_idempotency_filter_capacity)
 
 
 def find_existing_event_by_idempotency(db: Session, idempotency_key: str) -> Event | None:
-    stmt = select(Event).where(Event.idempotency_key == idempotency_key)
+    stmt = select(Event).where(Event.idempotency_hash == idempotency_key_hash(idempotency_key))
     return db.execute(stmt).scalar_one_or_none()
+
+
+# Built once per dialect: coercing a fresh .values() clause costs more than the insert itself.
+_INSERT_IF_NEW = {
+    name: dialect_insert(Event).on_conflict_do_nothing().returning(Event)
+    for name, dialect_insert in (("postgresql", postgresql.insert), ("sqlite", sqlite.insert))
+}
+
+
+def insert_event_if_new(db: Session, values: dict[str, Any]) -> Event | None:
+    """INSERT ... ON CONFLICT DO NOTHING RETURNING the event; None if its key is already taken."""
+    stmt = _INSERT_IF_NEW["postgresql" if db.get_bind().dialect.name == "postgresql" else "sqlite"]
+    return db.scalars(stmt, [values]).one_or_none()
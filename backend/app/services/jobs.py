@@ -12,6 +12,23 @@ def _now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def enqueue_job(db: Session, job_type: str, payload: dict[str, object]) -> Job:
+    job = Job(job_type=job_type, payload_json=payload, status="pending")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def has_open_job(db: Session, job_type: str) -> bool:
+    stmt = (
+        select(Job.job_id)
+        .where(Job.job_type == job_type, Job.status.in_(["pending", "running"]))
+        .limit(1)
+    )
+    return db.execute(stmt).first() is not None
+
+
 def fetch_next_job(db: Session, job_type: str | None = None) -> Job | None:
     stmt = select(Job).where(
         and_(
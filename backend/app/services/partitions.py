@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.config import settings
+
+
+PARTITIONED_TABLE = "events"
+_PARTITION_NAME = re.compile(rf"^{PARTITIONED_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def events_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    stmt = text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table AND c.relnamespace = to_regnamespace(current_schema())"
+    )
+    return db.execute(stmt, {"table": PARTITIONED_TABLE}).first() is not None
+
+
+def list_event_partitions(db: Session) -> list[tuple[str, datetime, datetime]]:
+    stmt = text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :table"
+    )
+    partitions = []
+    for name in db.execute(stmt, {"table": PARTITIONED_TABLE}).scalars():
+        match = _PARTITION_NAME.match(name)
+        if match is None:
+            continue
+        start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+        partitions.append((name, start, _next_month(start)))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def ensure_event_partitions(
+    db: Session,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    months_ahead: int = settings.event_partition_months_ahead,
+) -> list[str]:
+    if not events_partitioned(db):
+        return []
+
+    now = datetime.now(timezone.utc)
+    month = _month_start(start or now)
+    end = end or _add_months(_month_start(now), max(months_ahead, 0))
+    existing = {name for name, _, _ in list_event_partitions(db)}
+    created = []
+    while month <= end:
+        name = partition_name(month)
+        if name not in existing:
+            upper = _next_month(month)
+            db.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARTITIONED_TABLE} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                )
+            )
+            created.append(name)
+        month = _next_month(month)
+    if created:
+        db.commit()
+    return created
+
+
+def drop_event_partition(db: Session, name: str) -> dict[str, int]:
+    if _PARTITION_NAME.match(name) is None:
+        raise ValueError(f"Not an events partition: {name}")
+    # Row triggers do not fire on DROP, so clear dependants that point into the partition first.
+    links = db.execute(
+        text(f"DELETE FROM event_artifacts WHERE event_id IN (SELECT event_id FROM {name})")
+    ).rowcount
+    db.execute(
+        text(f"DELETE FROM event_idempotency_keys WHERE event_id IN (SELECT event_id FROM {name})")
+    )
+    events = db.execute(text(f"SELECT count(*) FROM {name}")).scalar_one()
+    db.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}"))
+    db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+    # Rows removed per table, for the retention report.
+    return {"event_artifacts": links or 0, "events": events}
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITIONED_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def _month_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(month: datetime) -> datetime:
+    return _add_months(month, 1)
+
+
+def _add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
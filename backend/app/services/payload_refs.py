@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from backend.app.services.artifact_store import ArtifactStore
+
+
+PAYLOAD_REF_KEY = "$payload_ref"
+PAYLOAD_ARTIFACT_TYPE = "event_payload"
+PAYLOAD_MIME_TYPE = "application/json"
+# Fields smaller than this stay inline even in an oversized payload;
+# a stub would not be much smaller.
+MIN_OFFLOAD_FIELD_BYTES = 1024
+
+
+def is_payload_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(PAYLOAD_REF_KEY), str)
+
+
+def payload_ref(artifact_hash: str, byte_size: int) -> dict[str, Any]:
+    """Stub left in `payload_json` for a field whose JSON value lives in the artifact store."""
+    return {PAYLOAD_REF_KEY: artifact_hash, "byte_size": byte_size, "mime_type": PAYLOAD_MIME_TYPE}
+
+
+def payload_ref_hashes(payload: dict[str, Any]) -> list[str]:
+    return sorted({value[PAYLOAD_REF_KEY] for value in payload.values() if is_payload_ref(value)})
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def split_payload(
+    payload: dict[str, Any], max_inline_bytes: int
+) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """Move top-level fields out of a payload larger than `max_inline_bytes`, largest first.
+
+    Returns the payload with the moved fields replaced by stubs, and their JSON content by hash.
+    """
+    if max_inline_bytes <= 0 or not payload:
+        return payload, {}
+    total = len(_encode(payload))
+    if total <= max_inline_bytes:
+        return payload, {}
+    encoded = {key: _encode(value) for key, value in payload.items()}
+    result = dict(payload)
+    contents: dict[str, bytes] = {}
+    for key in sorted(encoded, key=lambda name: len(encoded[name]), reverse=True):
+        content = encoded[key]
+        if total <= max_inline_bytes or len(content) < MIN_OFFLOAD_FIELD_BYTES:
+            break
+        artifact_hash = hashlib.sha256(content).hexdigest()
+        contents[artifact_hash] = content
+        result[key] = payload_ref(artifact_hash, len(content))
+        total -= len(content)
+    return result, contents
+
+
+def rehydrate_payload(
+    store: ArtifactStore, payload: dict[str, Any] | None
+) -> dict[str, Any] | None:
+    """Load offloaded fields back from the artifact store; payloads without stubs are unchanged."""
+    if not payload or not any(is_payload_ref(value) for value in payload.values()):
+        return payload
+    return {
+        key: _load_ref(store, value) if is_payload_ref(value) else value
+        for key, value in payload.items()
+    }
+
+
+def _load_ref(store: ArtifactStore, ref: dict[str, Any]) -> Any:
+    try:
+        return json.loads(store.load(ref[PAYLOAD_REF_KEY]))
+    except Exception:  # noqa: BLE001 - a purged or unreachable artifact leaves its stub in place
+        return ref
+
+
+def rehydrate_rows(store: ArtifactStore, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Rehydrate the `payload` of event dicts (rows listed without payloads pass through)."""
+    return [
+        {**row, "payload": rehydrate_payload(store, row["payload"])} if "payload" in row else row
+        for row in rows
+    ]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
+
+Message = tuple[str, dict[str, Any]]
+
+
+class Subscription:
+    def __init__(self, topic: str, loop: asyncio.AbstractEventLoop, max_queue: int) -> None:
+        self.topic = topic
+        self.loop = loop
+        self.queue: asyncio.Queue[Message] = asyncio.Queue(maxsize=max_queue)
+        # Set when a message had to be dropped; the reader must resync from the database.
+        self.overflowed = False
+
+    def offer(self, message: Message) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> Message | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=max(timeout, 0.0))
+        except TimeoutError:
+            return None
+
+
+class Broker:
+    def __init__(self, max_queue: int = 1000) -> None:
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(topic, asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        return topic in self._subscribers
+
+    def publish(self, topic: str, kind: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, (kind, data))
+            except RuntimeError:
+                # Event loop already closed; the stream is gone and will unsubscribe itself.
+                continue
+
+
+broker = Broker()
+
+
+def run_topic(run_id: str) -> str:
+    return f"run:{run_id}"
+
+
+def replay_topic(replay_session_id: str) -> str:
+    return f"replay:{replay_session_id}"
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import json
 import uuid
+from datetime import datetime
 from typing import Any
 
-from fastapi import Request
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 
 def request_id(request: Request) -> str:
@@ -38,3 +45,43 @@ def error_envelope(
             "retryable": retryable,
         },
     }
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Pydantic's JSON mode writes a UTC offset as "Z";
+        # keep the bytes identical to model_dump output.
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize response data straight from row dicts; datetimes are written as pydantic would."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            pass  # integers beyond 64 bits in client payloads; the stdlib encoder handles them
+    # Same separators as FastAPI's JSONResponse.
+    text = json.dumps(
+        data, default=_json_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    )
+    return text.encode("utf-8")
+
+
+def success_body(req_id: str, data: bytes) -> bytes:
+    return (
+        b'{"request_id":'
+        + dumps(req_id)
+        + b',"status":"success","data":'
+        + data
+        + b',"error":null}'
+    )
+
+
+def success_response(req_id: str, data: Any, headers: dict[str, str] | None = None) -> Response:
+    """A success envelope written in one pass, without model validation or jsonable_encoder."""
+    return Response(
+        content=success_body(req_id, dumps(data)), media_type="application/json", headers=headers
+    )
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Session
+
+from backend.app.db.models import Artifact, Event, EventArtifact, Run, RunSnapshot, RunStats
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _merge(counts: dict[str, int], delta: dict[str, int]) -> dict[str, int]:
+    # JSON columns are not mutation-tracked, so always assign a fresh dict.
+    merged = dict(counts or {})
+    for key, value in delta.items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def init_run_stats(db: Session, run_id: str) -> RunStats:
+    stats = RunStats(
+        run_id=run_id,
+        total_events=0,
+        last_sequence_no=-1,
+        event_type_counts_json={},
+        determinism_mode_counts_json={},
+        artifact_bytes=0,
+        updated_at_utc=_now(),
+    )
+    db.add(stats)
+    return stats
+
+
+def record_run_events(
+    db: Session,
+    run_id: str,
+    event_type_counts: dict[str, int],
+    determinism_mode_counts: dict[str, int],
+    last_sequence_no: int,
+    artifact_bytes: int = 0,
+) -> None:
+    """Add a batch of newly written events to the run's counters, in the caller's transaction."""
+    # The row lock serializes concurrent writers to the same run on Postgres; SQLite ignores it.
+    stats = db.execute(
+        select(RunStats).where(RunStats.run_id == run_id).with_for_update()
+    ).scalar_one_or_none()
+    if stats is None:
+        # Run predates run_stats: count everything it has, including the caller's pending events.
+        db.flush()
+        rebuild_run_stats(db, run_id)
+        return
+    stats.total_events = (stats.total_events or 0) + sum(event_type_counts.values())
+    stats.last_sequence_no = max(stats.last_sequence_no, last_sequence_no)
+    stats.event_type_counts_json = _merge(stats.event_type_counts_json, event_type_counts)
+    stats.determinism_mode_counts_json = _merge(
+        stats.determinism_mode_counts_json, determinism_mode_counts
+    )
+    stats.artifact_bytes = (stats.artifact_bytes or 0) + artifact_bytes
+    stats.updated_at_utc = _now()
+
+
+def compute_run_stats(db: Session, run_id: str) -> dict[str, Any]:
+    type_counts = {
+        event_type: count
+        for event_type, count in db.execute(
+            select(Event.event_type, func.count())
+            .where(Event.run_id == run_id)
+            .group_by(Event.event_type)
+        )
+    }
+    mode_counts = {
+        mode: count
+        for mode, count in db.execute(
+            select(Event.determinism_mode, func.count())
+            .where(Event.run_id == run_id)
+            .group_by(Event.determinism_mode)
+        )
+    }
+    last_sequence_no = db.execute(
+        select(func.max(Event.sequence_no)).where(Event.run_id == run_id)
+    ).scalar_one()
+    artifact_bytes = db.execute(
+        select(func.coalesce(func.sum(Artifact.byte_size), 0))
+        .select_from(EventArtifact)
+        .join(Event, Event.event_id == EventArtifact.event_id)
+        .join(Artifact, Artifact.artifact_hash == EventArtifact.artifact_hash)
+        .where(Event.run_id == run_id)
+    ).scalar_one()
+    return {
+        "total_events": sum(type_counts.values()),
+        "last_sequence_no": -1 if last_sequence_no is None else last_sequence_no,
+        "event_type_counts": type_counts,
+        "determinism_mode_counts": mode_counts,
+        "artifact_bytes": int(artifact_bytes),
+    }
+
+
+def rebuild_run_stats(db: Session, run_id: str) -> RunStats | None:
+    """Recompute a run's counters from its events, replacing whatever row exists.
+
+    Sealed runs are skipped and None is returned: their event rows are gone, and their counters
+    were final when they were sealed.
+    """
+    if db.get(RunSnapshot, run_id) is not None:
+        return None
+    values = compute_run_stats(db, run_id)
+    stats = db.execute(
+        select(RunStats).where(RunStats.run_id == run_id).with_for_update()
+    ).scalar_one_or_none()
+    if stats is None:
+        stats = init_run_stats(db, run_id)
+    stats.total_events = values["total_events"]
+    stats.last_sequence_no = values["last_sequence_no"]
+    stats.event_type_counts_json = values["event_type_counts"]
+    stats.determinism_mode_counts_json = values["determinism_mode_counts"]
+    stats.artifact_bytes = values["artifact_bytes"]
+    stats.updated_at_utc = _now()
+    return stats
+
+
+def rebuild_all_run_stats(
+    db: Session, run_ids: Iterable[str] | None = None, batch_size: int = 100
+) -> int:
+    if run_ids is None:
+        # Sealed runs would only be skipped one by one below.
+        run_ids = (
+            db.execute(
+                select(Run.run_id)
+                .where(~exists().where(RunSnapshot.run_id == Run.run_id))
+                .order_by(Run.run_id)
+            )
+            .scalars()
+            .all()
+        )
+    rebuilt = 0
+    for run_id in run_ids:
+        if rebuild_run_stats(db, run_id) is None:
+            continue
+        rebuilt += 1
+        if rebuilt % batch_size == 0:
+            db.commit()
+    db.commit()
+    return rebuilt
+
+
+def run_stats_dict(stats: RunStats) -> dict[str, Any]:
+    return {
+        "total_events": stats.total_events,
+        "last_sequence_no": stats.last_sequence_no,
+        "event_type_counts": dict(stats.event_type_counts_json or {}),
+        "determinism_mode_counts": dict(stats.determinism_mode_counts_json or {}),
+        "artifact_bytes": stats.artifact_bytes,
+    }
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import io
+from collections.abc import Iterator
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file object that buffers output until a streaming response drains it."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        if data:
+            self._chunks.append(bytes(data))
+            self._size += len(data)
+        return len(data)
+
+    def drain(self, min_bytes: int) -> Iterator[bytes]:
+        if self._size == 0 or self._size < min_bytes:
+            return
+        payload = b"".join(self._chunks)
+        self._chunks.clear()
+        self._size = 0
+        yield payload
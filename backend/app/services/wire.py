@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import io
+import threading
+import zlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from backend.app.config import settings
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+MSGPACK_CONTENT_TYPES = {MSGPACK_CONTENT_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+CONTENT_ENCODINGS = {"identity", "gzip", "zstd"}
+
+# zstd contexts are costly to build and not thread-safe, so each worker thread keeps one.
+_zstd_local = threading.local()
+
+
+def _wire_error(
+    status_code: int, code: str, message: str, details: dict[str, Any] | None = None
+) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail={"code": code, "message": message, "details": details or {}, "retryable": False},
+    )
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    message = "Decoded request body exceeds REQUEST_BODY_MAX_BYTES"
+    return _wire_error(413, "PAYLOAD_TOO_LARGE", message, {"max_bytes": max_bytes})
+
+
+def media_type(content_type: str | None) -> str:
+    return (content_type or JSON_CONTENT_TYPE).split(";", 1)[0].strip().lower()
+
+
+def decompress_body(body: bytes, content_encoding: str | None, max_bytes: int) -> bytes:
+    """Undo `Content-Encoding`, refusing bodies that inflate past `max_bytes`."""
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding not in CONTENT_ENCODINGS:
+        raise _wire_error(
+            415, "UNSUPPORTED_MEDIA_TYPE", f"Unsupported Content-Encoding '{encoding}'"
+        )
+    if encoding == "identity":
+        data = body
+    elif encoding == "gzip":
+        inflater = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        try:
+            data = inflater.decompress(body, max_bytes + 1)
+        except zlib.error as exc:
+            raise _wire_error(400, "VALIDATION_ERROR", f"Malformed gzip body: {exc}") from exc
+    else:
+        if zstandard is None:
+            raise _wire_error(
+                415, "UNSUPPORTED_MEDIA_TYPE", "zstd bodies require the optional zstandard package"
+            )
+        try:
+            data = _zstd_decompress(body, max_bytes)
+        except zstandard.ZstdError as exc:
+            raise _wire_error(400, "VALIDATION_ERROR", f"Malformed zstd body: {exc}") from exc
+    if len(data) > max_bytes:
+        raise _too_large(max_bytes)
+    return data
+
+
+def _zstd_decompress(body: bytes, max_bytes: int) -> bytes:
+    decompressor = getattr(_zstd_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    content_size = zstandard.frame_content_size(body)
+    if content_size > max_bytes:
+        raise _too_large(max_bytes)
+    if content_size >= 0:
+        return decompressor.decompress(body)
+    # No size in the frame header: stream it so the limit still bounds memory.
+    with decompressor.stream_reader(io.BytesIO(body)) as reader:
+        return reader.read(max_bytes + 1)
+
+
+def parse_body(model: type[BaseModel], body: bytes, content_type: str | None) -> BaseModel:
+    kind = media_type(content_type)
+    try:
+        if kind in MSGPACK_CONTENT_TYPES:
+            if msgpack is None:
+                raise _wire_error(
+                    415,
+                    "UNSUPPORTED_MEDIA_TYPE",
+                    "msgpack bodies require the optional msgpack package",
+                )
+            try:
+                # timestamp=3 decodes the msgpack timestamp extension straight to an aware datetime.
+                data = msgpack.unpackb(body, raw=False, timestamp=3)
+            except (ValueError, msgpack.UnpackException) as exc:
+                raise _wire_error(
+                    400, "VALIDATION_ERROR", f"Malformed msgpack body: {exc}"
+                ) from exc
+            return model.model_validate(data)
+        if kind == JSON_CONTENT_TYPE or kind.endswith("+json"):
+            return model.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)],
+            body=None,
+        ) from exc
+    raise _wire_error(
+        415,
+        "UNSUPPORTED_MEDIA_TYPE",
+        f"Unsupported Content-Type '{kind}'",
+        {"supported": [JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE]},
+    )
+
+
+def wire_body(model: type[BaseModel]) -> Callable[[Request], Awaitable[BaseModel]]:
+    """Dependency that parses a JSON or msgpack request body, optionally gzip/zstd encoded."""
+
+    async def dependency(http_request: Request) -> BaseModel:
+        body = decompress_body(
+            await http_request.body(),
+            http_request.headers.get("content-encoding"),
+            settings.request_body_max_bytes,
+        )
+        return parse_body(model, body, http_request.headers.get("content-type"))
+
+    return dependency
@@ -0,0 +1,178 @@
+"""Compare ingest req/s and latency between sync and async database modes.
+
+Usage:
+    python -m benchmarks.bench_async_ingest --clients 500 --events-per-client 20
+
+Starts the API under uvicorn once per mode (DATABASE_ASYNC=false, then true)
+against a throwaway SQLite database (or DATABASE_URL when set), and drives it
+with concurrent simulated SDK clients. Each client creates a run, posts its
+events one request at a time and reads the run back.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _event(run: dict, sequence_no: int) -> dict:
+    if sequence_no == 0:
+        event_type, payload = (
+            "run_started",
+            {"app_id": "bench", "environment": "bench", "entrypoint_name": "bench"},
+        )
+    else:
+        event_type, payload = (
+            "input_received",
+            {"input_channels": ["cli"], "input_hash": "h", "input_policy_labels": []},
+        )
+    return {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{sequence_no}",
+        "parent_step_id": None,
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": [],
+        "redaction_status": "not_required",
+        "payload": payload,
+    }
+
+
+async def _client(
+    http: httpx.AsyncClient, events: int, latencies: list[float], errors: list[int]
+) -> None:
+    async def call(method: str, path: str, **kwargs) -> dict | None:
+        started = time.perf_counter()
+        response = await http.request(method, path, **kwargs)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+            return None
+        return response.json()["data"]
+
+    run = await call("POST", "/api/v1/runs", json={"app_id": "bench", "environment": "bench"})
+    if run is None:
+        return
+    for sequence_no in range(events):
+        await call(
+            "POST",
+            f"/api/v1/runs/{run['run_id']}/events",
+            json={"idempotency_key": str(uuid.uuid4()), "event": _event(run, sequence_no)},
+        )
+    await call("GET", f"/api/v1/runs/{run['run_id']}")
+
+
+async def _drive(base_url: str, clients: int, events: int) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(_client(http, events, latencies, errors) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(value: float) -> float:
+        return (
+            round(latencies[min(int(len(latencies) * value), len(latencies) - 1)] * 1000, 1)
+            if latencies
+            else 0.0
+        )
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health/ready", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API server did not become ready")
+
+
+def run_mode(database_async: bool, database_url: str, clients: int, events: int) -> dict:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC": "true" if database_async else "false",
+        "AUTH_ENABLED": "false",
+    }
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "backend.app.main:app",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+    ]
+    proc = subprocess.Popen(command, env=env)
+    try:
+        _wait_ready(base_url, proc)
+        result = asyncio.run(_drive(base_url, clients, events))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return {"mode": "async" if database_async else "sync", **result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--events-per-client", type=int, default=20)
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-async-")
+    modes = {"sync": [False], "async": [True], "both": [False, True]}[args.mode]
+    for database_async in modes:
+        # A fresh database per mode so the second run does not ingest into a larger table.
+        database_url = os.environ.get("DATABASE_URL") or f"sqlite:///{workdir}/bench-{int(database_async)}.db"
+        result = run_mode(database_async, database_url, args.clients, args.events_per_client)
+        print(
+            json.dumps(
+                {"database": database_url.split(":", 1)[0], "clients": args.clients, **result}
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Measure bundle import throughput in events/s.
+
+Usage:
+    python -m benchmarks.bench_bundle_import --events 50000 --chunk-size 2000
+
+Builds a synthetic bundle in memory and imports it into a throwaway SQLite
+database (or DATABASE_URL when set).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import json
+import os
+import tarfile
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+
+def build_bundle(event_count: int, events_per_step: int = 4) -> bytes:
+    run_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc).isoformat()
+    step_count = (event_count + events_per_step - 1) // events_per_step
+
+    def member(archive: tarfile.TarFile, name: str, payload: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(payload)
+        archive.addfile(info, io.BytesIO(payload))
+
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=1) as compressed:
+        with tarfile.open(fileobj=compressed, mode="w|") as archive:
+            manifest = {
+                "bundle_format_version": 1,
+                "bundle_id": str(uuid.uuid4()),
+                "bundle_profile": "minimal_failure",
+                "run_id": run_id,
+                "event_count": event_count,
+                "step_count": step_count,
+                "artifact_count": 0,
+                "artifact_content_included": False,
+            }
+            member(archive, "manifest.json", json.dumps(manifest).encode("utf-8"))
+            run = {
+                "run_id": run_id,
+                "trace_id": str(uuid.uuid4()),
+                "app_id": "bench",
+                "environment": "bench",
+                "status": "success",
+                "started_at_utc": now,
+                "ended_at_utc": now,
+                "source_type": "live",
+                "source_run_id": None,
+                "tags": {},
+                "retention_class": "dev_short",
+            }
+            member(archive, "run.json", json.dumps(run).encode("utf-8"))
+
+            steps = [
+                {
+                    "step_id": f"step-{index}",
+                    "run_id": run_id,
+                    "parent_step_id": None,
+                    "sequence_no": index * events_per_step,
+                    "step_type": "model_called",
+                    "started_at_utc": now,
+                    "ended_at_utc": now,
+                    "determinism_mode": "live",
+                }
+                for index in range(step_count)
+            ]
+            for page, start in enumerate(range(0, len(steps), 500)):
+                lines = b"".join(
+                    json.dumps(step).encode("utf-8") + b"\n" for step in steps[start : start + 500]
+                )
+                member(archive, f"steps/{page:06d}.ndjson", lines)
+
+            for page, start in enumerate(range(0, event_count, 500)):
+                lines = []
+                for sequence_no in range(start, min(start + 500, event_count)):
+                    event = {
+                        "event_id": str(uuid.uuid4()),
+                        "run_id": run_id,
+                        "step_id": f"step-{sequence_no // events_per_step}",
+                        "parent_step_id": None,
+                        "event_type": "model_result",
+                        "schema_version": "1.0.0",
+                        "payload": {
+                            "model_id": "bench",
+                            "latency_ms": sequence_no % 500,
+                            "finish_reason": "stop",
+                        },
+                        "redaction_status": "not_required",
+                        "created_at_utc": now,
+                        "idempotency_key": f"{run_id}:{sequence_no}",
+                        "sequence_no": sequence_no,
+                        "timestamp_utc": now,
+                        "actor_type": "sdk",
+                        "determinism_mode": "live",
+                        "artifact_pending": False,
+                        "artifact_refs": [],
+                    }
+                    lines.append(json.dumps(event).encode("utf-8") + b"\n")
+                member(archive, f"events/{page:06d}.ndjson", b"".join(lines))
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-import-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("ARTIFACT_LOCAL_DIR", f"{workdir}/artifacts")
+
+    from backend.app.db.session import Base, SessionLocal, engine
+    from backend.app.modules.bundles.service import import_bundle
+    from backend.app.services.artifact_store import build_artifact_store
+
+    Base.metadata.create_all(bind=engine)
+    bundle = build_bundle(args.events)
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = import_bundle(
+            db, build_artifact_store(), io.BytesIO(bundle), chunk_size=args.chunk_size
+        )
+    elapsed = time.perf_counter() - started
+
+    print(
+        json.dumps(
+            {
+                "database": engine.dialect.name,
+                "events": result["events_loaded"],
+                "chunk_size": args.chunk_size,
+                "bundle_bytes": len(bundle),
+                "seconds": round(elapsed, 3),
+                "events_per_second": round(result["events_loaded"] / elapsed, 1),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Compare the legacy text key layout with the compact one: table size, index size and insert rate.
+
+Usage:
+    python -m benchmarks.bench_compact_keys --events 200000 --runs 200
+    DATABASE_URL=postgresql+psycopg://localhost/bench python -m benchmarks.bench_compact_keys
+
+`legacy` stores ids and label columns as VARCHAR and issues random UUIDv4 keys; `compact`
+is the current schema (native uuid and enum columns on Postgres) with time-ordered UUIDv7
+keys. Each layout gets freshly created runs/steps/events tables, so DATABASE_URL must point
+at a throwaway database. SQLite stores text either way; there only the key order differs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+
+def _tables(layout: str) -> list[Any]:
+    from sqlalchemy import DDL, Enum, MetaData, String, event
+
+    from backend.app.db.models import SEARCH_DDL, SEARCH_TABLES, Event, Run, Step, UUIDString
+
+    tables = [Run.__table__, Step.__table__, Event.__table__]
+    if layout == "compact":
+        return tables
+    metadata = MetaData()
+    copies = [table.to_metadata(metadata) for table in tables]
+    for table in copies:
+        for column in table.columns:
+            if isinstance(column.type, (UUIDString, Enum)):
+                column.type = String(64)
+    # Table copies do not carry the search triggers, which every events insert pays for.
+    events = copies[-1]
+    for dialect, statements in SEARCH_DDL["events"].items():
+        for statement in statements:
+            event.listen(events, "after_create", DDL(statement).execute_if(dialect=dialect))
+    drop_search = DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLES['events']}").execute_if(
+        dialect="sqlite"
+    )
+    event.listen(events, "after_drop", drop_search)
+    return copies
+
+
+def _sizes(connection: Any, table: str) -> tuple[int, int]:
+    from sqlalchemy import text
+
+    if connection.dialect.name == "postgresql":
+        row = connection.execute(
+            text(f"SELECT pg_table_size('{table}'), pg_indexes_size('{table}')")
+        ).one()
+        return int(row[0]), int(row[1])
+    indexes = [
+        name
+        for (name,) in connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table},
+        )
+    ]
+    sizes = dict(
+        connection.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all()
+    )
+    return int(sizes.get(table, 0)), sum(int(sizes.get(name, 0)) for name in indexes)
+
+
+def run_layout(database_url: str, layout: str, events: int, runs: int, batch: int) -> dict:
+    from sqlalchemy import create_engine, insert
+
+    from backend.app.db.models import idempotency_key_hash, new_id
+    from backend.app.db.session import configure_engine
+
+    make_id = new_id if layout == "compact" else lambda: str(uuid.uuid4())
+    run_table, step_table, event_table = tables = _tables(layout)
+    engine = configure_engine(create_engine(database_url))
+    metadata = run_table.metadata
+    metadata.drop_all(engine, tables=tables[::-1])
+    metadata.create_all(engine, tables=tables)
+
+    now = datetime.now(timezone.utc)
+    run_ids = [make_id() for _ in range(runs)]
+    with engine.begin() as connection:
+        connection.execute(
+            insert(run_table),
+            [
+                {
+                    "run_id": run_id,
+                    "trace_id": run_id,
+                    "app_id": "bench",
+                    "environment": "bench",
+                    "status": "running",
+                    "started_at_utc": now,
+                    "source_type": "live",
+                    "tags_json": {},
+                    "retention_class": "dev_short",
+                    "legal_hold": False,
+                }
+                for run_id in run_ids
+            ],
+        )
+
+    per_run = max(events // runs, 1)
+    pending_steps: list[dict] = []
+    pending_events: list[dict] = []
+    started = time.perf_counter()
+
+    def flush() -> None:
+        with engine.begin() as connection:
+            connection.execute(insert(step_table), pending_steps)
+            connection.execute(insert(event_table), pending_events)
+        pending_steps.clear()
+        pending_events.clear()
+
+    # Runs are written concurrently in practice,
+    # so sequence numbers advance across all runs together.
+    for sequence_no in range(per_run):
+        for run_id in run_ids:
+            step_id = f"{run_id}:{sequence_no}"
+            pending_steps.append(
+                {
+                    "step_id": step_id,
+                    "run_id": run_id,
+                    "sequence_no": sequence_no,
+                    "step_type": "tool_called",
+                    "started_at_utc": now,
+                    "determinism_mode": "live",
+                }
+            )
+            pending_events.append(
+                {
+                    "event_id": make_id(),
+                    "run_id": run_id,
+                    "step_id": step_id,
+                    "event_type": "tool_called",
+                    "schema_version": "1.0.0",
+                    "payload_json": {"tool_name": "search", "timeout_ms": 1000},
+                    "redaction_status": "not_required",
+                    "created_at_utc": now,
+                    "idempotency_key": step_id,
+                    "idempotency_hash": idempotency_key_hash(step_id),
+                    "sequence_no": sequence_no,
+                    "timestamp_utc": now,
+                    "actor_type": "sdk",
+                    "determinism_mode": "live",
+                    "artifact_pending": False,
+                }
+            )
+            if len(pending_events) >= batch:
+                flush()
+    if pending_events:
+        flush()
+    elapsed = time.perf_counter() - started
+    total = per_run * runs
+
+    with engine.connect() as connection:
+        table_bytes, index_bytes = _sizes(connection, "events")
+    metadata.drop_all(engine, tables=tables[::-1])
+    engine.dispose()
+    return {
+        "layout": layout,
+        "dialect": engine.dialect.name,
+        "events": total,
+        "events_per_second": round(total / elapsed, 1),
+        "events_table_mib": round(table_bytes / 2**20, 2),
+        "events_index_mib": round(index_bytes / 2**20, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--layouts", default="legacy,compact")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-keys-")
+    database_url = os.environ.get("DATABASE_URL") or f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("DATABASE_URL", database_url)
+    for layout in args.layouts.split(","):
+        print(json.dumps(run_layout(database_url, layout, args.events, args.runs, args.batch)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Seal finished runs into snapshots; compare database size and list_events pages before and after.
+
+Usage:
+    python -m benchmarks.bench_compaction --runs 200 --events 200
+    DATABASE_URL=postgresql+psycopg://localhost/bench python -m benchmarks.bench_compaction
+
+Ingests `--runs` completed runs of `--events` events each into a throwaway SQLite
+database (or DATABASE_URL), ages them past the seal threshold and seals them. It reports
+the size of the events and sealed_event_ids tables before and after (SQLite sizes are taken
+after VACUUM), the snapshot bytes written to the artifact store and the time to page
+through every run's events.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def _payload(sequence_no: int, last: int) -> tuple[str, dict]:
+    if sequence_no == 0:
+        return "run_started", {
+            "app_id": "bench",
+            "environment": "bench",
+            "entrypoint_name": "bench",
+        }
+    if sequence_no == last:
+        return "run_completed", {"status": "success", "total_steps": last, "total_latency_ms": last}
+    return "input_received", {
+        "input_channels": ["cli"],
+        "input_hash": f"{sequence_no:064x}",
+        "input_policy_labels": ["pii:none", "tenant:bench"],
+        "note": f"step {sequence_no} of a benchmark run with a modestly sized payload",
+    }
+
+
+def _events_bytes(db) -> int:
+    from sqlalchemy import text
+
+    if db.get_bind().dialect.name == "postgresql":
+        sizes = "pg_total_relation_size('events') + pg_total_relation_size('sealed_event_ids')"
+        return int(db.execute(text(f"SELECT {sizes}")).scalar_one())
+    db.commit()
+    db.connection().exec_driver_sql("VACUUM")
+    query = "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'event%' OR name LIKE 'sealed_event%'"
+    return int(db.execute(text(query)).scalar_one() or 0)
+
+
+def _page_all(db, run_ids: list[str]) -> float:
+    from backend.app.modules.query.service import list_events
+
+    started = time.perf_counter()
+    for run_id in run_ids:
+        page_token = None
+        while True:
+            _, page_token = list_events(db, run_id, page_size=200, page_token=page_token)
+            if page_token is None:
+                break
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-compaction-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("ARTIFACT_LOCAL_DIR", f"{workdir}/artifacts")
+
+    from sqlalchemy import update
+
+    from backend.app.db.models import Run
+    from backend.app.db.session import Base, SessionLocal, engine
+    from backend.app.modules.compaction.service import seal_runs
+    from backend.app.modules.ingestion.service import create_run, ingest_event
+    from backend.app.schemas.api import CreateRunRequest
+    from backend.app.schemas.events import CanonicalEvent
+    from backend.app.services.artifact_store import get_artifact_store
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    run_ids: list[str] = []
+    with SessionLocal() as db:
+        for _ in range(args.runs):
+            run = create_run(db, CreateRunRequest(app_id="bench", environment="bench"))
+            run_ids.append(run.run_id)
+            for sequence_no in range(args.events):
+                event_type, payload = _payload(sequence_no, args.events - 1)
+                event = CanonicalEvent(
+                    trace_id=run.trace_id,
+                    run_id=run.run_id,
+                    step_id=f"{run.run_id}:{sequence_no}",
+                    sequence_no=sequence_no,
+                    event_type=event_type,
+                    timestamp_utc=datetime.now(timezone.utc),
+                    payload=payload,
+                )
+                ingest_event(db, run, f"{run.run_id}:{sequence_no}", event)
+        db.execute(update(Run).values(ended_at_utc=datetime.now(timezone.utc) - timedelta(days=30)))
+        db.commit()
+
+        before_bytes = _events_bytes(db)
+        live_seconds = _page_all(db, run_ids)
+        started = time.perf_counter()
+        report = seal_runs(db, get_artifact_store(), seal_after_days=7)
+        seal_seconds = time.perf_counter() - started
+        after_bytes = _events_bytes(db)
+        # Each run's snapshot is decoded on first read;
+        # re-reading one run is served from the process cache.
+        cold_seconds = _page_all(db, run_ids)
+        warm_seconds = _page_all(db, run_ids[:1] * args.runs)
+
+    print(
+        json.dumps(
+            {
+                "runs": args.runs,
+                "events": report.events_moved,
+                "seal_seconds": round(seal_seconds, 2),
+                "events_tables_mib_before": round(before_bytes / 2**20, 2),
+                "events_tables_mib_after": round(after_bytes / 2**20, 2),
+                "snapshot_raw_mib": round(report.raw_bytes / 2**20, 2),
+                "snapshot_stored_mib": round(report.stored_bytes / 2**20, 2),
+                "list_ms_per_run_live": round(live_seconds / args.runs * 1000, 2),
+                "list_ms_per_run_sealed_cold": round(cold_seconds / args.runs * 1000, 2),
+                "list_ms_per_run_sealed_cached": round(warm_seconds / args.runs * 1000, 2),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Measure how event ingest scales with concurrent writer threads.
+
+Usage:
+    python -m benchmarks.bench_concurrent_ingest --threads 1,2,4,8,16 --events 2000
+    SQLITE_JOURNAL_MODE=DELETE python -m benchmarks.bench_concurrent_ingest
+
+Each writer thread owns a session and ingests events into its own run through
+the same service call the API uses. Every thread count starts on a fresh
+throwaway SQLite database (or DATABASE_URL when set). Errors such as
+"database is locked" are counted, not retried.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+
+def _payload(sequence_no: int) -> tuple[str, dict]:
+    if sequence_no == 0:
+        return "run_started", {
+            "app_id": "bench",
+            "environment": "bench",
+            "entrypoint_name": "bench",
+        }
+    return "input_received", {
+        "input_channels": ["cli"],
+        "input_hash": str(sequence_no),
+        "input_policy_labels": [],
+    }
+
+
+def _writer(events: int, latencies: list[float], errors: list[str]) -> None:
+    from backend.app.db.session import SessionLocal
+    from backend.app.modules.ingestion.service import create_run, ingest_event
+    from backend.app.schemas.api import CreateRunRequest
+    from backend.app.schemas.events import CanonicalEvent
+
+    with SessionLocal() as db:
+        run = create_run(db, CreateRunRequest(app_id="bench", environment="bench"))
+        for sequence_no in range(events):
+            event_type, payload = _payload(sequence_no)
+            event = CanonicalEvent(
+                schema_version="1.0.0",
+                trace_id=run.trace_id,
+                run_id=run.run_id,
+                step_id=f"{run.run_id}:{sequence_no}",
+                sequence_no=sequence_no,
+                event_type=event_type,
+                timestamp_utc=datetime.now(timezone.utc),
+                payload=payload,
+            )
+            started = time.perf_counter()
+            try:
+                ingest_event(db, run, f"{run.run_id}:{sequence_no}", event)
+            except Exception as exc:  # noqa: BLE001
+                db.rollback()
+                errors.append(str(getattr(exc, "orig", exc)) or type(exc).__name__)
+                continue
+            latencies.append(time.perf_counter() - started)
+
+
+def run_threads(thread_count: int, total_events: int) -> dict:
+    from backend.app.db import models  # noqa: F401
+    from backend.app.db.session import Base, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    latencies: list[float] = []
+    errors: list[str] = []
+    per_thread = max(total_events // thread_count, 1)
+    threads = [
+        threading.Thread(target=_writer, args=(per_thread, latencies, errors))
+        for _ in range(thread_count)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] if latencies else 0.0
+    return {
+        "threads": thread_count,
+        "events": len(latencies),
+        "errors": len(errors),
+        "error_kinds": sorted(set(errors)),
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(len(latencies) / elapsed, 1),
+        "p99_ms": round(p99 * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", default="1,2,4,8,16")
+    parser.add_argument(
+        "--events", type=int, default=2000, help="events per thread count, split across threads"
+    )
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-concurrent-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("ARTIFACT_LOCAL_DIR", f"{workdir}/artifacts")
+
+    from backend.app.config import settings
+    from backend.app.db.session import engine
+
+    for thread_count in (int(value) for value in args.threads.split(",")):
+        result = run_threads(thread_count, args.events)
+        mode = settings.sqlite_journal_mode if engine.dialect.name == "sqlite" else None
+        print(json.dumps({"database": engine.dialect.name, "journal_mode": mode, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Compare per-event requests with one streaming NDJSON ingest request.
+
+Usage:
+    python -m benchmarks.bench_ingest_stream --events 5000
+    python -m benchmarks.bench_ingest_stream --events 5000 --runs 10
+
+Starts the API under uvicorn against a throwaway SQLite database (or
+DATABASE_URL when set). "requests" mode sends each event with
+`TraceClient.emit_event` on a keep-alive connection. "stream" mode sends the
+same events as lines of one `/api/v1/ingest/stream` request via
+`TraceClient.stream_lines`. Events are spread round-robin across `--runs` runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_async_ingest import _free_port, _wait_ready
+
+
+def _bodies(client, runs: list, events: int) -> list[dict]:
+    bodies = []
+    for index in range(events):
+        run = runs[index % len(runs)]
+        sequence_no = index // len(runs)
+        if sequence_no == 0:
+            event_type, payload = (
+                "run_started",
+                {"app_id": "bench", "environment": "bench", "entrypoint_name": "bench"},
+            )
+        else:
+            event_type = "input_received"
+            payload = {
+                "input_channels": ["cli"],
+                "input_hash": str(index),
+                "input_policy_labels": [],
+            }
+        bodies.append(
+            client.event_body(
+                event_type=event_type,
+                sequence_no=sequence_no,
+                step_id=f"{run.run_id}:{sequence_no}",
+                payload=payload,
+                run_id=run.run_id,
+                trace_id=run.trace_id,
+            )
+        )
+    return bodies
+
+
+def run_mode(mode: str, base_url: str, events: int, run_count: int) -> dict:
+    from sdk.python.trace_sdk.client import TraceClient
+
+    client = TraceClient(
+        api_url=base_url, timeout=300.0, wire_format="json", compression="identity"
+    )
+    runs = [client.start_run(app_id="bench", environment="bench") for _ in range(run_count)]
+    bodies = _bodies(client, runs, events)
+    errors = 0
+    started = time.perf_counter()
+    if mode == "requests":
+        for body in bodies:
+            event = body["event"]
+            client.emit_event(
+                event_type=event["event_type"],
+                sequence_no=event["sequence_no"],
+                step_id=event["step_id"],
+                payload=event["payload"],
+                idempotency_key=body["idempotency_key"],
+                run_id=event["run_id"],
+                trace_id=event["trace_id"],
+            )
+    else:
+        acks = 0
+        for ack in client.stream_lines({"kind": "event", **body} for body in bodies):
+            acks += 1
+            errors += ack["status"] != "success"
+        assert acks == events, f"expected {events} acks, got {acks}"
+    elapsed = time.perf_counter() - started
+    client.close()
+    return {
+        "mode": mode,
+        "events": events,
+        "runs": run_count,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(events / elapsed, 1),
+        "us_per_event": round(elapsed / events * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--mode", choices=["requests", "stream", "both"], default="both")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-stream-")
+    modes = ["requests", "stream"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        database_url = os.environ.get("DATABASE_URL") or f"sqlite:///{workdir}/bench-{mode}.db"
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        env = {**os.environ, "DATABASE_URL": database_url, "AUTH_ENABLED": "false"}
+        command = [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(port)]
+        proc = subprocess.Popen([*command, "--log-level", "warning"], env=env)
+        try:
+            _wait_ready(base_url, proc)
+            result = run_mode(mode, base_url, args.events, args.runs)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        print(json.dumps({"database": database_url.split(":", 1)[0], **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Compare sustained ingest events/s: per-event commit vs the group-commit ingest log.
+
+Usage:
+    python -m benchmarks.bench_ingest_wal --threads 16 --events 4000
+
+Writer threads each ingest into their own run. "commit" mode calls the
+per-event service path (one transaction and fsync per event). "wal" mode
+acknowledges each event after a shared log fsync and lets the committer batch
+them into the database. Throughput counts until every event is in the
+database. Uses a throwaway SQLite database (or DATABASE_URL when set).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+
+def _event(run_id: str, trace_id: str, sequence_no: int):
+    from backend.app.schemas.events import CanonicalEvent
+
+    if sequence_no == 0:
+        event_type, payload = (
+            "run_started",
+            {"app_id": "bench", "environment": "bench", "entrypoint_name": "bench"},
+        )
+    else:
+        event_type, payload = (
+            "input_received",
+            {"input_channels": ["cli"], "input_hash": "h", "input_policy_labels": []},
+        )
+    return CanonicalEvent(
+        trace_id=trace_id,
+        run_id=run_id,
+        step_id=f"{run_id}:{sequence_no}",
+        sequence_no=sequence_no,
+        event_type=event_type,
+        timestamp_utc=datetime.now(timezone.utc),
+        payload=payload,
+    )
+
+
+def run_mode(mode: str, thread_count: int, total_events: int, workdir: str) -> dict:
+    from backend.app.db import models  # noqa: F401
+    from backend.app.db.session import Base, SessionLocal, engine
+    from backend.app.modules.ingestion.service import create_run, get_run_or_error, ingest_event
+    from backend.app.modules.ingestion.wal import IngestWal
+    from backend.app.schemas.api import CreateRunRequest
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    wal = (
+        IngestWal(os.path.join(workdir, f"wal-{time.monotonic_ns()}"), SessionLocal)
+        if mode == "wal"
+        else None
+    )
+    if wal is not None:
+        wal.start()
+
+    with SessionLocal() as db:
+        runs = []
+        for _ in range(thread_count):
+            run = create_run(db, CreateRunRequest(app_id="bench", environment="bench"))
+            runs.append((run.run_id, run.trace_id))
+    per_thread = max(total_events // thread_count, 1)
+    latencies: list[float] = []
+
+    def writer(run_id: str, trace_id: str) -> None:
+        with SessionLocal() as db:
+            run = get_run_or_error(db, run_id)
+            for sequence_no in range(per_thread):
+                event = _event(run_id, trace_id, sequence_no)
+                key = f"{run_id}:{sequence_no}"
+                started = time.perf_counter()
+                if wal is not None:
+                    wal.ingest(run_id, key, event)
+                else:
+                    ingest_event(db, run, key, event)
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=writer, args=run) for run in runs]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    acknowledged = time.perf_counter() - started
+    if wal is not None:
+        wal.wait_committed()
+        wal.stop()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "threads": thread_count,
+        "events": len(latencies),
+        "ack_seconds": round(acknowledged, 3),
+        "committed_seconds": round(elapsed, 3),
+        "events_per_second": round(len(latencies) / elapsed, 1),
+        "ack_p99_ms": round(
+            latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000, 2
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument(
+        "--events", type=int, default=4000, help="total events, split across threads"
+    )
+    parser.add_argument("--mode", choices=["commit", "wal", "both"], default="both")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-wal-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("ARTIFACT_LOCAL_DIR", f"{workdir}/artifacts")
+
+    from backend.app.db.session import engine
+
+    modes = ["commit", "wal"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = run_mode(mode, args.threads, args.events, workdir)
+        print(json.dumps({"database": engine.dialect.name, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compare inline and offloaded large event payloads: ingest, table size and list_events pages.
+
+Usage:
+    python -m benchmarks.bench_payload_offload --events 2000 --field-kib 256
+    python -m benchmarks.bench_payload_offload --offload-bytes 0,65536
+
+Ingests `--events` events, each carrying one `--field-kib` field, into a throwaway
+SQLite database per threshold (0 keeps payloads inline). Then it times full-payload
+list_events pages of 200 and reports the database file size (the artifact store is
+not counted).
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+
+def run_mode(workdir: str, offload_bytes: int, events: int, field_kib: int) -> dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import backend.app.modules.ingestion.service as ingestion_service
+    from backend.app.db.models import Run
+    from backend.app.db.session import Base, configure_engine
+    from backend.app.modules.query.service import list_events
+    from backend.app.schemas.events import CanonicalEvent
+
+    path = f"{workdir}/offload-{offload_bytes}.db"
+    engine = configure_engine(create_engine(f"sqlite:///{path}"))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    ingestion_service.settings = dataclasses.replace(
+        ingestion_service.settings, event_payload_offload_bytes=offload_bytes
+    )
+
+    run_id = str(uuid.uuid4())
+    filler = "x" * (field_kib * 1024)
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        run = Run(
+            run_id=run_id, trace_id=run_id, app_id="bench", environment="bench", status="running"
+        )
+        db.add(run)
+        db.commit()
+        started = time.perf_counter()
+        for sequence_no in range(events):
+            if sequence_no == 0:
+                event_type = "run_started"
+                payload = {"app_id": "bench", "environment": "bench", "entrypoint_name": "bench"}
+            else:
+                event_type = "input_received"
+                payload = {
+                    "input_channels": ["cli"],
+                    "input_hash": str(sequence_no),
+                    "input_policy_labels": [],
+                }
+            # Distinct per event, so content addressing does not collapse the offloaded fields.
+            payload["transcript"] = f"{sequence_no}:{filler}"
+            event = CanonicalEvent(
+                trace_id=run_id,
+                run_id=run_id,
+                step_id=f"{run_id}:{sequence_no}",
+                sequence_no=sequence_no,
+                event_type=event_type,
+                timestamp_utc=now,
+                payload=payload,
+            )
+            ingestion_service.ingest_event(db, run, f"{run_id}:{sequence_no}", event)
+        ingest_seconds = time.perf_counter() - started
+
+        pages = 0
+        started = time.perf_counter()
+        page_token = None
+        while True:
+            _, page_token = list_events(db, run_id, page_size=200, page_token=page_token)
+            pages += 1
+            if page_token is None:
+                break
+        list_seconds = time.perf_counter() - started
+    engine.dispose()
+    db_bytes = os.path.getsize(path)
+    os.remove(path)
+
+    return {
+        "offload_bytes": offload_bytes,
+        "events": events,
+        "field_kib": field_kib,
+        "ingest_events_per_second": round(events / ingest_seconds, 1),
+        "list_ms_per_page": round(list_seconds / pages * 1000, 2),
+        "db_mib": round(db_bytes / 2**20, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--field-kib", type=int, default=256)
+    parser.add_argument("--offload-bytes", default="0,65536")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-offload-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/unused.db")
+    os.environ.setdefault("ARTIFACT_LOCAL_DIR", f"{workdir}/artifacts")
+    for offload_bytes in (int(value) for value in args.offload_bytes.split(",")):
+        print(json.dumps(run_mode(workdir, offload_bytes, args.events, args.field_kib)))
+
+
+if __name__ == "__main__":
+    main()
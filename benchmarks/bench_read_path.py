@@ -0,0 +1,145 @@
+"""Compare rows/s of list endpoint pages built via ORM objects and pydantic models vs column rows.
+
+Usage:
+    python -m benchmarks.bench_read_path --events 5000 --runs 2000
+    DATABASE_URL=postgresql+psycopg://localhost/bench python -m benchmarks.bench_read_path
+
+Seeds a throwaway SQLite database (or DATABASE_URL) and times query plus response body for
+full pages: 500 events per page of List Run Events and 200 runs (its cap) per page of List Runs.
+The `legacy` path is what the handlers did before: runs loaded as ORM objects and copied into
+dicts, each page validated into its response model, then `model_dump`, `jsonable_encoder` and
+`json.dumps` of the envelope. The `core` path selects columns and writes the envelope with
+`responses.dumps` (orjson when installed). No HTTP server is involved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def _timed(build, pages: int) -> float:
+    started = time.perf_counter()
+    for _ in range(pages):
+        build()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-read-path-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import insert, select
+
+    from backend.app.db.models import Event, Run, new_id
+    from backend.app.db.session import Base, SessionLocal, engine
+    from backend.app.modules.query.service import list_events, list_runs, run_to_summary_dict
+    from backend.app.schemas.api import ListEventsResponse, ListRunsResponse
+    from backend.app.services.responses import dumps, success_body, success_envelope
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    run_rows = [
+        {
+            "run_id": new_id(),
+            "trace_id": new_id(),
+            "app_id": "bench",
+            "environment": "bench",
+            "status": "success",
+            "source_type": "live",
+            "started_at_utc": now - timedelta(seconds=index),
+            "ended_at_utc": now,
+            "retention_class": "dev_short",
+        }
+        for index in range(max(args.runs, 1))
+    ]
+    run_id = run_rows[0]["run_id"]
+    event_rows = [
+        {
+            "event_id": new_id(),
+            "run_id": run_id,
+            "step_id": f"step-{sequence_no // 2}",
+            "event_type": "input_received",
+            "schema_version": "1.0.0",
+            "payload_json": {
+                "input_channels": ["cli"],
+                "input_hash": f"{sequence_no:064x}",
+                "input_policy_labels": ["pii:none", "tenant:bench"],
+                "note": f"step {sequence_no} of a benchmark run",
+            },
+            "idempotency_key": f"{run_id}:{sequence_no}",
+            "sequence_no": sequence_no,
+            "timestamp_utc": now,
+        }
+        for sequence_no in range(args.events)
+    ]
+    with SessionLocal() as db:
+        db.execute(insert(Run), run_rows)
+        db.execute(insert(Event), event_rows)
+        db.commit()
+
+    with SessionLocal() as db:
+
+        def legacy_body(model, req_id: str = "bench") -> bytes:
+            envelope = jsonable_encoder(success_envelope(req_id, model.model_dump(mode="json")))
+            return json.dumps(
+                envelope, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+            ).encode("utf-8")
+
+        def legacy_events() -> bytes:
+            rows, token = list_events(db, run_id, page_size=500)
+            return legacy_body(ListEventsResponse(items=rows, next_page_token=token))
+
+        def core_events() -> bytes:
+            rows, token = list_events(db, run_id, page_size=500)
+            return success_body("bench", dumps({"items": rows, "next_page_token": token}))
+
+        def legacy_runs() -> bytes:
+            stmt = select(Run).order_by(Run.started_at_utc.desc(), Run.run_id.desc()).limit(201)
+            runs = list(db.execute(stmt).scalars().all())[:200]
+            return legacy_body(ListRunsResponse(items=[run_to_summary_dict(run) for run in runs]))
+
+        def core_runs() -> bytes:
+            rows, token = list_runs(db, page_size=200)
+            return success_body("bench", dumps({"items": rows, "next_page_token": token}))
+
+        assert json.loads(legacy_events()) == json.loads(core_events())
+        assert (
+            json.loads(legacy_runs())["data"]["items"] == json.loads(core_runs())["data"]["items"]
+        )
+        event_page_rows = min(args.events, 500)
+        run_page_rows = min(len(run_rows), 200)
+        results = {}
+        for name, build, rows_per_page in (
+            ("events_legacy", legacy_events, event_page_rows),
+            ("events_core", core_events, event_page_rows),
+            ("runs_legacy", legacy_runs, run_page_rows),
+            ("runs_core", core_runs, run_page_rows),
+        ):
+            db.expunge_all()
+            build()
+            seconds = _timed(build, args.pages)
+            results[f"{name}_rows_per_s"] = round(rows_per_page * args.pages / seconds)
+            results[f"{name}_ms_per_page"] = round(seconds / args.pages * 1000, 2)
+
+    print(
+        json.dumps(
+            {"events_page_rows": event_page_rows, "runs_page_rows": run_page_rows, **results}
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare bytes on the wire and server parse time for ingest request encodings.
+
+Usage:
+    python -m benchmarks.bench_wire_format --events 5000
+    python -m benchmarks.bench_wire_format --artifact-kib 256
+
+Bodies are encoded with the SDK's `TraceClient.encode_body` and decoded with
+the API's body dependency helpers (Content-Encoding, then JSON or msgpack into
+the pydantic request model), so both sides match what runs in production. No
+database or HTTP server is involved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+ENCODINGS = [
+    ("json", "identity"),
+    ("json", "gzip"),
+    ("json", "zstd"),
+    ("msgpack", "identity"),
+    ("msgpack", "zstd"),
+]
+
+
+def _event_body(run_id: str, trace_id: str, sequence_no: int) -> dict:
+    return {
+        "idempotency_key": f"{run_id}:model:{sequence_no}",
+        "event": {
+            "schema_version": "1.0.0",
+            "trace_id": trace_id,
+            "run_id": run_id,
+            "step_id": f"step-{sequence_no // 2}",
+            "parent_step_id": None,
+            "sequence_no": sequence_no,
+            "event_type": "model_called",
+            "timestamp_utc": datetime.now(timezone.utc),
+            "actor_type": "sdk",
+            "determinism_mode": "live",
+            "artifact_refs": [
+                {
+                    "artifact_hash": uuid.uuid4().hex * 2,
+                    "artifact_type": "prompt",
+                    "byte_size": 4096,
+                    "mime_type": "application/json",
+                    "content_encoding": "identity",
+                }
+            ],
+            "redaction_status": "not_required",
+            "payload": {
+                "provider": "openai",
+                "model_id": "gpt-4.1",
+                "model_api_version": "v1",
+                "temperature": 0.2,
+                "top_p": 1,
+                "max_tokens": 512,
+                "request_ref": uuid.uuid4().hex,
+            },
+        },
+    }
+
+
+def measure(name: str, bodies: list[dict], model: type, wire_format: str, compression: str) -> dict:
+    from backend.app.services.wire import decompress_body, parse_body
+    from sdk.python.trace_sdk.client import TraceClient
+
+    client = TraceClient(wire_format=wire_format, compression=compression, compress_min_bytes=0)
+    started = time.perf_counter()
+    encoded = [client.encode_body(body) for body in bodies]
+    encode_seconds = time.perf_counter() - started
+    client.close()
+
+    started = time.perf_counter()
+    for content, headers in encoded:
+        raw = decompress_body(content, headers.get("content-encoding"), 1 << 30)
+        parse_body(model, raw, headers["content-type"])
+    parse_seconds = time.perf_counter() - started
+    wire_bytes = sum(len(content) for content, _ in encoded)
+    return {
+        "body": name,
+        "wire_format": wire_format,
+        "compression": compression,
+        "requests": len(bodies),
+        "wire_bytes_per_request": round(wire_bytes / len(bodies), 1),
+        "sdk_encode_us_per_request": round(encode_seconds / len(bodies) * 1e6, 1),
+        "api_parse_us_per_request": round(parse_seconds / len(bodies) * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--artifacts", type=int, default=200)
+    parser.add_argument("--artifact-kib", type=int, default=64)
+    args = parser.parse_args()
+
+    from backend.app.schemas.api import IngestEventRequest, RegisterArtifactRequest
+
+    run_id, trace_id = str(uuid.uuid4()), str(uuid.uuid4())
+    events = [_event_body(run_id, trace_id, sequence_no) for sequence_no in range(args.events)]
+    # Prompt-like artifact content: repetitive text with some entropy, like real model transcripts.
+    line = b'{"role": "user", "content": "Summarize the attached ticket and propose next steps."}\n'
+    artifacts = []
+    for _ in range(args.artifacts):
+        content = (line * (args.artifact_kib * 1024 // len(line) + 1))[
+            : args.artifact_kib * 1024 - 32
+        ]
+        artifacts.append(
+            {"artifact_type": "prompt", "content": content + os.urandom(16).hex().encode()}
+        )
+
+    for wire_format, compression in ENCODINGS:
+        print(json.dumps(measure("event", events, IngestEventRequest, wire_format, compression)))
+    for wire_format, compression in ENCODINGS:
+        # Mirrors TraceClient.register_artifact: raw bytes for msgpack, base64 text for JSON.
+        field = "content_bytes" if wire_format == "msgpack" else "content_base64"
+        bodies = [
+            {
+                "artifact_type": item["artifact_type"],
+                "byte_size": len(item["content"]),
+                field: item["content"],
+            }
+            for item in artifacts
+        ]
+        print(
+            json.dumps(
+                measure("artifact", bodies, RegisterArtifactRequest, wire_format, compression)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import subprocess
 import sys
-import time
 import uuid
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -16,7 +17,11 @@ import typer
 
 app = typer.Typer(help="Trace CLI for LLM Flight Recorder")
 runs_app = typer.Typer(help="Run query commands")
+bundle_app = typer.Typer(help="Bundle export and import commands")
+export_app = typer.Typer(help="Columnar event export commands")
 app.add_typer(runs_app, name="runs")
+app.add_typer(bundle_app, name="bundle")
+app.add_typer(export_app, name="export")
 
 
 EXIT_SUCCESS = 0
@@ -65,6 +70,95 @@ class ApiClient:
 
         return body["data"]
 
+    def download(
+        self, path: str, payload: dict[str, Any], dest_dir: Path, default_name: str
+    ) -> Path:
+        headers: dict[str, str] = {"content-type": "application/json"}
+        if self.auth_token:
+            headers["authorization"] = f"Bearer {self.auth_token}"
+        url = f"{self.api_url}{path}"
+        try:
+            with self.client.stream("POST", url, json=payload, headers=headers) as response:
+                if response.status_code >= 400:
+                    body = json.loads(response.read())
+                    error = body.get("error") or {}
+                    raise ApiError(
+                        code=error.get("code", "INTERNAL_ERROR"),
+                        message=error.get("message", "request failed"),
+                        status_code=response.status_code,
+                    )
+
+                match = re.search(
+                    r'filename="([^"]+)"', response.headers.get("content-disposition", "")
+                )
+                target = dest_dir / (match.group(1) if match else default_name)
+                dest_dir.mkdir(parents=True, exist_ok=True)
+                with target.open("wb") as handle:
+                    for chunk in response.iter_bytes():
+                        handle.write(chunk)
+        except httpx.TimeoutException as exc:
+            raise RuntimeError(f"Dependency unavailable: {exc}") from exc
+        except httpx.TransportError as exc:
+            raise RuntimeError(f"Dependency unavailable: {exc}") from exc
+
+        if self.verbose:
+            typer.echo(f"bundle_id={response.headers.get('x-bundle-id', '')}", err=True)
+        return target
+
+    def upload(self, path: str, source: Path) -> dict[str, Any]:
+        headers: dict[str, str] = {"content-type": "application/octet-stream"}
+        if self.auth_token:
+            headers["authorization"] = f"Bearer {self.auth_token}"
+        url = f"{self.api_url}{path}"
+        try:
+            with source.open("rb") as handle:
+                response = self.client.post(url, content=handle, headers=headers)
+        except httpx.TimeoutException as exc:
+            raise RuntimeError(f"Dependency unavailable: {exc}") from exc
+        except httpx.TransportError as exc:
+            raise RuntimeError(f"Dependency unavailable: {exc}") from exc
+
+        body = response.json()
+        if response.status_code >= 400:
+            error = body.get("error") or {}
+            raise ApiError(
+                code=error.get("code", "INTERNAL_ERROR"),
+                message=error.get("message", "request failed"),
+                status_code=response.status_code,
+            )
+        return body["data"]
+
+    def stream(self, path: str) -> Iterator[tuple[str, dict[str, Any]]]:
+        headers: dict[str, str] = {"accept": "text/event-stream"}
+        if self.auth_token:
+            headers["authorization"] = f"Bearer {self.auth_token}"
+        url = f"{self.api_url}{path}"
+        # Streams sit idle between updates; only the connect phase is bounded by --timeout.
+        timeout = httpx.Timeout(self.timeout, read=None)
+        try:
+            with self.client.stream("GET", url, headers=headers, timeout=timeout) as response:
+                if response.status_code >= 400:
+                    body = json.loads(response.read())
+                    error = body.get("error") or {}
+                    raise ApiError(
+                        code=error.get("code", "INTERNAL_ERROR"),
+                        message=error.get("message", "request failed"),
+                        status_code=response.status_code,
+                    )
+                kind, data = "message", []
+                for line in response.iter_lines():
+                    if line.startswith("event: "):
+                        kind = line[len("event: ") :]
+                    elif line.startswith("data: "):
+                        data.append(line[len("data: ") :])
+                    elif not line and data:
+                        yield kind, json.loads("\n".join(data))
+                        kind, data = "message", []
+        except httpx.TimeoutException as exc:
+            raise RuntimeError(f"Dependency unavailable: {exc}") from exc
+        except httpx.TransportError as exc:
+            raise RuntimeError(f"Dependency unavailable: {exc}") from exc
+
 
 class ApiError(Exception):
     def __init__(self, code: str, message: str, status_code: int) -> None:
@@ -111,6 +205,7 @@ def capture(
     env: str = typer.Option("local", "--env"),
     retention_class: str = typer.Option("dev_short", "--retention-class"),
     bundle_on_fail: bool = typer.Option(False, "--bundle-on-fail"),
+    bundle_dir: Path = typer.Option(Path("."), "--bundle-dir"),
     api_url: str = typer.Option("http://localhost:8000", "--api-url"),
     auth_token: str | None = typer.Option(None, "--auth-token"),
     output: str = typer.Option("text", "--output"),
@@ -212,21 +307,30 @@ def capture(
             {"final_status": "success" if proc.returncode == 0 else "failed"},
         )
 
-        output_payload = {
+        output_payload: dict[str, Any] = {
             "run_id": run_id,
             "trace_id": trace_id,
             "command_exit_code": proc.returncode,
             "bundle_exported": False,
         }
-        _print(output_payload, output)
 
         if proc.returncode != 0 and bundle_on_fail:
-            typer.echo(
-                "bundle-on-fail is reserved for M3 bundle workflows and is not yet implemented",
-                err=True,
-            )
+            try:
+                bundle_path = client.download(
+                    "/api/v1/bundles/export",
+                    {"run_id": run_id, "bundle_profile": "minimal_failure"},
+                    bundle_dir,
+                    f"run-{run_id}.tar.zst",
+                )
+                output_payload["bundle_exported"] = True
+                output_payload["bundle_path"] = str(bundle_path)
+            except Exception as err:  # noqa: BLE001
+                typer.echo(f"bundle export failed: {err}", err=True)
 
+        _print(output_payload, output)
         raise typer.Exit(code=proc.returncode)
+    except typer.Exit:
+        raise
     except Exception as err:  # noqa: BLE001
         typer.echo(f"error: {err}", err=True)
         raise typer.Exit(code=_map_error_to_exit(err)) from err
@@ -253,11 +357,22 @@ def replay(
         if override_profile:
             profile = json.loads(override_profile.read_text(encoding="utf-8"))
 
+        source_run_id = bundle_or_run_ref
+        bundle_path = Path(bundle_or_run_ref)
+        if bundle_path.is_file():
+            imported = client.upload("/api/v1/bundles/import", bundle_path)
+            source_run_id = imported["run_id"]
+            if fork_step:
+                # Imported bundles remap ids deterministically under the bundle id.
+                fork_step = str(uuid.uuid5(uuid.UUID(imported["import_id"]), fork_step))
+            if verbose:
+                typer.echo(f"imported_run_id={source_run_id}", err=True)
+
         created = client.call(
             "POST",
             "/api/v1/replays",
             {
-                "source_run_id": bundle_or_run_ref,
+                "source_run_id": source_run_id,
                 "fork_step_id": fork_step,
                 "override_profile": profile,
                 "replay_preferences": {
@@ -273,15 +388,15 @@ def replay(
             raise typer.Exit(code=EXIT_SUCCESS)
 
         terminal = None
-        while True:
-            status = client.call("GET", f"/api/v1/replays/{replay_session_id}")
+        for _, status in client.stream(f"/api/v1/replays/{replay_session_id}/stream"):
             if verbose:
                 typer.echo(f"status={status['status']}", err=True)
 
             if status["status"] not in {"pending", "running"}:
                 terminal = status
                 break
-            time.sleep(1)
+        if terminal is None:
+            terminal = client.call("GET", f"/api/v1/replays/{replay_session_id}")
 
         _print(terminal, output)
 
@@ -348,6 +463,119 @@ def runs_get(
         client.close()
 
 
+@runs_app.command("tail")
+def runs_tail(
+    run_id: str,
+    after_sequence_no: int = typer.Option(-1, "--after"),
+    api_url: str = typer.Option("http://localhost:8000", "--api-url"),
+    auth_token: str | None = typer.Option(None, "--auth-token"),
+    output: str = typer.Option("text", "--output"),
+    timeout: float = typer.Option(10.0, "--timeout"),
+    verbose: bool = typer.Option(False, "--verbose"),
+) -> None:
+    client = ApiClient(api_url, auth_token, timeout, verbose=verbose)
+    try:
+        path = f"/api/v1/runs/{run_id}/events/stream?after_sequence_no={after_sequence_no}"
+        for kind, data in client.stream(path):
+            if output == "json":
+                typer.echo(json.dumps({"event": kind, "data": data}, default=str))
+            elif kind == "trace_event":
+                typer.echo(f"{data['sequence_no']}\t{data['event_type']}\t{data['step_id']}")
+            else:
+                typer.echo(f"run {data['run_id']} {data['status']}")
+    except Exception as err:  # noqa: BLE001
+        typer.echo(f"error: {err}", err=True)
+        raise typer.Exit(code=_map_error_to_exit(err)) from err
+    finally:
+        client.close()
+
+
+@bundle_app.command("export")
+def bundle_export(
+    run_id: str = typer.Option(..., "--run"),
+    bundle_profile: str = typer.Option("full_debug", "--profile"),
+    dest_dir: Path = typer.Option(Path("."), "--dest"),
+    api_url: str = typer.Option("http://localhost:8000", "--api-url"),
+    auth_token: str | None = typer.Option(None, "--auth-token"),
+    output: str = typer.Option("text", "--output"),
+    timeout: float = typer.Option(10.0, "--timeout"),
+    verbose: bool = typer.Option(False, "--verbose"),
+) -> None:
+    client = ApiClient(api_url, auth_token, timeout, verbose=verbose)
+    try:
+        bundle_path = client.download(
+            "/api/v1/bundles/export",
+            {"run_id": run_id, "bundle_profile": bundle_profile},
+            dest_dir,
+            f"run-{run_id}.tar.zst",
+        )
+        _print({"run_id": run_id, "bundle_path": str(bundle_path)}, output)
+    except Exception as err:  # noqa: BLE001
+        typer.echo(f"error: {err}", err=True)
+        raise typer.Exit(code=_map_error_to_exit(err)) from err
+    finally:
+        client.close()
+
+
+@bundle_app.command("import")
+def bundle_import(
+    path: Path = typer.Option(..., "--path"),
+    api_url: str = typer.Option("http://localhost:8000", "--api-url"),
+    auth_token: str | None = typer.Option(None, "--auth-token"),
+    output: str = typer.Option("text", "--output"),
+    timeout: float = typer.Option(60.0, "--timeout"),
+    verbose: bool = typer.Option(False, "--verbose"),
+) -> None:
+    client = ApiClient(api_url, auth_token, timeout, verbose=verbose)
+    try:
+        data = client.upload("/api/v1/bundles/import", path)
+        _print(data, output)
+    except Exception as err:  # noqa: BLE001
+        typer.echo(f"error: {err}", err=True)
+        raise typer.Exit(code=_map_error_to_exit(err)) from err
+    finally:
+        client.close()
+
+
+@export_app.command("events")
+def export_events(
+    run_ids: list[str] | None = typer.Option(None, "--run"),
+    from_utc: str | None = typer.Option(None, "--from"),
+    to_utc: str | None = typer.Option(None, "--to"),
+    app_id: str | None = typer.Option(None, "--app-id"),
+    environment: str | None = typer.Option(None, "--environment"),
+    export_format: str = typer.Option("parquet", "--format"),
+    dest_dir: Path = typer.Option(Path("."), "--dest"),
+    api_url: str = typer.Option("http://localhost:8000", "--api-url"),
+    auth_token: str | None = typer.Option(None, "--auth-token"),
+    output: str = typer.Option("text", "--output"),
+    timeout: float = typer.Option(300.0, "--timeout"),
+    verbose: bool = typer.Option(False, "--verbose"),
+) -> None:
+    client = ApiClient(api_url, auth_token, timeout, verbose=verbose)
+    try:
+        payload = {
+            "format": export_format,
+            "run_ids": run_ids or None,
+            "from_utc": from_utc,
+            "to_utc": to_utc,
+            "app_id": app_id,
+            "environment": environment,
+        }
+        export_path = client.download(
+            "/api/v1/exports/events",
+            {key: value for key, value in payload.items() if value is not None},
+            dest_dir,
+            f"events.{export_format}",
+        )
+        _print({"format": export_format, "export_path": str(export_path)}, output)
+    except Exception as err:  # noqa: BLE001
+        typer.echo(f"error: {err}", err=True)
+        raise typer.Exit(code=_map_error_to_exit(err)) from err
+    finally:
+        client.close()
+
+
 def run() -> None:
     app()
 
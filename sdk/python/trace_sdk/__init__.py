@@ -1,9 +1,11 @@
 from sdk.python.trace_sdk.adapters import OpenAIChatRequest, OpenAIModelAdapter
 from sdk.python.trace_sdk.client import TraceClient
 from sdk.python.trace_sdk.context import RunContext, get_current_context, set_current_context
+from sdk.python.trace_sdk.exporter import StreamExporter
 
 __all__ = [
     "TraceClient",
+    "StreamExporter",
     "RunContext",
     "get_current_context",
     "set_current_context",
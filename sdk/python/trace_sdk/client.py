@@ -1,18 +1,50 @@
 from __future__ import annotations
 
 import base64
+import gzip
 import hashlib
 import json
 import os
+import threading
 import time
 import uuid
 from datetime import datetime, timezone
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 import httpx
 
 from sdk.python.trace_sdk.context import RunContext, get_current_context, set_current_context
 
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+WIRE_FORMATS = {"json": "application/json", "msgpack": "application/msgpack"}
+COMPRESSIONS = {"identity", "gzip", "zstd"}
+
+
+def default_wire_format() -> str:
+    return "msgpack" if msgpack is not None else "json"
+
+
+def default_compression() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 class TraceClient:
     def __init__(
@@ -21,11 +53,28 @@ class TraceClient:
         auth_token: str | None = None,
         timeout: float = 10.0,
         max_retries: int = 3,
+        wire_format: str | None = None,
+        compression: str | None = None,
+        compress_min_bytes: int = 1024,
     ) -> None:
         self.api_url = api_url.rstrip("/")
         self.auth_token = auth_token
         self.timeout = timeout
         self.max_retries = max_retries
+        # msgpack bodies with zstd (or gzip) Content-Encoding by default; a server that answers 415
+        # switches this client to "json"/"identity" for good (see `_use_plain_json`).
+        self.wire_format = wire_format or default_wire_format()
+        self.compression = compression or default_compression()
+        self.compress_min_bytes = compress_min_bytes
+        self._local = threading.local()
+        if self.wire_format not in WIRE_FORMATS:
+            raise ValueError(f"Unsupported wire_format '{self.wire_format}'")
+        if self.wire_format == "msgpack" and msgpack is None:
+            raise ValueError("wire_format 'msgpack' requires the msgpack package")
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"Unsupported compression '{self.compression}'")
+        if self.compression == "zstd" and zstandard is None:
+            raise ValueError("compression 'zstd' requires the zstandard package")
         self._client = httpx.Client(timeout=timeout)
 
     @classmethod
@@ -35,6 +84,8 @@ class TraceClient:
             auth_token=os.getenv("TRACE_AUTH_TOKEN"),
             timeout=float(os.getenv("TRACE_TIMEOUT", "10")),
             max_retries=int(os.getenv("TRACE_MAX_RETRIES", "3")),
+            wire_format=os.getenv("TRACE_WIRE_FORMAT") or None,
+            compression=os.getenv("TRACE_COMPRESSION") or None,
         )
 
     def start_run(
@@ -66,7 +117,7 @@ class TraceClient:
             json={"final_status": final_status},
         )["data"]
 
-    def emit_event(
+    def event_body(
         self,
         *,
         event_type: str,
@@ -83,6 +134,7 @@ class TraceClient:
         run_id: str | None = None,
         trace_id: str | None = None,
     ) -> dict[str, Any]:
+        """Build an ingest body (`idempotency_key` plus canonical `event`) without sending it."""
         ctx = get_current_context()
         resolved_run_id = run_id or (ctx.run_id if ctx else None)
         resolved_trace_id = trace_id or (ctx.trace_id if ctx else None)
@@ -98,20 +150,52 @@ class TraceClient:
             "parent_step_id": parent_step_id,
             "sequence_no": sequence_no,
             "event_type": event_type,
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+            "timestamp_utc": datetime.now(timezone.utc),
             "actor_type": actor_type,
             "determinism_mode": determinism_mode,
             "artifact_refs": artifact_refs or [],
             "redaction_status": redaction_status,
             "payload": payload,
         }
-        return self._request(
-            "POST",
-            f"/api/v1/runs/{resolved_run_id}/events",
-            json={"idempotency_key": idem, "event": event},
-        )["data"]
+        return {"idempotency_key": idem, "event": event}
 
-    def register_artifact(
+    def emit_event(
+        self,
+        *,
+        event_type: str,
+        sequence_no: int,
+        step_id: str,
+        payload: dict[str, Any],
+        parent_step_id: str | None = None,
+        determinism_mode: str = "live",
+        actor_type: str = "sdk",
+        artifact_refs: list[dict[str, Any]] | None = None,
+        redaction_status: str = "not_required",
+        schema_version: str = "1.0.0",
+        idempotency_key: str | None = None,
+        run_id: str | None = None,
+        trace_id: str | None = None,
+    ) -> dict[str, Any]:
+        body = self.event_body(
+            event_type=event_type,
+            sequence_no=sequence_no,
+            step_id=step_id,
+            payload=payload,
+            parent_step_id=parent_step_id,
+            determinism_mode=determinism_mode,
+            actor_type=actor_type,
+            artifact_refs=artifact_refs,
+            redaction_status=redaction_status,
+            schema_version=schema_version,
+            idempotency_key=idempotency_key,
+            run_id=run_id,
+            trace_id=trace_id,
+        )
+        return self._request("POST", f"/api/v1/runs/{body['event']['run_id']}/events", json=body)[
+            "data"
+        ]
+
+    def artifact_body(
         self,
         *,
         artifact_type: str,
@@ -120,24 +204,77 @@ class TraceClient:
         redaction_profile: str = "default",
         retention_class: str = "dev_short",
         field_policies: dict[str, str] | None = None,
+        raw_content: bool = False,
     ) -> dict[str, Any]:
+        """Build an artifact registration body.
+
+        `raw_content` sends the bytes as-is, which only binary wire formats support.
+        """
         if isinstance(content, str):
             payload_bytes = content.encode("utf-8")
         else:
             payload_bytes = content
 
-        content_base64 = base64.b64encode(payload_bytes).decode("ascii")
-        body = {
+        body: dict[str, Any] = {
             "artifact_type": artifact_type,
             "byte_size": len(payload_bytes),
             "mime_type": mime_type,
             "redaction_profile": redaction_profile,
             "retention_class": retention_class,
-            "content_base64": content_base64,
             "field_policies": field_policies or {},
         }
+        if raw_content:
+            body["content_bytes"] = payload_bytes
+        else:
+            body["content_base64"] = base64.b64encode(payload_bytes).decode("ascii")
+        return body
+
+    def register_artifact(
+        self,
+        *,
+        artifact_type: str,
+        content: str | bytes,
+        mime_type: str = "text/plain",
+        redaction_profile: str = "default",
+        retention_class: str = "dev_short",
+        field_policies: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        body = self.artifact_body(
+            artifact_type=artifact_type,
+            content=content,
+            mime_type=mime_type,
+            redaction_profile=redaction_profile,
+            retention_class=retention_class,
+            field_policies=field_policies,
+            raw_content=self.wire_format == "msgpack",
+        )
         return self._request("POST", "/api/v1/artifacts", json=body)["data"]
 
+    def stream_lines(self, lines: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Send lines to the streaming ingest endpoint in one chunked request; yield per-line acks.
+
+        Lines are `{"kind": "event", "idempotency_key": ..., "event": ...}` (see `event_body`) or
+        `{"kind": "artifact", "artifact": ...}` (see `artifact_body`). The body is produced lazily,
+        so a generator can keep one request open while events are captured.
+        """
+
+        def body() -> Iterator[bytes]:
+            for line in lines:
+                yield (
+                    json.dumps(line, default=_json_default, separators=(",", ":")).encode("utf-8")
+                    + b"\n"
+                )
+
+        headers = {"content-type": "application/x-ndjson"}
+        if self.auth_token:
+            headers["authorization"] = f"Bearer {self.auth_token}"
+        url = f"{self.api_url}/api/v1/ingest/stream"
+        with self._client.stream("POST", url, content=body(), headers=headers) as response:
+            response.raise_for_status()
+            for raw in response.iter_lines():
+                if raw:
+                    yield json.loads(raw)
+
     def compute_call_signature_hash(self, payload: dict[str, Any]) -> str:
         normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
         return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -145,29 +282,70 @@ class TraceClient:
     def close(self) -> None:
         self._client.close()
 
+    def encode_body(self, body: dict[str, Any]) -> tuple[bytes, dict[str, str]]:
+        if self.wire_format == "msgpack":
+            content = msgpack.packb(body, datetime=True)
+        else:
+            if isinstance(body.get("content_bytes"), bytes):
+                # JSON has no bytes type: raw artifact content built for msgpack goes as base64.
+                raw = body["content_bytes"]
+                body = {key: value for key, value in body.items() if key != "content_bytes"}
+                body["content_base64"] = base64.b64encode(raw).decode("ascii")
+            content = json.dumps(body, default=_json_default, separators=(",", ":")).encode("utf-8")
+        headers = {"content-type": WIRE_FORMATS[self.wire_format]}
+        # Small bodies are not worth the compression CPU on either side.
+        if self.compression != "identity" and len(content) >= self.compress_min_bytes:
+            if self.compression == "zstd":
+                content = self._zstd_compressor().compress(content)
+            else:
+                content = gzip.compress(content, mtime=0)
+            headers["content-encoding"] = self.compression
+        return content, headers
+
+    def _zstd_compressor(self) -> Any:
+        # Compression contexts are not thread-safe; keep one per calling thread.
+        compressor = getattr(self._local, "zstd", None)
+        if compressor is None:
+            compressor = self._local.zstd = zstandard.ZstdCompressor()
+        return compressor
+
+    def _use_plain_json(self) -> bool:
+        """Switch this client to uncompressed JSON bodies; False if it already sends them."""
+        if (self.wire_format, self.compression) == ("json", "identity"):
+            return False
+        self.wire_format, self.compression = "json", "identity"
+        return True
+
     def _request(self, method: str, path: str, json: dict[str, Any] | None = None) -> dict[str, Any]:
         url = f"{self.api_url}{path}"
-        headers = {"content-type": "application/json"}
+        response = self._send(method, url, json)
+        if response.status_code == 415 and json is not None and self._use_plain_json():
+            # An older server, or one without msgpack/zstandard: resend once as plain JSON and
+            # keep sending that for the rest of this client's requests.
+            response = self._send(method, url, json)
+
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("status") != "success":
+            message = payload.get("error", {}).get("message", "unknown error")
+            raise RuntimeError(message)
+        return payload
+
+    def _send(self, method: str, url: str, json: dict[str, Any] | None) -> httpx.Response:
+        content, headers = self.encode_body(json) if json is not None else (None, {})
         if self.auth_token:
             headers["authorization"] = f"Bearer {self.auth_token}"
 
         attempts = 0
         while True:
             attempts += 1
-            response = self._client.request(method, url, json=json, headers=headers)
+            response = self._client.request(method, url, content=content, headers=headers)
             if response.status_code < 500:
-                break
+                return response
             if attempts > self.max_retries:
-                break
+                return response
             time.sleep(0.2 * attempts)
 
-        response.raise_for_status()
-        payload = response.json()
-        if payload.get("status") != "success":
-            message = payload.get("error", {}).get("message", "unknown error")
-            raise RuntimeError(message)
-        return payload
-
     @staticmethod
     def _idem_key(run_id: str, step_id: str, event_type: str, sequence_no: int) -> str:
         return f"{run_id}:{step_id}:{event_type}:{sequence_no}"
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import httpx
+
+from sdk.python.trace_sdk.client import TraceClient
+
+_STOP = object()
+
+
+class StreamExporter:
+    """Ships events from a background thread over long-lived streaming ingest requests.
+
+    A request stays open while lines keep arriving. It closes after `max_lines` lines or once
+    the queue has been idle for `linger_seconds`, and httpx reuses the connection for the next
+    one, so the process holds a single connection. Acks are read when a request closes and go
+    to `on_ack`. Lines the server rejected are kept in `failed`.
+    """
+
+    def __init__(
+        self,
+        client: TraceClient,
+        max_lines: int = 10000,
+        linger_seconds: float = 1.0,
+        on_ack: Callable[[dict[str, Any], dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.client = client
+        self.max_lines = max(max_lines, 1)
+        self.linger_seconds = linger_seconds
+        self.on_ack = on_ack
+        self.failed: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="trace-stream-exporter", daemon=True)
+        self._thread.start()
+
+    def emit_event(self, **kwargs: Any) -> str:
+        """Queue an event from `TraceClient.emit_event` arguments; returns its idempotency key."""
+        body = self.client.event_body(**kwargs)
+        self._queue.put({"kind": "event", **body})
+        return body["idempotency_key"]
+
+    def register_artifact(self, **kwargs: Any) -> None:
+        """Queue a small inline artifact (arguments as for `TraceClient.register_artifact`)."""
+        self._queue.put({"kind": "artifact", "artifact": self.client.artifact_body(**kwargs)})
+
+    def flush(self) -> None:
+        """Block until every queued line has been sent and acknowledged (or failed)."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _lines(self, first: dict[str, Any], sent: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        line = first
+        while True:
+            sent.append(line)
+            yield line
+            if len(sent) >= self.max_lines:
+                return
+            try:
+                line = self._queue.get(timeout=self.linger_seconds)
+            except queue.Empty:
+                return
+            if line is _STOP:
+                self._stopping = True
+                self._queue.task_done()
+                return
+
+    def _run(self) -> None:
+        while not self._stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+            sent: list[dict[str, Any]] = []
+            try:
+                self._send(self._lines(first, sent), sent)
+            finally:
+                for _ in sent:
+                    self._queue.task_done()
+
+    def _send(self, lines: Iterator[dict[str, Any]], sent: list[dict[str, Any]]) -> None:
+        acked: set[int] = set()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                for ack in self.client.stream_lines(lines):
+                    if ack["line"] in acked:
+                        continue
+                    acked.add(ack["line"])
+                    line = sent[ack["line"] - 1]
+                    if ack["status"] != "success":
+                        self.failed.append((line, ack))
+                    if self.on_ack is not None:
+                        self.on_ack(line, ack)
+                return
+            except httpx.HTTPError as exc:
+                # Event lines are idempotent, so resending the whole request is safe.
+                if attempts > self.client.max_retries:
+                    error = {
+                        "code": "DEPENDENCY_UNAVAILABLE",
+                        "message": str(exc),
+                        "retryable": True,
+                    }
+                    for index, line in enumerate(sent, start=1):
+                        if index not in acked:
+                            self.failed.append(
+                                (line, {"line": index, "status": "error", "error": error})
+                            )
+                    return
+                lines = iter(list(sent))
@@ -10,13 +10,15 @@ os.environ.setdefault("DATABASE_URL", "sqlite:///./flight_recorder.db")
 os.environ.setdefault("AUTH_ENABLED", "false")
 
 from backend.app.db.session import Base, engine  # noqa: E402
-from backend.app.main import app  # noqa: E402
+from backend.app.main import app, response_cache  # noqa: E402
 
 
 @pytest.fixture(autouse=True)
 def reset_db() -> None:
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Cached pages would outlive the rows they were read from.
+    response_cache.clear()
 
 
 @pytest.fixture
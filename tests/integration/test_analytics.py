@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from backend.app.db.session import SessionLocal
+from backend.app.modules.analytics.service import rebuild_usage_rollups
+
+STARTED = {"app_id": "usage-app", "environment": "test", "entrypoint_name": "pytest"}
+MODEL_CALLED = {
+    "provider": "openai",
+    "model_id": "gpt-4.1",
+    "model_api_version": "v1",
+    "temperature": 0,
+    "top_p": 1,
+    "max_tokens": 64,
+    "request_ref": "q",
+}
+
+
+def _post_event(
+    client, run: dict, sequence_no: int, step_id: str, event_type: str, payload: dict
+) -> None:
+    event = {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{step_id}",
+        "parent_step_id": None,
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": [],
+        "redaction_status": "not_required",
+        "payload": payload,
+    }
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": f"{run['run_id']}:{sequence_no}", "event": event},
+    )
+    assert response.status_code == 200
+
+
+def _model_run(client, model_id: str, latency_ms: int, cost_usd: float) -> None:
+    run = client.post("/api/v1/runs", json={"app_id": "usage-app", "environment": "test"}).json()[
+        "data"
+    ]
+    _post_event(client, run, 0, "start", "run_started", STARTED)
+    _post_event(client, run, 1, "model", "model_called", {**MODEL_CALLED, "model_id": model_id})
+    result = {
+        "provider": "openai",
+        "model_id": model_id,
+        "finish_reason": "stop",
+        "token_usage": {"prompt": 100, "completion": 20, "total": 120},
+        "response_ref": "r",
+        "latency_ms": latency_ms,
+        "cost_usd": cost_usd,
+    }
+    _post_event(client, run, 2, "model", "model_result", result)
+
+
+def _usage(client, **params) -> list[dict]:
+    response = client.get("/api/v1/analytics/usage", params=params)
+    assert response.status_code == 200
+    return response.json()["data"]["items"]
+
+
+def test_usage_rollups_aggregate_latency_tokens_and_cost(client) -> None:
+    for latency_ms in (40, 80, 120, 900):
+        _model_run(client, "gpt-4.1", latency_ms, 0.25)
+    _model_run(client, "gpt-4.1-mini", 15, 0.01)
+
+    items = _usage(client, kind="model", group_by="model_id")
+    assert [item["group"] for item in items] == [
+        {"model_id": "gpt-4.1"},
+        {"model_id": "gpt-4.1-mini"},
+    ]
+    large = items[0]
+    assert large["call_count"] == 4
+    assert large["token_usage"] == {"prompt": 400, "completion": 80, "total": 480}
+    assert large["cost_usd"] == 1.0
+    assert large["latency_ms"]["avg"] == 285.0
+    assert large["latency_ms"]["max"] == 900.0
+    assert 50 <= large["latency_ms"]["p50"] <= 100
+    assert 500 <= large["latency_ms"]["p99"] <= 900
+
+    daily = _usage(client, kind="model", group_by="app_id,bucket", bucket="day")
+    assert len(daily) == 1 and daily[0]["call_count"] == 5
+
+    with SessionLocal() as db:
+        rebuild_usage_rollups(db)
+    assert _usage(client, kind="model", group_by="model_id") == items
+
+    assert (
+        client.get("/api/v1/analytics/usage", params={"group_by": "tool_name"}).status_code == 400
+    )
+
+
+def test_overlong_model_ids_get_separate_bounded_subjects(client) -> None:
+    prefix = "fine-tuned/" + "m" * 200
+    _model_run(client, f"{prefix}-a", 40, 0.1)
+    _model_run(client, f"{prefix}-b", 60, 0.1)
+
+    items = _usage(client, kind="model", group_by="model_id")
+    subjects = [item["group"]["model_id"] for item in items]
+    assert len(set(subjects)) == 2
+    assert all(len(subject) == 128 and subject.startswith(prefix[:100]) for subject in subjects)
+
+    [only_a] = _usage(client, kind="model", group_by="model_id", subject=f"{prefix}-a")
+    assert only_a["call_count"] == 1 and only_a["latency_ms"]["max"] == 40.0
@@ -155,3 +155,75 @@ def test_event_idempotency_returns_prior_response(client) -> None:
     assert second.status_code == 200
     assert first.json()["data"]["event_id"] == second.json()["data"]["event_id"]
     assert second.json()["data"]["accepted"] is False
+
+
+def test_event_listing_projection_and_lazy_event_fetch(client) -> None:
+    from backend.app.db.models import Event
+    from backend.app.db.session import SessionLocal
+
+    run_id = client.post("/api/v1/runs", json={"app_id": "test-app", "environment": "test"}).json()[
+        "data"
+    ]["run_id"]
+    with SessionLocal() as db:
+        db.add_all(
+            Event(
+                run_id=run_id,
+                step_id="step-bulk",
+                event_type="model_result",
+                schema_version="1.0.0",
+                payload_json={"index": index},
+                idempotency_key=f"bulk-{index}",
+                sequence_no=index,
+            )
+            for index in range(501)
+        )
+        db.commit()
+
+    first = client.get(f"/api/v1/runs/{run_id}/events?page_size=1000&include_payload=false").json()[
+        "data"
+    ]
+    assert len(first["items"]) == 500
+    assert first["next_page_token"] == "499"
+    assert all("payload" not in item for item in first["items"])
+
+    projected = client.get(
+        f"/api/v1/runs/{run_id}/events?page_size=2&fields=event_type&include_payload=summary"
+    ).json()["data"]["items"]
+    assert set(projected[0]) == {"event_id", "sequence_no", "event_type", "payload_bytes"}
+    assert projected[0]["payload_bytes"] == len('{"index": 0}')
+
+    rejected = client.get(f"/api/v1/runs/{run_id}/events?fields=secret")
+    assert rejected.status_code == 400
+
+    rest = client.get(f"/api/v1/runs/{run_id}/events?page_token={first['next_page_token']}").json()[
+        "data"
+    ]
+    assert [item["sequence_no"] for item in rest["items"]] == [500]
+
+    event = client.get(f"/api/v1/events/{rest['items'][0]['event_id']}").json()["data"]
+    assert event["payload"] == {"index": 500}
+
+
+def test_event_retry_after_restart_returns_original_event(client) -> None:
+    from backend.app.services.idempotency import recent_keys
+
+    run = client.post(
+        "/api/v1/runs", json={"app_id": "test-app", "environment": "test", "tags": {}}
+    ).json()["data"]
+    event = _event(
+        trace_id=run["trace_id"],
+        run_id=run["run_id"],
+        step_id="step-one",
+        sequence_no=0,
+        event_type="run_started",
+        payload={"app_id": "test-app", "environment": "test", "entrypoint_name": "pytest"},
+    )
+
+    first = _post_event(client, run["run_id"], "restart-idem", event)
+    # A fresh process has an empty key filter, so the retry skips the lookup and must still dedupe.
+    recent_keys.clear()
+    second = _post_event(client, run["run_id"], "restart-idem", event)
+
+    assert second.status_code == 200
+    assert second.json()["data"]["event_id"] == first.json()["data"]["event_id"]
+    assert second.json()["data"]["accepted"] is False
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from backend.app.config import settings  # noqa: E402
+from backend.app.db.session import (  # noqa: E402
+    async_database_url,
+    build_async_sessionmaker,
+    get_db_runner,
+    open_db_runner,
+)
+from backend.app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def async_client(client):
+    session_factory = build_async_sessionmaker(settings.database_url)
+
+    async def async_runner():
+        async for runner in open_db_runner(session_factory):
+            yield runner
+
+    app.dependency_overrides[get_db_runner] = async_runner
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.pop(get_db_runner, None)
+
+
+def test_async_database_url_swaps_driver() -> None:
+    assert async_database_url("sqlite:///./flight_recorder.db") == "sqlite+aiosqlite:///./flight_recorder.db"
+    assert async_database_url("postgresql+psycopg://u:p@db:5432/x") == "postgresql+psycopg://u:p@db:5432/x"
+    assert async_database_url("postgresql://u:p@db/x") == "postgresql+psycopg://u:p@db/x"
+    assert async_database_url("postgresql+asyncpg://u:p@db/x") == "postgresql+asyncpg://u:p@db/x"
+
+
+def test_ingest_and_query_through_async_session(async_client) -> None:
+    run = async_client.post(
+        "/api/v1/runs", json={"app_id": "async-app", "environment": "test"}
+    ).json()["data"]
+    event = {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": "step-start",
+        "parent_step_id": None,
+        "sequence_no": 0,
+        "event_type": "run_started",
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": [],
+        "redaction_status": "not_required",
+        "payload": {"app_id": "async-app", "environment": "test", "entrypoint_name": "pytest"},
+    }
+    response = async_client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": "async-0", "event": event},
+    )
+    assert response.status_code == 200
+    event_id = response.json()["data"]["event_id"]
+
+    detail = async_client.get(f"/api/v1/runs/{run['run_id']}").json()["data"]
+    assert detail["counters"]["total_events"] == 1
+    assert (
+        async_client.get(f"/api/v1/events/{event_id}").json()["data"]["event_type"] == "run_started"
+    )
+    items = async_client.get("/api/v1/runs", params={"app_id": "async-app"}).json()["data"]["items"]
+    assert [item["run_id"] for item in items] == [run["run_id"]]
+
+    missing = async_client.get("/api/v1/runs/does-not-exist")
+    assert missing.status_code == 404
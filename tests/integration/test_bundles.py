@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import io
+import json
+import tarfile
+from datetime import datetime, timezone
+
+
+def _event(
+    trace_id: str, run_id: str, sequence_no: int, event_type: str, payload: dict, refs=None
+) -> dict:
+    return {
+        "schema_version": "1.0.0",
+        "trace_id": trace_id,
+        "run_id": run_id,
+        "step_id": f"{run_id}-step",
+        "parent_step_id": None,
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": refs or [],
+        "redaction_status": "not_required",
+        "payload": payload,
+    }
+
+
+def _seed_run(client) -> str:
+    created = client.post(
+        "/api/v1/runs", json={"app_id": "bundle-app", "environment": "test"}
+    ).json()["data"]
+    run_id, trace_id = created["run_id"], created["trace_id"]
+
+    artifact = client.post(
+        "/api/v1/artifacts",
+        json={
+            "artifact_type": "output",
+            "byte_size": 5,
+            "mime_type": "text/plain",
+            "content_text": "hello",
+        },
+    ).json()["data"]
+    ref = {"artifact_hash": artifact["artifact_hash"], "artifact_type": "output", "byte_size": 5}
+
+    events = [
+        _event(
+            trace_id,
+            run_id,
+            0,
+            "run_started",
+            {"app_id": "a", "environment": "t", "entrypoint_name": "x"},
+        ),
+        _event(
+            trace_id,
+            run_id,
+            1,
+            "final_output",
+            {"output_ref": artifact["artifact_hash"], "response_channel": "stdout"},
+            [ref],
+        ),
+        _event(
+            trace_id,
+            run_id,
+            2,
+            "run_failed",
+            {
+                "status": "failed",
+                "failed_step_id": "s",
+                "error_class": "E",
+                "error_message_ref": "m",
+            },
+        ),
+    ]
+    for event in events:
+        response = client.post(
+            f"/api/v1/runs/{run_id}/events",
+            json={"idempotency_key": f"{run_id}:{event['sequence_no']}", "event": event},
+        )
+        assert response.status_code == 200
+    return run_id
+
+
+def _export(client, run_id: str) -> bytes:
+    response = client.post(
+        "/api/v1/bundles/export",
+        json={"run_id": run_id, "bundle_profile": "full_debug", "compression": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    return response.content
+
+
+def test_bundle_export_streams_run_events_and_artifacts(client) -> None:
+    run_id = _seed_run(client)
+
+    with tarfile.open(fileobj=io.BytesIO(_export(client, run_id)), mode="r:gz") as archive:
+        names = archive.getnames()
+        manifest = json.loads(archive.extractfile("manifest.json").read())
+        events = archive.extractfile("events/000000.ndjson").read().decode("utf-8").splitlines()
+        blobs = [
+            name for name in names if name.startswith("artifacts/") and not name.endswith(".json")
+        ]
+        blob = archive.extractfile(blobs[0]).read()
+
+    assert names[:2] == ["manifest.json", "run.json"]
+    assert manifest["event_count"] == 3
+    assert manifest["artifact_count"] == 1
+    assert [json.loads(line)["sequence_no"] for line in events] == [0, 1, 2]
+    assert blob == b"hello"
+
+
+def test_bundle_export_unknown_run_returns_not_found(client) -> None:
+    response = client.post("/api/v1/bundles/export", json={"run_id": "missing"})
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "NOT_FOUND"
+
+
+def _import(client, bundle: bytes):
+    return client.post(
+        "/api/v1/bundles/import", content=bundle, headers={"content-type": "application/gzip"}
+    )
+
+
+def test_bundle_import_round_trip_is_idempotent(client) -> None:
+    run_id = _seed_run(client)
+    bundle = _export(client, run_id)
+
+    first = _import(client, bundle)
+    assert first.status_code == 200
+    imported = first.json()["data"]
+    assert imported["status"] == "completed"
+    assert imported["source_run_id"] == run_id
+    assert imported["events_loaded"] == 3
+    assert imported["artifacts_skipped"] == 1
+
+    run = client.get(f"/api/v1/runs/{imported['run_id']}").json()["data"]["run"]
+    assert run["source_type"] == "ci_bundle_import"
+    events = client.get(f"/api/v1/runs/{imported['run_id']}/events").json()["data"]["items"]
+    assert [event["sequence_no"] for event in events] == [0, 1, 2]
+
+    second = _import(client, bundle).json()["data"]
+    assert second["run_id"] == imported["run_id"]
+    assert second["events_loaded"] == 3
+
+
+def test_bundle_import_resumes_after_interruption(client) -> None:
+    run_id = _seed_run(client)
+    bundle = _export(client, run_id)
+
+    truncated = io.BytesIO()
+    with tarfile.open(fileobj=io.BytesIO(bundle), mode="r:gz") as source:
+        with tarfile.open(fileobj=truncated, mode="w:gz") as target:
+            for member in source.getmembers():
+                if member.name.startswith("artifacts/") and not member.name.endswith(".json"):
+                    break
+                target.addfile(member, source.extractfile(member))
+            corrupt = tarfile.TarInfo(member.name)
+            corrupt.size = 3
+            target.addfile(corrupt, io.BytesIO(b"bad"))
+
+    from sqlalchemy import update
+
+    from backend.app.db.models import Artifact
+    from backend.app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        db.execute(update(Artifact).values(status="pending"))
+        db.commit()
+
+    interrupted = _import(client, truncated.getvalue())
+    assert interrupted.status_code == 400
+
+    resumed = _import(client, bundle).json()["data"]
+    assert resumed["status"] == "completed"
+    assert resumed["events_loaded"] == 3
+    assert resumed["artifacts_loaded"] == 1
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import io
+import tarfile
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from backend.app.db.models import (
+    Artifact,
+    Event,
+    EventArtifact,
+    Run,
+    RunSnapshot,
+    RunStats,
+    SealedEventId,
+)
+from backend.app.db.session import SessionLocal
+from backend.app.main import artifact_store
+from backend.app.modules.compaction.service import seal_runs
+from backend.app.modules.retention.service import run_retention
+from backend.app.services.run_stats import rebuild_all_run_stats, run_stats_dict
+from worker.app.runner import process_one
+
+
+def _event(
+    run: dict, sequence_no: int, event_type: str, payload: dict, refs: list | None = None
+) -> dict:
+    return {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{sequence_no}",
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "artifact_refs": refs or [],
+        "payload": payload,
+    }
+
+
+def _seed_completed_run(client) -> tuple[str, str]:
+    run = client.post("/api/v1/runs", json={"app_id": "sealed-app", "environment": "test"}).json()[
+        "data"
+    ]
+    artifact = client.post(
+        "/api/v1/artifacts",
+        json={
+            "artifact_type": "output",
+            "byte_size": 6,
+            "mime_type": "text/plain",
+            "content_text": "sealed",
+        },
+    ).json()["data"]
+    refs = [{"artifact_hash": artifact["artifact_hash"], "artifact_type": "output", "byte_size": 6}]
+    events = [
+        _event(
+            run,
+            0,
+            "run_started",
+            {"app_id": "sealed-app", "environment": "test", "entrypoint_name": "main"},
+        ),
+        _event(
+            run,
+            1,
+            "final_output",
+            {"output_ref": artifact["artifact_hash"], "response_channel": "stdout"},
+            refs,
+        ),
+        _event(
+            run, 2, "run_completed", {"status": "success", "total_steps": 3, "total_latency_ms": 12}
+        ),
+    ]
+    for event in events:
+        response = client.post(
+            f"/api/v1/runs/{run['run_id']}/events",
+            json={"idempotency_key": f"{run['run_id']}:{event['sequence_no']}", "event": event},
+        )
+        assert response.status_code == 200
+
+    with SessionLocal() as db:
+        db.execute(
+            update(Run)
+            .where(Run.run_id == run["run_id"])
+            .values(ended_at_utc=datetime.now(timezone.utc) - timedelta(days=10))
+        )
+        db.commit()
+    return run["run_id"], artifact["artifact_hash"]
+
+
+def test_sealed_run_reads_from_its_snapshot(client) -> None:
+    run_id, _ = _seed_completed_run(client)
+    events_url = f"/api/v1/runs/{run_id}/events"
+    before = client.get(events_url).json()["data"]["items"]
+    detail = client.get(f"/api/v1/runs/{run_id}").json()["data"]
+
+    with SessionLocal() as db:
+        assert seal_runs(db, artifact_store, seal_after_days=30).runs_sealed == 0
+        report = seal_runs(db, artifact_store, seal_after_days=7)
+        assert report.runs_sealed == 1 and report.events_moved == 3
+        assert db.execute(select(func.count()).select_from(Event)).scalar_one() == 0
+        snapshot = db.get(RunSnapshot, run_id)
+        assert snapshot.event_count == 3 and snapshot.last_sequence_no == 2
+        assert db.get(Artifact, snapshot.artifact_hash).artifact_type == "run_snapshot"
+        assert db.execute(select(func.count()).select_from(EventArtifact)).scalar_one() == 1
+
+    assert client.get(events_url).json()["data"]["items"] == before
+    assert client.get(f"/api/v1/runs/{run_id}").json()["data"] == detail
+
+    first = client.get(events_url, params={"page_size": 2}).json()["data"]
+    assert [item["sequence_no"] for item in first["items"]] == [0, 1]
+    rest = client.get(
+        events_url, params={"page_size": 2, "page_token": first["next_page_token"]}
+    ).json()["data"]
+    assert [item["sequence_no"] for item in rest["items"]] == [2] and rest[
+        "next_page_token"
+    ] is None
+    filtered = client.get(
+        events_url, params={"event_type": "final_output", "include_payload": "false"}
+    )
+    assert [item["sequence_no"] for item in filtered.json()["data"]["items"]] == [1]
+    assert "payload" not in filtered.json()["data"]["items"][0]
+
+    by_id = client.get(f"/api/v1/events/{before[1]['event_id']}")
+    assert by_id.status_code == 200 and by_id.json()["data"] == before[1]
+    diff = client.get(f"/api/v1/events/{before[1]['event_id']}/diff/{before[1]['event_id']}")
+    assert (
+        diff.status_code == 200 and diff.json()["data"]["fields"]["output_ref"]["identical"] is True
+    )
+
+    export = {"run_id": run_id, "bundle_profile": "full_debug", "compression": "gzip"}
+    bundle = client.post("/api/v1/bundles/export", json=export)
+    assert bundle.status_code == 200
+    with tarfile.open(fileobj=io.BytesIO(bundle.content), mode="r:gz") as archive:
+        members = {
+            member.name: archive.extractfile(member).read() for member in archive if member.isfile()
+        }
+    assert len(members["events/000000.ndjson"].splitlines()) == 3
+    assert [name for name in members if name.startswith("artifacts/") and name.endswith(".json")]
+
+    late = _event({"run_id": run_id, "trace_id": run_id}, 0, "run_started", before[0]["payload"])
+    response = client.post(events_url, json={"idempotency_key": "late", "event": late})
+    assert response.status_code == 409
+
+    replay = client.post("/api/v1/replays", json={"source_run_id": run_id}).json()["data"]
+    assert process_one()
+    derived_run_id = client.get(f"/api/v1/replays/{replay['replay_session_id']}").json()["data"][
+        "derived_run_id"
+    ]
+    derived = client.get(f"/api/v1/runs/{derived_run_id}/events").json()["data"]["items"]
+    assert [item["event_type"] for item in derived] == [item["event_type"] for item in before]
+
+
+def test_rebuilding_a_named_sealed_run_keeps_its_counters(client) -> None:
+    run_id, _ = _seed_completed_run(client)
+    with SessionLocal() as db:
+        assert seal_runs(db, artifact_store, seal_after_days=7).runs_sealed == 1
+        before = run_stats_dict(db.get(RunStats, run_id))
+        assert before["total_events"] == 3 and before["last_sequence_no"] == 2
+
+        assert rebuild_all_run_stats(db, [run_id]) == 0
+        db.expire_all()
+        assert run_stats_dict(db.get(RunStats, run_id)) == before
+
+
+def test_retention_purges_sealed_runs_with_their_links_and_snapshot(client) -> None:
+    run_id, artifact_hash = _seed_completed_run(client)
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+
+    with SessionLocal() as db:
+        seal_runs(db, artifact_store, seal_after_days=7)
+        snapshot_hash = db.get(RunSnapshot, run_id).artifact_hash
+        db.execute(update(Run).values(started_at_utc=old, ended_at_utc=old))
+        db.execute(update(Artifact).values(created_at_utc=old))
+        db.commit()
+
+        # Referenced by the manifest row, the snapshot outlives its retention class
+        # until the run goes.
+        run_retention(db, artifact_store)
+        assert db.get(Artifact, snapshot_hash) is not None
+
+        purged = run_retention(
+            db, artifact_store, now=datetime.now(timezone.utc) + timedelta(days=2)
+        )
+        assert purged.runs_deleted == 1
+        assert purged.rows_deleted["event_artifacts"] == 1
+        assert purged.rows_deleted["run_snapshots"] == 1
+        assert purged.rows_deleted["sealed_event_ids"] == 3
+        assert db.execute(select(func.count()).select_from(SealedEventId)).scalar_one() == 0
+        assert db.get(Artifact, artifact_hash) is None
+        assert db.get(Artifact, snapshot_hash) is None
+        assert not artifact_store.exists(snapshot_hash)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+ipc = pytest.importorskip("pyarrow.ipc")
+parquet = pytest.importorskip("pyarrow.parquet")
+
+STARTED = {"app_id": "export-app", "environment": "test", "entrypoint_name": "pytest"}
+MODEL_CALLED = {
+    "provider": "openai",
+    "model_id": "gpt-4.1",
+    "model_api_version": "v1",
+    "temperature": 0,
+    "top_p": 1,
+    "max_tokens": 64,
+    "request_ref": "q",
+}
+MODEL_RESULT = {
+    "provider": "openai",
+    "model_id": "gpt-4.1",
+    "finish_reason": "stop",
+    "token_usage": {"prompt": 100, "completion": 20, "total": 120},
+    "response_ref": "r",
+    "latency_ms": 250,
+}
+
+
+def _post_event(
+    client, run: dict, sequence_no: int, step_id: str, event_type: str, payload: dict
+) -> None:
+    event = {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{step_id}",
+        "parent_step_id": None,
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": [],
+        "redaction_status": "not_required",
+        "payload": payload,
+    }
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": f"{run['run_id']}:{sequence_no}", "event": event},
+    )
+    assert response.status_code == 200
+
+
+def _model_run(client) -> str:
+    run = client.post("/api/v1/runs", json={"app_id": "export-app", "environment": "test"}).json()[
+        "data"
+    ]
+    _post_event(client, run, 0, "start", "run_started", STARTED)
+    _post_event(client, run, 1, "model", "model_called", MODEL_CALLED)
+    _post_event(client, run, 2, "model", "model_result", MODEL_RESULT)
+    return run["run_id"]
+
+
+def test_export_events_as_parquet_and_arrow(client) -> None:
+    run_id = _model_run(client)
+    other_run_id = _model_run(client)
+
+    response = client.post(
+        "/api/v1/exports/events", json={"format": "parquet", "run_ids": [run_id]}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    table = parquet.read_table(io.BytesIO(response.content))
+    assert table.column("run_id").to_pylist() == [run_id] * 3
+    assert table.column("sequence_no").to_pylist() == [0, 1, 2]
+    assert table.schema.field("latency_ms").type == pyarrow.float64()
+    assert table.schema.field("total_tokens").type == pyarrow.int64()
+    result = table.to_pylist()[2]
+    assert result["model_id"] == "gpt-4.1"
+    assert result["latency_ms"] == 250.0
+    assert result["total_tokens"] == 120
+    assert result["tool_name"] is None
+
+    response = client.post(
+        "/api/v1/exports/events",
+        json={"format": "arrow", "from_utc": "2000-01-01T00:00:00Z", "app_id": "export-app"},
+    )
+    assert response.status_code == 200
+    table = ipc.open_stream(response.content).read_all()
+    assert set(table.column("run_id").to_pylist()) == {run_id, other_run_id}
+    assert table.num_rows == 6
+
+
+def test_export_events_requires_a_run_set_or_range(client) -> None:
+    response = client.post("/api/v1/exports/events", json={"format": "parquet"})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    response = client.post("/api/v1/exports/events", json={"format": "csv", "run_ids": ["x"]})
+    assert response.status_code == 400
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+import backend.app.main as main_module
+from backend.app.modules.ingestion.reorder import ReorderBuffer
+
+
+def _event(run: dict, sequence_no: int) -> dict:
+    if sequence_no == 0:
+        event_type, payload = (
+            "run_started",
+            {"app_id": "reorder-app", "environment": "test", "entrypoint_name": "pytest"},
+        )
+    else:
+        event_type = "input_received"
+        payload = {
+            "input_channels": ["cli"],
+            "input_hash": str(sequence_no),
+            "input_policy_labels": [],
+        }
+    return {
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{sequence_no}",
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "payload": payload,
+    }
+
+
+def test_concurrent_emitters_are_committed_in_sequence(monkeypatch) -> None:
+    buffer = ReorderBuffer(main_module.apply_released_event, window=32, timeout_ms=10000)
+    monkeypatch.setattr(main_module, "reorder_buffer", buffer)
+    # One portal (event loop) for every request, as under uvicorn.
+    with TestClient(main_module.app) as client:
+        run = client.post(
+            "/api/v1/runs", json={"app_id": "reorder-app", "environment": "test"}
+        ).json()["data"]
+
+        def post(sequence_no: int) -> dict:
+            body = {"idempotency_key": f"reorder-{sequence_no}", "event": _event(run, sequence_no)}
+            return client.post(f"/api/v1/runs/{run['run_id']}/events", json=body).json()
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            responses = list(pool.map(post, [5, 3, 4, 1, 2, 0]))
+        assert all(response["status"] == "success" for response in responses), responses
+
+        items = client.get(f"/api/v1/runs/{run['run_id']}/events").json()["data"]["items"]
+        assert [item["sequence_no"] for item in items] == [0, 1, 2, 3, 4, 5]
+        stats = client.get("/api/v1/ingest/reorder").json()["data"]
+        assert stats["enabled"] is True
+        assert stats["in_order"] + stats["reordered"] == 6
+        assert stats["held_events"] == 0
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from datetime import datetime, timezone
+
+import backend.app.main as main_module
+from sdk.python.trace_sdk.client import TraceClient
+from sdk.python.trace_sdk.exporter import StreamExporter
+
+
+def _line(
+    run: dict, sequence_no: int, event_type: str = "run_started", key: str | None = None
+) -> dict:
+    payload = {"app_id": "stream-app", "environment": "test", "entrypoint_name": "pytest"}
+    if event_type == "input_received":
+        payload = {"input_channels": ["cli"], "input_hash": "h", "input_policy_labels": []}
+    return {
+        "kind": "event",
+        "idempotency_key": key or f"{run['run_id']}:{sequence_no}",
+        "event": {
+            "trace_id": run["trace_id"],
+            "run_id": run["run_id"],
+            "step_id": f"{run['run_id']}:{sequence_no}",
+            "sequence_no": sequence_no,
+            "event_type": event_type,
+            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+            "payload": payload,
+        },
+    }
+
+
+def test_stream_acks_each_line_across_runs(client, monkeypatch) -> None:
+    monkeypatch.setattr(
+        main_module, "settings", replace(main_module.settings, ingest_stream_max_line_bytes=4096)
+    )
+    runs = [
+        client.post("/api/v1/runs", json={"app_id": "stream-app", "environment": "test"}).json()[
+            "data"
+        ]
+        for _ in range(2)
+    ]
+    lines = [
+        json.dumps(_line(runs[0], 0)),
+        json.dumps(_line(runs[1], 0)),
+        json.dumps(_line(runs[0], 1, "input_received")),
+        "{not json",
+        json.dumps(_line(runs[0], 1, "input_received")),
+        json.dumps(_line(runs[1], 0, key="other-key")),
+        json.dumps(
+            {
+                "kind": "artifact",
+                "artifact": {"artifact_type": "prompt", "byte_size": 2, "content_text": "hi"},
+            }
+        ),
+        "x" * 5000,
+        "",
+        json.dumps(_line(runs[1], 1, "input_received")),
+    ]
+    response = client.post(
+        "/api/v1/ingest/stream",
+        content=("\n".join(lines)).encode(),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    acks = [json.loads(raw) for raw in response.text.splitlines()]
+
+    assert [ack["line"] for ack in acks] == [1, 2, 3, 4, 5, 6, 7, 8, 10]
+    assert [ack["status"] for ack in acks] == [
+        "success", "success", "success", "error", "success", "error", "success", "error", "success"
+    ]
+    assert acks[4]["data"] == {
+        "event_id": acks[2]["data"]["event_id"],
+        "accepted": False,
+        "validation_warnings": [],
+    }
+    assert acks[3]["error"]["code"] == "VALIDATION_ERROR"
+    assert acks[5]["error"]["code"] == "CONFLICT"
+    assert acks[6]["data"]["upload_required"] is False
+    assert "INGEST_STREAM_MAX_LINE_BYTES" in acks[7]["error"]["message"]
+
+    for run, expected in ((runs[0], 2), (runs[1], 2)):
+        detail = client.get(f"/api/v1/runs/{run['run_id']}").json()["data"]
+        assert detail["counters"]["total_events"] == expected
+
+
+def test_exporter_streams_queued_events(client) -> None:
+    trace = TraceClient(wire_format="json", compression="identity")
+    trace._client = client
+    run = trace.start_run(app_id="stream-app", environment="test")
+    acks: list[dict] = []
+    exporter = StreamExporter(
+        trace, linger_seconds=0.05, on_ack=lambda _line, ack: acks.append(ack)
+    )
+    exporter.emit_event(
+        event_type="run_started",
+        sequence_no=0,
+        step_id="start",
+        payload={"app_id": "stream-app", "environment": "test", "entrypoint_name": "pytest"},
+    )
+    for sequence_no in range(1, 5):
+        exporter.emit_event(
+            event_type="input_received",
+            sequence_no=sequence_no,
+            step_id=f"input-{sequence_no}",
+            payload={
+                "input_channels": ["cli"],
+                "input_hash": str(sequence_no),
+                "input_policy_labels": [],
+            },
+            run_id=run.run_id,
+            trace_id=run.trace_id,
+        )
+    exporter.flush()
+    exporter.close()
+
+    assert exporter.failed == []
+    assert len(acks) == 5
+    items = client.get(f"/api/v1/runs/{run.run_id}/events").json()["data"]["items"]
+    assert [item["sequence_no"] for item in items] == [0, 1, 2, 3, 4]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+import backend.app.main as main_module
+from backend.app.db.models import Event
+from backend.app.db.session import SessionLocal
+from backend.app.modules.ingestion.wal import LOG_NAME, IngestWal
+from backend.app.schemas.events import CanonicalEvent
+
+MODEL_CALLED = {
+    "provider": "openai",
+    "model_id": "gpt-4.1",
+    "model_api_version": "v1",
+    "temperature": 0,
+    "top_p": 1,
+    "max_tokens": 64,
+    "request_ref": "q",
+}
+MODEL_RESULT = {
+    "provider": "openai",
+    "model_id": "gpt-4.1",
+    "finish_reason": "stop",
+    "token_usage": {"prompt": 1, "completion": 1, "total": 2},
+    "response_ref": "r",
+    "latency_ms": 5,
+}
+STEPS = [
+    (
+        "run_started",
+        "start",
+        {"app_id": "wal-app", "environment": "test", "entrypoint_name": "pytest"},
+    ),
+    ("model_called", "model", MODEL_CALLED),
+    ("model_result", "model", MODEL_RESULT),
+]
+
+
+def _event(run: dict, sequence_no: int) -> dict:
+    event_type, step, payload = STEPS[sequence_no]
+    return {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{step}",
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "payload": payload,
+    }
+
+
+def test_acknowledged_events_are_readable_and_committed(client, tmp_path, monkeypatch) -> None:
+    # A long commit interval keeps events in flight,
+    # so reads must go through the buffer or the barrier.
+    wal = IngestWal(tmp_path, SessionLocal, commit_interval_ms=60000)
+    wal.start()
+    monkeypatch.setattr(main_module, "ingest_wal", wal)
+    try:
+        run = client.post("/api/v1/runs", json={"app_id": "wal-app", "environment": "test"}).json()[
+            "data"
+        ]
+        event_ids = []
+        for sequence_no in range(3):
+            response = client.post(
+                f"/api/v1/runs/{run['run_id']}/events",
+                json={"idempotency_key": f"wal-{sequence_no}", "event": _event(run, sequence_no)},
+            )
+            assert response.status_code == 200, response.json()
+            event_ids.append(response.json()["data"]["event_id"])
+
+        duplicate = client.post(
+            f"/api/v1/runs/{run['run_id']}/events",
+            json={"idempotency_key": "wal-1", "event": _event(run, 1)},
+        ).json()["data"]
+        assert duplicate == {"event_id": event_ids[1], "accepted": False, "validation_warnings": []}
+
+        assert (
+            client.get(f"/api/v1/events/{event_ids[2]}").json()["data"]["event_type"]
+            == "model_result"
+        )
+        items = client.get(f"/api/v1/runs/{run['run_id']}/events").json()["data"]["items"]
+        assert [item["event_id"] for item in items] == event_ids
+        assert (
+            client.get(f"/api/v1/runs/{run['run_id']}").json()["data"]["counters"]["total_events"]
+            == 3
+        )
+    finally:
+        wal.stop()
+
+
+def test_restart_recovers_logged_events(client, tmp_path) -> None:
+    run = client.post("/api/v1/runs", json={"app_id": "wal-app", "environment": "test"}).json()[
+        "data"
+    ]
+    wal = IngestWal(tmp_path, SessionLocal)
+    # No committer: events are acknowledged into the log only, as if the process died right after.
+    for sequence_no in range(2):
+        event = CanonicalEvent.model_validate(_event(run, sequence_no))
+        _, accepted, _ = wal.ingest(run["run_id"], f"recover-{sequence_no}", event)
+        assert accepted
+    wal.log.close()
+    with (tmp_path / LOG_NAME).open("ab") as handle:
+        handle.write(b'{"event_id": "torn')
+
+    recovered = IngestWal(tmp_path, SessionLocal)
+    recovered.start()
+    try:
+        assert recovered.wait_committed(timeout=10)
+    finally:
+        recovered.stop()
+
+    with SessionLocal() as db:
+        keys = (
+            db.execute(select(Event.idempotency_key).where(Event.run_id == run["run_id"]))
+            .scalars()
+            .all()
+        )
+    assert sorted(keys) == ["recover-0", "recover-1"]
+    assert not (tmp_path / LOG_NAME).read_bytes().endswith(b"torn")
+
+
+def test_committer_survives_unexpected_errors_and_reads_report_the_backlog(
+    client, tmp_path, monkeypatch
+) -> None:
+    run = client.post(
+        "/api/v1/runs", json={"app_id": "wal-app", "environment": "test"}
+    ).json()["data"]
+    wal = IngestWal(tmp_path, SessionLocal, commit_interval_ms=10)
+    failures = []
+    recovered = threading.Event()
+    apply = wal._apply
+
+    def flaky_apply(batch):
+        if not recovered.is_set():
+            failures.append(len(batch))
+            raise OSError("artifact store unavailable")
+        apply(batch)
+
+    monkeypatch.setattr(wal, "_apply", flaky_apply)
+    monkeypatch.setattr(main_module, "ingest_wal", wal)
+    fast_reads = replace(main_module.settings, ingest_wal_read_wait_ms=50)
+    monkeypatch.setattr(main_module, "settings", fast_reads)
+    wal.start()
+    try:
+        wal.ingest(run["run_id"], "flaky-0", CanonicalEvent.model_validate(_event(run, 0)))
+
+        # The committer keeps failing, so a read cannot honour read-your-writes.
+        response = client.get(f"/api/v1/runs/{run['run_id']}/events")
+        assert response.status_code == 503
+        assert response.json()["error"]["code"] == "DEPENDENCY_UNAVAILABLE"
+        assert response.json()["error"]["retryable"] is True
+        assert failures and wal._thread.is_alive()
+
+        recovered.set()
+        assert wal.wait_committed(timeout=10)
+        items = client.get(f"/api/v1/runs/{run['run_id']}/events").json()["data"]["items"]
+        assert [item["sequence_no"] for item in items] == [0]
+    finally:
+        wal.stop()
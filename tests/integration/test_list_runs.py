@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.app.db.models import Run
+from backend.app.db.session import SessionLocal, engine
+from backend.app.modules.query.service import encode_run_page_token, list_runs_query
+
+
+def _add_runs(count: int, started_at: datetime, **fields) -> None:
+    with SessionLocal() as db:
+        for index in range(count):
+            db.add(
+                Run(
+                    run_id=f"run-{index:03d}",
+                    trace_id=f"trace-{index:03d}",
+                    app_id=fields.get("app_id", "list-app"),
+                    environment="test",
+                    status=fields.get("status", "success"),
+                    started_at_utc=started_at,
+                )
+            )
+        db.commit()
+
+
+def test_keyset_pages_do_not_skip_or_repeat_runs_started_together(client) -> None:
+    _add_runs(5, datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    seen: list[str] = []
+    token = None
+    while True:
+        params = {"page_size": 2, **({"page_token": token} if token else {})}
+        data = client.get("/api/v1/runs", params=params).json()["data"]
+        seen.extend(item["run_id"] for item in data["items"])
+        token = data["next_page_token"]
+        if token is None:
+            break
+
+    assert seen == [f"run-{index:03d}" for index in reversed(range(5))]
+    assert client.get("/api/v1/runs", params={"page_token": "not-a-token"}).status_code == 400
+
+
+def _explain(stmt) -> str:
+    with engine.connect() as connection:
+        compiled = stmt.compile(dialect=engine.dialect)
+        params = compiled.params
+        if compiled.positional:
+            params = tuple(params[name] for name in compiled.positiontup)
+        if engine.dialect.name == "postgresql":
+            # Test tables are tiny; make the planner show which index it would use at scale.
+            connection.exec_driver_sql("SET enable_seqscan = off")
+            rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", params).all()
+            return "\n".join(row[0] for row in rows)
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    ("filters", "index_name"),
+    [
+        ({"app_id": "list-app"}, "ix_runs_app_started"),
+        ({"status": "success"}, "ix_runs_status_started"),
+        ({}, "ix_runs_started_run"),
+    ],
+)
+def test_run_listing_is_served_by_keyset_indexes(filters: dict, index_name: str) -> None:
+    _add_runs(3, datetime(2026, 1, 1, tzinfo=timezone.utc))
+    with SessionLocal() as db:
+        token = encode_run_page_token(db.get(Run, "run-002"))
+
+    plan = _explain(list_runs_query(**filters, page_size=50, page_token=token))
+    assert index_name in plan
+    if engine.dialect.name == "postgresql":
+        assert "Sort" not in plan
+    else:
+        assert "TEMP B-TREE" not in plan
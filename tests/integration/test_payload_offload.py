@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+import backend.app.modules.ingestion.service as ingestion_service
+from backend.app import main as main_module
+from backend.app.db.models import Artifact, Event, EventArtifact
+from backend.app.db.session import SessionLocal
+from backend.app.services.payload_refs import PAYLOAD_REF_KEY, split_payload
+
+TRANSCRIPT = [{"role": "user", "content": f"message {index} " + "x" * 200} for index in range(40)]
+
+
+def _run_started(run: dict) -> dict:
+    return {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:start",
+        "sequence_no": 0,
+        "event_type": "run_started",
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "payload": {
+            "app_id": "offload-app",
+            "environment": "test",
+            "entrypoint_name": "pytest",
+            "transcript": TRANSCRIPT,
+        },
+    }
+
+
+def test_split_payload_moves_largest_fields_until_the_rest_fits() -> None:
+    payload = {"small": "a", "medium": "b" * 3000, "large": "c" * 9000}
+
+    unchanged, contents = split_payload(payload, 20000)
+    assert unchanged is payload and contents == {}
+
+    inline, contents = split_payload(payload, 5000)
+    assert inline["small"] == "a" and inline["medium"] == payload["medium"]
+    assert inline["large"][PAYLOAD_REF_KEY] in contents
+    assert inline["large"]["byte_size"] == 9002
+
+
+def test_large_payload_fields_are_offloaded_and_rehydrated_on_request(client, monkeypatch) -> None:
+    settings = dataclasses.replace(ingestion_service.settings, event_payload_offload_bytes=4096)
+    monkeypatch.setattr(ingestion_service, "settings", settings)
+    run = client.post("/api/v1/runs", json={"app_id": "offload-app", "environment": "test"}).json()[
+        "data"
+    ]
+
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": "offload-0", "event": _run_started(run)},
+    )
+    assert response.status_code == 200
+    event_id = response.json()["data"]["event_id"]
+
+    with SessionLocal() as db:
+        stored = db.execute(
+            select(Event.payload_json).where(Event.event_id == event_id)
+        ).scalar_one()
+        artifact_hash = stored["transcript"][PAYLOAD_REF_KEY]
+        assert stored["entrypoint_name"] == "pytest"
+        assert db.get(Artifact, artifact_hash).artifact_type == "event_payload"
+        assert db.execute(
+            select(EventArtifact).where(EventArtifact.event_id == event_id)
+        ).scalar_one()
+
+    lazy = client.get(f"/api/v1/events/{event_id}").json()["data"]
+    assert lazy["payload"]["transcript"][PAYLOAD_REF_KEY] == artifact_hash
+
+    full = client.get(f"/api/v1/events/{event_id}", params={"hydrate_payload": "true"}).json()[
+        "data"
+    ]
+    assert full["payload"]["transcript"] == TRANSCRIPT
+
+    listed = client.get(
+        f"/api/v1/runs/{run['run_id']}/events", params={"hydrate_payload": "true"}
+    ).json()["data"]
+    assert listed["items"][0]["payload"]["transcript"] == TRANSCRIPT
+
+
+def test_ingest_writes_offloaded_fields_before_the_database_step(client, monkeypatch) -> None:
+    settings = dataclasses.replace(ingestion_service.settings, event_payload_offload_bytes=4096)
+    monkeypatch.setattr(ingestion_service, "settings", settings)
+    run = client.post(
+        "/api/v1/runs", json={"app_id": "offload-app", "environment": "test"}
+    ).json()["data"]
+    ingest_event = main_module.ingest_event
+    stored_payloads = []
+
+    def ingest_without_store(db, run, idempotency_key, event, stored_payload=None):
+        stored_payloads.append(stored_payload)
+        with monkeypatch.context() as patch:
+            # Under DATABASE_ASYNC the database step runs on the event loop, so it must not
+            # touch the artifact store.
+            patch.setattr(ingestion_service, "get_artifact_store", None)
+            return ingest_event(db, run, idempotency_key, event, stored_payload)
+
+    monkeypatch.setattr(main_module, "ingest_event", ingest_without_store)
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": "offload-0", "event": _run_started(run)},
+    )
+    assert response.status_code == 200
+    [stored_payload] = stored_payloads
+    [artifact] = stored_payload.artifacts
+    assert stored_payload.payload["transcript"][PAYLOAD_REF_KEY] == artifact["artifact_hash"]
+    with SessionLocal() as db:
+        assert db.get(Artifact, artifact["artifact_hash"]).retention_class == "dev_short"
+    event_id = response.json()["data"]["event_id"]
+    hydrated = client.get(f"/api/v1/events/{event_id}", params={"hydrate_payload": "true"})
+    full = hydrated.json()["data"]
+    assert full["payload"]["transcript"] == TRANSCRIPT
+
+
+def test_offloaded_fields_of_a_rejected_event_are_left_for_retention(client, monkeypatch) -> None:
+    settings = dataclasses.replace(ingestion_service.settings, event_payload_offload_bytes=4096)
+    monkeypatch.setattr(ingestion_service, "settings", settings)
+    run = client.post(
+        "/api/v1/runs", json={"app_id": "offload-app", "environment": "test"}
+    ).json()["data"]
+    event = _run_started(run)
+    event["payload"]["transcript"] = [{"role": "user", "content": "rejected " + "y" * 8000}]
+    event["event_type"] = "model_called"
+
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": "offload-rejected", "event": event},
+    )
+    assert response.status_code == 400
+
+    with SessionLocal() as db:
+        [artifact] = db.execute(
+            select(Artifact).where(Artifact.artifact_type == "event_payload")
+        ).scalars()
+        # Registered but unreferenced, so retention's artifact GC deletes it and its blob.
+        assert artifact.retention_class == "dev_short" and artifact.status == "ready"
+        assert db.execute(select(EventArtifact)).first() is None
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete
+
+from backend.app import main as main_module
+from backend.app.db.models import Event, new_id
+from backend.app.db.session import SessionLocal
+
+
+def _event(run: dict, sequence_no: int, event_type: str, payload: dict) -> dict:
+    return {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{sequence_no}",
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "payload": payload,
+    }
+
+
+def _ingest(client, run: dict, event: dict) -> None:
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": f"{run['run_id']}:{event['sequence_no']}", "event": event},
+    )
+    assert response.status_code == 200
+
+
+def test_event_pages_of_finished_runs_are_immutable_and_cached(client) -> None:
+    run = client.post("/api/v1/runs", json={"app_id": "cache-app", "environment": "test"}).json()[
+        "data"
+    ]
+    events_url = f"/api/v1/runs/{run['run_id']}/events"
+    started = {"app_id": "cache-app", "environment": "test", "entrypoint_name": "main"}
+    _ingest(client, run, _event(run, 0, "run_started", started))
+
+    live = client.get(events_url)
+    assert live.headers["cache-control"] == "no-cache"
+    assert (
+        client.get(events_url, headers={"if-none-match": live.headers["etag"]}).status_code == 304
+    )
+
+    completed = {"status": "success", "total_steps": 2, "total_latency_ms": 5}
+    _ingest(client, run, _event(run, 1, "run_completed", completed))
+    finished = client.get(events_url, params={"page_size": 10})
+    assert finished.headers["etag"] != live.headers["etag"]
+    assert finished.headers["cache-control"].endswith("immutable")
+    assert [item["sequence_no"] for item in finished.json()["data"]["items"]] == [0, 1]
+
+    with SessionLocal() as db:
+        db.execute(delete(Event))
+        db.commit()
+    # Served from the response cache: the rows are gone, the page and its ETag are not.
+    cached = client.get(
+        events_url, params={"page_size": 10}, headers={"x-request-id": "req-cached"}
+    )
+    assert cached.json()["data"] == finished.json()["data"]
+    assert cached.json()["request_id"] == "req-cached"
+    assert cached.headers["etag"] == finished.headers["etag"]
+    revalidated = client.get(
+        events_url, params={"page_size": 10}, headers={"if-none-match": cached.headers["etag"]}
+    )
+    assert revalidated.status_code == 304 and revalidated.content == b""
+
+
+def test_page_read_before_the_terminal_event_is_not_cached(client, monkeypatch) -> None:
+    run = client.post(
+        "/api/v1/runs", json={"app_id": "cache-app", "environment": "test"}
+    ).json()["data"]
+    events_url = f"/api/v1/runs/{run['run_id']}/events"
+    started = {"app_id": "cache-app", "environment": "test", "entrypoint_name": "main"}
+    _ingest(client, run, _event(run, 0, "run_started", started))
+    list_events = main_module.list_events
+
+    def list_then_complete(db, **kwargs):
+        page = list_events(db, **kwargs)
+        # The run completes after the page was read but before the response is built.
+        with SessionLocal() as writer:
+            writer.add(
+                Event(
+                    event_id=new_id(),
+                    run_id=run["run_id"],
+                    step_id="late",
+                    event_type="run_completed",
+                    schema_version="1.0.0",
+                    payload_json={"status": "success", "total_steps": 1, "total_latency_ms": 5},
+                    idempotency_key=f"{run['run_id']}:1",
+                    sequence_no=1,
+                    timestamp_utc=datetime.now(timezone.utc),
+                )
+            )
+            writer.commit()
+        return page
+
+    monkeypatch.setattr(main_module, "list_events", list_then_complete)
+    stale = client.get(events_url)
+    assert [item["sequence_no"] for item in stale.json()["data"]["items"]] == [0]
+    assert stale.headers["cache-control"] == "no-cache"
+
+    monkeypatch.setattr(main_module, "list_events", list_events)
+    assert [item["sequence_no"] for item in client.get(events_url).json()["data"]["items"]] == [
+        0,
+        1,
+    ]
+
+
+def test_ready_artifact_metadata_is_immutable(client) -> None:
+    artifact = client.post(
+        "/api/v1/artifacts",
+        json={
+            "artifact_type": "output",
+            "byte_size": 5,
+            "mime_type": "text/plain",
+            "content_text": "hello",
+        },
+    ).json()["data"]
+    response = client.get(f"/api/v1/artifacts/{artifact['artifact_hash']}")
+    assert response.json()["data"]["status"] == "ready"
+    assert response.headers["cache-control"] == "private, max-age=3600, immutable"
+    etag = response.headers["etag"]
+    revalidated = client.get(
+        f"/api/v1/artifacts/{artifact['artifact_hash']}", headers={"if-none-match": etag}
+    )
+    assert revalidated.status_code == 304
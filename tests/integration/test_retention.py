@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from backend.app.db.models import Artifact, Event, Run
+from backend.app.db.session import SessionLocal
+from backend.app.main import artifact_store
+from backend.app.modules.retention.service import run_retention
+from worker.app.runner import process_one
+
+
+def _seed_run(client, app_id: str) -> tuple[str, str]:
+    created = client.post("/api/v1/runs", json={"app_id": app_id, "environment": "test"}).json()[
+        "data"
+    ]
+    artifact = client.post(
+        "/api/v1/artifacts",
+        json={
+            "artifact_type": "output",
+            "byte_size": len(app_id),
+            "mime_type": "text/plain",
+            "content_text": app_id,
+        },
+    ).json()["data"]
+    refs = [
+        {
+            "artifact_hash": artifact["artifact_hash"],
+            "artifact_type": "output",
+            "byte_size": len(app_id),
+        }
+    ]
+    events = [
+        ("run_started", {"app_id": app_id, "environment": "test", "entrypoint_name": "main"}, []),
+        (
+            "final_output",
+            {"output_ref": artifact["artifact_hash"], "response_channel": "stdout"},
+            refs,
+        ),
+    ]
+    for sequence_no, (event_type, payload, artifact_refs) in enumerate(events):
+        event = {
+            "schema_version": "1.0.0",
+            "trace_id": created["trace_id"],
+            "run_id": created["run_id"],
+            "step_id": f"{created['run_id']}-step",
+            "parent_step_id": None,
+            "sequence_no": sequence_no,
+            "event_type": event_type,
+            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+            "actor_type": "sdk",
+            "determinism_mode": "live",
+            "artifact_refs": artifact_refs,
+            "redaction_status": "not_required",
+            "payload": payload,
+        }
+        response = client.post(
+            f"/api/v1/runs/{created['run_id']}/events",
+            json={"idempotency_key": f"{created['run_id']}:{sequence_no}", "event": event},
+        )
+        assert response.status_code == 200
+    return created["run_id"], artifact["artifact_hash"]
+
+
+def test_retention_marks_then_purges_after_grace(client) -> None:
+    expired_run, expired_hash = _seed_run(client, "expired")
+    held_run, _ = _seed_run(client, "held")
+    fresh_run, _ = _seed_run(client, "fresh")
+
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    with SessionLocal() as db:
+        db.execute(
+            update(Run).where(Run.run_id.in_([expired_run, held_run])).values(started_at_utc=old)
+        )
+        db.execute(update(Run).where(Run.run_id == held_run).values(legal_hold=True))
+        db.execute(update(Artifact).values(created_at_utc=old))
+        db.commit()
+
+        preview = run_retention(db, artifact_store, dry_run=True)
+        assert preview.runs_marked == 1
+        assert preview.runs_deleted == 0
+        assert preview.skipped_legal_hold == 1
+
+        marked = run_retention(db, artifact_store)
+        assert marked.runs_marked == 1
+        assert marked.runs_deleted == 0
+
+        purged = run_retention(
+            db, artifact_store, now=datetime.now(timezone.utc) + timedelta(days=2)
+        )
+        assert purged.runs_deleted == 1
+        assert purged.rows_deleted["events"] == 2
+        assert purged.artifacts_deleted == 1
+
+        remaining = set(db.execute(select(Run.run_id)).scalars())
+        assert remaining == {held_run, fresh_run}
+        assert db.execute(select(func.count()).select_from(Event)).scalar_one() == 4
+        assert db.get(Artifact, expired_hash) is None
+        assert not artifact_store.exists(expired_hash)
+
+
+def test_retention_purge_job_records_report(client) -> None:
+    _seed_run(client, "job")
+
+    queued = client.post("/api/v1/retention/purge", json={"dry_run": True})
+    assert queued.status_code == 200
+    assert queued.json()["data"]["status"] == "pending"
+    assert process_one()
+
+    reports = client.get("/api/v1/retention/reports").json()["data"]["items"]
+    assert len(reports) == 1
+    assert reports[0]["dry_run"] is True
+    assert reports[0]["runs_deleted"] == 0
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+
+from backend.app.db.models import RunStats
+from backend.app.db.session import SessionLocal
+from backend.app.services.run_stats import rebuild_all_run_stats
+
+
+def _post_event(
+    client, run: dict, sequence_no: int, event_type: str, payload: dict, artifact_refs=()
+):
+    event = {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"step-{sequence_no}",
+        "parent_step_id": None,
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": list(artifact_refs),
+        "redaction_status": "not_required",
+        "payload": payload,
+    }
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": f"{run['run_id']}:{sequence_no}", "event": event},
+    )
+    assert response.status_code == 200
+
+
+def test_run_counters_are_maintained_at_ingest_and_rebuildable(client) -> None:
+    run = client.post("/api/v1/runs", json={"app_id": "stats-app", "environment": "test"}).json()[
+        "data"
+    ]
+    ref = {"artifact_hash": "a" * 64, "artifact_type": "prompt", "byte_size": 120}
+    _post_event(
+        client,
+        run,
+        0,
+        "run_started",
+        {"app_id": "stats-app", "environment": "test", "entrypoint_name": "t"},
+    )
+    _post_event(
+        client, run, 1, "final_output", {"output_ref": "a" * 64, "response_channel": "api"}, [ref]
+    )
+    # Idempotent retries must not be counted twice.
+    _post_event(
+        client, run, 1, "final_output", {"output_ref": "a" * 64, "response_channel": "api"}, [ref]
+    )
+
+    expected = {
+        "total_events": 2,
+        "last_sequence_no": 1,
+        "event_type_counts": {"run_started": 1, "final_output": 1},
+        "determinism_mode_counts": {"live": 2},
+        "artifact_bytes": 120,
+    }
+    detail = client.get(f"/api/v1/runs/{run['run_id']}").json()["data"]
+    assert detail["stats"] == expected
+    assert detail["counters"] == {"run_started": 1, "final_output": 1, "total_events": 2}
+
+    with SessionLocal() as db:
+        db.execute(delete(RunStats).where(RunStats.run_id == run["run_id"]))
+        db.commit()
+    assert client.get(f"/api/v1/runs/{run['run_id']}").json()["data"]["stats"] == expected
+
+    with SessionLocal() as db:
+        assert rebuild_all_run_stats(db) == 1
+        stats = db.execute(select(RunStats).where(RunStats.run_id == run["run_id"])).scalar_one()
+        assert (stats.total_events, stats.artifact_bytes) == (2, 120)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def _post_event(
+    client,
+    run: dict,
+    sequence_no: int,
+    step_id: str,
+    event_type: str,
+    payload: dict,
+    artifact_refs=(),
+):
+    event = {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"{run['run_id']}:{step_id}",
+        "parent_step_id": None,
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": list(artifact_refs),
+        "redaction_status": "not_required",
+        "payload": payload,
+    }
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": f"{run['run_id']}:{sequence_no}", "event": event},
+    )
+    assert response.status_code == 200
+
+
+MODEL_CALLED = {
+    "provider": "openai",
+    "model_id": "gpt-4.1",
+    "model_api_version": "v1",
+    "temperature": 0,
+    "top_p": 1,
+    "max_tokens": 64,
+    "request_ref": "q",
+}
+TOOL_CALLED = {
+    "tool_name": "web_search",
+    "tool_version": "1",
+    "call_signature_hash": "h",
+    "args_ref": "a",
+    "timeout_ms": 100,
+}
+
+
+def _model_result(finish_reason: str) -> dict:
+    return {
+        "provider": "openai",
+        "model_id": "gpt-4.1",
+        "finish_reason": finish_reason,
+        "token_usage": {"prompt": 10, "completion": 5},
+        "response_ref": "r",
+        "latency_ms": 12,
+    }
+
+
+def _search(client, **params) -> dict:
+    response = client.get("/api/v1/search", params=params)
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def test_search_matches_payload_fields_text_and_artifacts(client) -> None:
+    runs = [
+        client.post("/api/v1/runs", json={"app_id": "search-app", "environment": "test"}).json()[
+            "data"
+        ]
+        for _ in range(2)
+    ]
+    started = {"app_id": "search-app", "environment": "test", "entrypoint_name": "pytest"}
+    artifact_hash = client.post(
+        "/api/v1/artifacts",
+        json={
+            "artifact_type": "tool_result",
+            "byte_size": 32,
+            "mime_type": "text/plain",
+            "content_text": "upstream zebra gateway timed out",
+        },
+    ).json()["data"]["artifact_hash"]
+
+    for index, run in enumerate(runs):
+        _post_event(client, run, 0, "start", "run_started", started)
+        _post_event(client, run, 1, "model", "model_called", MODEL_CALLED)
+        _post_event(
+            client,
+            run,
+            2,
+            "model",
+            "model_result",
+            _model_result("length" if index == 0 else "stop"),
+        )
+    _post_event(client, runs[1], 3, "tool", "tool_called", TOOL_CALLED)
+    _post_event(
+        client,
+        runs[1],
+        4,
+        "tool",
+        "tool_result",
+        {
+            "tool_name": "web_search",
+            "status": "error",
+            "result_ref": artifact_hash,
+            "latency_ms": 30,
+        },
+        [{"artifact_hash": artifact_hash, "artifact_type": "tool_result", "byte_size": 32}],
+    )
+
+    hits = _search(client, match="finish_reason=length")["items"]
+    assert [(hit["run_id"], hit["sequence_no"]) for hit in hits] == [(runs[0]["run_id"], 2)]
+    hits = _search(client, match=["payload.token_usage.prompt=10", "finish_reason=stop"])["items"]
+    assert [hit["run_id"] for hit in hits] == [runs[1]["run_id"]]
+
+    hits = _search(client, q="web_search error", event_type="tool_result")["items"]
+    assert [(hit["run_id"], hit["event_type"]) for hit in hits] == [
+        (runs[1]["run_id"], "tool_result")
+    ]
+
+    assert _search(client, q="zebra")["items"] == []
+    assert len(_search(client, q="zebra", include_artifacts="true")["items"]) == 1
+
+    seen, token = [], None
+    while True:
+        cursor = {"page_token": token} if token else {}
+        page = _search(client, q="openai", event_type="model_result", page_size=1, **cursor)
+        seen.extend(hit["event_id"] for hit in page["items"])
+        token = page["next_page_token"]
+        if token is None:
+            break
+    assert len(seen) == len(set(seen)) == 2
+
+    assert client.get("/api/v1/search").status_code == 400
+    assert client.get("/api/v1/search", params={"match": "no-equals"}).status_code == 400
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from backend.app.db.session import SessionLocal
+from backend.app.modules.streaming.service import stream_run_events
+
+
+def _post_event(client, run: dict, sequence_no: int, event_type: str, payload: dict):
+    event = {
+        "schema_version": "1.0.0",
+        "trace_id": run["trace_id"],
+        "run_id": run["run_id"],
+        "step_id": f"step-{sequence_no}",
+        "parent_step_id": None,
+        "sequence_no": sequence_no,
+        "event_type": event_type,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "actor_type": "sdk",
+        "determinism_mode": "live",
+        "artifact_refs": [],
+        "redaction_status": "not_required",
+        "payload": payload,
+    }
+    response = client.post(
+        f"/api/v1/runs/{run['run_id']}/events",
+        json={"idempotency_key": f"{run['run_id']}:{sequence_no}", "event": event},
+    )
+    assert response.status_code == 200
+
+
+STARTED = {"app_id": "stream-app", "environment": "test", "entrypoint_name": "pytest"}
+COMPLETED = {"status": "success", "total_steps": 2, "total_latency_ms": 5}
+
+
+def _parse(frames: list[bytes]) -> list[tuple[str, dict]]:
+    parsed = []
+    for frame in frames:
+        fields = dict(
+            line.split(": ", 1)
+            for line in frame.decode("utf-8").strip().splitlines()
+            if ": " in line
+        )
+        if "event" in fields:
+            parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+def test_stream_replays_tail_after_cursor_and_closes_on_terminal_run(client) -> None:
+    run = client.post("/api/v1/runs", json={"app_id": "stream-app", "environment": "test"}).json()[
+        "data"
+    ]
+    _post_event(client, run, 0, "run_started", STARTED)
+    _post_event(client, run, 1, "run_completed", COMPLETED)
+
+    response = client.get(
+        f"/api/v1/runs/{run['run_id']}/events/stream", headers={"last-event-id": "0"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame.encode("utf-8") for frame in response.text.split("\n\n") if frame]
+    assert [(kind, data.get("sequence_no")) for kind, data in _parse(frames)] == [
+        ("trace_event", 1),
+        ("run_status", None),
+    ]
+
+    missing = client.get("/api/v1/runs/missing/events/stream")
+    assert missing.status_code == 404
+
+
+def test_stream_pushes_newly_ingested_events(client) -> None:
+    run = client.post("/api/v1/runs", json={"app_id": "stream-app", "environment": "test"}).json()[
+        "data"
+    ]
+    _post_event(client, run, 0, "run_started", STARTED)
+
+    async def consume() -> list[bytes]:
+        async def connected() -> bool:
+            return False
+
+        stream = stream_run_events(SessionLocal, run["run_id"], -1, connected)
+        frames = [await stream.__anext__()]
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _post_event, client, run, 1, "run_completed", COMPLETED)
+        frames.extend([frame async for frame in stream])
+        return frames
+
+    parsed = _parse(asyncio.run(asyncio.wait_for(consume(), timeout=3)))
+    assert [kind for kind, _ in parsed] == ["trace_event", "trace_event", "run_status"]
+    assert parsed[1][1]["event_type"] == "run_completed"
+    assert parsed[2][1]["status"] == "success"
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import replace
+
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+zstandard = pytest.importorskip("zstandard")
+
+from backend.app.services import wire  # noqa: E402
+from sdk.python.trace_sdk.client import TraceClient  # noqa: E402
+
+
+def test_sdk_sends_compressed_msgpack_bodies(client) -> None:
+    trace = TraceClient(compress_min_bytes=0)
+    trace._client = client
+    assert (trace.wire_format, trace.compression) == ("msgpack", "zstd")
+
+    ctx = trace.start_run(app_id="wire-app", environment="test")
+    result = trace.emit_event(
+        event_type="run_started",
+        sequence_no=0,
+        step_id="start",
+        payload={"app_id": "wire-app", "environment": "test", "entrypoint_name": "pytest"},
+    )
+    assert result["accepted"] is True
+    content = b"prompt with a raw \x00 byte"
+    artifact = trace.register_artifact(artifact_type="prompt", content=content)
+    assert artifact["upload_required"] is False
+
+    event = client.get(f"/api/v1/events/{result['event_id']}").json()["data"]
+    assert event["run_id"] == ctx.run_id
+    assert event["event_type"] == "run_started"
+    stored = client.get(f"/api/v1/artifacts/{artifact['artifact_hash']}").json()["data"]
+    assert stored["byte_size"] == len(content)
+
+
+def test_sdk_falls_back_to_plain_json_when_the_server_answers_415(client, monkeypatch) -> None:
+    monkeypatch.setattr(wire, "msgpack", None)
+    monkeypatch.setattr(wire, "zstandard", None)
+    trace = TraceClient(compress_min_bytes=0)
+    trace._client = client
+    statuses = []
+    request = client.request
+
+    def counted_request(*args, **kwargs):
+        response = request(*args, **kwargs)
+        statuses.append(response.status_code)
+        return response
+
+    monkeypatch.setattr(client, "request", counted_request)
+    trace.start_run(app_id="wire-app", environment="test")
+    assert statuses == [415, 200]
+    assert (trace.wire_format, trace.compression) == ("json", "identity")
+
+    content = b"prompt with a raw \x00 byte"
+    artifact = trace.register_artifact(artifact_type="prompt", content=content)
+    assert statuses[2:] == [200]
+    stored = client.get(f"/api/v1/artifacts/{artifact['artifact_hash']}").json()["data"]
+    assert stored["byte_size"] == len(content)
+
+
+def test_json_and_gzip_bodies_still_accepted(client) -> None:
+    body = gzip.compress(json.dumps({"app_id": "wire-app", "environment": "test"}).encode())
+    response = client.post(
+        "/api/v1/runs",
+        content=body,
+        headers={"content-type": "application/json", "content-encoding": "gzip"},
+    )
+    assert response.status_code == 200, response.json()
+
+    response = client.post("/api/v1/runs", json={"app_id": "wire-app"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "environment"]
+
+
+def test_rejects_unsupported_and_oversized_bodies(client, monkeypatch) -> None:
+    packed = msgpack.packb({"app_id": "wire-app", "environment": "test"})
+    response = client.post(
+        "/api/v1/runs", content=packed, headers={"content-type": "application/xml"}
+    )
+    assert response.status_code == 415
+    assert response.json()["error"]["code"] == "UNSUPPORTED_MEDIA_TYPE"
+
+    response = client.post(
+        "/api/v1/runs",
+        content=b"not zstd",
+        headers={"content-type": "application/msgpack", "content-encoding": "zstd"},
+    )
+    assert response.status_code == 400
+
+    monkeypatch.setattr(wire, "settings", replace(wire.settings, request_body_max_bytes=1024))
+    bomb = zstandard.ZstdCompressor().compress(
+        msgpack.packb({"app_id": "x" * 4096, "environment": "test"})
+    )
+    response = client.post(
+        "/api/v1/runs",
+        content=bomb,
+        headers={"content-type": "application/msgpack", "content-encoding": "zstd"},
+    )
+    assert response.status_code == 413
@@ -0,0 +1,122 @@
+import gzip
+import json
+
+import pytest
+
+from backend.app.modules.diff.service import (
+    ArtifactDiffService,
+    json_structural_diff,
+    rank_movement_diff,
+    text_diff,
+)
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.services.artifact_store import LocalArtifactStore
+
+
+def test_text_diff_counts_changed_lines() -> None:
+    result = text_diff("a\nb\nc", "a\nB\nc\nd")
+
+    assert result["lines_added"] == 2
+    assert result["lines_removed"] == 1
+    assert "-b" in result["unified_diff"]
+    assert "+B" in result["unified_diff"]
+
+
+def test_json_structural_diff_reports_paths() -> None:
+    result = json_structural_diff(
+        {"model": "a", "params": {"top_k": 5}, "tags": ["x"]},
+        {"model": "b", "params": {"top_k": 5, "filters": {}}, "tags": []},
+    )
+
+    ops = {(change["path"], change["op"]) for change in result["changes"]}
+    assert ops == {("$.model", "changed"), ("$.params.filters", "added"), ("$.tags[0]", "removed")}
+
+
+def test_rank_movement_diff() -> None:
+    result = rank_movement_diff(
+        [{"chunk_id": "a"}, {"chunk_id": "b"}, {"chunk_id": "c"}],
+        {"candidates": [{"chunk_id": "b"}, {"chunk_id": "a"}, {"chunk_id": "d"}]},
+    )
+
+    assert [item["candidate_id"] for item in result["moved"]] == ["b", "a"]
+    assert result["moved"][0]["rank_delta"] == 1
+    assert result["added"] == [{"candidate_id": "d", "candidate_rank": 3}]
+    assert result["removed"] == [{"candidate_id": "c", "base_rank": 3}]
+
+
+def test_artifact_diff_short_circuits_and_caches(client, tmp_path) -> None:
+    from backend.app.db.models import Artifact
+    from backend.app.db.session import SessionLocal
+
+    store = LocalArtifactStore(str(tmp_path), "artifacts")
+    service = ArtifactDiffService(store)
+
+    identical = service.diff_artifacts(None, "same", "same")  # type: ignore[arg-type]
+    assert identical["identical"] is True
+
+    with SessionLocal() as db:
+        for name, body in (("base", {"a": 1}), ("cand", {"a": 2})):
+            payload = json.dumps(body).encode("utf-8")
+            store.store(name, payload)
+            db.add(
+                Artifact(
+                    artifact_hash=name,
+                    artifact_type="model_response",
+                    byte_size=len(payload),
+                    mime_type="application/json",
+                    storage_bucket="artifacts",
+                    storage_object_key=f"{name[:2]}/{name}",
+                    status="ready",
+                )
+            )
+        db.commit()
+
+        first = service.diff_artifacts(db, "base", "cand")
+        assert first["diff_kind"] == "json"
+        assert first["changes"]["changed"] == 1
+
+        (tmp_path / "ba" / "base").unlink()
+        assert service.diff_artifacts(db, "base", "cand") is first
+
+
+def test_artifact_diff_decodes_content_and_reports_missing_blobs(client, tmp_path) -> None:
+    from backend.app.db.models import Artifact
+    from backend.app.db.session import SessionLocal
+
+    store = LocalArtifactStore(str(tmp_path), "artifacts")
+    service = ArtifactDiffService(store, cache_entries=0)
+    blobs = {
+        "gz": ("gzip", gzip.compress(b"alpha\nbeta\n")),
+        "plain": ("identity", b"alpha\ngamma\n"),
+        "brotli": ("br", b"not decodable here"),
+        "gone": ("identity", b"deleted\n"),
+    }
+    with SessionLocal() as db:
+        for name, (encoding, content) in blobs.items():
+            store.store(name, content)
+            db.add(
+                Artifact(
+                    artifact_hash=name,
+                    artifact_type="model_response",
+                    byte_size=len(content),
+                    mime_type="text/plain",
+                    content_encoding=encoding,
+                    storage_bucket="artifacts",
+                    storage_object_key=f"{name[:2]}/{name}",
+                    status="ready",
+                )
+            )
+        db.commit()
+        (tmp_path / "go" / "gone").unlink()
+
+        decoded = service.diff_artifacts(db, "gz", "plain")
+        assert decoded["changes"]["unified_diff"][1:] == [" alpha", "-beta", "+gamma"]
+
+        with pytest.raises(EventValidationError) as unsupported:
+            service.diff_artifacts(db, "brotli", "plain")
+        assert unsupported.value.details["content_encoding"] == "br"
+
+        with pytest.raises(EventValidationError) as missing:
+            service.diff_artifacts(db, "gone", "plain")
+        assert missing.value.code == "NOT_FOUND"
+        assert missing.value.details == {"artifact_hash": "gone", "error": "FileNotFoundError"}
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import io
+import time
+
+from backend.app.modules.bundles.service import _iter_artifact_content
+
+
+class OpenCountingStore:
+    def __init__(self) -> None:
+        self.handles: list[io.BytesIO] = []
+
+    def open(self, artifact_hash: str) -> tuple[io.BytesIO, int]:
+        handle = io.BytesIO(artifact_hash.encode("utf-8"))
+        self.handles.append(handle)
+        return handle, len(artifact_hash)
+
+
+def test_closing_the_export_early_closes_prefetched_handles() -> None:
+    store = OpenCountingStore()
+    records = (
+        {"artifact_hash": f"hash-{index}", "status": "ready", "byte_size": 100}
+        for index in range(10)
+    )
+    chunks = _iter_artifact_content(
+        store, records, include_content=True, read_workers=4, prefetch_max_bytes=0
+    )
+
+    _, (handle, _) = next(chunks)
+    handle.close()  # The consumer owns what it was given.
+    chunks.close()
+
+    deadline = time.monotonic() + 5
+    while not all(opened.closed for opened in store.handles) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.handles and all(opened.closed for opened in store.handles)
+    assert len(store.handles) <= 5
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+import uuid
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+
+from backend.app.db.models import NIL_UUID, Event, UUIDString, new_id, uuid7
+
+
+def test_uuid7_is_time_ordered_version_7() -> None:
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert first.version == 7 and first.variant == uuid.RFC_4122
+    assert str(first) < str(second)
+    assert abs((first.int >> 80) - time.time_ns() // 1_000_000) < 1000
+    assert uuid.UUID(new_id()).version == 7
+
+
+def test_uuid_keys_bind_natively_on_postgres_and_as_text_elsewhere() -> None:
+    column = UUIDString()
+    key = "0192F0A0-8C44-7DA1-953A-12910561D8FA"
+    assert column.process_bind_param(key, postgresql.dialect()) == key.lower()
+    assert column.process_bind_param("does-not-exist", postgresql.dialect()) == NIL_UUID
+    assert column.process_bind_param("run-1", sqlite.dialect()) == "run-1"
+
+
+def test_events_use_uuid_and_enum_columns_on_postgres_only() -> None:
+    postgres = str(CreateTable(Event.__table__).compile(dialect=postgresql.dialect()))
+    assert "event_id UUID NOT NULL" in postgres
+    assert "event_type event_type NOT NULL" in postgres
+    assert "step_id VARCHAR(64)" in postgres
+
+    other = str(CreateTable(Event.__table__).compile(dialect=sqlite.dialect()))
+    assert "event_id VARCHAR(64)" in other and "event_type VARCHAR(64)" in other
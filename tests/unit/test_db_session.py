@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from backend.app.config import settings
+from backend.app.db.session import engine, engine_options
+
+
+def test_pool_options_skip_in_memory_sqlite() -> None:
+    assert "pool_size" not in engine_options("sqlite://")
+    options = engine_options("sqlite:///./other.db")
+    assert options["pool_size"] == settings.db_pool_size
+    assert options["pool_pre_ping"] is settings.db_pool_pre_ping
+    assert "connect_args" not in engine_options("postgresql+psycopg://u:p@db/x")
+
+
+def test_sqlite_connections_use_wal_and_busy_timeout() -> None:
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert (
+            connection.execute(text("PRAGMA busy_timeout")).scalar()
+            == settings.sqlite_busy_timeout_ms
+        )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+
+from backend.app.services.http_cache import ResponseCache, etag_matches, make_body
+
+
+def test_response_cache_evicts_least_recently_used_past_byte_budget() -> None:
+    cache = ResponseCache(max_bytes=400, max_age_seconds=60)
+    bodies = {key: make_body({"key": key, "pad": "x" * 70}, 60) for key in "abcde"}
+    for key in "abcd":
+        cache.put(key, bodies[key])
+    assert cache.get("a") is bodies["a"]
+
+    cache.put("e", bodies["e"])
+    assert cache.get("b") is None
+    assert all(cache.get(key) is bodies[key] for key in "acde")
+    assert cache.stats()["bytes"] <= 400
+
+    cache.put("big", make_body({"pad": "x" * 200}, 60))
+    assert cache.get("big") is None
+
+
+def test_response_cache_expires_entries_and_can_be_disabled() -> None:
+    cache = ResponseCache(max_bytes=1000, max_age_seconds=0)
+    cache.put("a", make_body({"a": 1}, 0))
+    time.sleep(0.001)
+    assert cache.get("a") is None and cache.stats()["bytes"] == 0
+
+    disabled = ResponseCache(max_bytes=0)
+    disabled.put("a", make_body({"a": 1}, 60))
+    assert disabled.get("a") is None
+
+
+def test_etag_is_strong_and_matches_weak_or_listed_validators() -> None:
+    body = make_body({"a": 1}, 60)
+    assert body.etag.startswith('"') and body.etag == make_body({"a": 1}, 60).etag
+    assert body.etag != make_body({"a": 2}, 60).etag
+    assert etag_matches(f'"other", W/{body.etag}', body.etag)
+    assert etag_matches("*", body.etag)
+    assert not etag_matches(None, body.etag) and not etag_matches('"other"', body.etag)
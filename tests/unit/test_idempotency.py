@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from backend.app.db.models import Event, Run, Step, idempotency_key_hash
+from backend.app.services.idempotency import RecentKeyFilter, insert_event_if_new
+
+
+def test_recent_key_filter_remembers_keys_across_one_rotation() -> None:
+    keys = RecentKeyFilter(capacity=100)
+    hashes = [idempotency_key_hash(f"key-{index}") for index in range(250)]
+    for key_hash in hashes:
+        keys.add(key_hash)
+
+    # Keys from the current and previous generation are kept; the oldest generation is gone.
+    assert all(keys.might_contain(key_hash) for key_hash in hashes[100:])
+    unseen = [idempotency_key_hash(f"other-{index}") for index in range(1000)]
+    assert sum(keys.might_contain(key_hash) for key_hash in unseen) < 50
+
+
+def test_disabled_filter_always_asks_for_the_lookup() -> None:
+    keys = RecentKeyFilter(capacity=0)
+    assert keys.might_contain(idempotency_key_hash("anything"))
+
+
+def test_insert_event_if_new_skips_a_taken_key(client) -> None:
+    from backend.app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        db.add(
+            Run(
+                run_id="run-1",
+                trace_id="trace-1",
+                app_id="demo",
+                environment="test",
+                status="running",
+            )
+        )
+        db.add(Step(step_id="step-1", run_id="run-1", sequence_no=0, step_type="run_started"))
+        db.flush()
+        values = {
+            "run_id": "run-1",
+            "step_id": "step-1",
+            "event_type": "run_started",
+            "schema_version": "1.0.0",
+            "payload_json": {},
+            "idempotency_key": "same-key",
+            "idempotency_hash": idempotency_key_hash("same-key"),
+            "sequence_no": 0,
+        }
+
+        first = insert_event_if_new(db, {"event_id": "event-1", **values})
+        second = insert_event_if_new(db, {"event_id": "event-2", **values})
+        db.commit()
+
+        assert isinstance(first, Event) and first.event_id == "event-1"
+        assert second is None
+        assert db.query(Event).count() == 1
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from backend.app.db.session import SessionLocal
+from backend.app.services.partitions import _add_months, ensure_event_partitions, partition_name
+
+
+def test_partition_names_roll_over_year_boundaries() -> None:
+    december = datetime(2026, 12, 1, tzinfo=timezone.utc)
+    assert partition_name(december) == "events_p202612"
+    assert partition_name(_add_months(december, 1)) == "events_p202701"
+    assert _add_months(december, -12) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+def test_partition_maintenance_is_noop_on_unpartitioned_events() -> None:
+    with SessionLocal() as db:
+        assert ensure_event_partitions(db) == []
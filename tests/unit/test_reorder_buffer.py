@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.app.modules.ingestion.reorder import ReorderBuffer
+from backend.app.modules.ingestion.validation import EventValidationError
+from backend.app.schemas.events import CanonicalEvent
+
+
+def build_event(sequence_no: int) -> CanonicalEvent:
+    return CanonicalEvent(
+        trace_id="trace-1",
+        run_id="run-1",
+        step_id=f"step-{sequence_no}",
+        sequence_no=sequence_no,
+        event_type="run_started" if sequence_no == 0 else "input_received",
+        timestamp_utc="2026-02-11T00:00:00Z",
+        payload={},
+    )
+
+
+class FakeRun:
+    """Stands in for ingest: records apply order and enforces monotonic sequence numbers."""
+
+    def __init__(self) -> None:
+        self.applied: list[int] = []
+
+    async def apply(
+        self, run_id: str, idempotency_key: str, event: CanonicalEvent
+    ) -> tuple[str, bool, list[str]]:
+        await asyncio.sleep(0)
+        if self.applied and event.sequence_no <= self.applied[-1]:
+            raise EventValidationError("CONFLICT", "Event sequence_no must be monotonic and unique")
+        self.applied.append(event.sequence_no)
+        return f"event-{event.sequence_no}", True, []
+
+    async def last_sequence(self, run_id: str) -> int | None:
+        return self.applied[-1] if self.applied else None
+
+
+def submit(buffer: ReorderBuffer, run: FakeRun, sequence_no: int, apply=None):
+    key, event = f"key-{sequence_no}", build_event(sequence_no)
+    return buffer.submit("run-1", key, event, apply or run.apply, run.last_sequence)
+
+
+async def closed_session_apply(run_id: str, idempotency_key: str, event: CanonicalEvent):
+    raise AssertionError("held events must not be applied through the request that sent them")
+
+
+def test_concurrent_out_of_order_events_apply_in_sequence() -> None:
+    async def scenario() -> tuple[list[int], list[tuple[str, bool, list[str]]], dict]:
+        run = FakeRun()
+        buffer = ReorderBuffer(run.apply, window=16, timeout_ms=5000)
+        results = await asyncio.gather(
+            *(submit(buffer, run, sequence_no) for sequence_no in [3, 1, 4, 0, 2])
+        )
+        return run.applied, results, buffer.stats()
+
+    applied, results, stats = asyncio.run(scenario())
+    assert applied == [0, 1, 2, 3, 4]
+    assert [event_id for event_id, _, _ in results] == [
+        "event-3",
+        "event-1",
+        "event-4",
+        "event-0",
+        "event-2",
+    ]
+    assert stats["held_events"] == 0
+    assert stats["in_order"] + stats["reordered"] == 5
+
+
+def test_gap_is_skipped_after_timeout_and_late_event_conflicts() -> None:
+    async def scenario() -> tuple[list[int], dict]:
+        run = FakeRun()
+        buffer = ReorderBuffer(run.apply, window=16, timeout_ms=50)
+        await submit(buffer, run, 0)
+        await asyncio.gather(submit(buffer, run, 2), submit(buffer, run, 3))
+        with pytest.raises(EventValidationError):
+            await submit(buffer, run, 1)
+        return run.applied, buffer.stats()
+
+    applied, stats = asyncio.run(scenario())
+    assert applied == [0, 2, 3]
+    assert stats["gap_timeouts"] == 1
+    assert stats["late"] == 1
+    assert stats["dropped"] == 1
+
+
+def test_window_overflow_skips_the_gap() -> None:
+    async def scenario() -> tuple[list[int], dict]:
+        run = FakeRun()
+        buffer = ReorderBuffer(run.apply, window=2, timeout_ms=60000)
+        await submit(buffer, run, 0)
+        await asyncio.gather(*(submit(buffer, run, sequence_no) for sequence_no in [2, 3, 4]))
+        return run.applied, buffer.stats()
+
+    applied, stats = asyncio.run(scenario())
+    assert applied == [0, 2, 3, 4]
+    assert stats["window_overflows"] == 1
+    assert stats["gap_timeouts"] == 0
+
+
+def test_released_events_apply_through_the_releasing_request_or_the_buffer() -> None:
+    async def scenario() -> list[int]:
+        run = FakeRun()
+        buffer = ReorderBuffer(run.apply, window=16, timeout_ms=50)
+        await submit(buffer, run, 0)
+        # 2 is released by the request that fills the gap, 4 by the gap timer.
+        await asyncio.gather(
+            submit(buffer, run, 2, closed_session_apply),
+            submit(buffer, run, 1),
+            submit(buffer, run, 4, closed_session_apply),
+        )
+        return run.applied
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 4]
+
+
+def test_held_event_without_waiting_requests_is_dropped() -> None:
+    async def scenario() -> tuple[list[int], list[int], dict]:
+        run = FakeRun()
+        buffer = ReorderBuffer(run.apply, window=16, timeout_ms=60000)
+        await submit(buffer, run, 0)
+        abandoned = asyncio.ensure_future(submit(buffer, run, 2))
+        retry = asyncio.ensure_future(submit(buffer, run, 3))
+        retry_of_retry = asyncio.ensure_future(submit(buffer, run, 3))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        retry.cancel()
+        await submit(buffer, run, 1)
+        applied_before_retry = list(run.applied)
+        await submit(buffer, run, 2)
+        await retry_of_retry
+        return applied_before_retry, run.applied, buffer.stats()
+
+    applied_before_retry, applied, stats = asyncio.run(scenario())
+    # 3 still has a waiting request, but stays held until 2 is sent again.
+    assert applied_before_retry == [0, 1]
+    assert applied == [0, 1, 2, 3]
+    assert stats["dropped"] == 1
+    assert stats["held_events"] == 0
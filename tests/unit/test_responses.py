@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.app.schemas.api import ListEventsResponse, ListRunsResponse
+from backend.app.services.responses import dumps, success_body
+
+
+def _legacy(model) -> bytes:
+    # What FastAPI's JSONResponse wrote for a model_dump(mode="json") envelope.
+    encoded = jsonable_encoder(model.model_dump(mode="json"))
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def test_row_dicts_serialize_like_validated_response_models() -> None:
+    run = {
+        "run_id": "0192f0a0-8c44-7da1-953a-12910561d8fa",
+        "trace_id": "trace-1",
+        "app_id": "app",
+        "environment": "prod",
+        "status": "success",
+        "source_type": "live",
+        "source_run_id": None,
+        "started_at_utc": datetime(2026, 10, 19, 8, 30, 0, 120, tzinfo=timezone.utc),
+        "ended_at_utc": datetime(2026, 10, 19, 10, 30, tzinfo=timezone(timedelta(hours=2))),
+        "retention_class": "dev_short",
+    }
+    naive = {**run, "ended_at_utc": None, "started_at_utc": datetime(2026, 1, 1, 0, 0)}
+    runs = {"items": [run, naive], "next_page_token": "abc"}
+    assert dumps(runs) == _legacy(ListRunsResponse(**runs))
+
+    event = {
+        "event_id": "e-1",
+        "sequence_no": 3,
+        "timestamp_utc": datetime(2026, 10, 19, tzinfo=timezone.utc),
+        "payload": {"text": "héllo ✓", "score": 0.1, "nested": [1, True, None, {"k": 2.5}]},
+    }
+    events = {"items": [event], "next_page_token": None}
+    assert dumps(events) == _legacy(ListEventsResponse(**events))
+    # orjson may spell exponents differently (1e-7 vs 1e-07); the value is the same.
+    assert json.loads(dumps({"k": 1e-7})) == {"k": 1e-7}
+
+
+def test_dumps_falls_back_for_integers_beyond_64_bits() -> None:
+    assert json.loads(dumps({"value": 2**70})) == {"value": 2**70}
+    body = json.loads(success_body("req-1", dumps({"items": []})))
+    assert body == {
+        "request_id": "req-1",
+        "status": "success",
+        "data": {"items": []},
+        "error": None,
+    }
@@ -35,6 +35,12 @@ export type EventView = {
   payload: Record<string, unknown>;
 };
 
+export type TimelineEvent = Pick<EventView, "event_id" | "step_id" | "sequence_no" | "event_type" | "determinism_mode"> & {
+  payload_bytes?: number;
+};
+
+export type TimelinePage = { items: TimelineEvent[]; next_page_token: string | null };
+
 export type ReplayStatus = {
   replay_session_id: string;
   status: string;
@@ -43,6 +49,22 @@ export type ReplayStatus = {
   failure_reason_code: string | null;
 };
 
+export type RunStats = {
+  total_events: number;
+  last_sequence_no: number;
+  event_type_counts: Record<string, number>;
+  determinism_mode_counts: Record<string, number>;
+  artifact_bytes: number;
+};
+
+export type RunDetail = { run: RunSummary; counters: Record<string, number>; stats: RunStats };
+
+export type RunStatusUpdate = {
+  run_id: string;
+  status: string;
+  ended_at_utc: string | null;
+};
+
 const API_URL = import.meta.env.VITE_API_URL ?? "http://localhost:8000";
 
 async function request<T>(path: string, init?: RequestInit): Promise<T> {
@@ -64,11 +86,63 @@ export function listRuns() {
 }
 
 export function getRun(runId: string) {
-  return request<{ run: RunSummary; counters: Record<string, number> }>(`/api/v1/runs/${runId}`);
+  return request<RunDetail>(`/api/v1/runs/${runId}`);
 }
 
-export function listRunEvents(runId: string) {
-  return request<{ items: EventView[]; next_page_token: string | null }>(`/api/v1/runs/${runId}/events`);
+const TIMELINE_FIELDS = "step_id,event_type,determinism_mode";
+
+export function listTimelineEvents(runId: string, pageToken: string | null, pageSize: number) {
+  const params = new URLSearchParams({
+    fields: TIMELINE_FIELDS,
+    include_payload: "summary",
+    page_size: String(pageSize),
+  });
+  if (pageToken) {
+    params.set("page_token", pageToken);
+  }
+  return request<TimelinePage>(`/api/v1/runs/${runId}/events?${params.toString()}`);
+}
+
+export function getEvent(eventId: string) {
+  return request<EventView>(`/api/v1/events/${eventId}`);
+}
+
+function openStream(path: string, handlers: Record<string, (data: unknown) => boolean | void>) {
+  const source = new EventSource(`${API_URL}${path}`);
+  for (const [name, handler] of Object.entries(handlers)) {
+    source.addEventListener(name, (message) => {
+      // A handler returns true on a terminal update; close so EventSource does not reconnect.
+      if (handler(JSON.parse((message as MessageEvent<string>).data))) {
+        source.close();
+      }
+    });
+  }
+  return () => source.close();
+}
+
+export function streamRunEvents(
+  runId: string,
+  afterSequenceNo: number,
+  onEvent: (event: EventView) => void,
+  onStatus: (status: RunStatusUpdate) => void,
+) {
+  return openStream(`/api/v1/runs/${runId}/events/stream?after_sequence_no=${afterSequenceNo}`, {
+    trace_event: (data) => onEvent(data as EventView),
+    run_status: (data) => {
+      onStatus(data as RunStatusUpdate);
+      return true;
+    },
+  });
+}
+
+export function streamReplayStatus(replaySessionId: string, onStatus: (status: ReplayStatus) => void) {
+  return openStream(`/api/v1/replays/${replaySessionId}/stream`, {
+    replay_status: (data) => {
+      const status = data as ReplayStatus;
+      onStatus(status);
+      return status.status !== "pending" && status.status !== "running";
+    },
+  });
 }
 
 export function createReplay(input: {
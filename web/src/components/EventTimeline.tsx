@@ -0,0 +1,156 @@
+import { UIEvent, useEffect, useMemo, useRef, useState } from "react";
+import { InfiniteData, useInfiniteQuery, useQueryClient } from "@tanstack/react-query";
+import { TimelineEvent, TimelinePage, listTimelineEvents, streamRunEvents } from "../api";
+
+export const TIMELINE_PAGE_SIZE = 500;
+const ROW_HEIGHT = 36;
+const OVERSCAN = 12;
+
+const modeColor: Record<string, string> = {
+  live: "live",
+  exact: "exact",
+  cached: "cached",
+  simulated: "simulated",
+};
+
+export function useRunTimeline(runId: string, onRunStatus: (status: string, endedAtUtc: string | null) => void) {
+  const queryClient = useQueryClient();
+  const query = useInfiniteQuery({
+    queryKey: ["timeline", runId],
+    queryFn: ({ pageParam }) => listTimelineEvents(runId, pageParam, TIMELINE_PAGE_SIZE),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next_page_token,
+    staleTime: Infinity,
+  });
+
+  const items = useMemo(() => query.data?.pages.flatMap((page) => page.items) ?? [], [query.data]);
+
+  // Events only ever append, so the id -> position index grows incrementally instead of being rebuilt.
+  const indexRef = useRef<{ runId: string; positions: Map<string, number>; size: number }>({
+    runId,
+    positions: new Map(),
+    size: 0,
+  });
+  if (indexRef.current.runId !== runId || items.length < indexRef.current.size) {
+    indexRef.current = { runId, positions: new Map(), size: 0 };
+  }
+  for (let position = indexRef.current.size; position < items.length; position += 1) {
+    indexRef.current.positions.set(items[position].event_id, position);
+  }
+  indexRef.current.size = items.length;
+
+  const onRunStatusRef = useRef(onRunStatus);
+  onRunStatusRef.current = onRunStatus;
+
+  const fullyLoaded = query.isSuccess && !query.hasNextPage;
+  useEffect(() => {
+    if (!fullyLoaded) {
+      return undefined;
+    }
+    const loaded = queryClient.getQueryData<InfiniteData<TimelinePage>>(["timeline", runId]);
+    const lastPage = loaded?.pages[loaded.pages.length - 1];
+    const afterSequenceNo = lastPage?.items.length ? lastPage.items[lastPage.items.length - 1].sequence_no : -1;
+    return streamRunEvents(
+      runId,
+      afterSequenceNo,
+      (evt) =>
+        queryClient.setQueryData<InfiniteData<TimelinePage>>(["timeline", runId], (current) => {
+          if (!current) {
+            return current;
+          }
+          const pages = current.pages.slice();
+          const last = pages[pages.length - 1];
+          if (last.items.length && last.items[last.items.length - 1].sequence_no >= evt.sequence_no) {
+            return current;
+          }
+          const { event_id, step_id, sequence_no, event_type, determinism_mode } = evt;
+          const item = { event_id, step_id, sequence_no, event_type, determinism_mode };
+          pages[pages.length - 1] = { ...last, items: [...last.items, item] };
+          return { ...current, pages };
+        }),
+      (status) => onRunStatusRef.current(status.status, status.ended_at_utc),
+    );
+  }, [runId, fullyLoaded, queryClient]);
+
+  return {
+    items,
+    positions: indexRef.current.positions,
+    isLoading: query.isLoading,
+    error: query.error,
+    hasNextPage: query.hasNextPage,
+    isFetchingNextPage: query.isFetchingNextPage,
+    fetchNextPage: query.fetchNextPage,
+  };
+}
+
+type EventTimelineProps = {
+  items: TimelineEvent[];
+  total: number;
+  selectedEventId: string | null;
+  onSelect: (event: TimelineEvent) => void;
+  onVisibleRangeChange: (start: number, end: number) => void;
+};
+
+export function EventTimeline({ items, total, selectedEventId, onSelect, onVisibleRangeChange }: EventTimelineProps) {
+  const viewportRef = useRef<HTMLDivElement>(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(600);
+
+  useEffect(() => {
+    const viewport = viewportRef.current;
+    if (!viewport) {
+      return undefined;
+    }
+    const observer = new ResizeObserver(() => setViewportHeight(viewport.clientHeight));
+    observer.observe(viewport);
+    return () => observer.disconnect();
+  }, []);
+
+  const rowCount = Math.max(total, items.length);
+  const start = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+  const end = Math.min(rowCount, Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN);
+
+  useEffect(() => {
+    onVisibleRangeChange(start, end);
+  }, [start, end, onVisibleRangeChange]);
+
+  const rows = [];
+  for (let position = start; position < end; position += 1) {
+    const evt = items[position];
+    const style = { top: position * ROW_HEIGHT, height: ROW_HEIGHT - 4 };
+    rows.push(
+      evt ? (
+        <button
+          key={evt.event_id}
+          type="button"
+          role="listitem"
+          style={style}
+          className={`timeline-item ${selectedEventId === evt.event_id ? "selected" : ""}`}
+          onClick={() => onSelect(evt)}
+        >
+          <span className={`mode-dot ${modeColor[evt.determinism_mode] ?? "live"}`} />
+          <strong>{evt.sequence_no}</strong>
+          <span>{evt.event_type}</span>
+        </button>
+      ) : (
+        <div key={`pending-${position}`} role="listitem" style={style} className="timeline-item pending">
+          Loading...
+        </div>
+      ),
+    );
+  }
+
+  return (
+    <div
+      ref={viewportRef}
+      className="timeline-list"
+      role="list"
+      tabIndex={0}
+      onScroll={(event: UIEvent<HTMLDivElement>) => setScrollTop(event.currentTarget.scrollTop)}
+    >
+      <div className="timeline-canvas" style={{ height: rowCount * ROW_HEIGHT }}>
+        {rows}
+      </div>
+    </div>
+  );
+}
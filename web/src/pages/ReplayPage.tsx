@@ -1,15 +1,21 @@
-import { useQuery } from "@tanstack/react-query";
+import { useEffect } from "react";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
 import { Link, useParams } from "react-router-dom";
-import { getReplayStatus } from "../api";
+import { getReplayStatus, streamReplayStatus } from "../api";
 
 export function ReplayPage() {
   const { replayId = "" } = useParams();
+  const queryClient = useQueryClient();
   const statusQuery = useQuery({
     queryKey: ["replay", replayId],
     queryFn: () => getReplayStatus(replayId),
-    refetchInterval: 1500,
   });
 
+  useEffect(
+    () => streamReplayStatus(replayId, (status) => queryClient.setQueryData(["replay", replayId], status)),
+    [replayId, queryClient],
+  );
+
   const status = statusQuery.data;
 
   return (
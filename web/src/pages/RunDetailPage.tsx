@@ -1,29 +1,35 @@
-import { FormEvent, useMemo, useState } from "react";
-import { useMutation, useQuery } from "@tanstack/react-query";
+import { FormEvent, useCallback, useEffect, useState } from "react";
+import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { useNavigate, useParams } from "react-router-dom";
-import { createReplay, getRun, listRunEvents } from "../api";
-
-const modeColor: Record<string, string> = {
-  live: "live",
-  exact: "exact",
-  cached: "cached",
-  simulated: "simulated",
-};
+import { RunDetail, createReplay, getEvent, getRun } from "../api";
+import { EventTimeline, TIMELINE_PAGE_SIZE, useRunTimeline } from "../components/EventTimeline";
 
 export function RunDetailPage() {
   const { runId = "" } = useParams();
   const navigate = useNavigate();
+  const queryClient = useQueryClient();
 
   const runQuery = useQuery({
     queryKey: ["run", runId],
     queryFn: () => getRun(runId),
   });
 
-  const eventsQuery = useQuery({
-    queryKey: ["events", runId],
-    queryFn: () => listRunEvents(runId),
-    refetchInterval: 5000,
-  });
+  const timeline = useRunTimeline(runId, (status, endedAtUtc) =>
+    queryClient.setQueryData<RunDetail>(["run", runId], (current) =>
+      current ? { ...current, run: { ...current.run, status, ended_at_utc: endedAtUtc } } : current,
+    ),
+  );
+
+  const [visibleEnd, setVisibleEnd] = useState(0);
+  const onVisibleRangeChange = useCallback((_start: number, end: number) => setVisibleEnd(end), []);
+  const { items, hasNextPage, isFetchingNextPage, fetchNextPage } = timeline;
+
+  // Keep one page loaded beyond the viewport; scrolling far ahead chains page fetches until it is covered.
+  useEffect(() => {
+    if (hasNextPage && !isFetchingNextPage && visibleEnd + TIMELINE_PAGE_SIZE / 2 >= items.length) {
+      void fetchNextPage();
+    }
+  }, [visibleEnd, items.length, hasNextPage, isFetchingNextPage, fetchNextPage]);
 
   const [selectedEventId, setSelectedEventId] = useState<string | null>(null);
   const [forkStepId, setForkStepId] = useState("");
@@ -33,16 +39,16 @@ export function RunDetailPage() {
   const [modelId, setModelId] = useState("");
   const [retrieverTopK, setRetrieverTopK] = useState("");
 
-  const selectedEvent = useMemo(() => {
-    const items = eventsQuery.data?.items ?? [];
-    if (!items.length) {
-      return null;
-    }
-    if (!selectedEventId) {
-      return items[0];
-    }
-    return items.find((item) => item.event_id === selectedEventId) ?? items[0];
-  }, [eventsQuery.data, selectedEventId]);
+  const selectedPosition = selectedEventId ? timeline.positions.get(selectedEventId) : undefined;
+  const selectedEvent = items[selectedPosition ?? 0] ?? null;
+
+  // Timeline pages omit payloads; only the selected event's payload is fetched. Events are immutable.
+  const payloadQuery = useQuery({
+    queryKey: ["event", selectedEvent?.event_id],
+    queryFn: () => getEvent(selectedEvent!.event_id),
+    enabled: Boolean(selectedEvent),
+    staleTime: Infinity,
+  });
 
   const replayMutation = useMutation({
     mutationFn: () =>
@@ -88,24 +94,17 @@ export function RunDetailPage() {
     <section className="cockpit">
       <aside className="panel timeline-panel" aria-label="Timeline panel">
         <h2>Timeline</h2>
-        <div className="timeline-list" role="list" tabIndex={0}>
-          {(eventsQuery.data?.items ?? []).map((evt) => (
-            <button
-              key={evt.event_id}
-              type="button"
-              role="listitem"
-              className={`timeline-item ${selectedEvent?.event_id === evt.event_id ? "selected" : ""}`}
-              onClick={() => {
-                setSelectedEventId(evt.event_id);
-                setForkStepId(evt.step_id);
-              }}
-            >
-              <span className={`mode-dot ${modeColor[evt.determinism_mode] ?? "live"}`} />
-              <strong>{evt.sequence_no}</strong>
-              <span>{evt.event_type}</span>
-            </button>
-          ))}
-        </div>
+        <EventTimeline
+          items={items}
+          total={runQuery.data?.counters.total_events ?? items.length}
+          selectedEventId={selectedEvent?.event_id ?? null}
+          onSelect={(evt) => {
+            setSelectedEventId(evt.event_id);
+            setForkStepId(evt.step_id);
+          }}
+          onVisibleRangeChange={onVisibleRangeChange}
+        />
+        {timeline.error ? <p className="error">Failed to load events.</p> : null}
       </aside>
 
       <article className="panel inspector-panel" aria-label="Step inspector">
@@ -125,8 +124,13 @@ export function RunDetailPage() {
             <h3>{selectedEvent.event_type}</h3>
             <p>Step: {selectedEvent.step_id}</p>
             <p>Mode: {selectedEvent.determinism_mode}</p>
-            <p>Redaction: {selectedEvent.redaction_status}</p>
-            <pre>{JSON.stringify(selectedEvent.payload, null, 2)}</pre>
+            {payloadQuery.data ? <p>Redaction: {payloadQuery.data.redaction_status}</p> : null}
+            {selectedEvent.payload_bytes !== undefined ? <p>Payload size: {selectedEvent.payload_bytes} bytes</p> : null}
+            {payloadQuery.data ? (
+              <pre>{JSON.stringify(payloadQuery.data.payload, null, 2)}</pre>
+            ) : (
+              <p>Loading payload...</p>
+            )}
           </div>
         ) : (
           <p>No events yet.</p>
@@ -0,0 +1,34 @@
+"""Recompute the precomputed per-run counters in run_stats from the events table.
+
+Usage:
+    python -m worker.app.rebuild_run_stats             # every run
+    python -m worker.app.rebuild_run_stats RUN_ID ...  # selected runs
+
+Use after upgrading to backfill runs that predate run_stats, or to repair drift. Sealed runs are
+skipped: their counters were final when they were sealed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from backend.app.db.session import SessionLocal
+from backend.app.services.run_stats import rebuild_all_run_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("run_ids", nargs="*")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        rebuilt = rebuild_all_run_stats(db, args.run_ids or None, batch_size=args.batch_size)
+    print(json.dumps({"runs_rebuilt": rebuilt}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Recompute the hourly usage rollups behind /analytics/usage from the events table.
+
+Usage:
+    python -m worker.app.rebuild_usage_rollups
+
+Use after upgrading to backfill existing events, or to repair drift. Rollups are
+replaced in one transaction, so run it while ingest is quiet.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from backend.app.db.session import SessionLocal
+from backend.app.modules.analytics.service import rebuild_usage_rollups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        rollups = rebuild_usage_rollups(db, batch_size=args.batch_size)
+    print(json.dumps({"rollups_written": rollups}))
+
+
+if __name__ == "__main__":
+    main()
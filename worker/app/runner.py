@@ -4,8 +4,22 @@ import time
 
 from backend.app.config import settings
 from backend.app.db.session import SessionLocal
+from backend.app.modules.compaction.service import seal_runs
 from backend.app.modules.replay.service import execute_replay_session
-from backend.app.services.jobs import fetch_next_job, mark_job_failure, mark_job_success
+from backend.app.modules.retention.service import run_retention
+from backend.app.services.artifact_store import get_artifact_store
+from backend.app.services.jobs import (
+    enqueue_job,
+    fetch_next_job,
+    has_open_job,
+    mark_job_failure,
+    mark_job_success,
+)
+from backend.app.services.partitions import ensure_event_partitions
+
+
+artifact_store = get_artifact_store()
+PARTITION_CHECK_SECONDS = 3600
 
 
 def process_one() -> bool:
@@ -18,6 +32,12 @@ def process_one() -> bool:
             if job.job_type == "replay_execute":
                 replay_session_id = str(job.payload_json["replay_session_id"])
                 execute_replay_session(db, replay_session_id)
+            elif job.job_type == "retention_purge":
+                run_retention(
+                    db, artifact_store, dry_run=bool(job.payload_json.get("dry_run", False))
+                )
+            elif job.job_type == "run_compaction":
+                seal_runs(db, artifact_store)
             else:
                 raise ValueError(f"Unsupported job type: {job.job_type}")
             mark_job_success(db, job)
@@ -26,9 +46,42 @@ def process_one() -> bool:
         return True
 
 
+def schedule_retention() -> None:
+    with SessionLocal() as db:
+        if not has_open_job(db, "retention_purge"):
+            enqueue_job(db, "retention_purge", {"dry_run": False})
+
+
+def schedule_compaction() -> None:
+    with SessionLocal() as db:
+        if not has_open_job(db, "run_compaction"):
+            enqueue_job(db, "run_compaction", {})
+
+
+def maintain_partitions() -> None:
+    with SessionLocal() as db:
+        ensure_event_partitions(db)
+
+
 def run_forever() -> None:
     interval = max(settings.worker_poll_interval_ms, 100) / 1000.0
+    retention_interval = settings.retention_interval_minutes * 60
+    compaction_interval = (
+        settings.compaction_interval_minutes * 60 if settings.compaction_seal_after_days > 0 else 0
+    )
+    next_retention = time.monotonic()
+    next_compaction = time.monotonic()
+    next_partition_check = time.monotonic()
     while True:
+        if time.monotonic() >= next_partition_check:
+            maintain_partitions()
+            next_partition_check = time.monotonic() + PARTITION_CHECK_SECONDS
+        if retention_interval > 0 and time.monotonic() >= next_retention:
+            schedule_retention()
+            next_retention = time.monotonic() + retention_interval
+        if compaction_interval > 0 and time.monotonic() >= next_compaction:
+            schedule_compaction()
+            next_compaction = time.monotonic() + compaction_interval
         handled = process_one()
         if not handled:
             time.sleep(interval)